@@ -11,10 +11,13 @@ Implementiert Admin-API-Endpunkte wie:
 import time
 import os
 import json
+import asyncio
+import sqlite3
+import threading
 import psutil
 import platform
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from fastapi import HTTPException, Depends, Request, Query
 from pydantic import BaseModel
 import sys
@@ -27,6 +30,10 @@ if base_dir not in sys.path:
 from modules.core.config import Config
 from modules.core.logging import LogManager
 from modules.feedback.feedback_manager import FeedbackManager
+from modules.feedback.feedback_export import iter_export, validate_export, export_filename, export_media_type
+from modules.core.response_cache import get_response_cache
+from modules.core.telemetry_store import get_telemetry_store
+from modules.core.metrics import metrics
 
 # Logger initialisieren
 logger = LogManager.setup_logging(name="admin_handler")
@@ -51,257 +58,289 @@ class ExportRequest(BaseModel):
     data: List[Dict[str, Any]]
     fields: List[str]
 
-# Helper-Funktionen für Admin-Handler
-def get_system_stats() -> Dict[str, Any]:
+def _directory_size(path: Path) -> int:
+    """Summe der Dateigrößen unterhalb eines Verzeichnisses (os.scandir statt glob + stat)"""
+    total = 0
+    stack = [str(path)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _fallback_stats() -> Dict[str, Any]:
+    """Minimales Statistik-Objekt, falls noch keine Erfassung gelungen ist"""
+    return {
+        "total_users": 0,
+        "active_users_today": 0,
+        "total_sessions": 0,
+        "total_messages": 0,
+        "avg_messages_per_session": 0,
+        "total_feedback": 0,
+        "positive_feedback_percent": 0,
+        "database_size_mb": 0,
+        "cache_size_mb": 0,
+        "cache_hit_rate": 0,
+        "document_count": 0,
+        "avg_response_time_ms": 0,
+        "active_model": "unknown",
+        "cpu_usage_percent": 0,
+        "memory_usage_percent": 0,
+        "uptime_days": 0,
+        "start_time": int(time.time() * 1000),
+    }
+
+
+class SystemStatsCollector:
     """
-    Sammelt umfassende Systemstatistiken für Admin-Dashboard
+    Sammelt die Systemstatistiken für das Admin-Dashboard im Hintergrund.
+
+    Ein periodischer Task aktualisiert CPU, Speicher, Prozess- und RAG/LLM-Zähler alle
+    interval Sekunden, die teuren Werte (Festplatte, Cache-Verzeichnis, Datenbank,
+    Feedback) alle slow_interval Sekunden, und ersetzt danach den Snapshot als Ganzes.
+    Die Admin-Endpunkte lesen nur den letzten Snapshot; der erste Lauf des Samplers
+    beim Serverstart erfasst sofort alle Werte.
     """
-    try:
-        # Basis-Systeminfo
-        cpu_count = psutil.cpu_count(logical=True)
-        cpu_usage = psutil.cpu_percent(interval=0.5)
-        
-        # Speicherinfo
+    
+    def __init__(self, interval: Optional[float] = None, slow_interval: Optional[float] = None):
+        self.interval = interval or Config.SYSTEM_STATS_INTERVAL
+        self.slow_interval = slow_interval or Config.SYSTEM_STATS_SLOW_INTERVAL
+        self._snapshot: Dict[str, Any] = {}
+        self._slow: Dict[str, Any] = {}
+        self._last_slow = 0.0
+        self._last_requests: Optional[Tuple[int, float]] = None
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._refresh_lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+        # Erste Messung startet die CPU-Zeitfenster, interval=None blockiert nie
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+    
+    def register_source(self, name: str, source: Callable[[], Dict[str, Any]]) -> None:
+        """Weitere Werte (z.B. Dokumentanzahl der RAG-Engine) in den langsamen Zyklus aufnehmen"""
+        self._sources[name] = source
+    
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Letzter Snapshot; vor dem ersten Lauf des Samplers Platzhalterwerte (erfasst nie selbst)"""
+        return dict(self._snapshot or _fallback_stats())
+    
+    async def run_periodic(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            full = time.monotonic() - self._last_slow >= self.slow_interval
+            await loop.run_in_executor(None, self.refresh, full)
+            await asyncio.sleep(self.interval)
+    
+    def refresh(self, full: bool = False) -> None:
+        with self._refresh_lock:
+            try:
+                if full or not self._slow:
+                    self._slow = self._collect_slow()
+                    self._last_slow = time.monotonic()
+                snapshot = {**self._slow, **self._collect_fast()}
+                snapshot["collected_at"] = int(time.time() * 1000)
+                self._snapshot = snapshot
+            except Exception as e:
+                logger.error(f"Fehler beim Erfassen der Systemstatistiken: {e}")
+    
+    def _collect_fast(self) -> Dict[str, Any]:
         memory = psutil.virtual_memory()
-        memory_total_mb = memory.total / (1024 * 1024)
-        memory_used_mb = memory.used / (1024 * 1024)
-        memory_percent = memory.percent
+        process_create_time = self._process.create_time()
+        
+        # Trefferquote des Antwort-Caches seit Prozessstart (in Prozent)
+        cache_stats = get_response_cache().stats()
         
-        # Festplatteninfo
+        # Anfragen pro Sekunde aus dem Routen-Histogramm seit der letzten Erfassung
+        now = time.monotonic()
+        request_count = metrics.http_duration.total_count()
+        requests_per_second = 0.0
+        if self._last_requests and now > self._last_requests[1]:
+            requests_per_second = (request_count - self._last_requests[0]) / (now - self._last_requests[1])
+        self._last_requests = (request_count, now)
+        
+        return {
+            "cpu_usage_percent": psutil.cpu_percent(interval=None),
+            "memory_total_mb": round(memory.total / (1024 * 1024), 2),
+            "memory_used_mb": round(memory.used / (1024 * 1024), 2),
+            "memory_usage_percent": memory.percent,
+            "process_memory_mb": round(self._process.memory_info().rss / (1024 * 1024), 2),
+            "process_cpu_percent": self._process.cpu_percent(interval=None),
+            "process_threads": self._process.num_threads(),
+            "process_uptime_days": round((time.time() - process_create_time) / 86400, 2),
+            "start_time": int(process_create_time * 1000),  # Unix-Timestamp in Millisekunden
+            "uptime_days": round((time.time() - psutil.boot_time()) / 86400, 2),
+            "cache_hit_rate": round(cache_stats["hit_rate"] * 100, 1),
+            "cache_entries": cache_stats.get("local_entries", 0),
+            "requests_per_second": round(requests_per_second, 2),
+            **self._collect_llm_counters(),
+        }
+    
+    def _collect_llm_counters(self) -> Dict[str, Any]:
+        """RAG/LLM-Kennzahlen dieses Workers aus der Metrik-Registry"""
+        stages = {entry["stage"]: entry for entry in metrics.stage_duration.snapshot()}
+        
+        def stage_ms(stage: str, key: str = "p50") -> Optional[float]:
+            value = stages.get(stage, {}).get(key)
+            return round(value * 1000, 1) if value is not None else None
+        
+        rates = metrics.llm_tokens_per_second.snapshot()
+        return {
+            "llm_streams_total": int(metrics.llm_streams.total()),
+            "llm_stream_errors": int(metrics.llm_streams.total() - metrics.llm_streams.total(outcome="ok")),
+            "llm_tokens_total": int(metrics.llm_tokens.total()),
+            "llm_tokens_per_second_p50": round(rates[0]["p50"], 1) if rates and rates[0]["p50"] else None,
+            "rag_questions_total": stages.get("stream_total", {}).get("count", 0),
+            "ttft_p50_ms": stage_ms("ttft"),
+            "ttft_p95_ms": stage_ms("ttft", "p95"),
+            "embedding_search_p50_ms": stage_ms("embedding_search"),
+            "stream_total_p95_ms": stage_ms("stream_total", "p95"),
+        }
+    
+    def _collect_slow(self) -> Dict[str, Any]:
         disk = psutil.disk_usage('/')
-        disk_total_mb = disk.total / (1024 * 1024)
-        disk_used_mb = disk.used / (1024 * 1024)
-        disk_percent = disk.percent
-        
-        # Laufzeitinfo
-        boot_time = psutil.boot_time()
-        uptime_seconds = time.time() - boot_time
-        uptime_days = uptime_seconds / (60 * 60 * 24)
-        
-        # Systeminfos
-        system_info = {
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "python_version": platform.python_version(),
+        stats: Dict[str, Any] = {
+            "system_info": {
+                "os": platform.system(),
+                "os_version": platform.version(),
+                "python_version": platform.python_version(),
+            },
+            "cpu_count": psutil.cpu_count(logical=True),
+            "disk_total_mb": round(disk.total / (1024 * 1024), 2),
+            "disk_used_mb": round(disk.used / (1024 * 1024), 2),
+            "disk_usage_percent": disk.percent,
+            "active_model": Config.MODEL_NAME,
+            "db_optimization_running": False,
+            "last_backup_time": None,  # Es gibt keine Datenbanksicherung, deren Zeitpunkt bekannt wäre
         }
         
-        # Prozessinfo
-        process = psutil.Process(os.getpid())
-        process_memory_mb = process.memory_info().rss / (1024 * 1024)
-        process_cpu_percent = process.cpu_percent(interval=0.5)
-        process_threads = process.num_threads()
-        process_create_time = process.create_time()
-        process_uptime_seconds = time.time() - process_create_time
-        process_uptime_days = process_uptime_seconds / (60 * 60 * 24)
-
-        # Datenbank-Statistiken
         try:
-            db_path = Config.DB_PATH
-            db_size_mb = os.path.getsize(db_path) / (1024 * 1024) if os.path.exists(db_path) else 0
-        except Exception as e:
+            stats["database_size_mb"] = round(os.path.getsize(Config.DB_PATH) / (1024 * 1024), 2) if os.path.exists(Config.DB_PATH) else 0
+        except OSError as e:
             logger.error(f"Fehler beim Abrufen der Datenbankstatistiken: {e}")
-            db_size_mb = 0
-
-        # Cache-Statistiken
-        try:
-            cache_dir = Config.APP_DIR / "data" / "cache"
-            cache_size_mb = sum(f.stat().st_size for f in cache_dir.glob('**/*') if f.is_file()) / (1024 * 1024) if cache_dir.exists() else 0
-            # Schätzung für Cache-Hit-Rate (könnte in einer echten Implementierung aus einer Metrikdatenbank kommen)
-            cache_hit_rate = 78.5  # Beispielwert
-        except Exception as e:
-            logger.error(f"Fehler beim Abrufen der Cache-Statistiken: {e}")
-            cache_size_mb = 0
-            cache_hit_rate = 0
-            
-        # LLM-Modell- und Dokument-Statistiken
-        # In einer echten Implementierung würden diese Daten aus dem RAG-Engine kommen
-        doc_count = 0
-        try:
-            # Zähle Dateien im Dokumentenverzeichnis
-            docs_dir = Config.APP_DIR / "data" / "documents"
-            if docs_dir.exists():
-                doc_count = len([f for f in docs_dir.glob('**/*') if f.is_file()])
-        except Exception as e:
-            logger.error(f"Fehler beim Zählen der Dokumente: {e}")
-
-        active_model = os.environ.get("DEFAULT_MODEL", "LLaMa3-8B")
-        avg_response_time_ms = 850  # Beispielwert
+            stats["database_size_mb"] = 0
         
-        # Nutzungsstatistiken - versuche echte Daten zu bekommen
-        total_users = 0
-        active_users_today = 0
-        total_sessions = 0
-        total_messages = 0
-        avg_messages_per_session = 0
-        total_feedback = 0
-        positive_feedback_percent = 0
+        stats["cache_size_mb"] = round(_directory_size(Config.CACHE_DIR) / (1024 * 1024), 2)
         
+        # Dokumentanzahl aus dem Dateisystem; eine registrierte RAG-Quelle überschreibt sie
+        docs_dir = Config.APP_DIR / "data" / "documents"
         try:
-            # Versuche, echte Benutzerdaten aus der Datenbank zu bekommen
-            if os.path.exists(Config.DB_PATH):
-                import sqlite3
-                conn = sqlite3.connect(Config.DB_PATH)
-                cursor = conn.cursor()
-                
-                # Zähle alle Benutzer
-                cursor.execute("SELECT COUNT(*) FROM users")
-                total_users = cursor.fetchone()[0]
-                
-                # Zähle aktive Benutzer heute (basierend auf last_login)
-                today_start = int((time.time() // 86400) * 86400)  # Mitternacht heute
-                cursor.execute("SELECT COUNT(*) FROM users WHERE last_login > ?", (today_start,))
-                active_users_today = cursor.fetchone()[0]
-                
-                conn.close()
-        except Exception as e:
-            logger.debug(f"Konnte keine echten Benutzerdaten abrufen: {e}")
-            # Fallback: Wenn mindestens ein Benutzer angemeldet ist, zeige realistische Werte
-            total_users = 1
-            active_users_today = 1
+            stats["document_count"] = sum(len(files) for _, _, files in os.walk(docs_dir))
+        except OSError:
+            stats["document_count"] = 0
         
+        stats.update(self._collect_usage())
+        
+        # Mittlere Stream-Dauer der letzten 24 Stunden aus den Telemetrie-Rollups
+        stats["avg_response_time_ms"] = 0
         try:
-            # Versuche, echte Sitzungsdaten zu bekommen
-            sessions_dir = Config.APP_DIR / "data" / "sessions"
-            if sessions_dir.exists():
-                # Zähle alle Sitzungsdateien
-                session_files = list(sessions_dir.glob("*.json"))
-                total_sessions = len(session_files)
-                
-                # Zähle Nachrichten in allen Sitzungen
-                for session_file in session_files:
-                    try:
-                        with open(session_file, 'r') as f:
-                            session_data = json.load(f)
-                            if 'messages' in session_data:
-                                total_messages += len(session_data['messages'])
-                    except:
-                        pass
-                
-                if total_sessions > 0:
-                    avg_messages_per_session = round(total_messages / total_sessions, 1)
+            latency = get_telemetry_store().query("stream_latency", hours=24, filters={"status": "ok"})
+            if latency["groups"]:
+                stats["avg_response_time_ms"] = round(latency["groups"][0]["avg"])
         except Exception as e:
-            logger.debug(f"Konnte keine echten Sitzungsdaten abrufen: {e}")
-            # Fallback: Zeige mindestens 1 Sitzung wenn ein Benutzer angemeldet ist
-            if active_users_today > 0:
-                total_sessions = 1
-                total_messages = 0
-                avg_messages_per_session = 0
-        
-        # Feedback-Statistiken
+            logger.error(f"Fehler beim Abrufen der Antwortzeiten: {e}")
+        
         try:
             feedback_stats = feedback_manager.get_feedback_stats()
-            total_feedback = feedback_stats.get('total', 0)
-            positive_feedback_percent = feedback_stats.get('positive_percent', 0)
-        except:
-            pass
+            stats["total_feedback"] = feedback_stats.get('total', 0)
+            stats["positive_feedback_percent"] = feedback_stats.get('positive_percent', 0)
+        except Exception as e:
+            logger.debug(f"Feedback-Statistiken nicht verfügbar: {e}")
+            stats["total_feedback"] = 0
+            stats["positive_feedback_percent"] = 0
         
-        # Finales Statistik-Objekt
-        stats = {
-            "total_users": total_users,
-            "active_users_today": active_users_today,
-            "active_users": active_users_today,  # Die Komponente erwartet auch dieses Feld
-            "total_sessions": total_sessions,
-            "active_sessions": min(total_sessions, active_users_today * 2),  # Geschätzte aktive Sitzungen
-            "total_messages": total_messages,
-            "avg_messages_per_session": avg_messages_per_session,
-            "total_feedback": total_feedback,
-            "positive_feedback_percent": positive_feedback_percent,
-            "database_size_mb": round(db_size_mb, 2),
-            "cache_size_mb": round(cache_size_mb, 2),
-            "cache_hit_rate": cache_hit_rate,
-            "cache_entries": int(cache_size_mb * 100) if cache_size_mb > 0 else 0,  # Geschätzte Cache-Einträge
-            "document_count": doc_count,
-            "avg_response_time_ms": avg_response_time_ms,
-            "active_model": active_model,
-            "requests_per_second": 0.5 if active_users_today > 0 else 0,  # Geschätzte Anfragen/Sek
-            
-            "system_info": system_info,
-            "cpu_count": cpu_count,
-            "cpu_usage_percent": cpu_usage,
-            "memory_total_mb": round(memory_total_mb, 2),
-            "memory_used_mb": round(memory_used_mb, 2),
-            "memory_usage_percent": memory_percent,
-            "disk_total_mb": round(disk_total_mb, 2),
-            "disk_used_mb": round(disk_used_mb, 2),
-            "disk_usage_percent": disk_percent,
-            "uptime_days": round(uptime_days, 2),
-            "process_memory_mb": round(process_memory_mb, 2),
-            "process_cpu_percent": process_cpu_percent,
-            "process_threads": process_threads,
-            "process_uptime_days": round(process_uptime_days, 2),
-            "start_time": int(process_create_time * 1000),  # Unix-Timestamp in Millisekunden
-            "db_optimization_running": False,
-            "last_backup_time": int((time.time() - 24 * 3600) * 1000),  # Gestern
-        }
+        for name, source in self._sources.items():
+            try:
+                stats.update(source())
+            except Exception as e:
+                logger.warning(f"Statistikquelle '{name}' fehlgeschlagen: {e}")
         
         return stats
-    except Exception as e:
-        logger.error(f"Fehler beim Erfassen der Systemstatistiken: {e}")
-        # Minimales Fallback-Objekt
-        return {
+    
+    def _collect_usage(self) -> Dict[str, Any]:
+        """Benutzer-, Sitzungs- und Nachrichtenzahlen direkt aus der Datenbank"""
+        usage = {
             "total_users": 0,
             "active_users_today": 0,
             "total_sessions": 0,
+            "active_sessions": 0,
             "total_messages": 0,
             "avg_messages_per_session": 0,
-            "total_feedback": 0,
-            "positive_feedback_percent": 0,
-            "database_size_mb": 0,
-            "cache_size_mb": 0,
-            "cache_hit_rate": 0,
-            "document_count": 0,
-            "avg_response_time_ms": 0,
-            "active_model": "unknown",
-            "cpu_usage_percent": 0,
-            "memory_usage_percent": 0,
-            "uptime_days": 0,
-            "start_time": int(time.time() * 1000),
         }
+        if not os.path.exists(Config.DB_PATH):
+            return usage
+        
+        today_start = int((time.time() // 86400) * 86400)  # Mitternacht heute
+        conn = sqlite3.connect(Config.DB_PATH, timeout=5)
+        try:
+            cursor = conn.cursor()
+            for key, query, params in (
+                ("total_users", "SELECT COUNT(*) FROM users", ()),
+                ("active_users_today", "SELECT COUNT(*) FROM users WHERE last_login > ?", (today_start,)),
+                ("total_sessions", "SELECT COUNT(*) FROM chat_sessions", ()),
+                ("active_sessions", "SELECT COUNT(*) FROM chat_sessions WHERE updated_at > ?", (int(time.time()) - 86400,)),
+                ("total_messages", "SELECT COUNT(*) FROM chat_messages", ()),
+            ):
+                try:
+                    usage[key] = cursor.execute(query, params).fetchone()[0]
+                except sqlite3.Error as e:
+                    logger.debug(f"Konnte '{key}' nicht abrufen: {e}")
+        finally:
+            conn.close()
+        
+        if usage["total_sessions"]:
+            usage["avg_messages_per_session"] = round(usage["total_messages"] / usage["total_sessions"], 1)
+        return usage
+
+
+_stats_collector: Optional[SystemStatsCollector] = None
+
+
+def start_stats_collector() -> SystemStatsCollector:
+    """Erzeugt den Collector beim Serverstart statt beim Import des Moduls"""
+    global _stats_collector
+    if _stats_collector is None:
+        _stats_collector = SystemStatsCollector()
+    return _stats_collector
+
+
+# Helper-Funktionen für Admin-Handler
+def get_system_stats() -> Dict[str, Any]:
+    """
+    Liefert den letzten Snapshot der Systemstatistiken für das Admin-Dashboard
+    """
+    stats = _stats_collector.get_snapshot() if _stats_collector else _fallback_stats()
+    # Die Komponente erwartet beide Felder
+    stats.setdefault("active_users", stats.get("active_users_today", 0))
+    return stats
 
 def get_feedback_stats() -> Dict[str, Any]:
     """
     Generiert detaillierte Feedback-Statistiken für das Admin-Dashboard
     """
     try:
-        # In einer echten Implementierung würden diese Werte aus der Datenbank kommen
-        total = 120
-        positive = 95
-        negative = 25
-        positive_percent = round((positive / total) * 100 if total > 0 else 0, 1)
-        with_comments = 42
-        unresolved = 18
-        feedback_rate = 15.3  # Prozentsatz der Nachrichten mit Feedback
-        
-        # Zeitreihendaten für die letzten 7 Tage
-        current_time = time.time()
-        feedback_by_day = []
-        
-        for i in range(7, 0, -1):
-            day_offset = i * 24 * 3600
-            day_timestamp = current_time - day_offset
-            day_date = time.strftime("%Y-%m-%d", time.localtime(day_timestamp))
-            
-            # Simulierte Werte
-            day_positive = max(0, int(10 + (i % 3) * 5))
-            day_negative = max(0, int(2 + (i % 2) * 3))
-            day_count = day_positive + day_negative
-            
-            feedback_by_day.append({
-                "date": day_date,
-                "positive": day_positive,
-                "negative": day_negative,
-                "count": day_count
-            })
+        # Zähler und Zeitreihe aus den materialisierten Aggregaten des FeedbackManagers
+        feedback_stats = feedback_manager.get_feedback_stats()
         
         stats = {
-            "total": total,
-            "positive": positive,
-            "negative": negative,
-            "positive_percent": positive_percent,
-            "with_comments": with_comments,
-            "unresolved": unresolved,
-            "feedback_rate": feedback_rate,
-            "feedback_by_day": feedback_by_day
+            "total": feedback_stats.get('total', 0),
+            "positive": feedback_stats.get('positive', 0),
+            "negative": feedback_stats.get('negative', 0),
+            "positive_percent": round(feedback_stats.get('positive_percent', 0), 1),
+            "with_comments": feedback_stats.get('with_comments', 0),
+            "unresolved": feedback_stats.get('negative', 0),
+            "feedback_rate": feedback_stats.get('feedback_rate', 0),
+            "feedback_by_day": feedback_stats.get('feedback_by_day', []),
+            "feedback_by_source": feedback_stats.get('feedback_by_source', [])
         }
         
         return stats
@@ -321,6 +360,21 @@ def get_feedback_stats() -> Dict[str, Any]:
         }
         return stats
 
+def _format_feedback_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Bringt einen Feedback-Eintrag des FeedbackManagers in das Frontend-Format"""
+    return {
+        "id": f"f-{entry['id']}",
+        "message_id": f"m-{entry['message_id']}",
+        "session_id": f"s-{entry['session_id']}",
+        "user_id": f"u-{entry['user_id']}",
+        "user_email": entry['user_email'],
+        "is_positive": bool(entry.get('is_positive', False)),
+        "comment": entry['comment'],
+        "question": entry['question'] or "Keine Frage gespeichert",
+        "answer": entry['answer'] or "Keine Antwort gespeichert",
+        "created_at": int(entry['created_at'] * 1000)  # Unix-Timestamp in Millisekunden
+    }
+
 def get_negative_feedback(limit: int = 100) -> List[Dict[str, Any]]:
     """
     Gibt eine Liste der negativen Feedback-Einträge zurück
@@ -330,23 +384,7 @@ def get_negative_feedback(limit: int = 100) -> List[Dict[str, Any]]:
         feedback_entries = feedback_manager.get_negative_feedback_messages(limit)
         
         # Format für Frontend anpassen
-        formatted_entries = []
-        for entry in feedback_entries:
-            formatted_entry = {
-                "id": f"f-{entry['id']}",
-                "message_id": f"m-{entry['message_id']}",
-                "session_id": f"s-{entry['session_id']}",
-                "user_id": f"u-{entry['user_id']}",
-                "user_email": entry['user_email'],
-                "is_positive": False,
-                "comment": entry['comment'],
-                "question": entry['question'] or "Keine Frage gespeichert",
-                "answer": entry['answer'] or "Keine Antwort gespeichert",
-                "created_at": int(entry['created_at'] * 1000)  # Unix-Timestamp in Millisekunden
-            }
-            formatted_entries.append(formatted_entry)
-        
-        return formatted_entries
+        return [_format_feedback_entry(entry) for entry in feedback_entries]
         
     except Exception as e:
         logger.error(f"Fehler beim Abrufen des negativen Feedbacks: {e}")
@@ -401,40 +439,24 @@ def filter_feedback(filter_params: Dict[str, Any]) -> List[Dict[str, Any]]:
     Filtert Feedback-Einträge nach bestimmten Kriterien
     """
     try:
-        # In einer echten Implementierung würden die Daten aus der Datenbank gefiltert
-        # Hier erzeugen wir gefilterte Beispieldaten
-        entries = get_negative_feedback(50)  # Holen zuerst alle Einträge
+        # Filter und Volltextsuche laufen in SQLite (FTS5-Index), nicht mehr in Python
+        def to_seconds(value):
+            # Das Frontend sendet Millisekunden-Zeitstempel
+            return int(value / 1000) if value and value > 10**11 else value
         
-        # Filtern nach Zeitraum
-        if "dateFrom" in filter_params and filter_params["dateFrom"]:
-            entries = [e for e in entries if e["created_at"] >= filter_params["dateFrom"]]
-            
-        if "dateTo" in filter_params and filter_params["dateTo"]:
-            entries = [e for e in entries if e["created_at"] <= filter_params["dateTo"]]
-            
-        # Filtern nach vorhandenem Kommentar
-        if "hasComment" in filter_params:
-            if filter_params["hasComment"]:
-                entries = [e for e in entries if e.get("comment")]
-            else:
-                entries = [e for e in entries if not e.get("comment")]
-                
-        # Filtern nach Suchbegriff
-        if "searchTerm" in filter_params and filter_params["searchTerm"]:
-            search_term = filter_params["searchTerm"].lower()
-            filtered_entries = []
-            
-            for entry in entries:
-                # Suche in E-Mail, Kommentar, Frage und Antwort
-                if (search_term in entry.get("user_email", "").lower() or
-                    (entry.get("comment") and search_term in entry.get("comment").lower()) or
-                    (entry.get("question") and search_term in entry.get("question").lower()) or
-                    (entry.get("answer") and search_term in entry.get("answer").lower())):
-                    filtered_entries.append(entry)
-                    
-            entries = filtered_entries
-            
-        return entries
+        has_comment = filter_params.get("hasComment") if "hasComment" in filter_params else None
+        
+        feedback_entries = feedback_manager.search_feedback(
+            search_term=filter_params.get("searchTerm") or None,
+            is_positive=False,
+            has_comment=bool(has_comment) if has_comment is not None else None,
+            date_from=to_seconds(filter_params.get("dateFrom")),
+            date_to=to_seconds(filter_params.get("dateTo")),
+            limit=int(filter_params.get("limit", 50)),
+            offset=int(filter_params.get("offset", 0))
+        )
+        
+        return [_format_feedback_entry(entry) for entry in feedback_entries]
         
     except Exception as e:
         logger.error(f"Fehler beim Filtern des Feedbacks: {str(e)}")
@@ -442,100 +464,24 @@ def filter_feedback(filter_params: Dict[str, Any]) -> List[Dict[str, Any]]:
 
 def export_feedback(options: Dict[str, Any]) -> Tuple[bytes, str, str]:
     """
-    Exportiert Feedback-Daten in verschiedenen Formaten
+    Exportiert Feedback-Daten in verschiedenen Formaten (csv, json, ndjson, xlsx, parquet, pdf)
+    
+    Für große Datenmengen stattdessen iter_export() mit feedback_manager.iter_feedback()
+    verwenden; diese Funktion setzt den Export vollständig im Speicher zusammen.
     
     Returns:
         Tuple mit (Daten als Bytes, MIME-Typ, Dateiname)
     """
     try:
         format_type = options.get("format", "csv").lower()
-        data = options.get("data", [])
-        fields = options.get("fields", ["id", "user_email", "question", "answer", "comment", "created_at"])
-        
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        filename = f"feedback_export_{timestamp}"
+        fields = validate_export(format_type, options.get("fields"))
+        data = options.get("data") or feedback_manager.iter_feedback(is_positive=False)
         
-        # In einer echten Implementierung würden diese Daten aus dem options-Parameter kommen
-        if not data:
-            # Wenn keine Daten übergeben wurden, hole negative Feedback-Einträge als Beispiel
-            data = get_negative_feedback(50)
-        
-        # CSV-Export
-        if format_type == "csv":
-            import csv
-            from io import StringIO
-            
-            output = StringIO()
-            writer = csv.DictWriter(output, fieldnames=fields, extrasaction="ignore")
-            writer.writeheader()
-            
-            for entry in data:
-                # Format dates as readable strings if needed
-                if "created_at" in fields and "created_at" in entry and isinstance(entry["created_at"], int):
-                    entry["created_at"] = time.strftime("%Y-%m-%d %H:%M:%S", 
-                                                        time.localtime(entry["created_at"] / 1000))
-                
-                writer.writerow({field: entry.get(field, "") for field in fields})
-                
-            result = output.getvalue().encode("utf-8")
-            mime_type = "text/csv"
-            filename = f"{filename}.csv"
-            
-        # JSON-Export
-        elif format_type == "json":
-            result_data = []
-            
-            for entry in data:
-                result_data.append({field: entry.get(field, None) for field in fields})
-                
-            result = json.dumps(result_data, indent=2, ensure_ascii=False).encode("utf-8")
-            mime_type = "application/json"
-            filename = f"{filename}.json"
-            
-        # XLSX-Export (simuliert, würde in echtem System xlsx-Datei erzeugen)
-        elif format_type == "xlsx":
-            # In einer echten Implementierung würde hier eine XLSX-Datei erstellt
-            # Für dieses Beispiel erstellen wir einen JSON-Export mit XLSX-Header
-            result_data = []
-            
-            for entry in data:
-                result_data.append({field: entry.get(field, None) for field in fields})
-                
-            result = json.dumps(result_data, indent=2, ensure_ascii=False).encode("utf-8")
-            mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            filename = f"{filename}.xlsx"
-            
-        # PDF-Export (simuliert, würde in echtem System PDF-Datei erzeugen)
-        elif format_type == "pdf":
-            # In einer echten Implementierung würde hier eine PDF-Datei erstellt
-            # Für dieses Beispiel erstellen wir einen Text mit PDF-Header
-            lines = ["Feedback-Export " + timestamp]
-            lines.append("=" * 50)
-            lines.append("")
-            
-            # Header
-            lines.append("\t".join(fields))
-            lines.append("-" * 80)
-            
-            # Data
-            for entry in data:
-                row = []
-                for field in fields:
-                    value = entry.get(field, "")
-                    if field == "created_at" and isinstance(value, int):
-                        value = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value / 1000))
-                    row.append(str(value))
-                lines.append("\t".join(row))
-                
-            result = "\n".join(lines).encode("utf-8")
-            mime_type = "application/pdf"
-            filename = f"{filename}.pdf"
-        
-        else:
-            raise ValueError(f"Unbekanntes Exportformat: {format_type}")
-            
-        return result, mime_type, filename
+        result = b"".join(iter_export(data, format_type, fields))
+        return result, export_media_type(format_type), export_filename(format_type)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Fehler beim Exportieren des Feedbacks: {str(e)}")
         raise HTTPException(status_code=500, 
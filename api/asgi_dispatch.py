@@ -0,0 +1,169 @@
+"""
+In-Process-Dispatch von Sub-Requests in die ASGI-Anwendung
+
+Batch-Requests werden nicht mehr per HTTP-Loopback an den eigenen Server
+geschickt, sondern direkt an den Router der Anwendung übergeben. Dadurch
+entfallen Socket-Roundtrip, Serialisierung über TCP, Middleware-Durchlauf
+und die erneute JWT-Dekodierung pro Sub-Request.
+
+Sub-Requests durchlaufen daher keine App-Middleware (CORS, Kompression,
+Metriken, statische Assets); sie erscheinen in den Request-Metriken nur als
+Teil des Batch-Requests. Der einmal verifizierte Benutzer wird über
+request.state geteilt, die Sperrliste prüft get_current_user trotzdem für
+jeden Sub-Request erneut, damit ein Widerruf während eines Batches greift.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.exceptions import HTTPException
+
+# Schlüssel in request.state, unter dem der bereits verifizierte Benutzer liegt
+BATCH_USER_STATE_KEY = "batch_user"
+
+
+def apply_batch_auth(headers: Optional[Dict[str, str]],
+                     auth: Optional[Dict[str, Any]]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Überträgt den Authorization-Header des Batch-Aufrufers auf einen Sub-Request.
+    Gibt (headers, state) zurück; den verifizierten Benutzer erhält der Sub-Request nur,
+    wenn er mit demselben Token läuft wie der Batch-Request.
+    """
+    headers = dict(headers or {})
+    state: Dict[str, Any] = {}
+    if auth and auth.get("authorization"):
+        sub_authorization = next((v for k, v in headers.items() if k.lower() == "authorization"), None)
+        if sub_authorization is None:
+            headers["Authorization"] = sub_authorization = auth["authorization"]
+        if auth.get("user") and sub_authorization == auth["authorization"]:
+            state[BATCH_USER_STATE_KEY] = auth["user"]
+    return headers, state
+
+
+@dataclass
+class DispatchResult:
+    """Antwort eines in-process ausgeführten Sub-Requests"""
+    status: int
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+    @property
+    def content_type(self) -> str:
+        for name, value in self.headers:
+            if name.lower() == b"content-type":
+                return value.decode("latin-1")
+        return ""
+
+    def data(self) -> Any:
+        """Dekodiert den Body als JSON, sonst als Text"""
+        if not self.body:
+            return None
+        text = self.body.decode("utf-8", errors="replace")
+        if "json" in self.content_type:
+            try:
+                return json.loads(text)
+            except ValueError:
+                pass
+        return text
+
+
+class InProcessDispatcher:
+    """Führt HTTP-Sub-Requests direkt gegen den Router einer FastAPI/Starlette-App aus"""
+
+    def __init__(self, app, through_middleware: bool = False):
+        self.app = app
+        # Ohne Middleware wird direkt der Router angesprochen; die Exception-Handler
+        # der App werden über den Scope trotzdem angewendet
+        self.target = app if through_middleware else app.router
+        self._exception_handlers = None
+
+    def _handlers(self):
+        if self._exception_handlers is None:
+            handlers = getattr(self.app, "exception_handlers", {}) or {}
+            self._exception_handlers = (
+                {key: value for key, value in handlers.items() if not isinstance(key, int)},
+                {key: value for key, value in handlers.items() if isinstance(key, int)},
+            )
+        return self._exception_handlers
+
+    def _build_scope(self, method: str, path: str, params: Optional[Dict[str, Any]],
+                     headers: Dict[str, str], body: bytes, state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        path, _, query = path.partition("?")
+        if params:
+            extra = urlencode(params, doseq=True)
+            query = f"{query}&{extra}" if query else extra
+
+        raw_headers = [(name.lower().encode("latin-1"), str(value).encode("latin-1"))
+                       for name, value in headers.items()]
+        if body and "content-type" not in {name.lower() for name in headers}:
+            raw_headers.append((b"content-type", b"application/json"))
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "root_path": "",
+            "query_string": query.encode("latin-1"),
+            "headers": raw_headers,
+            "client": ("batch", 0),
+            "server": ("batch", 0),
+            "app": self.app,
+            "state": dict(state or {}),
+            "starlette.exception_handlers": self._handlers(),
+        }
+
+    async def dispatch(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+                       json_body: Any = None, headers: Optional[Dict[str, str]] = None,
+                       state: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> DispatchResult:
+        """Führt einen Sub-Request aus; Ausnahmen der Route werden an den Aufrufer weitergereicht"""
+        body = json.dumps(json_body).encode("utf-8") if json_body is not None else b""
+        scope = self._build_scope(method, path, params, headers or {}, body, state)
+
+        result = DispatchResult(status=500)
+        chunks: List[bytes] = []
+        request_sent = False
+        response_complete = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Erst nach vollständiger Antwort trennen, sonst brechen Streaming-Responses ab
+            await response_complete.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                result.status = message["status"]
+                result.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_complete.set()
+
+        try:
+            if timeout:
+                await asyncio.wait_for(self.target(scope, receive, send), timeout)
+            else:
+                await self.target(scope, receive, send)
+        except HTTPException as e:
+            # Z.B. 404/405 aus dem Router, die sonst die ExceptionMiddleware abfangen würde
+            return DispatchResult(
+                status=e.status_code,
+                headers=[(b"content-type", b"application/json")],
+                body=json.dumps({"detail": e.detail}).encode("utf-8"),
+            )
+        finally:
+            response_complete.set()
+
+        result.body = b"".join(chunks)
+        return result
@@ -10,10 +10,11 @@ Bietet 75% Performance-Verbesserung durch:
 import asyncio
 import hashlib
 import json
+import re
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -23,6 +24,9 @@ from functools import lru_cache
 import aiohttp
 from fastapi import Request, HTTPException
 
+from api.asgi_dispatch import InProcessDispatcher, apply_batch_auth
+from modules.core.response_cache import ResponseCache, get_response_cache, tags_for_path
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +38,18 @@ class RequestPriority(Enum):
     LOW = 4       # Archivierte Sessions, alte Daten
 
 
+# Standard-Parallelität pro Priorität im DAG-Modus
+DEFAULT_PRIORITY_LIMITS = {
+    RequestPriority.CRITICAL: 8,
+    RequestPriority.HIGH: 6,
+    RequestPriority.NORMAL: 4,
+    RequestPriority.LOW: 2,
+}
+
+# Platzhalter für Ergebnisse von Abhängigkeiten, z.B. "${create.data.session_id}"
+_DEPENDENCY_REF = re.compile(r"\$\{([^.}]+)((?:\.[^.}]+)*)\}")
+
+
 @dataclass
 class BatchRequest:
     """Einzelne Batch-Request mit Metadaten"""
@@ -48,6 +64,7 @@ class BatchRequest:
     max_retries: int = 3
     timeout: float = 30.0
     cache_key: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
     timestamp: float = field(default_factory=time.time)
 
 
@@ -62,63 +79,18 @@ class BatchResponse:
     duration: float = 0.0
     timestamp: float = field(default_factory=time.time)
     from_cache: bool = False
-
-
-class ResponseCache:
-    """LRU Cache mit TTL für GET-Requests"""
-    
-    def __init__(self, max_size: int = 1000, default_ttl: int = 60):
-        self.cache: Dict[str, Tuple[Any, float]] = {}
-        self.access_times: Dict[str, float] = {}
-        self.max_size = max_size
-        self.default_ttl = default_ttl
-        self._lock = asyncio.Lock()
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """Hole Wert aus Cache wenn noch gültig"""
-        async with self._lock:
-            if key not in self.cache:
-                return None
-            
-            value, expiry = self.cache[key]
-            if time.time() > expiry:
-                del self.cache[key]
-                return None
-            
-            self.access_times[key] = time.time()
-            return value
     
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Setze Wert in Cache mit TTL"""
-        async with self._lock:
-            # Wenn Cache voll, entferne älteste Einträge
-            if len(self.cache) >= self.max_size:
-                # Finde LRU items
-                lru_items = sorted(
-                    self.access_times.items(),
-                    key=lambda x: x[1]
-                )[:len(self.cache) - self.max_size + 1]
-                
-                for key, _ in lru_items:
-                    self.cache.pop(key, None)
-                    self.access_times.pop(key, None)
-            
-            ttl = ttl or self.default_ttl
-            expiry = time.time() + ttl
-            self.cache[key] = (value, expiry)
-            self.access_times[key] = time.time()
-    
-    async def clear_expired(self):
-        """Entferne abgelaufene Einträge"""
-        async with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, (_, expiry) in self.cache.items()
-                if current_time > expiry
-            ]
-            for key in expired_keys:
-                del self.cache[key]
-                self.access_times.pop(key, None)
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'success': self.success,
+            'data': self.data,
+            'error': self.error,
+            'timestamp': self.timestamp,
+            'duration': self.duration,
+            'from_cache': self.from_cache
+        }
 
 
 class EnhancedBatchProcessor:
@@ -126,18 +98,20 @@ class EnhancedBatchProcessor:
     
     def __init__(self, 
                  max_concurrent: int = 10,
-                 cache_size: int = 1000,
+                 cache: Optional[ResponseCache] = None,
                  cache_ttl: int = 60,
                  enable_deduplication: bool = True,
                  enable_caching: bool = True,
-                 enable_prioritization: bool = True):
+                 enable_prioritization: bool = True,
+                 priority_limits: Optional[Dict[RequestPriority, int]] = None):
         self.max_concurrent = max_concurrent
         self.enable_deduplication = enable_deduplication
         self.enable_caching = enable_caching
         self.enable_prioritization = enable_prioritization
         
-        # Cache für GET-Requests
-        self.cache = ResponseCache(max_size=cache_size, default_ttl=cache_ttl)
+        # Gemeinsamer Antwort-Cache für GET-Requests (lokal + über Worker hinweg)
+        self.cache = cache or get_response_cache()
+        self.cache_ttl = cache_ttl
         
         # Request-Deduplizierung
         self.pending_requests: Dict[str, List[str]] = defaultdict(list)
@@ -157,8 +131,81 @@ class EnhancedBatchProcessor:
         
         # Semaphore für Concurrency-Kontrolle
         self.semaphore = asyncio.Semaphore(max_concurrent)
+        
+        # Zusätzliche Limits pro Priorität (DAG-Modus), damit LOW-Requests
+        # die Slots für Auth/Session-Requests nicht belegen
+        limits = {**DEFAULT_PRIORITY_LIMITS, **(priority_limits or {})}
+        self.priority_semaphores = {
+            priority: asyncio.Semaphore(limit) for priority, limit in limits.items()
+        }
+        
+        # In-Process-Dispatch (ohne HTTP-Loopback), siehe configure()
+        self.dispatcher: Optional[InProcessDispatcher] = None
+        self.loopback_url = "http://localhost:3001"  # Nur ohne konfigurierte App
+        self._http_session: Optional[aiohttp.ClientSession] = None
+    
+    def configure(self, app) -> None:
+        """Aktiviert den In-Process-Dispatch in die angegebene ASGI-App"""
+        self.dispatcher = InProcessDispatcher(app)
+    
+    async def close(self) -> None:
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
     
-    def _get_request_key(self, req: BatchRequest) -> str:
+    async def _execute_in_process(self, req: BatchRequest, auth: Optional[Dict[str, Any]]) -> Tuple[int, Any]:
+        """Führt den Request direkt gegen den Router der App aus"""
+        headers, state = apply_batch_auth(req.headers, auth)
+        result = await self.dispatcher.dispatch(
+            req.method,
+            req.endpoint,
+            params=req.params,
+            json_body=req.data if req.method.upper() != 'GET' else None,
+            headers=headers,
+            state=state,
+            timeout=req.timeout
+        )
+        return result.status, result.data()
+    
+    async def _execute_loopback(self, req: BatchRequest) -> Tuple[int, Any]:
+        """HTTP-Loopback an den eigenen Server (Fallback ohne konfigurierte App)"""
+        # Eine gemeinsame Session statt einer neuen pro Sub-Request
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession()
+        
+        kwargs = {
+            'method': req.method,
+            'headers': req.headers or {},
+            'timeout': aiohttp.ClientTimeout(total=req.timeout)
+        }
+        
+        if req.method.upper() == 'GET' and req.params:
+            kwargs['params'] = req.params
+        elif req.data:
+            kwargs['json'] = req.data
+        
+        async with self._http_session.request(url=f"{self.loopback_url}{req.endpoint}", **kwargs) as response:
+            try:
+                response_data = await response.json()
+            except:
+                response_data = await response.text()
+            return response.status, response_data
+    
+    @staticmethod
+    def _cache_identity(req: BatchRequest, auth: Optional[Dict[str, Any]]) -> Optional[Tuple[Optional[Dict[str, Any]], str]]:
+        """
+        Bestimmt (Benutzer, Scope) für den Cache-Key; None, wenn der Sub-Request
+        mit einem fremden, nicht verifizierten Token läuft und nicht gecacht werden darf.
+        """
+        sub_authorization = next((v for k, v in (req.headers or {}).items() if k.lower() == 'authorization'), None)
+        caller_authorization = (auth or {}).get('authorization')
+        if sub_authorization is None and caller_authorization is None:
+            return None, 'public'
+        if (auth or {}).get('user') and sub_authorization in (None, caller_authorization):
+            return auth['user'], 'user'
+        return None
+    
+    def _get_request_key(self, req: BatchRequest, auth: Optional[Dict[str, Any]] = None) -> str:
         """Generiere eindeutigen Key für Request-Deduplizierung"""
         if req.cache_key:
             return req.cache_key
@@ -167,12 +214,21 @@ class EnhancedBatchProcessor:
         if req.method.upper() != 'GET':
             return f"{req.id}_{time.time()}"
         
+        # Benutzer-/rollenbezogener Key ohne rohe Authorization-Header
+        identity = self._cache_identity(req, auth)
+        if identity is not None:
+            user, scope = identity
+            vary = {k.lower(): v for k, v in (req.headers or {}).items() if k.lower() != 'authorization'}
+            return ResponseCache.make_key('batch', req.endpoint, req.params, user=user, scope=scope, vary=vary)
+        
         # Erstelle deterministischen Key
         key_parts = [
             req.method.upper(),
             req.endpoint,
             json.dumps(req.params or {}, sort_keys=True),
-            json.dumps(req.headers or {}, sort_keys=True)
+            json.dumps(req.headers or {}, sort_keys=True),
+            # Sub-Requests ohne eigene Header laufen mit dem Token des Aufrufers
+            (auth or {}).get('authorization') or ''
         ]
         key_string = '|'.join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
@@ -195,49 +251,26 @@ class EnhancedBatchProcessor:
         
         return RequestPriority.NORMAL
     
-    async def _execute_single_request(self, req: BatchRequest) -> BatchResponse:
+    async def _execute_single_request(self, req: BatchRequest, auth: Optional[Dict[str, Any]] = None) -> BatchResponse:
         """Führe einzelnen Request aus mit Fehlerbehandlung"""
         start_time = time.time()
         
         try:
-            # Verwende aiohttp für interne API-Aufrufe
-            async with aiohttp.ClientSession() as session:
-                # Baue vollständige URL
-                base_url = "http://localhost:3001"  # Interner API-Aufruf
-                url = f"{base_url}{req.endpoint}"
-                
-                # Bereite Request vor
-                kwargs = {
-                    'method': req.method,
-                    'headers': req.headers or {},
-                    'timeout': aiohttp.ClientTimeout(total=req.timeout)
-                }
-                
-                if req.method.upper() == 'GET' and req.params:
-                    kwargs['params'] = req.params
-                elif req.data:
-                    kwargs['json'] = req.data
-                
-                # Führe Request aus
-                async with session.request(url=url, **kwargs) as response:
-                    status_code = response.status
-                    
-                    # Parse Response
-                    try:
-                        response_data = await response.json()
-                    except:
-                        response_data = await response.text()
-                    
-                    duration = time.time() - start_time
-                    
-                    return BatchResponse(
-                        id=req.id,
-                        status=status_code,
-                        success=200 <= status_code < 300,
-                        data=response_data,
-                        error=None if 200 <= status_code < 300 else f"HTTP {status_code}",
-                        duration=duration
-                    )
+            if self.dispatcher is not None:
+                status_code, response_data = await self._execute_in_process(req, auth)
+            else:
+                status_code, response_data = await self._execute_loopback(req)
+            
+            duration = time.time() - start_time
+            
+            return BatchResponse(
+                id=req.id,
+                status=status_code,
+                success=200 <= status_code < 300,
+                data=response_data,
+                error=None if 200 <= status_code < 300 else f"HTTP {status_code}",
+                duration=duration
+            )
                 
         except asyncio.TimeoutError:
             logger.error(f"Timeout for request {req.id}: {req.endpoint}")
@@ -259,7 +292,7 @@ class EnhancedBatchProcessor:
             if req.retry_count < req.max_retries:
                 req.retry_count += 1
                 await asyncio.sleep(0.5 * req.retry_count)  # Exponential backoff
-                return await self._execute_single_request(req)
+                return await self._execute_single_request(req, auth)
             
             return BatchResponse(
                 id=req.id,
@@ -269,59 +302,256 @@ class EnhancedBatchProcessor:
                 duration=duration
             )
     
-    async def _process_with_cache(self, req: BatchRequest) -> BatchResponse:
+    async def _process_with_cache(self, req: BatchRequest, auth: Optional[Dict[str, Any]] = None) -> BatchResponse:
         """Verarbeite Request mit Cache-Unterstützung"""
         # Nur GET-Requests cachen
         if not self.enable_caching or req.method.upper() != 'GET':
-            return await self._execute_single_request(req)
+            return await self._execute_single_request(req, auth)
+        
+        # Ohne verifizierte Identität nicht cachen
+        identity = self._cache_identity(req, auth)
+        if identity is None:
+            return await self._execute_single_request(req, auth)
         
         # Cache-Key generieren
-        cache_key = self._get_request_key(req)
+        cache_key = self._get_request_key(req, auth)
+        
+        async def compute() -> Dict[str, Any]:
+            response = await self._execute_single_request(req, auth)
+            return {'status': response.status, 'data': response.data, 'error': response.error,
+                    'duration': response.duration}
         
-        # Prüfe Cache
-        cached_response = await self.cache.get(cache_key)
-        if cached_response:
+        # Veraltete Einträge werden sofort geliefert und im Hintergrund aktualisiert
+        result, from_cache = await self.cache.get_or_set(
+            cache_key,
+            compute,
+            ttl=self.cache_ttl,
+            tags=tags_for_path(req.endpoint, identity[0]),
+            should_cache=lambda value: value['status'] == 200
+        )
+        if from_cache:
             self.stats['cache_hits'] += 1
-            return BatchResponse(
-                id=req.id,
-                status=200,
-                success=True,
-                data=cached_response,
-                duration=0.001,  # Cache-Hit ist sehr schnell
-                from_cache=True
-            )
         
-        # Führe Request aus
-        response = await self._execute_single_request(req)
+        status = result['status']
+        return BatchResponse(
+            id=req.id,
+            status=status,
+            success=200 <= status < 300,
+            data=result['data'],
+            error=result['error'],
+            duration=0.001 if from_cache else result['duration'],  # Cache-Hit ist sehr schnell
+            from_cache=from_cache
+        )
+    
+    def _to_batch_request(self, req_data: Dict[str, Any]) -> BatchRequest:
+        """Konvertiere Request-Dict in BatchRequest inkl. Priorität und Abhängigkeiten"""
+        batch_req = BatchRequest(
+            id=str(req_data.get('id', time.time())),
+            endpoint=req_data.get('endpoint', ''),
+            method=req_data.get('method', 'GET').upper(),
+            params=req_data.get('params'),
+            data=req_data.get('data'),
+            headers=req_data.get('headers'),
+            depends_on=[str(dep) for dep in req_data.get('depends_on') or []]
+        )
+        if req_data.get('timeout'):
+            batch_req.timeout = float(req_data['timeout'])
+        
+        # Setze Priorität (explizit angegeben oder aus dem Endpoint abgeleitet)
+        explicit = str(req_data.get('priority') or '').upper()
+        if explicit in RequestPriority.__members__:
+            batch_req.priority = RequestPriority[explicit]
+        elif self.enable_prioritization:
+            batch_req.priority = self._determine_priority(batch_req)
+        
+        return batch_req
+    
+    @staticmethod
+    def _find_cycle(requests: Dict[str, BatchRequest]) -> Optional[List[str]]:
+        """Gibt einen Zyklus im Abhängigkeitsgraphen zurück (oder None)"""
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = {req_id: WHITE for req_id in requests}
+        
+        for root in requests:
+            if color[root] != WHITE:
+                continue
+            # Iterative Tiefensuche, Pfad für die Fehlermeldung mitführen
+            stack = [(root, iter(requests[root].depends_on))]
+            path = [root]
+            color[root] = GREY
+            while stack:
+                node, deps = stack[-1]
+                dep = next(deps, None)
+                if dep is None:
+                    color[node] = BLACK
+                    stack.pop()
+                    path.pop()
+                elif dep in requests:
+                    if color[dep] == GREY:
+                        return path[path.index(dep):] + [dep]
+                    if color[dep] == WHITE:
+                        color[dep] = GREY
+                        stack.append((dep, iter(requests[dep].depends_on)))
+                        path.append(dep)
+        return None
+    
+    @staticmethod
+    def _resolve_references(value: Any, results: Dict[str, BatchResponse]) -> Any:
+        """Ersetzt ${id.data.feld}-Platzhalter durch Werte aus Abhängigkeits-Responses"""
+        if isinstance(value, dict):
+            return {k: EnhancedBatchProcessor._resolve_references(v, results) for k, v in value.items()}
+        if isinstance(value, list):
+            return [EnhancedBatchProcessor._resolve_references(v, results) for v in value]
+        if not isinstance(value, str) or '${' not in value:
+            return value
+        
+        def lookup(match) -> Any:
+            current: Any = results[match.group(1)].to_dict()
+            for part in filter(None, match.group(2).split('.')):
+                if isinstance(current, list):
+                    current = current[int(part)]
+                else:
+                    current = current[part]
+            return current
+        
+        # Ganzer String ist ein Platzhalter: Typ des referenzierten Werts beibehalten
+        full = _DEPENDENCY_REF.fullmatch(value)
+        if full:
+            return lookup(full)
+        return _DEPENDENCY_REF.sub(lambda m: str(lookup(m)), value)
+    
+    async def _run_dag_node(self, req: BatchRequest, results: Dict[str, BatchResponse],
+                            auth: Optional[Dict[str, Any]]) -> BatchResponse:
+        """Führt einen DAG-Knoten aus, sobald alle Abhängigkeiten erfüllt sind"""
+        try:
+            req.endpoint = self._resolve_references(req.endpoint, results)
+            req.params = self._resolve_references(req.params, results)
+            req.data = self._resolve_references(req.data, results)
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            return BatchResponse(id=req.id, status=424, success=False,
+                                 error=f"Unresolvable dependency reference: {e}")
+        
+        async with self.priority_semaphores[req.priority], self.semaphore:
+            return await self._process_with_cache(req, auth)
+    
+    async def stream_batch(self, requests: List[Dict[str, Any]],
+                           auth: Optional[Dict[str, Any]] = None) -> AsyncIterator[BatchResponse]:
+        """
+        Führt einen Batch als Abhängigkeitsgraph aus und liefert jede Response,
+        sobald sie fertig ist (nicht in Request-Reihenfolge).
+        
+        Requests ohne offene Abhängigkeiten laufen parallel unter den Limits ihrer
+        Priorität; schlägt eine Abhängigkeit fehl, werden abhängige Requests mit
+        Status 424 übersprungen.
+        """
+        self.stats['total_requests'] += len(requests)
+        batch_requests: Dict[str, BatchRequest] = {}
+        for req_data in requests:
+            req = self._to_batch_request(req_data)
+            if req.id in batch_requests:
+                yield BatchResponse(id=req.id, status=400, success=False, error="Duplicate request id")
+                continue
+            batch_requests[req.id] = req
+        
+        # Unbekannte Abhängigkeiten und Zyklen vorab abweisen; Requests, die (auch transitiv)
+        # von einem abgewiesenen Request abhängen, werden mit 424 übersprungen
+        rejected: Set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for req in list(batch_requests.values()):
+                unknown = [dep for dep in req.depends_on if dep not in batch_requests and dep not in rejected]
+                failed = [dep for dep in req.depends_on if dep in rejected]
+                if unknown:
+                    response = BatchResponse(id=req.id, status=400, success=False,
+                                             error=f"Unknown dependencies: {', '.join(unknown)}")
+                elif failed:
+                    response = BatchResponse(id=req.id, status=424, success=False,
+                                             error=f"Dependency '{failed[0]}' failed")
+                else:
+                    continue
+                del batch_requests[req.id]
+                rejected.add(req.id)
+                changed = True
+                yield response
+        cycle = self._find_cycle(batch_requests)
+        if cycle:
+            for req_id in batch_requests:
+                yield BatchResponse(id=req_id, status=400, success=False,
+                                    error=f"Dependency cycle: {' -> '.join(cycle)}")
+            return
+        
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        pending_deps: Dict[str, int] = {}
+        for req in batch_requests.values():
+            pending_deps[req.id] = len(set(req.depends_on))
+            for dep in set(req.depends_on):
+                dependents[dep].append(req.id)
+        
+        results: Dict[str, BatchResponse] = {}
+        running: Dict[asyncio.Task, str] = {}
         
-        # Cache erfolgreiche Responses
-        if response.success and response.status == 200:
-            await self.cache.set(cache_key, response.data)
+        def start(req_id: str):
+            task = asyncio.ensure_future(self._run_dag_node(batch_requests[req_id], results, auth))
+            running[task] = req_id
         
-        return response
+        # Fertige Response verbuchen und freigewordene Abhängige starten bzw. überspringen
+        def complete(req_id: str, response: BatchResponse) -> List[BatchResponse]:
+            finished = [response]
+            results[req_id] = response
+            queue = [(req_id, response)]
+            while queue:
+                done_id, done_response = queue.pop()
+                for child in dependents.get(done_id, []):
+                    if child in results:
+                        continue
+                    if not done_response.success:
+                        skipped = BatchResponse(id=child, status=424, success=False,
+                                                error=f"Dependency '{done_id}' failed")
+                        results[child] = skipped
+                        finished.append(skipped)
+                        queue.append((child, skipped))
+                        continue
+                    pending_deps[child] -= 1
+                    if pending_deps[child] == 0:
+                        start(child)
+            return finished
+        
+        for req in sorted(batch_requests.values(), key=lambda r: r.priority.value):
+            if pending_deps[req.id] == 0:
+                start(req.id)
+        
+        try:
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    req_id = running.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        self.stats['errors'] += 1
+                        response = BatchResponse(id=req_id, status=500, success=False, error=str(e))
+                    for finished in complete(req_id, response):
+                        yield finished
+        finally:
+            # Client hat die Verbindung getrennt: laufende Sub-Requests abbrechen
+            for task in running:
+                task.cancel()
     
-    async def process_batch(self, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Verarbeite Batch von Requests mit allen Optimierungen"""
+    async def process_batch(self, requests: List[Dict[str, Any]],
+                            auth: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Verarbeite Batch von Requests mit allen Optimierungen
+        
+        auth ({'authorization': ..., 'user': ...}) ist der bereits verifizierte Aufrufer;
+        beim In-Process-Dispatch wird er an Sub-Requests mit demselben (oder keinem)
+        Token weitergegeben, die Token werden nicht erneut geprüft.
+        """
         start_time = time.time()
         self.stats['total_requests'] += len(requests)
         
         # Konvertiere zu BatchRequest-Objekten
-        batch_requests: List[BatchRequest] = []
-        for req_data in requests:
-            batch_req = BatchRequest(
-                id=req_data.get('id', str(time.time())),
-                endpoint=req_data.get('endpoint', ''),
-                method=req_data.get('method', 'GET').upper(),
-                params=req_data.get('params'),
-                data=req_data.get('data'),
-                headers=req_data.get('headers')
-            )
-            
-            # Setze Priorität
-            if self.enable_prioritization:
-                batch_req.priority = self._determine_priority(batch_req)
-            
-            batch_requests.append(batch_req)
+        batch_requests = [self._to_batch_request(req_data) for req_data in requests]
         
         # Sortiere nach Priorität
         if self.enable_prioritization:
@@ -332,7 +562,7 @@ class EnhancedBatchProcessor:
         request_mapping: Dict[str, List[str]] = defaultdict(list)
         
         for req in batch_requests:
-            req_key = self._get_request_key(req)
+            req_key = self._get_request_key(req, auth)
             request_mapping[req_key].append(req.id)
             
             if req_key not in unique_requests:
@@ -345,7 +575,7 @@ class EnhancedBatchProcessor:
         for req_key, req in unique_requests.items():
             async def process_request(r: BatchRequest, k: str):
                 async with self.semaphore:
-                    response = await self._process_with_cache(r)
+                    response = await self._process_with_cache(r, auth)
                     # Setze Response für alle deduplizierten Requests
                     for req_id in request_mapping[k]:
                         self.request_results[req_id] = BatchResponse(
@@ -384,26 +614,10 @@ class EnhancedBatchProcessor:
         # Bereinige temporäre Daten
         self.request_results.clear()
         
-        # Gelegentlich Cache bereinigen
-        if len(requests) % 100 == 0:
-            await self.cache.clear_expired()
-        
         return {
             'success': True,
             'data': {
-                'responses': [
-                    {
-                        'id': r.id,
-                        'status': r.status,
-                        'success': r.success,
-                        'data': r.data,
-                        'error': r.error,
-                        'timestamp': r.timestamp,
-                        'duration': r.duration,
-                        'from_cache': r.from_cache
-                    }
-                    for r in responses
-                ],
+                'responses': [r.to_dict() for r in responses],
                 'count': len(responses),
                 'timestamp': datetime.now().isoformat(),
                 'stats': {
@@ -426,7 +640,6 @@ def get_batch_processor() -> EnhancedBatchProcessor:
     if _processor_instance is None:
         _processor_instance = EnhancedBatchProcessor(
             max_concurrent=20,  # Mehr Parallelität
-            cache_size=2000,    # Größerer Cache
             cache_ttl=120,      # 2 Minuten Cache
             enable_deduplication=True,
             enable_caching=True,
@@ -435,7 +648,8 @@ def get_batch_processor() -> EnhancedBatchProcessor:
     return _processor_instance
 
 
-async def handle_batch_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
+async def handle_batch_request(request_data: Dict[str, Any],
+                               auth: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Handler-Funktion für Batch-Requests"""
     processor = get_batch_processor()
     
@@ -454,4 +668,4 @@ async def handle_batch_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
         }
     
     # Verarbeite Batch
-    return await processor.process_batch(requests)
\ No newline at end of file
+    return await processor.process_batch(requests, auth)
\ No newline at end of file
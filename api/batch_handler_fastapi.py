@@ -1,18 +1,26 @@
 """FastAPI Batch Handler for parallel API request processing"""
 
+import os
 import json
 import time
 import traceback
 import asyncio
 import httpx
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional, Union
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from contextlib import asynccontextmanager
 import logging
 
+from api.asgi_dispatch import InProcessDispatcher, apply_batch_auth
+from api.batch_handler_enhanced import get_batch_processor
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of sub-requests per batch
+MAX_BATCH_SIZE = int(os.getenv('BATCH_MAX_SIZE', '50'))
+
 # Pydantic models for request/response validation
 class BatchRequest(BaseModel):
     id: str = Field(..., description="Unique request identifier")
@@ -22,6 +30,8 @@ class BatchRequest(BaseModel):
     data: Optional[Dict[str, Any]] = Field(default={}, description="Request body data")
     headers: Optional[Dict[str, str]] = Field(default={}, description="Additional headers")
     timeout: Optional[int] = Field(default=30, description="Request timeout in seconds")
+    depends_on: Optional[List[str]] = Field(default=[], description="Ids of requests that must succeed first (stream mode)")
+    priority: Optional[str] = Field(default=None, description="critical, high, normal or low (stream mode)")
 
 class BatchRequestContainer(BaseModel):
     requests: List[BatchRequest] = Field(..., description="List of batch requests")
@@ -52,6 +62,30 @@ class BatchProcessor:
         self.max_concurrent_requests = max_concurrent_requests
         self.request_semaphore = asyncio.Semaphore(max_concurrent_requests)
         self.client: Optional[httpx.AsyncClient] = None
+        self.dispatcher: Optional[InProcessDispatcher] = None
+        self.auth_resolver: Optional[Callable[[Request], Awaitable[Optional[Dict[str, Any]]]]] = None
+    
+    def configure(self, app: FastAPI, auth_resolver=None):
+        """
+        Enable in-process dispatch into the given app.
+        
+        auth_resolver(request) returns the verified user for the batch request
+        (or None); it is resolved once and shared with all sub-requests that
+        carry the same (or no) Authorization header. Sub-requests go straight
+        to the router and skip the app middleware; revocation is still
+        checked per sub-request in get_current_user.
+        """
+        self.dispatcher = InProcessDispatcher(app)
+        self.auth_resolver = auth_resolver
+        get_batch_processor().configure(app)
+    
+    async def resolve_auth(self, request: Request) -> Dict[str, Any]:
+        """Verify the batch caller once and build the context shared with sub-requests"""
+        authorization = request.headers.get("Authorization")
+        user = None
+        if authorization and self.auth_resolver:
+            user = await self.auth_resolver(request)
+        return {"authorization": authorization, "user": user}
     
     async def initialize(self):
         """Initialize the httpx client"""
@@ -67,43 +101,88 @@ class BatchProcessor:
             await self.client.aclose()
             self.client = None
     
-    async def process_batch(self, requests: List[BatchRequest], base_url: str) -> List[BatchResponse]:
+    async def process_batch(self, requests: List[BatchRequest], base_url: str,
+                            auth: Optional[Dict[str, Any]] = None) -> List[BatchResponse]:
         """Process a batch of API requests in parallel"""
-        await self.initialize()
+        return [response async for response in self.iter_batch(requests, base_url, auth)]
+    
+    async def iter_batch(self, requests: List[BatchRequest], base_url: str,
+                         auth: Optional[Dict[str, Any]] = None) -> AsyncIterator[BatchResponse]:
+        """Run all requests concurrently and yield the responses in request order"""
+        if self.dispatcher is None:
+            await self.initialize()
         
-        # Create tasks for all requests
         tasks = [
-            self.process_request(req, base_url)
+            asyncio.ensure_future(self.process_request(req, base_url, auth))
             for req in requests
         ]
         
-        # Execute all requests in parallel
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            for i, task in enumerate(tasks):
+                try:
+                    yield await task
+                except Exception as e:
+                    # Convert exceptions to error responses
+                    yield BatchResponse(
+                        id=requests[i].id,
+                        status=500,
+                        success=False,
+                        error=str(e),
+                        data=None,
+                        timestamp=int(time.time() * 1000),
+                        duration=0,
+                        request=requests[i]
+                    )
+        finally:
+            # Client disconnected mid-stream: don't leave sub-requests running
+            for task in tasks:
+                task.cancel()
+    
+    async def _dispatch_in_process(self, request_data: BatchRequest,
+                                   auth: Optional[Dict[str, Any]]) -> tuple:
+        """Execute a sub-request directly against the app router"""
+        headers, state = apply_batch_auth(request_data.headers, auth)
+        result = await self.dispatcher.dispatch(
+            request_data.method,
+            request_data.endpoint,
+            params=request_data.params,
+            json_body=request_data.data if request_data.method.upper() in ["POST", "PUT", "PATCH"] else None,
+            headers=headers,
+            state=state,
+            timeout=request_data.timeout
+        )
+        return result.status, result.data()
+    
+    async def _dispatch_http(self, request_data: BatchRequest, url: str) -> tuple:
+        """Loopback/external HTTP call via httpx"""
+        await self.initialize()
+        request_kwargs = {
+            "method": request_data.method.upper(),
+            "url": url,
+            "params": request_data.params,
+            "headers": request_data.headers or {},
+            "timeout": request_data.timeout
+        }
+        
+        # Add body data for appropriate methods
+        if request_data.method.upper() in ["POST", "PUT", "PATCH"]:
+            request_kwargs["json"] = request_data.data
         
-        # Convert exceptions to error responses
-        final_responses = []
-        for i, response in enumerate(responses):
-            if isinstance(response, Exception):
-                final_responses.append(BatchResponse(
-                    id=requests[i].id,
-                    status=500,
-                    success=False,
-                    error=str(response),
-                    data=None,
-                    timestamp=int(time.time() * 1000),
-                    duration=0,
-                    request=requests[i]
-                ))
-            else:
-                final_responses.append(response)
+        resp = await self.client.request(**request_kwargs)
         
-        return final_responses
+        try:
+            resp_data = resp.json()
+        except:
+            resp_data = resp.text
+        return resp.status_code, resp_data
     
-    async def process_request(self, request_data: BatchRequest, base_url: str) -> BatchResponse:
+    async def process_request(self, request_data: BatchRequest, base_url: str,
+                              auth: Optional[Dict[str, Any]] = None) -> BatchResponse:
         """Process a single API request"""
         start_time = time.time()
         
         # Build full URL
+        in_process = self.dispatcher is not None and request_data.endpoint.startswith('/')
         if request_data.endpoint.startswith('/'):
             url = f"{base_url}{request_data.endpoint}"
         else:
@@ -122,35 +201,19 @@ class BatchProcessor:
         
         try:
             async with self.request_semaphore:
-                # Build request parameters
-                request_kwargs = {
-                    "method": request_data.method.upper(),
-                    "url": url,
-                    "params": request_data.params,
-                    "headers": request_data.headers or {},
-                    "timeout": request_data.timeout
-                }
-                
-                # Add body data for appropriate methods
-                if request_data.method.upper() in ["POST", "PUT", "PATCH"]:
-                    request_kwargs["json"] = request_data.data
-                
                 # Execute request
-                resp = await self.client.request(**request_kwargs)
-                
-                # Parse response
-                try:
-                    resp_data = resp.json()
-                except:
-                    resp_data = resp.text
+                if in_process:
+                    status_code, resp_data = await self._dispatch_in_process(request_data, auth)
+                else:
+                    status_code, resp_data = await self._dispatch_http(request_data, url)
                 
                 # Update response
-                response.status = resp.status_code
-                response.success = 200 <= resp.status_code < 300
+                response.status = status_code
+                response.success = 200 <= status_code < 300
                 response.data = resp_data
-                response.error = None if response.success else f"HTTP error {resp.status_code}"
+                response.error = None if response.success else f"HTTP error {status_code}"
         
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, asyncio.TimeoutError):
             response.status = 0
             response.success = False
             response.error = "Request timeout"
@@ -190,22 +253,22 @@ async def lifespan(app: FastAPI):
 async def handle_batch(
     batch_request: BatchRequestContainer,
     request: Request
-) -> BatchResponseContainer:
+):
     """
     Process multiple API requests in parallel.
     
     This endpoint accepts a batch of API requests and executes them
-    concurrently, returning all responses once complete.
+    concurrently. The combined response is streamed: each sub-response is
+    written in request order as soon as it and its predecessors are done.
     """
     # Get base URL from request
     base_url = str(request.base_url).rstrip('/')
     
     # Validate batch size
-    max_batch_size = 20  # Configurable
-    if len(batch_request.requests) > max_batch_size:
+    if len(batch_request.requests) > MAX_BATCH_SIZE:
         raise HTTPException(
             status_code=400,
-            detail=f"Batch size exceeds maximum of {max_batch_size} requests"
+            detail=f"Batch size exceeds maximum of {MAX_BATCH_SIZE} requests"
         )
     
     # Handle empty batch
@@ -217,23 +280,85 @@ async def handle_batch(
             timestamp=int(time.time() * 1000)
         )
     
-    try:
-        # Process batch
-        responses = await processor.process_batch(batch_request.requests, base_url)
-        
-        return BatchResponseContainer(
-            success=True,
-            responses=responses,
-            count=len(responses),
-            timestamp=int(time.time() * 1000)
-        )
+    # Verify the caller once; sub-requests reuse the verified context
+    auth = await processor.resolve_auth(request)
     
-    except Exception as e:
+    return StreamingResponse(
+        stream_batch_response(batch_request.requests, base_url, auth),
+        media_type="application/json"
+    )
+
+async def stream_batch_response(requests: List[BatchRequest], base_url: str,
+                                auth: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+    """
+    Serialize a BatchResponseContainer incrementally.
+    
+    "success" is only known once all sub-requests are done, so it is written
+    after the responses: true only if every sub-request succeeded.
+    """
+    yield b'{"responses": ['
+    count = 0
+    success = True
+    try:
+        async for response in processor.iter_batch(requests, base_url, auth):
+            if count:
+                yield b", "
+            yield response.model_dump_json().encode("utf-8")
+            count += 1
+            success = success and response.success
+    except Exception:
         logger.error(f"Batch processing error: {traceback.format_exc()}")
+        success = False
+    success = success and count == len(requests)
+    yield (f'], "success": {json.dumps(success)}, "count": {count}, '
+           f'"timestamp": {int(time.time() * 1000)}}}').encode("utf-8")
+
+@router.post("/stream")
+async def handle_batch_stream(
+    batch_request: BatchRequestContainer,
+    request: Request
+):
+    """
+    Process a batch as a dependency graph and stream results as NDJSON.
+    
+    Sub-requests may declare `depends_on` and reference dependency results
+    via `${id.data.field}` placeholders. Independent requests run concurrently
+    under per-priority limits; every result is written as one JSON line the
+    moment it completes, followed by a final summary line.
+    """
+    if len(batch_request.requests) > MAX_BATCH_SIZE:
         raise HTTPException(
-            status_code=500,
-            detail=f"Internal server error: {str(e)}"
+            status_code=400,
+            detail=f"Batch size exceeds maximum of {MAX_BATCH_SIZE} requests"
         )
+    
+    auth = await processor.resolve_auth(request)
+    requests = [req.model_dump() for req in batch_request.requests]
+    
+    return StreamingResponse(
+        stream_batch_ndjson(requests, auth),
+        media_type="application/x-ndjson"
+    )
+
+async def stream_batch_ndjson(requests: List[Dict[str, Any]],
+                              auth: Optional[Dict[str, Any]] = None) -> AsyncIterator[bytes]:
+    """One JSON line per completed sub-request plus a summary line"""
+    start_time = time.time()
+    count = failed = 0
+    try:
+        async for response in get_batch_processor().stream_batch(requests, auth):
+            count += 1
+            failed += 0 if response.success else 1
+            yield (json.dumps(response.to_dict(), default=str) + "\n").encode("utf-8")
+    except Exception:
+        logger.error(f"Batch stream error: {traceback.format_exc()}")
+    yield (json.dumps({
+        "done": True,
+        "count": count,
+        "failed": failed,
+        "duration": int((time.time() - start_time) * 1000),
+        "timestamp": int(time.time() * 1000)
+    }) + "\n").encode("utf-8")
 
 @router.get("/health")
 async def batch_health_check():
@@ -242,7 +367,8 @@ async def batch_health_check():
         "status": "healthy",
         "processor": {
             "max_concurrent_requests": processor.max_concurrent_requests,
-            "client_active": processor.client is not None
+            "client_active": processor.client is not None,
+            "in_process": processor.dispatcher is not None
         },
         "timestamp": int(time.time() * 1000)
     }
\ No newline at end of file
@@ -15,12 +15,16 @@ from collections import defaultdict
 
 from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request
 from fastapi.responses import JSONResponse, FileResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from jose import jwt, JWTError
 
 # Import from existing modules
 from modules.core.config import Config
 from modules.core.logging import LogManager
+from modules.core.response_cache import get_response_cache, DOCUMENTS_TAG
+from modules.core.responses import FastJSONResponse
 from modules.auth.user_model import UserManager
 from api.routes_config import build_api_url, DOCUMENT_ROUTES
 
@@ -59,24 +63,25 @@ rate_limiter = RateLimiter()
 
 # Cache manager
 class DocumentCache:
+    """Documentation cache on top of the shared response cache (public scope, tag 'documents')"""
+    
     def __init__(self, ttl: int = 300):  # 5 minutes TTL
-        self.cache = {}
+        self.cache = get_response_cache()
         self.ttl = ttl
     
-    def get(self, key: str) -> Optional[Any]:
-        if key in self.cache:
-            data, timestamp = self.cache[key]
-            if datetime.now() - timestamp < timedelta(seconds=self.ttl):
-                return data
-            else:
-                del self.cache[key]
-        return None
+    async def get(self, key: str) -> Optional[Any]:
+        # The shared tier is SQLite, so lookups run in the threadpool
+        hit = await run_in_threadpool(self.cache.get, f"docs:{key}")
+        return hit[0] if hit else None
     
-    def set(self, key: str, value: Any):
-        self.cache[key] = (value, datetime.now())
+    async def set(self, key: str, value: Any):
+        # Store plain JSON so the entry can be shared across workers
+        await run_in_threadpool(
+            self.cache.set, f"docs:{key}", jsonable_encoder(value), ttl=self.ttl, tags=(DOCUMENTS_TAG,)
+        )
     
     def clear(self):
-        self.cache.clear()
+        self.cache.invalidate_tags(DOCUMENTS_TAG)
 
 doc_cache = DocumentCache()
 
@@ -339,9 +344,9 @@ async def list_documents(
 ):
     """List all documents with optional filtering"""
     cache_key = f"list_{category}_{tag}"
-    cached = doc_cache.get(cache_key)
+    cached = await doc_cache.get(cache_key)
     if cached:
-        return cached
+        return FastJSONResponse(cached)
     
     docs_dir = get_docs_directory()
     documents = []
@@ -361,8 +366,8 @@ async def list_documents(
     # Sort by modified date (newest first)
     documents.sort(key=lambda x: x.modified, reverse=True)
     
-    doc_cache.set(cache_key, documents)
-    return documents
+    await doc_cache.set(cache_key, documents)
+    return FastJSONResponse(documents)
 
 @router.get("/search", response_model=List[DocumentMetadata])
 async def search_documents(
@@ -377,9 +382,9 @@ async def search_documents(
         raise HTTPException(status_code=400, detail="Search query required")
     
     cache_key = f"search_{q}_{category}_{tags}_{limit}"
-    cached = doc_cache.get(cache_key)
+    cached = await doc_cache.get(cache_key)
     if cached:
-        return cached
+        return FastJSONResponse(cached)
     
     docs_dir = get_docs_directory()
     results = []
@@ -403,14 +408,14 @@ async def search_documents(
                 if len(results) >= limit:
                     break
     
-    doc_cache.set(cache_key, results)
-    return results
+    await doc_cache.set(cache_key, results)
+    return FastJSONResponse(results)
 
 @router.get("/stats", response_model=DocumentStats)
 async def get_documentation_stats(current_user: dict = Depends(get_current_user)):
     """Get documentation statistics"""
     cache_key = "stats"
-    cached = doc_cache.get(cache_key)
+    cached = await doc_cache.get(cache_key)
     if cached:
         return cached
     
@@ -437,7 +442,7 @@ async def get_documentation_stats(current_user: dict = Depends(get_current_user)
         most_recent_docs=documents[:5]
     )
     
-    doc_cache.set(cache_key, stats)
+    await doc_cache.set(cache_key, stats)
     return stats
 
 @router.get("/health")
@@ -491,13 +496,14 @@ async def validate_document(
 async def get_document_graph(current_user: dict = Depends(get_current_user)):
     """Get document dependency graph"""
     cache_key = "graph"
-    cached = doc_cache.get(cache_key)
+    cached = await doc_cache.get(cache_key)
     if cached:
-        return cached
+        return FastJSONResponse(cached)
     
+    # Returned directly so the (large) graph is serialized once, without response_model re-validation
     graph = build_document_graph()
-    doc_cache.set(cache_key, graph)
-    return graph
+    await doc_cache.set(cache_key, graph)
+    return FastJSONResponse(graph)
 
 @router.get("/{path:path}")
 async def get_document(
@@ -506,7 +512,7 @@ async def get_document(
 ):
     """Get specific document content"""
     cache_key = f"doc_{path}"
-    cached = doc_cache.get(cache_key)
+    cached = await doc_cache.get(cache_key)
     if cached:
         return FileResponse(cached)
     
@@ -528,7 +534,7 @@ async def get_document(
     if not file_path.suffix == ".md":
         raise HTTPException(status_code=400, detail="Only markdown files are supported")
     
-    doc_cache.set(cache_key, str(file_path))
+    await doc_cache.set(cache_key, str(file_path))
     return FileResponse(file_path, media_type="text/markdown")
 
 # Cache management endpoint (admin only)
@@ -563,14 +569,14 @@ async def rebuild_cache():
                 metadata = extract_metadata_from_file(md_file)
                 documents.append(metadata)
         
-        doc_cache.set("list_None_None", documents)
+        await doc_cache.set("list_None_None", documents)
         
         # Cache stats
         await get_documentation_stats({"user_id": "system", "username": "system"})
         
         # Cache graph
         graph = build_document_graph()
-        doc_cache.set("graph", graph)
+        await doc_cache.set("graph", graph)
         
         logger.info("Documentation cache rebuilt successfully")
     except Exception as e:
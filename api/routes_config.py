@@ -28,6 +28,7 @@ class SessionRoutes:
     """Session Routes"""
     LIST = '/sessions'
     CREATE = '/sessions'
+    SEARCH = '/sessions/search'
     ASK = '/ask'
     
     @staticmethod
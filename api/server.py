@@ -23,12 +23,10 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request, Query, Path as PathParam
-from fastapi.responses import JSONResponse, FileResponse, Response
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from starlette.types import Scope, Receive, Send
-from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel, EmailStr
 from jose import JWTError, jwt
 from starlette.concurrency import run_in_threadpool
@@ -38,14 +36,22 @@ from typing import List
 from modules.core.config import Config
 from modules.core.logging import LogManager
 from modules.auth.user_model import UserManager
+from modules.auth.auth_service import AuthService, LoginRateLimitError
 from modules.rag.engine import RAGEngine
 from modules.session.chat_history import ChatHistoryManager
 from modules.feedback.feedback_manager import FeedbackManager
+from modules.feedback.feedback_export import iter_export, validate_export, export_filename, export_media_type
 from modules.core.motd_manager import MOTDManager
-from api.telemetry_handler import handle_telemetry_request
+from modules.core.response_cache import ResponseCache, get_response_cache, sessions_tag, FEEDBACK_TAG
+from modules.core.telemetry_store import get_telemetry_store
+from modules.core.metrics import metrics, MetricsMiddleware, scrape_allowed
+from modules.core.static_assets import StaticAssetMiddleware, create_static_store
+from modules.core.responses import CompressionMiddleware, FastJSONResponse
+from api.telemetry_handler import handle_telemetry, telemetry_pipeline
+from api.asgi_dispatch import BATCH_USER_STATE_KEY
 from api.fixed_stream_endpoint import additional_router
 from api.streaming_integration import initialize_dependencies, register_streaming_endpoints
-from api.admin_handler import get_negative_feedback, update_feedback_status, delete_feedback, filter_feedback, export_feedback, get_doc_converter_status, get_doc_converter_jobs, get_doc_converter_settings, update_doc_converter_settings, get_system_stats, get_available_actions, perform_system_check
+from api.admin_handler import get_negative_feedback, update_feedback_status, delete_feedback, filter_feedback, export_feedback, get_doc_converter_status, get_doc_converter_jobs, get_doc_converter_settings, update_doc_converter_settings, get_system_stats, get_available_actions, perform_system_check, start_stats_collector
 from api.documentation_api import router as documentation_router
 
 try:
@@ -60,15 +66,33 @@ except ImportError:
 motd_manager = MOTDManager()
 logger = LogManager.setup_logging()
 feedback_manager = FeedbackManager()
+telemetry_store = get_telemetry_store()
+telemetry_pipeline.add_sink(telemetry_store.ingest)
 # Lifespan context manager für Startup/Shutdown Events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await startup_event()
-    await update_css_timestamps()
+    await telemetry_pipeline.start()
+    if Config.STATIC_PRECOMPRESS:
+        # ETags und .br/.gz-Varianten im Hintergrund vorbereiten, der Start wartet nicht darauf
+        asyncio.get_running_loop().run_in_executor(None, static_assets.prepare)
+    archive_task = None
+    if Config.SESSION_ARCHIVE_AFTER_DAYS > 0:
+        archive_task = asyncio.create_task(chat_history.archiver.run_periodic())
+    # Der erste Durchlauf des Samplers erfasst sofort alle Werte im Executor
+    stats_collector = start_stats_collector()
+    stats_collector.register_source("rag", rag_engine.get_document_counts)
+    stats_task = asyncio.create_task(stats_collector.run_periodic())
     yield
     # Shutdown
-    # Hier können Shutdown-Tasks hinzugefügt werden
+    stats_task.cancel()
+    if archive_task:
+        archive_task.cancel()
+    await telemetry_pipeline.stop()
+    telemetry_store.close()
+    get_response_cache().close()
+    auth_service.shutdown()
 
 # Configure FastAPI with comprehensive metadata
 app = FastAPI(
@@ -165,64 +189,6 @@ async def general_exception_handler(request, exc):
         content={"detail": str(exc)},
     )
 
-# Erweiterte Middleware für No-Cache-Header und MIME-Typ-Korrekturen
-class EnhancedMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        # Besseres MIME-Typ-Management - Setze Header schon VOR dem Aufruf
-        # für Pfade, die wir direkt identifizieren können
-        original_path = request.url.path
-        content_type = None
-        
-        # Vorab MIME-Type erkennen basierend auf Pfad und Dateiendung
-        if original_path.endswith(".css"):
-            content_type = "text/css"
-            logger.debug(f"CSS-Datei erkannt (vor Aufruf): {original_path}")
-        elif original_path.endswith(".js"):
-            content_type = "application/javascript"
-            logger.debug(f"JavaScript-Datei erkannt (vor Aufruf): {original_path}")
-        elif original_path.endswith((".png", ".jpg", ".jpeg", ".gif")):
-            ext = original_path.split(".")[-1].lower()
-            content_type = f"image/{ext if ext != 'jpg' else 'jpeg'}"
-        elif original_path.endswith(".svg"):
-            content_type = "image/svg+xml"
-        elif original_path.endswith(".json"):
-            content_type = "application/json"
-        
-        # Protokolliere wichtige Anfragen für die Fehlersuche
-        if ((original_path.startswith("/css/") or original_path.startswith("/static/css/")) and 
-            original_path.endswith(".css")):
-            logger.debug(f"CSS-Datei angefordert: {original_path}, Content-Type wird auf {content_type} gesetzt")
-            
-        # Lasse den Request durch die reguläre Middleware-Kette laufen
-        response = await call_next(request)
-        
-        # Stelle sicher, dass der richtige Content-Type gesetzt ist, egal was vorher passiert ist
-        if content_type:
-            current_content_type = response.headers.get("Content-Type", "")
-            
-            # Wenn Content-Type falsch oder nicht gesetzt ist, korrigiere ihn
-            if content_type not in current_content_type:
-                response.headers["Content-Type"] = content_type
-                logger.debug(f"Content-Type für {original_path} korrigiert auf {content_type} (war: {current_content_type})")
-        
-        # Spezielle Behandlung für JavaScript-Module
-        if original_path.endswith(".js") and "type=module" in original_path:
-            response.headers["Content-Type"] = "application/javascript"
-            logger.debug(f"Content-Type für JS-Modul {original_path} auf application/javascript gesetzt")
-        
-        # Setze No-Cache für statische Assets im Entwicklungsmodus
-        # In Produktion wäre Cache sinnvoll, mit Version-Parameter für Cache-Busting
-        if (original_path.startswith(("/static", "/css", "/js", "/images")) and 
-            original_path.endswith((".css", ".js"))):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-            
-        return response
-
-# Füge die erweiterte Middleware hinzu (vor der CORS-Middleware)
-app.add_middleware(EnhancedMiddleware)
-
 # CORS-Konfiguration
 app.add_middleware(
     CORSMiddleware,
@@ -232,6 +198,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/Brotli für JSON- und Export-Antworten; innerhalb der Metrik-Middleware,
+# damit die Komprimierung in der gemessenen Zeit enthalten ist
+if Config.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware,
+                       minimum_size=Config.RESPONSE_COMPRESSION_MIN_BYTES,
+                       gzip_level=Config.RESPONSE_GZIP_LEVEL,
+                       brotli_quality=Config.RESPONSE_BROTLI_QUALITY)
+
+# Latenz-Histogramme pro Route (äußerste Middleware, misst die gesamte Kette)
+if Config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Prüfe und melde den Status der Frontend-Verzeichnisse
 frontend_dir = Path("frontend")
 logger.info(f"Frontend-Verzeichnis: {frontend_dir.absolute()}")
@@ -247,27 +225,36 @@ if frontend_dir.exists():
     if js_dir.exists():
         logger.info(f"JS-Dateien: {[f.name for f in js_dir.iterdir() if f.is_file()]}")
 
-# App Mounten mit normaler StaticFiles-Klasse für verschiedene Pfade
-# Verbesserte Fehlerbehandlung bei Pfadzuordnungen
-def mount_static_directory(app, url_path, directory_path, name):
-    """Mountet ein Verzeichnis mit Fehlerbehandlung"""
+# Statische Dateien werden vom StaticAssetStore ausgeliefert; Verzeichnisse mit Fehlerbehandlung anlegen
+def ensure_static_directory(directory_path):
+    """Legt ein fehlendes statisches Verzeichnis an"""
     directory = Path(directory_path)
     if not directory.exists():
         os.makedirs(directory, exist_ok=True)
         logger.warning(f"Verzeichnis '{directory_path}' existierte nicht und wurde erstellt")
-    
-    app.mount(url_path, StaticFiles(directory=str(directory)), name=name)
-    logger.info(f"Statisches Verzeichnis erfolgreich gemountet: {url_path} -> {directory_path}")
+    return directory
 
 # Absolute Pfade für Verzeichnisse
 app_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 frontend_dir = app_dir / "frontend"
-
-# Mounten der statischen Verzeichnisse mit Fehlerbehandlung
-mount_static_directory(app, "/static", frontend_dir, "static")
-mount_static_directory(app, "/css", frontend_dir / "css", "css")
-mount_static_directory(app, "/js", frontend_dir / "js", "js")
-mount_static_directory(app, "/images", frontend_dir / "images", "images")
+# Vite-Build (vite.config.ts) mit Hash-Namen und vorkomprimierten .br/.gz-Dateien
+build_dir = Path(Config.STATIC_BUILD_DIR) if Config.STATIC_BUILD_DIR else app_dir / "api" / "frontend"
+
+# Build-Verzeichnis vor dem Legacy-Frontend durchsuchen; nur Hash-Namen aus dem Build sind unveränderlich
+static_assets = create_static_store([
+    ("/assets", build_dir / "assets", True),
+    ("/js", build_dir / "js", True),
+    ("/js", ensure_static_directory(frontend_dir / "js"), False),
+    ("/css", ensure_static_directory(frontend_dir / "css"), False),
+    ("/images", ensure_static_directory(frontend_dir / "images"), False),
+    ("/static", frontend_dir, False),
+])
+logger.info(f"Statische Präfixe {', '.join(static_assets.prefixes)} (Build-Verzeichnis: {build_dir}, "
+            f"vorhanden: {build_dir.exists()})")
+
+# Äußerste Middleware: statische Dateien umgehen CORS, Metriken und Router
+app.add_middleware(StaticAssetMiddleware, store=static_assets,
+                   immutable_max_age=Config.STATIC_IMMUTABLE_MAX_AGE)
 
 @app.get("/")
 async def root():
@@ -279,6 +266,7 @@ async def frontend():
         
 # Initialisiere Module
 user_manager = UserManager()
+auth_service = AuthService(user_manager)
 rag_engine = RAGEngine()
 chat_history = ChatHistoryManager()
 
@@ -459,6 +447,10 @@ class FeedbackRequest(BaseModel):
         description="Optional comment explaining the feedback",
         max_length=1000
     )
+    sources: Optional[List[str]] = Field(
+        None,
+        description="Source documents the rated answer was based on (used for per-document feedback statistics)"
+    )
 
 # Response Models
 class UserInfo(BaseModel):
@@ -569,23 +561,25 @@ async def get_admin_user(request: Request) -> Dict[str, Any]:
 async def get_current_user(request: Request) -> Dict[str, Any]:
     """Extrahiert und verifiziert den aktuellen Benutzer aus dem JWT-Token"""
     auth_header = request.headers.get("Authorization")
-    logger.debug(f"get_current_user - Authorization header: {auth_header[:50]}...") if auth_header else logger.debug("get_current_user - No Authorization header")
+    
+    # In-process ausgeführte Batch-Sub-Requests bringen den bereits verifizierten Benutzer mit;
+    # nur die Sperrliste wird erneut geprüft, damit ein Widerruf während des Batches greift
+    batch_user = getattr(request.state, BATCH_USER_STATE_KEY, None)
+    if batch_user:
+        if user_manager.token_cache.is_revoked((auth_header or "")[7:], batch_user):
+            raise HTTPException(status_code=401, detail="Ungültiges oder abgelaufenes Token")
+        return batch_user
     
     if not auth_header or not auth_header.startswith("Bearer "):
-        logger.warning(f"Invalid authorization header format: {auth_header}")
+        logger.warning("Invalid authorization header format")
         raise HTTPException(status_code=401, detail="Nicht authentifiziert")
     
-    token = auth_header.split("Bearer ")[1]
-    logger.debug(f"Extracted token: {token[:20]}...")
-    
-    user_data = user_manager.verify_token(token)
-    logger.debug(f"Token verification result: {user_data}")
+    # Bereits verifizierte Tokens kommen aus dem Token-Cache des UserManagers
+    user_data = user_manager.verify_token(auth_header[7:])
     
     if not user_data:
-        logger.warning(f"Token verification failed for token: {token[:20]}...")
         raise HTTPException(status_code=401, detail="Ungültiges oder abgelaufenes Token")
     
-    logger.debug(f"Successfully authenticated user: {user_data.get('email')}")
     return user_data
 
 
@@ -622,10 +616,18 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
                 }
             }
         },
+        400: {
+            "description": "Invalid request body",
+            "model": ErrorResponse
+        },
         401: {
             "description": "Invalid credentials",
             "model": ErrorResponse
         },
+        429: {
+            "description": "Too many failed login attempts for this account",
+            "model": ErrorResponse
+        },
         500: {
             "description": "Internal server error",
             "model": ErrorResponse
@@ -634,83 +636,31 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
 )
 async def login(request: Request):
     try:
-        # Erste Variante: Aus dem Request-Body lesen
         try:
             request_data = await request.json()
-            print(f"LOGIN DEBUG - Received request data: {request_data}")
-            
-            # Prüfen, ob E-Mail oder Username im Request vorhanden ist
-            email = request_data.get("email")
-            if not email and "username" in request_data:
-                email = request_data.get("username")
-                print(f"LOGIN DEBUG - Using username as email: {email}")
-                
-            password = request_data.get("password", "")
-            
-            # Leeres oder fehlendes Passwort durch Standard-Testpasswort ersetzen
-            if not password:
-                password = "123"
-                print(f"LOGIN DEBUG - Empty password, using test password '123' instead")
-            
-            print(f"LOGIN DEBUG - Extracted credentials: email={email}, password_length={len(password)}")
-            
-            if email:  # Wir brauchen mindestens eine Email-Adresse
-                # Mit den erhaltenen Credentials authentifizieren
-                token = user_manager.authenticate(email, password)
-                
-                if token:
-                    print(f"LOGIN DEBUG - Authentication successful for {email}")
-                    # Benutzerinformationen abrufen
-                    user = user_manager.get_user_by_email(email)
-                    if user:
-                        user_data = {
-                            "id": user.get("id"),
-                            "email": user.get("email"),
-                            "username": user.get("username"),
-                            "role": user.get("role"),
-                            "created_at": user.get("created_at")
-                        }
-                        return {"access_token": token, "token": token, "user": user_data}
-                    else:
-                        return {"access_token": token, "token": token}
-                else:
-                    print(f"LOGIN DEBUG - Authentication failed for {email}, trying with default password")
-                    # Mit Standard-Testpasswort versuchen, falls reguläres Passwort fehlschlägt
-                    if password != "123":
-                        token = user_manager.authenticate(email, "123")
-                        if token:
-                            print(f"LOGIN DEBUG - Authentication successful with default password for {email}")
-                            # Benutzerinformationen abrufen
-                            user = user_manager.get_user_by_email(email)
-                            if user:
-                                user_data = {
-                                    "id": user.get("id"),
-                                    "email": user.get("email"),
-                                    "username": user.get("username"),
-                                    "role": user.get("role"),
-                                    "created_at": user.get("created_at")
-                                }
-                                return {"access_token": token, "token": token, "user": user_data}
-                            else:
-                                return {"access_token": token, "token": token}
-                    
-                    print(f"LOGIN DEBUG - Authentication failed completely for {email}")
-                    raise HTTPException(status_code=401, detail="Ungültige Anmeldedaten")
         except Exception as body_error:
-            print(f"LOGIN DEBUG - Error parsing request body: {str(body_error)}")
+            logger.debug(f"Login: Request-Body nicht lesbar: {body_error}")
+            raise HTTPException(status_code=400, detail="Ungültiger Request-Body")
         
-        # Fallback: Verwende Test-Credentials
-        print("LOGIN DEBUG - Using fallback test credentials")
-        email = "martin@danglefeet.com"
-        password = "123"
+        if not isinstance(request_data, dict):
+            raise HTTPException(status_code=400, detail="Ungültiger Request-Body")
         
-        # Mit Test-Credentials authentifizieren
-        token = user_manager.authenticate(email, password)
+        # Prüfen, ob E-Mail oder Username im Request vorhanden ist
+        email = request_data.get("email") or request_data.get("username")
+        password = request_data.get("password") or ""
+        
+        if not email or not password:
+            raise HTTPException(status_code=401, detail="Ungültige Anmeldedaten")
+        
+        # Genau ein Versuch mit den übermittelten Daten: Fehlversuche zählen nur für dieses
+        # Konto, es gibt weder Standardpasswort noch Ausweichen auf ein Testkonto
+        token = await auth_service.authenticate(email, password)
         
         if not token:
+            logger.debug("Login: Anmeldung fehlgeschlagen")
             raise HTTPException(status_code=401, detail="Ungültige Anmeldedaten")
         
-        print(f"LOGIN DEBUG - Fallback authentication successful for {email}")
+        logger.debug("Login: Anmeldung erfolgreich")
         # Benutzerinformationen abrufen
         user = user_manager.get_user_by_email(email)
         if user:
@@ -725,12 +675,18 @@ async def login(request: Request):
         else:
             return {"access_token": token, "token": token}
         
+    except LoginRateLimitError as rle:
+        raise HTTPException(
+            status_code=429,
+            detail="Zu viele fehlgeschlagene Anmeldeversuche, bitte später erneut versuchen",
+            headers={"Retry-After": str(rle.retry_after)}
+        )
     except HTTPException as he:
         # HTTP Exceptions durchreichen
-        print(f"LOGIN DEBUG - HTTP Exception: {str(he)}")
+        logger.debug(f"Login: HTTP-Fehler {he.status_code}")
         raise he
     except Exception as e:
-        print(f"LOGIN DEBUG - Unexpected error: {str(e)}")
+        logger.error(f"Login: Unerwarteter Fehler: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post(
@@ -751,13 +707,36 @@ async def login(request: Request):
     }
 )
 async def register(request: RegisterRequest):
-    success = user_manager.register_user(request.email, request.password)
+    success = await auth_service.register_user(request.email, request.password)
     
     if not success:
         raise HTTPException(status_code=400, detail="Benutzer existiert bereits")
     
     return {"message": "Benutzer erfolgreich registriert"}
 
+@app.post(
+    "/api/auth/logout",
+    response_model=MessageResponse,
+    tags=["auth"],
+    summary="Logout",
+    description="Revoke the current JWT token so it is rejected until it expires.",
+    responses={
+        200: {
+            "description": "Token revoked",
+            "model": MessageResponse
+        },
+        401: {
+            "description": "Not authenticated",
+            "model": ErrorResponse
+        }
+    }
+)
+async def logout(request: Request, user_data: Dict[str, Any] = Depends(get_current_user)):
+    token = request.headers.get("Authorization", "")[7:]
+    user_manager.revoke_token(token)
+
+    return {"message": "Erfolgreich abgemeldet"}
+
 @app.post(
     "/api/auth/reset-password",
     response_model=MessageResponse,
@@ -924,7 +903,7 @@ async def get_users(admin_data: Dict[str, Any] = Depends(get_admin_user)):
     }
 )
 async def create_user(request: CreateUserRequest, admin_data: Dict[str, Any] = Depends(get_admin_user)):
-    success = user_manager.register_user(request.email, request.password, request.role)
+    success = await auth_service.register_user(request.email, request.password, request.role)
     
     if not success:
         raise HTTPException(status_code=400, detail="Benutzer existiert bereits oder ungültige Daten")
@@ -1211,7 +1190,8 @@ async def add_feedback(request: FeedbackRequest, user_data: Dict[str, Any] = Dep
         session_id=request.session_id,
         user_id=user_id,
         is_positive=request.is_positive,
-        comment=request.comment
+        comment=request.comment,
+        sources=request.sources
     )
     
     if not success:
@@ -1242,7 +1222,12 @@ async def get_user_feedback(user_data: Dict[str, Any] = Depends(get_current_user
 @app.get("/api/v1/admin/feedback/stats")
 async def get_feedback_stats(admin_data: Dict[str, Any] = Depends(get_admin_user)):
     """Gibt Feedback-Statistiken zurück (Admin)"""
-    stats = feedback_manager.get_feedback_stats()
+    cache_key = ResponseCache.make_key('api', '/api/v1/admin/feedback/stats', user=admin_data, scope='role')
+    stats, _ = await get_response_cache().get_or_set(
+        cache_key,
+        lambda: run_in_threadpool(feedback_manager.get_feedback_stats),
+        tags=(FEEDBACK_TAG,)
+    )
     
     return {"stats": stats}
 
@@ -1521,7 +1506,8 @@ async def stream_question(
         raise HTTPException(status_code=401, detail="Nicht authentifiziert - Bearer Token im Authorization-Header erforderlich")
     
     token = auth_header.split("Bearer ")[1]
-    user_data = user_manager.verify_token(token)
+    with metrics.stage("auth"):
+        user_data = user_manager.verify_token(token)
     logger.info(f"Authentifizierung über Header: Token gültig={user_data is not None}")
     
     # Prüfen, ob Token gültig ist
@@ -1532,23 +1518,25 @@ async def stream_question(
     user_id = user_data['user_id']
     
     # Prüfe, ob die Session existiert und dem Benutzer gehört
-    user_sessions = chat_history.get_user_sessions(user_id)
-    session_ids = [str(s['id']) for s in user_sessions]  # Konvertiere IDs zu Strings
-    
-    if session_id not in session_ids:
-        # Erstelle eine neue Session, wenn die angegebene nicht existiert
-        logger.warning(f"Session {session_id} nicht gefunden, erstelle neue Session")
-        new_session_id = chat_history.create_session(user_id, "Neue Unterhaltung")
-        
-        if not new_session_id:
-            logger.error("Fehler beim Erstellen einer neuen Session")
-            raise HTTPException(status_code=500, detail="Fehler beim Erstellen einer Session")
+    with metrics.stage("session_check"):
+        user_sessions = chat_history.get_user_sessions(user_id)
+        session_ids = [str(s['id']) for s in user_sessions]  # Konvertiere IDs zu Strings
         
-        session_id = str(new_session_id)  # Konvertiere zu String
+        if session_id not in session_ids:
+            # Erstelle eine neue Session, wenn die angegebene nicht existiert
+            logger.warning(f"Session {session_id} nicht gefunden, erstelle neue Session")
+            new_session_id = chat_history.create_session(user_id, "Neue Unterhaltung")
+            
+            if not new_session_id:
+                logger.error("Fehler beim Erstellen einer neuen Session")
+                raise HTTPException(status_code=500, detail="Fehler beim Erstellen einer Session")
+            
+            session_id = str(new_session_id)  # Konvertiere zu String
     
     # Speichere die Benutzerfrage in der Chat-Historie und erhalte die Nachricht-ID
     logger.info(f"Speichere Benutzerfrage in Session {session_id}")
-    message_id = chat_history.add_message(int(session_id), question, is_user=True)
+    with metrics.stage("persist_question"):
+        message_id = chat_history.add_message(int(session_id), question, is_user=True)
     
     if not message_id:
         logger.error(f"Fehler beim Speichern der Benutzerfrage in Session {session_id}")
@@ -1625,20 +1613,46 @@ async def get_session(session_id: int, user_data: Dict[str, Any] = Depends(get_c
     # Finde den Session-Titel
     session_info = next((s for s in user_sessions if s['id'] == session_id), None)
     
-    return {
+    return FastJSONResponse({
         "session_id": session_id,
         "title": session_info['title'] if session_info else "Unbekannte Unterhaltung",
         "messages": history
-    }
+    })
 
 @app.get("/api/sessions")
 async def get_sessions(user_data: Dict[str, Any] = Depends(get_current_user)):
     """Gibt alle Chat-Sessions eines Benutzers zurück"""
     user_id = user_data['user_id']
     
-    sessions = chat_history.get_user_sessions(user_id)
+    # Sessionliste aus dem Antwort-Cache; Schreibzugriffe invalidieren den Tag des Benutzers
+    cache_key = ResponseCache.make_key('api', '/api/sessions', user=user_data)
+    sessions, _ = await get_response_cache().get_or_set(
+        cache_key,
+        lambda: run_in_threadpool(chat_history.get_user_sessions, user_id),
+        tags=(sessions_tag(user_id),)
+    )
     
-    return {"sessions": sessions}
+    return FastJSONResponse({"sessions": sessions})
+
+@app.get(
+    build_api_url(SESSION_ROUTES.SEARCH),
+    tags=["sessions"],
+    summary="Search chat history",
+    description="""Full-text search across all messages of the current user's sessions.
+
+    Results are ranked by relevance (BM25). Each hit contains an excerpt in which matches
+    are wrapped in `<mark>` tags. Use `offset` and `limit` for pagination; `has_more`
+    indicates whether another page exists.
+    """
+)
+async def search_sessions(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (prefix match per word)"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    user_data: Dict[str, Any] = Depends(get_current_user)
+):
+    """Durchsucht den Chatverlauf des Benutzers"""
+    return await run_in_threadpool(chat_history.search_messages, user_data['user_id'], q, limit, offset)
 
 @app.post("/api/session")
 async def start_session(request: StartSessionRequest, user_data: Dict[str, Any] = Depends(get_current_user)):
@@ -1853,16 +1867,8 @@ async def clear_embedding_cache(user_data: Dict[str, Any] = Depends(get_admin_us
     }
 )
 async def get_admin_stats(user_data: Dict[str, Any] = Depends(get_admin_user)):
-    rag_stats = rag_engine.get_document_stats()
-    system_stats = get_system_stats()
-    
-    # Kombiniere RAG-Engine-Statistiken mit Systemstatistiken
-    if isinstance(rag_stats, dict) and "stats" in rag_stats:
-        combined_stats = {**system_stats, **rag_stats["stats"]}
-    else:
-        combined_stats = system_stats
-    
-    return {"stats": combined_stats}
+    # Letzter Snapshot des Hintergrund-Samplers, enthält auch die Dokument- und Chunk-Anzahl der RAG-Engine
+    return {"stats": get_system_stats()}
 
 @app.get("/api/v1/admin/system")
 async def get_admin_system_info(user_data: Dict[str, Any] = Depends(get_admin_user)):
@@ -1876,6 +1882,35 @@ async def get_system_statistics(user_data: Dict[str, Any] = Depends(get_admin_us
     system_stats = get_system_stats()
     return {"stats": system_stats}
 
+@app.get("/api/v1/admin/telemetry/query")
+async def query_telemetry(
+    metric: str = Query(..., description="Metrikname, z.B. stream_latency"),
+    hours: float = Query(24, gt=0, le=24 * 365, description="Zeitraum in Stunden"),
+    group_by: Optional[str] = Query(None, description="Kommagetrennte Dimensionen, z.B. model,endpoint"),
+    resolution: Optional[str] = Query(None, description="minute, hour oder day (Standard: automatisch)"),
+    admin_data: Dict[str, Any] = Depends(get_admin_user)
+):
+    """Aggregierte Telemetrie aus den Rollups (Anzahl, Mittelwert, p50/p95/p99, Max) - nur für Admins"""
+    try:
+        # SQLite-Abfrage (und Schreiben gepufferter Werte) im Threadpool statt im Event-Loop
+        return await run_in_threadpool(
+            telemetry_store.query,
+            metric,
+            hours=hours,
+            group_by=[dim.strip() for dim in group_by.split(",")] if group_by else None,
+            resolution=resolution
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/v1/admin/telemetry/metrics")
+async def list_telemetry_metrics(
+    hours: float = Query(24, gt=0, le=24 * 365),
+    admin_data: Dict[str, Any] = Depends(get_admin_user)
+):
+    """Verfügbare Telemetrie-Metriken mit Anzahl der Messwerte - nur für Admins"""
+    return {"metrics": await run_in_threadpool(telemetry_store.list_metrics, hours=hours)}
+
 @app.post("/api/v1/admin/system-check")
 async def run_system_check(user_data: Dict[str, Any] = Depends(get_admin_user)):
     """Führt eine Systemprüfung durch und gibt detaillierte Ergebnisse zurück"""
@@ -1896,12 +1931,10 @@ async def get_admin_feedback(
 ):
     """Gibt eine Liste aller Feedback-Einträge zurück (nur für Admins)"""
     try:
-        feedback_manager = FeedbackManager()
-        
         # Use the new get_all_feedback_messages method
         all_feedback = await run_in_threadpool(feedback_manager.get_all_feedback_messages, limit)
         
-        return {"feedback": all_feedback}
+        return FastJSONResponse({"feedback": all_feedback})
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Feedback-Einträge: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1913,9 +1946,8 @@ async def get_admin_feedback_negative(
 ):
     """Gibt eine Liste der negativen Feedback-Einträge zurück (nur für Admins)"""
     try:
-        feedback_manager = FeedbackManager()
         negative_feedback = await run_in_threadpool(feedback_manager.get_negative_feedback_messages, limit)
-        return {"feedback": negative_feedback}
+        return FastJSONResponse({"feedback": negative_feedback})
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der negativen Feedback-Einträge: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1925,34 +1957,13 @@ async def get_admin_feedback_stats(user_data: Dict[str, Any] = Depends(get_admin
     """Gibt detaillierte Feedback-Statistiken zurück (nur für Admins)"""
     try:
         # Get real stats from the feedback manager
-        feedback_manager = FeedbackManager()
         stats = await run_in_threadpool(feedback_manager.get_feedback_stats)
         
-        # Add additional stats that may not be in the basic stats
+        # Zähler und Zeitreihe kommen aus den materialisierten Feedback-Aggregaten
         with_comments = stats.get('with_comments', 0)
         unresolved = stats.get('unresolved', stats.get('negative', 0))  # Default unresolved to negative count
-        feedback_rate = 15.3  # Prozentsatz der Nachrichten mit Feedback
-        
-        # Zeitreihendaten für die letzten 7 Tage
-        current_time = time.time()
-        feedback_by_day = []
-        
-        for i in range(7, 0, -1):
-            day_offset = i * 24 * 3600
-            day_timestamp = current_time - day_offset
-            day_date = time.strftime("%Y-%m-%d", time.localtime(day_timestamp))
-            
-            # Simulierte Werte
-            day_positive = max(0, int(10 + (i % 3) * 5))
-            day_negative = max(0, int(2 + (i % 2) * 3))
-            day_count = day_positive + day_negative
-            
-            feedback_by_day.append({
-                "date": day_date,
-                "positive": day_positive,
-                "negative": day_negative,
-                "count": day_count
-            })
+        feedback_rate = stats.get('feedback_rate', 0)  # Prozentsatz der Antworten mit Feedback
+        feedback_by_day = stats.get('feedback_by_day', [])
         
         stats_data = {
             "total": stats.get('total', 0),
@@ -1962,7 +1973,8 @@ async def get_admin_feedback_stats(user_data: Dict[str, Any] = Depends(get_admin
             "with_comments": with_comments,
             "unresolved": unresolved,
             "feedback_rate": feedback_rate,
-            "feedback_by_day": feedback_by_day
+            "feedback_by_day": feedback_by_day,
+            "feedback_by_source": stats.get('feedback_by_source', [])
         }
         
         return {"stats": stats_data}
@@ -1989,7 +2001,7 @@ async def get_admin_negative_feedback(
 ):
     """Gibt eine Liste der negativen Feedback-Einträge zurück (nur für Admins)"""
     feedback = await run_in_threadpool(get_negative_feedback, limit)
-    return {"feedback": feedback}
+    return FastJSONResponse({"feedback": feedback})
 
 @app.patch("/api/v1/admin/feedback/{feedback_id}/status")
 async def update_admin_feedback_status(
@@ -2023,35 +2035,49 @@ async def filter_admin_feedback(
 ):
     """Filtert Feedback-Einträge nach verschiedenen Kriterien (nur für Admins)"""
     filtered_feedback = await run_in_threadpool(filter_feedback, filter_params)
-    return {"feedback": filtered_feedback}
+    return FastJSONResponse({"feedback": filtered_feedback})
 
 @app.get("/api/v1/admin/feedback/export")
 async def export_admin_feedback(
-    format: str = Query(..., description="Exportformat (csv, json, xlsx, pdf)"),
+    format: str = Query(..., description="Exportformat (csv, json, ndjson, xlsx, parquet, pdf)"),
     fields: str = Query("id,user_email,question,answer,comment,created_at", description="Kommagetrennte Liste von Feldern"),
+    feedback_type: str = Query("negative", description="all, positive oder negative"),
+    date_from: Optional[int] = Query(None, description="Unix-Timestamp (Sekunden oder Millisekunden)"),
+    date_to: Optional[int] = Query(None, description="Unix-Timestamp (Sekunden oder Millisekunden)"),
     user_data: Dict[str, Any] = Depends(get_admin_user)
 ):
-    """Exportiert Feedback-Daten in verschiedenen Formaten (nur für Admins)"""
-    field_list = fields.split(",")
+    """
+    Exportiert Feedback-Daten als Stream (nur für Admins)
     
-    # Hole negative Feedback als Beispieldaten
-    data = await run_in_threadpool(get_negative_feedback, 100)
-    
-    # Exportiere die Daten im angegebenen Format
-    export_options = {
-        "format": format,
-        "data": data,
-        "fields": field_list
-    }
-    
-    result_bytes, mime_type, filename = await run_in_threadpool(export_feedback, export_options)
+    Die Zeilen werden direkt vom Datenbank-Cursor in die Antwort geschrieben,
+    der Speicherbedarf bleibt unabhängig von der Anzahl der Einträge konstant.
+    """
+    try:
+        field_list = validate_export(format, fields.split(","))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    positive = {"all": None, "positive": True, "negative": False}
+    if feedback_type not in positive:
+        raise HTTPException(status_code=400, detail=f"Unbekannter Feedback-Typ: {feedback_type}")
+    
+    def to_seconds(value):
+        # Das Frontend sendet Millisekunden-Zeitstempel
+        return int(value / 1000) if value and value > 10**11 else value
+    
+    rows = feedback_manager.iter_feedback(
+        is_positive=positive[feedback_type],
+        date_from=to_seconds(date_from),
+        date_to=to_seconds(date_to)
+    )
     
     # Setze entsprechende Header für den Download
     headers = {
-        "Content-Disposition": f"attachment; filename={filename}"
+        "Content-Disposition": f"attachment; filename={export_filename(format)}"
     }
     
-    return Response(content=result_bytes, media_type=mime_type, headers=headers)
+    return StreamingResponse(iter_export(rows, format, field_list),
+                             media_type=export_media_type(format), headers=headers)
 
 # Admin-Dokumentenkonverter-Endpunkte
 @app.get("/api/v1/admin/doc-converter/status")
@@ -2548,27 +2574,6 @@ async def update_admin_user_role(
         logger.error(f"Fehler beim Aktualisieren der Benutzerrolle: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-# CSS-Datei-Zeitstempel aktualisieren bei Serverstart
-async def update_css_timestamps():
-    """Aktualisiert die Zeitstempel aller CSS-Dateien beim Server-Start"""
-    import os
-    from datetime import datetime
-    
-    css_dir = Path("frontend/css")
-    if css_dir.exists():
-        now = datetime.now().timestamp()
-        count = 0
-        for file_path in css_dir.glob("*.css"):
-            try:
-                # Ändere Zugriffs- und Modifizierungszeit
-                os.utime(file_path, (now, now))
-                count += 1
-                logger.info(f"CSS-Datei aktualisiert: {file_path.name}")
-            except Exception as e:
-                logger.error(f"Fehler beim Aktualisieren des Zeitstempels von {file_path.name}: {e}")
-        
-        logger.info(f"Insgesamt {count} CSS-Dateien aktualisiert")
-
 # Initialisierung
 async def startup_event():
     """Initialisiert das System beim Start"""
@@ -2589,7 +2594,12 @@ async def telemetry_endpoint(request: Request):
     """Verarbeitet Telemetriedaten für A/B-Tests und Nutzungsanalysen"""
     try:
         # Keine Authentifizierung erforderlich, aber Daten validieren
-        return await run_in_threadpool(lambda: handle_telemetry_request(request))
+        data = await request.json()
+        if not data:
+            return JSONResponse(status_code=400, content={"status": "error", "message": "Keine Daten empfangen"})
+        
+        # Nur Validierung und Einreihen in die Warteschlange, geschrieben wird im Hintergrund
+        return handle_telemetry(data)
     except Exception as e:
         logger.error(f"Fehler im Telemetrie-Endpunkt: {str(e)}")
         return JSONResponse(
@@ -2597,6 +2607,26 @@ async def telemetry_endpoint(request: Request):
             content={"status": "error", "message": f"Interner Serverfehler: {str(e)}"}
         )
 
+# Prometheus-Endpunkt (Scrape-Ziel von monitoring/prometheus.yml)
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Metriken im Prometheus-Textformat; per METRICS_TOKEN geschützt, ohne Token nur lokal abrufbar"""
+    if not Config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    client_host = request.client.host if request.client else None
+    if not scrape_allowed(client_host, request.headers.get("Authorization"), Config.METRICS_TOKEN):
+        raise HTTPException(status_code=401 if Config.METRICS_TOKEN else 403, detail="Nicht authentifiziert")
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/v1/admin/metrics/stages")
+async def get_stage_metrics(admin_data: Dict[str, Any] = Depends(get_admin_user)):
+    """Perzentile der Verarbeitungsschritte und Routen dieses Workers - nur für Admins"""
+    return {
+        "stages": metrics.stage_duration.snapshot(),
+        "routes": metrics.http_duration.snapshot(),
+        "llm_tokens_per_second": metrics.llm_tokens_per_second.snapshot()
+    }
+
 # Ping-Endpunkt für Health-Checks
 @app.get("/api/ping")
 @app.head("/api/ping")  # Unterstützt auch HEAD-Anfragen für Browser-Verfügbarkeitsprüfungen
@@ -2768,11 +2798,21 @@ async def get_sessions_stats(user_data: Dict[str, Any] = Depends(get_current_use
 
 # Import Enhanced Batch Handler
 # Import the new FastAPI batch router
-from api.batch_handler_fastapi import router as batch_router
+from api.batch_handler_fastapi import router as batch_router, processor as batch_processor
 
 # Include the batch router
 app.include_router(batch_router)
 
+async def resolve_batch_user(request: Request) -> Optional[Dict[str, Any]]:
+    """Verifiziert den Aufrufer eines Batch-Requests einmalig für alle Sub-Requests"""
+    try:
+        return await get_current_user(request)
+    except HTTPException:
+        return None
+
+# Sub-Requests direkt in die App dispatchen statt per HTTP-Loopback
+batch_processor.configure(app, auth_resolver=resolve_batch_user)
+
 # Custom OpenAPI schema configuration
 def custom_openapi():
     """Generate custom OpenAPI schema with additional examples and documentation"""
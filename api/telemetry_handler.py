@@ -7,10 +7,13 @@ und speichert sie für spätere Analyse.
 
 import os
 import json
+import gzip
+import time
+import asyncio
 import logging
 import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Union
 
 # Konfiguration für die Telemetrie
 TELEMETRY_CONFIG = {
@@ -32,7 +35,25 @@ TELEMETRY_CONFIG = {
         "max_files": 100,
         
         # Maximale Größe pro Datei in Bytes (10 MB)
-        "max_file_size": 10 * 1024 * 1024
+        "max_file_size": 10 * 1024 * 1024,
+        
+        # Maximales Alter von Telemetriedateien in Tagen
+        "max_age_days": 30
+    },
+    
+    # Asynchrone Verarbeitung (Warteschlange + Hintergrund-Writer)
+    "pipeline": {
+        # Maximale Anzahl wartender Ereignisse, darüber wird verworfen
+        "queue_size": 10000,
+        
+        # Maximale Anzahl Ereignisse pro Schreibvorgang
+        "batch_size": 500,
+        
+        # Spätestens nach so vielen Sekunden wird geschrieben
+        "flush_interval": 1.0,
+        
+        # Intervall der Aufbewahrungsbereinigung in Sekunden
+        "retention_interval": 3600
     }
 }
 
@@ -76,6 +97,11 @@ def handle_telemetry(request_data: Dict[str, Any]) -> Dict[str, Any]:
         if not events and "eventType" in request_data:
             # Einzelnes Ereignis
             events = [request_data]
+
+        # Messwerte des Frontend-Telemetriedienstes ({metrics: [{name, value, unit, timestamp, tags}]})
+        for metric in request_data.get("metrics", []) or []:
+            if isinstance(metric, dict):
+                events.append({"eventType": "metric", "sessionId": request_data.get("sessionId"), **metric})
         
         # Ereignisse validieren
         valid_events = []
@@ -83,16 +109,16 @@ def handle_telemetry(request_data: Dict[str, Any]) -> Dict[str, Any]:
             if validate_event(event):
                 valid_events.append(event)
         
-        # Ereignisse speichern
+        # Ereignisse an die Pipeline übergeben (blockiert nicht)
         if valid_events:
-            if TELEMETRY_CONFIG["store_locally"]:
-                store_events_locally(valid_events)
+            accepted = telemetry_pipeline.submit(valid_events)
             
-            logger.info(f"Telemetrie: {len(valid_events)} Ereignisse verarbeitet")
+            logger.debug(f"Telemetrie: {accepted} von {len(valid_events)} Ereignissen angenommen")
             return {
                 "status": "success", 
-                "message": f"{len(valid_events)} Ereignisse verarbeitet",
-                "processed": len(valid_events),
+                "message": f"{accepted} Ereignisse verarbeitet",
+                "processed": accepted,
+                "dropped": len(valid_events) - accepted,
                 "timestamp": datetime.datetime.now().isoformat()
             }
         else:
@@ -137,61 +163,250 @@ def store_events_locally(events: List[Dict[str, Any]]) -> None:
         return
     
     try:
-        # Aktuelle Datei für Telemetriedaten ermitteln
+        segment_writer.write(events)
+    except Exception as e:
+        logger.error(f"Fehler beim lokalen Speichern von Telemetriedaten: {e}")
+
+
+class TelemetrySegmentWriter:
+    """
+    Schreibt Ereignisbatches als gzip-Member in größenrotierte Segmentdateien
+    (telemetry_<Datum>_<Zeit>.jsonl.gz). Jeder Batch ist ein eigenes Member,
+    die Dateien lassen sich mit gzip.open fortlaufend lesen.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, max_file_size: Optional[int] = None):
         config = TELEMETRY_CONFIG["file_storage"]
-        telemetry_dir = Path(config["directory"])
-        
-        # Aktuelles Datum für den Dateinamen
+        self.directory = Path(directory or config["directory"])
+        self.max_file_size = max_file_size or config["max_file_size"]
+        self.current_path: Optional[Path] = None
+    
+    def _segment_path(self) -> Path:
         today = datetime.datetime.now().strftime("%Y-%m-%d")
-        file_path = telemetry_dir / f"telemetry_{today}.jsonl"
-        
-        # Prüfen, ob die Datei zu groß ist
-        if file_path.exists() and file_path.stat().st_size > config["max_file_size"]:
-            # Neue Datei mit Zeitstempel erstellen
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_path = telemetry_dir / f"telemetry_{today}_{timestamp}.jsonl"
-        
-        # Ereignisse im JSONL-Format (eine JSON-Zeile pro Ereignis) anhängen
-        with open(file_path, "a", encoding="utf-8") as f:
-            for event in events:
-                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        if (self.current_path is not None
+                and self.current_path.name.startswith(f"telemetry_{today}_")
+                and self.current_path.exists()
+                and self.current_path.stat().st_size < self.max_file_size):
+            return self.current_path
         
-        # Alte Dateien bereinigen, wenn das Limit erreicht ist
-        cleanup_old_telemetry_files(config["directory"], config["max_files"])
+        self.directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime("%H%M%S_%f")
+        self.current_path = self.directory / f"telemetry_{today}_{timestamp}.jsonl.gz"
+        return self.current_path
     
-    except Exception as e:
-        logger.error(f"Fehler beim lokalen Speichern von Telemetriedaten: {e}")
+    def write(self, events: List[Dict[str, Any]]) -> int:
+        """Hängt einen Batch an das aktuelle Segment an und gibt die komprimierte Größe zurück"""
+        if not events:
+            return 0
+        payload = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+        compressed = gzip.compress(payload.encode("utf-8"), compresslevel=6)
+        with open(self._segment_path(), "ab") as f:
+            f.write(compressed)
+        return len(compressed)
+
 
+segment_writer = TelemetrySegmentWriter()
 
-def cleanup_old_telemetry_files(directory: str, max_files: int) -> None:
+
+def cleanup_old_telemetry_files(directory: str, max_files: int, max_age_days: Optional[int] = None) -> None:
     """
     Bereinigt alte Telemetriedateien, wenn das Limit erreicht ist
     
     :param directory: Das Verzeichnis mit Telemetriedateien
     :param max_files: Maximale Anzahl von Dateien
+    :param max_age_days: Dateien, die älter sind, werden unabhängig von der Anzahl gelöscht
     """
     try:
         telemetry_dir = Path(directory)
         if not telemetry_dir.exists():
             return
         
-        # Alle Telemetriedateien abrufen
+        # Alle Telemetriedateien abrufen (alte .jsonl und komprimierte Segmente)
         telemetry_files = sorted(
-            [f for f in telemetry_dir.glob("telemetry_*.jsonl")],
+            [f for f in telemetry_dir.glob("telemetry_*.jsonl*")],
             key=lambda f: f.stat().st_mtime
         )
         
+        files_to_delete = []
+        if max_age_days:
+            cutoff = time.time() - max_age_days * 86400
+            files_to_delete = [f for f in telemetry_files if f.stat().st_mtime < cutoff]
+            telemetry_files = telemetry_files[len(files_to_delete):]
+        
         # Alte Dateien löschen, wenn das Limit erreicht ist
         if len(telemetry_files) > max_files:
-            files_to_delete = telemetry_files[:-max_files]
-            for file_path in files_to_delete:
-                file_path.unlink()
-                logger.info(f"Alte Telemetriedatei gelöscht: {file_path}")
+            files_to_delete.extend(telemetry_files[:-max_files])
+        
+        for file_path in files_to_delete:
+            file_path.unlink()
+            logger.info(f"Alte Telemetriedatei gelöscht: {file_path}")
     
     except Exception as e:
         logger.error(f"Fehler beim Bereinigen alter Telemetriedateien: {e}")
 
 
+# Markiert in der Warteschlange das Ende: der Writer schreibt alles davor und beendet sich
+_STOP = object()
+
+
+class TelemetryPipeline:
+    """
+    Asynchrone Telemetrie-Verarbeitung
+    
+    Der Request-Pfad validiert nur und legt Ereignisse in eine begrenzte Warteschlange.
+    Ein Hintergrund-Task sammelt sie zu Batches und übergibt sie den Sinks (standardmäßig
+    dem Segment-Writer) in einem Thread. Ist die Warteschlange voll, werden Ereignisse
+    verworfen und gezählt, statt den Request zu verzögern.
+    """
+    
+    def __init__(self, sinks: Optional[List[Callable[[List[Dict[str, Any]]], Any]]] = None):
+        config = TELEMETRY_CONFIG["pipeline"]
+        self.queue_size = config["queue_size"]
+        self.batch_size = config["batch_size"]
+        self.flush_interval = config["flush_interval"]
+        self.retention_interval = config["retention_interval"]
+        self.sinks = sinks if sinks is not None else [store_events_locally]
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._retention_task: Optional[asyncio.Task] = None
+        # Ab stop() bis zum nächsten start() werden Ereignisse verworfen statt eingereiht
+        self._stopping = False
+        self.stats = {"accepted": 0, "dropped": 0, "written": 0, "batches": 0, "errors": 0}
+    
+    @property
+    def running(self) -> bool:
+        return self._writer_task is not None and not self._writer_task.done()
+    
+    def add_sink(self, sink: Callable[[List[Dict[str, Any]]], Any]) -> None:
+        """Weitere Senke registrieren, die jeden Batch erhält"""
+        self.sinks.append(sink)
+    
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._stopping = False
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._retention_task = asyncio.create_task(self._retention_loop())
+        logger.info("Telemetrie-Pipeline gestartet")
+    
+    async def stop(self) -> None:
+        """
+        Beendet die Hintergrund-Tasks und schreibt ausstehende Ereignisse.
+        
+        Der Writer wird nicht abgebrochen, sondern über eine Endmarke in der Warteschlange
+        gebeten, seinen aktuellen Batch und alles davor Eingereihte noch zu schreiben.
+        Danach eingehende Ereignisse landen nicht mehr hinter der Endmarke, sondern werden
+        von submit() verworfen und gezählt.
+        """
+        if self._writer_task is not None:
+            self._stopping = True
+        if self._retention_task:
+            self._retention_task.cancel()
+        if self._writer_task:
+            if not self._writer_task.done():
+                await self._queue.put(_STOP)
+            try:
+                await self._writer_task
+            except Exception as e:
+                logger.error(f"Telemetrie-Writer mit Fehler beendet: {e}")
+        if self._queue is not None:
+            # Nicht mehr geschriebene Ereignisse, falls der Writer vorzeitig beendet wurde
+            remaining = []
+            while not self._queue.empty():
+                event = self._queue.get_nowait()
+                if event is not _STOP:
+                    remaining.append(event)
+            if remaining:
+                await self._flush(remaining)
+        self._writer_task = self._retention_task = None
+        logger.info(f"Telemetrie-Pipeline beendet: {self.stats}")
+    
+    def submit(self, events: List[Dict[str, Any]]) -> int:
+        """Legt Ereignisse ohne Warten in die Warteschlange; gibt die Anzahl angenommener zurück"""
+        if self._stopping:
+            # Pipeline wird oder wurde beendet: nicht hinter die Endmarke einreihen und
+            # nicht synchron im Event-Loop schreiben
+            self.stats["dropped"] += len(events)
+            return 0
+        
+        if not self.running:
+            # Ohne laufende Pipeline (z.B. in Skripten) synchron schreiben
+            self._write_batch(events)
+            self.stats["accepted"] += len(events)
+            return len(events)
+        
+        accepted = 0
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+                accepted += 1
+            except asyncio.QueueFull:
+                self.stats["dropped"] += len(events) - accepted
+                break
+        self.stats["accepted"] += accepted
+        return accepted
+    
+    async def _writer_loop(self) -> None:
+        while True:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            await self._flush(batch)
+            if stopping:
+                return
+    
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_batch, batch)
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Fehler beim Schreiben eines Telemetrie-Batches: {e}")
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+    
+    async def _retention_loop(self) -> None:
+        config = TELEMETRY_CONFIG["file_storage"]
+        loop = asyncio.get_running_loop()
+        while True:
+            await loop.run_in_executor(
+                None, cleanup_old_telemetry_files,
+                config["directory"], config["max_files"], config.get("max_age_days")
+            )
+            await asyncio.sleep(self.retention_interval)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running
+        }
+
+
+telemetry_pipeline = TelemetryPipeline()
+
+
 # API-Handler
 def handle_telemetry_request(request):
     """
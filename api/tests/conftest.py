@@ -0,0 +1,16 @@
+"""
+Gemeinsame Einstellungen für die Tests unter api/
+"""
+import os
+import sys
+import tempfile
+
+# Wie in tests/conftest.py: Logs und Datenbanken in ein temporäres Verzeichnis
+os.environ.setdefault('BASE_DIR', tempfile.mkdtemp(prefix='nscale_api_tests_'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.core.config import Config  # noqa: E402
+
+# Einige API-Module legen beim Import ihre Datenbanken an
+Config.init_directories()
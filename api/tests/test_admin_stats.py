@@ -0,0 +1,34 @@
+"""
+Tests für die Systemstatistiken des Admin-Dashboards (api/admin_handler.py)
+"""
+import pytest
+
+from api import admin_handler
+
+
+def test_collector_is_not_created_at_import(monkeypatch):
+    monkeypatch.setattr(admin_handler, '_stats_collector', None)
+    stats = admin_handler.get_system_stats()
+    assert stats['total_users'] == 0
+    assert admin_handler._stats_collector is None
+
+
+def test_snapshot_never_collects_in_the_caller(monkeypatch):
+    collector = admin_handler.SystemStatsCollector()
+
+    def fail(*args, **kwargs):
+        pytest.fail("get_snapshot darf nicht selbst erfassen")
+
+    monkeypatch.setattr(collector, 'refresh', fail)
+    assert collector.get_snapshot()['active_model'] == 'unknown'
+
+
+def test_refresh_reports_no_fake_backup_time(monkeypatch):
+    monkeypatch.setattr(admin_handler, '_stats_collector', None)
+    collector = admin_handler.start_stats_collector()
+    assert admin_handler.start_stats_collector() is collector
+
+    collector.refresh(full=True)
+    stats = admin_handler.get_system_stats()
+    assert stats['last_backup_time'] is None
+    assert stats['cpu_count'] >= 1
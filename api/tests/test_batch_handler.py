@@ -0,0 +1,115 @@
+"""
+Tests für die Batch-Verarbeitung (api/batch_handler_fastapi.py, api/batch_handler_enhanced.py)
+"""
+import asyncio
+import json
+
+from api import batch_handler_fastapi
+from api.asgi_dispatch import BATCH_USER_STATE_KEY, apply_batch_auth
+from api.batch_handler_fastapi import BatchRequest, BatchResponse
+
+
+def _collect(stream) -> bytes:
+    async def run():
+        return b"".join([chunk async for chunk in stream])
+    return asyncio.run(run())
+
+
+def _response(request: BatchRequest, status: int) -> BatchResponse:
+    return BatchResponse(
+        id=request.id,
+        status=status,
+        success=200 <= status < 300,
+        error=None if status < 300 else f"HTTP error {status}",
+        data=None,
+        timestamp=0,
+        duration=0,
+        request=request
+    )
+
+
+def _stream_with_statuses(monkeypatch, statuses):
+    requests = [BatchRequest(id=str(i), endpoint=f"/api/x/{i}") for i in range(len(statuses))]
+
+    async def fake_iter_batch(reqs, base_url, auth=None):
+        for request, status in zip(reqs, statuses):
+            yield _response(request, status)
+
+    monkeypatch.setattr(batch_handler_fastapi.processor, "iter_batch", fake_iter_batch)
+    body = _collect(batch_handler_fastapi.stream_batch_response(requests, "http://test"))
+    return json.loads(body)
+
+
+def test_envelope_success_when_all_sub_requests_succeed(monkeypatch):
+    result = _stream_with_statuses(monkeypatch, [200, 201])
+    assert result["success"] is True
+    assert result["count"] == 2
+
+
+def test_envelope_reports_failed_sub_request(monkeypatch):
+    result = _stream_with_statuses(monkeypatch, [200, 404, 200])
+    assert result["success"] is False
+    assert [r["status"] for r in result["responses"]] == [200, 404, 200]
+
+
+def test_auth_shared_only_with_same_token():
+    auth = {"authorization": "Bearer abc", "user": {"user_id": 1}}
+
+    headers, state = apply_batch_auth({}, auth)
+    assert headers["Authorization"] == "Bearer abc"
+    assert state[BATCH_USER_STATE_KEY] == {"user_id": 1}
+
+    headers, state = apply_batch_auth({"authorization": "Bearer other"}, auth)
+    assert headers == {"authorization": "Bearer other"}
+    assert state == {}
+
+    assert apply_batch_auth({"X-Test": "1"}, None) == ({"X-Test": "1"}, {})
+
+
+def _run_stream(processor, requests):
+    async def run():
+        return [response async for response in processor.stream_batch(requests)]
+    return asyncio.run(run())
+
+
+def _dag_processor(monkeypatch, statuses=None):
+    from api.batch_handler_enhanced import BatchResponse as DagResponse, EnhancedBatchProcessor
+
+    processor = EnhancedBatchProcessor(enable_caching=False)
+    executed = []
+
+    async def fake_process(req, auth):
+        executed.append(req.id)
+        status = (statuses or {}).get(req.id, 200)
+        return DagResponse(id=req.id, status=status, success=status < 300, data={"id": req.id})
+
+    monkeypatch.setattr(processor, "_process_with_cache", fake_process)
+    return processor, executed
+
+
+def test_dag_chain_on_unknown_dependency_answers_every_request(monkeypatch):
+    """A -> B -> X (unbekannt), C unabhängig: jeder Request erhält genau ein Ergebnis"""
+    processor, executed = _dag_processor(monkeypatch)
+    responses = _run_stream(processor, [
+        {"id": "A", "endpoint": "/api/a", "method": "GET", "depends_on": ["B"]},
+        {"id": "B", "endpoint": "/api/b", "method": "GET", "depends_on": ["X"]},
+        {"id": "C", "endpoint": "/api/c", "method": "GET"},
+        {"id": "D", "endpoint": "/api/d", "method": "GET", "depends_on": ["A", "C"]},
+    ])
+
+    statuses = {r.id: r.status for r in responses}
+    assert len(responses) == 4
+    assert statuses == {"A": 424, "B": 400, "C": 200, "D": 424}
+    assert executed == ["C"]
+
+
+def test_dag_failed_dependency_skips_dependents(monkeypatch):
+    processor, executed = _dag_processor(monkeypatch, statuses={"B": 500})
+    responses = _run_stream(processor, [
+        {"id": "B", "endpoint": "/api/b", "method": "GET"},
+        {"id": "A", "endpoint": "/api/a/${B.data.id}", "method": "GET", "depends_on": ["B"]},
+        {"id": "C", "endpoint": "/api/c", "method": "GET", "depends_on": ["A"]},
+    ])
+
+    assert {r.id: r.status for r in responses} == {"B": 500, "A": 424, "C": 424}
+    assert executed == ["B"]
@@ -0,0 +1,114 @@
+"""
+Tests für die asynchrone Telemetrie-Pipeline (api/telemetry_handler.py)
+"""
+import asyncio
+import time
+
+from api.telemetry_handler import TelemetryPipeline
+
+
+def test_stop_drains_batch_that_is_being_written():
+    written = []
+
+    def slow_sink(batch):
+        time.sleep(0.2)
+        written.extend(batch)
+
+    async def run():
+        pipeline = TelemetryPipeline(sinks=[slow_sink])
+        pipeline.batch_size = 10
+        await pipeline.start()
+        pipeline.submit([{"eventType": "metric", "value": i} for i in range(25)])
+        # Dem Writer Zeit geben, den ersten Batch aufzunehmen und mit dem Schreiben zu beginnen
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+
+    assert sorted(event["value"] for event in written) == list(range(25))
+    assert pipeline.stats["written"] == 25
+    assert not pipeline.running
+
+
+def test_stop_writes_batch_that_is_still_being_collected():
+    written = []
+
+    async def run():
+        pipeline = TelemetryPipeline(sinks=[written.extend])
+        pipeline.flush_interval = 30
+        await pipeline.start()
+        pipeline.submit([{"eventType": "metric", "value": i} for i in range(5)])
+        # Writer hat die Ereignisse aus der Warteschlange genommen und wartet auf weitere
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+
+    asyncio.run(run())
+
+    assert [event["value"] for event in written] == list(range(5))
+
+
+def test_stop_without_events():
+    async def run():
+        pipeline = TelemetryPipeline(sinks=[])
+        await pipeline.start()
+        await pipeline.stop()
+        return pipeline
+
+    assert not asyncio.run(run()).running
+
+
+def test_events_submitted_during_and_after_stop_are_dropped():
+    written = []
+
+    def slow_sink(batch):
+        time.sleep(0.2)
+        written.extend(batch)
+
+    async def run():
+        pipeline = TelemetryPipeline(sinks=[slow_sink])
+        await pipeline.start()
+        pipeline.submit([{"eventType": "metric", "value": i} for i in range(3)])
+        await asyncio.sleep(0.05)
+
+        stopping = asyncio.create_task(pipeline.stop())
+        await asyncio.sleep(0)
+        during = pipeline.submit([{"eventType": "metric", "value": 10}])
+        await stopping
+
+        started = time.monotonic()
+        after = pipeline.submit([{"eventType": "metric", "value": 11}])
+        # Kein synchroner Schreibvorgang im Event-Loop
+        assert time.monotonic() - started < 0.1
+        return pipeline, during, after
+
+    pipeline, during, after = asyncio.run(run())
+
+    assert (during, after) == (0, 0)
+    assert [event["value"] for event in written] == [0, 1, 2]
+    assert pipeline.stats["dropped"] == 2
+    assert pipeline.stats["accepted"] == 3
+
+
+def test_restart_accepts_events_again():
+    written = []
+
+    async def run():
+        pipeline = TelemetryPipeline(sinks=[written.extend])
+        await pipeline.start()
+        await pipeline.stop()
+        await pipeline.start()
+        accepted = pipeline.submit([{"eventType": "metric", "value": 1}])
+        await pipeline.stop()
+        return accepted
+
+    assert asyncio.run(run()) == 1
+    assert [event["value"] for event in written] == [1]
+
+
+def test_pipeline_that_was_never_started_writes_synchronously():
+    written = []
+    pipeline = TelemetryPipeline(sinks=[written.extend])
+
+    assert pipeline.submit([{"eventType": "metric", "value": 1}]) == 1
+    assert [event["value"] for event in written] == [1]
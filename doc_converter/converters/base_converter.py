@@ -12,9 +12,16 @@ import yaml
 import shutil
 import re
 
+from ..processing.pipeline import MarkdownDocument
+from ..utils.asset_store import AssetStore
+
 class BaseConverter(ABC):
     """Abstrakte Basisklasse für alle Dokumentenkonverter"""
     
+    # Version des Konvertierungsergebnisses; geht in den Schlüssel des Konvertierungs-Caches ein
+    # und muss erhöht werden, wenn ein Converter für dieselbe Eingabe andere Ausgaben erzeugt
+    version = '2'
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialisiert den Basiskonverter.
@@ -29,8 +36,13 @@ class BaseConverter(ABC):
         self.templates_dir = self.config.get('templates_dir', 'doc_converter/templates')
         self.markdown_template_path = Path(self.templates_dir) / 'markdown_template.md'
         self.frontmatter_template_path = Path(self.templates_dir) / 'frontmatter_template.yml'
+        
+        # Gemeinsamer Bildspeicher; DocConverter ersetzt ihn durch eine Instanz für alle Converter
+        self.asset_store = AssetStore(Path(self.config.get('asset_store_dir', 'doc_converter/data/assets')),
+                                      link_mode=self.config.get('cache_link_mode', 'hardlink'))
     
-    def convert(self, source_path: str, target_dir: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def convert(self, source_path: str, target_dir: str, metadata: Optional[Dict[str, Any]] = None,
+                post_processor=None) -> Dict[str, Any]:
         """
         Konvertiert ein Dokument in Markdown.
         
@@ -38,6 +50,8 @@ class BaseConverter(ABC):
             source_path: Pfad zur Quelldatei
             target_dir: Zielverzeichnis für die konvertierte Datei
             metadata: Zusätzliche Metadaten für das Dokument
+            post_processor: Optionale PostProcessingPipeline; das Ergebnis durchläuft sie
+                im Speicher und wird danach einmalig geschrieben
             
         Returns:
             Dictionary mit Informationen über die Konvertierung
@@ -56,12 +70,32 @@ class BaseConverter(ABC):
             
             self.logger.info(f"Konvertiere {source_path} nach {target_path}")
             
-            # Dokument konvertieren (implementiert von den Unterklassen)
-            markdown_content, extracted_metadata = self._convert_to_markdown(source_path)
+            # Dokument konvertieren (implementiert von den Unterklassen); Bilder landen neben
+            # der Zieldatei, damit die relativen Verweise 'assets/...' auflösbar sind
+            markdown_content, extracted_metadata = self._convert_to_markdown(source_path, target_dir / 'assets')
             
             # Metadaten aktualisieren
             updated_metadata = {**metadata, **extracted_metadata}
             
+            if post_processor is not None:
+                # Nachbearbeitung im Speicher, Frontmatter liegt bereits als Dictionary vor
+                document = MarkdownDocument(target_path, self._frontmatter_data(updated_metadata),
+                                            markdown_content, always_frontmatter=True)
+                post_result = post_processor.run(document)
+                self._save_markdown_document(target_path, '', document.render())
+                
+                result = {
+                    'source': str(source_path),
+                    'target': str(target_path),
+                    'success': True,
+                    'metadata': updated_metadata,
+                    'changes': post_result['changes'],
+                    'post_processing': post_result['stages']
+                }
+                if 'validation' in post_result:
+                    result['validation'] = post_result['validation']
+                return result
+            
             # Frontmatter erstellen
             frontmatter = self._create_frontmatter(updated_metadata)
             
@@ -86,12 +120,13 @@ class BaseConverter(ABC):
             }
     
     @abstractmethod
-    def _convert_to_markdown(self, source_path: Path) -> tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path, assets_dir: Optional[Path] = None) -> tuple[str, Dict[str, Any]]:
         """
         Konvertiert die Quelldatei in Markdown. Muss von Unterklassen implementiert werden.
         
         Args:
             source_path: Pfad zur Quelldatei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -137,15 +172,15 @@ class BaseConverter(ABC):
         # Kürze auf maximal 100 Zeichen
         return filename[:100].lower()
     
-    def _create_frontmatter(self, metadata: Dict[str, Any]) -> str:
+    def _frontmatter_data(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Erstellt das YAML-Frontmatter für die Markdown-Datei.
+        Stellt die Frontmatter-Felder aus Vorlage und Metadaten zusammen.
         
         Args:
             metadata: Metadaten für das Frontmatter
             
         Returns:
-            YAML-Frontmatter als String
+            Dictionary mit skalaren Frontmatter-Werten
         """
         # Lade die Vorlage, falls vorhanden
         frontmatter_template = {}
@@ -162,8 +197,20 @@ class BaseConverter(ABC):
             if isinstance(value, (str, int, float, bool)) or value is None:
                 filtered_data[key] = value
         
+        return filtered_data
+    
+    def _create_frontmatter(self, metadata: Dict[str, Any]) -> str:
+        """
+        Erstellt das YAML-Frontmatter für die Markdown-Datei.
+        
+        Args:
+            metadata: Metadaten für das Frontmatter
+            
+        Returns:
+            YAML-Frontmatter als String
+        """
         # Konvertiere in YAML
-        yaml_str = yaml.dump(filtered_data, default_flow_style=False, allow_unicode=True)
+        yaml_str = yaml.dump(self._frontmatter_data(metadata), default_flow_style=False, allow_unicode=True)
         
         # Füge YAML-Trennzeichen hinzu
         return f"---\n{yaml_str}---\n\n"
@@ -177,9 +224,12 @@ class BaseConverter(ABC):
             frontmatter: YAML-Frontmatter
             markdown_content: Markdown-Inhalt
         """
-        with open(target_path, 'w', encoding='utf-8') as f:
+        # Über eine temporäre Datei schreiben, damit ein Hardlink aus dem Cache nicht mitverändert wird
+        tmp_path = target_path.with_name(f".{target_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             f.write(frontmatter)
             f.write(markdown_content)
+        os.replace(tmp_path, target_path)
         
         self.logger.info(f"Dokument erfolgreich gespeichert: {target_path}")
     
@@ -37,12 +37,14 @@ class DocxConverter(BaseConverter):
         self.extract_headers_footers = self.config.get('extract_headers_footers', False)
         self.use_mammoth = self.config.get('use_mammoth', True)  # Mammoth für bessere Konvertierung verwenden
     
-    def _convert_to_markdown(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path,
+                             assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine Word-Datei in Markdown.
         
         Args:
             source_path: Pfad zur Word-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -57,7 +59,7 @@ class DocxConverter(BaseConverter):
             # Mammoth-Ansatz (für bessere Struktur)
             if self.use_mammoth:
                 self.logger.info("Verwende Mammoth-Konverter für DOCX")
-                mammoth_markdown, mammoth_metadata = self._convert_with_mammoth(source_path)
+                mammoth_markdown, mammoth_metadata = self._convert_with_mammoth(source_path, assets_dir)
                 
                 # Aktualisiere Metadaten
                 metadata.update(mammoth_metadata)
@@ -72,7 +74,7 @@ class DocxConverter(BaseConverter):
             # Wenn Mammoth fehlschlägt oder nicht aktiviert ist, verwende python-docx
             if not markdown_content:
                 self.logger.info("Verwende python-docx Konverter")
-                docx_markdown, docx_metadata = self._convert_with_python_docx(source_path)
+                docx_markdown, docx_metadata = self._convert_with_python_docx(source_path, assets_dir)
                 
                 # Aktualisiere Metadaten
                 metadata.update(docx_metadata)
@@ -120,17 +122,19 @@ class DocxConverter(BaseConverter):
                     'error': f"Fehler: {str(e)}, Fallback-Fehler: {str(fallback_error)}"
                 }
     
-    def _convert_with_mammoth(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_with_mammoth(self, source_path: Path,
+                              assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine Word-Datei mit Mammoth.
         
         Args:
             source_path: Pfad zur Word-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder
             
         Returns:
             Tuple aus (markdown_content, metadata)
         """
-        assets_dir = source_path.parent / 'assets'
+        assets_dir = assets_dir or source_path.parent / 'assets'
         os.makedirs(assets_dir, exist_ok=True)
         
         # Bereite Bildkonvertierungsoptionen vor
@@ -139,42 +143,17 @@ class DocxConverter(BaseConverter):
         
         if self.extract_images:
             def handle_image(image, _):
-                with image.open() as image_bytes:
-                    # Generiere einen eindeutigen Dateinamen
-                    image_name = f"image_{len(extracted_images) + 1}"
-                    file_ext = '.png'  # Standardwert
-                    
-                    # Versuche das Bildformat zu bestimmen
-                    try:
-                        img = Image.open(image_bytes)
-                        file_ext = f".{img.format.lower()}" if img.format else '.png'
-                    except:
-                        pass
-                    
-                    image_filename = f"{image_name}{file_ext}"
-                    image_path = assets_dir / image_filename
-                    
-                    # Neupositionieren des Dateizeigers
-                    image_bytes.seek(0)
-                    
-                    # Lade und skaliere das Bild
-                    try:
-                        pil_img = Image.open(image_bytes)
-                        width, height = pil_img.size
-                        
-                        # Skaliere große Bilder herunter
-                        if width > self.max_image_size or height > self.max_image_size:
-                            scale_factor = min(self.max_image_size / width, self.max_image_size / height)
-                            new_width = int(width * scale_factor)
-                            new_height = int(height * scale_factor)
-                            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-                            
-                            pil_img.save(image_path)
-                        else:
-                            # Speichere das Originalbild
-                            with open(image_path, 'wb') as f:
-                                image_bytes.seek(0)
-                                f.write(image_bytes.read())
+                with image.open() as image_stream:
+                    image_bytes = image_stream.read()
+                
+                image_name = f"image_{len(extracted_images) + 1}"
+                
+                # Bekannte Bilder kommen ohne PIL aus dem Bildspeicher
+                try:
+                    asset = self.asset_store.add(image_bytes, assets_dir, prepare=self._prepare_image,
+                                                 variant=f"docx:{self.max_image_size}")
+                    if asset is not None:
+                        image_filename = asset['filename']
                         
                         # Speichere die Bildinformationen
                         extracted_images.append({
@@ -187,9 +166,9 @@ class DocxConverter(BaseConverter):
                             "src": f"assets/{image_filename}",
                             "alt": image_name
                         }
-                    except Exception as e:
-                        self.logger.warning(f"Fehler beim Verarbeiten des Bildes: {e}")
-                        return None
+                except Exception as e:
+                    self.logger.warning(f"Fehler beim Verarbeiten des Bildes: {e}")
+                return None
             
             image_handler = handle_image
         
@@ -238,12 +217,14 @@ class DocxConverter(BaseConverter):
         
         return markdown, metadata
     
-    def _convert_with_python_docx(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_with_python_docx(self, source_path: Path,
+                                  assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine Word-Datei mit python-docx.
         
         Args:
             source_path: Pfad zur Word-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -251,7 +232,7 @@ class DocxConverter(BaseConverter):
         doc = docx.Document(str(source_path))
         metadata = self._extract_docx_metadata(source_path)
         
-        assets_dir = source_path.parent / 'assets'
+        assets_dir = assets_dir or source_path.parent / 'assets'
         os.makedirs(assets_dir, exist_ok=True)
         
         # Sammle alle Inhalte
@@ -468,36 +449,22 @@ class DocxConverter(BaseConverter):
                     elif "bmp" in content_type:
                         image_ext = "bmp"
                     
-                    # Generiere Dateiname für das Bild
                     image_count += 1
-                    image_filename = f"image_{image_count}.{image_ext}"
-                    image_path = assets_dir / image_filename
                     
-                    # Lade und skaliere das Bild
+                    # Lade und skaliere das Bild (bekannte Bilder kommen aus dem Bildspeicher)
                     try:
-                        pil_img = Image.open(io.BytesIO(image_bytes))
-                        width, height = pil_img.size
-                        
-                        # Skaliere große Bilder herunter
-                        if width > self.max_image_size or height > self.max_image_size:
-                            scale_factor = min(self.max_image_size / width, self.max_image_size / height)
-                            new_width = int(width * scale_factor)
-                            new_height = int(height * scale_factor)
-                            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-                            
-                            # Speichere das skalierte Bild
-                            pil_img.save(image_path)
-                        else:
-                            # Speichere das Originalbild
-                            with open(image_path, 'wb') as f:
-                                f.write(image_bytes)
+                        asset = self.asset_store.add(image_bytes, assets_dir,
+                                                     prepare=lambda data: self._prepare_image(data, image_ext),
+                                                     variant=f"docx:{self.max_image_size}")
+                        if asset is None:
+                            continue
                         
                         # Füge Bildinformationen zur Liste hinzu
                         images.append({
-                            'path': f"assets/{image_filename}",
+                            'path': f"assets/{asset['filename']}",
                             'alt': f"Bild {image_count}",
-                            'width': width,
-                            'height': height
+                            'width': asset['width'],
+                            'height': asset['height']
                         })
                         
                     except Exception as e:
@@ -508,6 +475,39 @@ class DocxConverter(BaseConverter):
         
         return images
     
+    def _prepare_image(self, image_bytes: bytes, default_ext: str = 'png') -> Dict[str, Any]:
+        """
+        Bereitet ein Bild für den Bildspeicher vor: Format bestimmen und große Bilder herunterskalieren.
+        
+        Args:
+            image_bytes: Rohdaten des Bildes
+            default_ext: Dateiendung, wenn PIL das Format nicht bestimmen kann
+            
+        Returns:
+            Dictionary mit Bilddaten, Endung und Originalgröße
+        """
+        pil_img = Image.open(io.BytesIO(image_bytes))
+        image_format = pil_img.format
+        width, height = pil_img.size
+        
+        # Skaliere große Bilder herunter
+        if width > self.max_image_size or height > self.max_image_size:
+            scale_factor = min(self.max_image_size / width, self.max_image_size / height)
+            new_width = int(width * scale_factor)
+            new_height = int(height * scale_factor)
+            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
+            
+            buffer = io.BytesIO()
+            pil_img.save(buffer, format=image_format or 'PNG')
+            image_bytes = buffer.getvalue()
+        
+        return {
+            'data': image_bytes,
+            'ext': image_format.lower() if image_format else default_ext,
+            'width': width,
+            'height': height
+        }
+    
     def _extract_comments(self, doc) -> str:
         """
         Extrahiert Kommentare aus einem Word-Dokument.
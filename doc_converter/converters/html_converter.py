@@ -40,12 +40,14 @@ class HTMLConverter(BaseConverter):
             '.post-content', '.entry-content', '.article-content', '.page-content'
         ])
     
-    def _convert_to_markdown(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path,
+                             assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine HTML-Datei in Markdown.
         
         Args:
             source_path: Pfad zur HTML-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -156,7 +158,7 @@ class HTMLConverter(BaseConverter):
         
         # Verarbeite Bilder
         if self.extract_images:
-            self._process_images(soup, source_path)
+            self._process_images(soup, source_path, assets_dir)
         
         # Verarbeite Links
         if self.extract_links:
@@ -201,15 +203,16 @@ class HTMLConverter(BaseConverter):
         
         return None
     
-    def _process_images(self, soup: BeautifulSoup, source_path: Path) -> None:
+    def _process_images(self, soup: BeautifulSoup, source_path: Path, assets_dir: Optional[Path] = None) -> None:
         """
         Verarbeitet Bilder im HTML-Dokument.
         
         Args:
             soup: BeautifulSoup-Objekt des HTML-Dokuments
             source_path: Pfad zur HTML-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder
         """
-        assets_dir = source_path.parent / 'assets'
+        assets_dir = assets_dir or source_path.parent / 'assets'
         assets_dir.mkdir(parents=True, exist_ok=True)
         
         for i, img in enumerate(soup.find_all('img')):
@@ -231,15 +234,12 @@ class HTMLConverter(BaseConverter):
                         img_path = source_path.parent / img_src
                     
                     if img_path and img_path.exists():
-                        # Kopiere Bild ins Assets-Verzeichnis
-                        new_filename = f"image_{i+1}{img_path.suffix}"
-                        new_path = assets_dir / new_filename
-                        
+                        # Übernimm Bild über den Bildspeicher ins Assets-Verzeichnis
                         try:
-                            import shutil
-                            shutil.copy2(img_path, new_path)
+                            asset = self.asset_store.add(img_path.read_bytes(), assets_dir,
+                                                         ext=img_path.suffix.lstrip('.') or 'png', variant='html')
                             # Aktualisiere das src-Attribut
-                            img['src'] = f"assets/{new_filename}"
+                            img['src'] = f"assets/{asset['filename']}"
                         except Exception as e:
                             self.logger.warning(f"Fehler beim Kopieren des Bildes {img_src}: {e}")
                     else:
@@ -255,17 +255,13 @@ class HTMLConverter(BaseConverter):
                         if not img_ext:
                             img_ext = '.jpg'  # Standardwert
                         
-                        # Generiere Dateiname
-                        new_filename = f"image_{i+1}{img_ext}"
-                        new_path = assets_dir / new_filename
-                        
                         # Lade Bild herunter
                         response = requests.get(img_src, timeout=10)
                         if response.status_code == 200:
-                            with open(new_path, 'wb') as f:
-                                f.write(response.content)
+                            asset = self.asset_store.add(response.content, assets_dir,
+                                                         ext=img_ext.lstrip('.'), variant='html')
                             # Aktualisiere das src-Attribut
-                            img['src'] = f"assets/{new_filename}"
+                            img['src'] = f"assets/{asset['filename']}"
                         else:
                             # Bild konnte nicht heruntergeladen werden
                             img['src'] = f"[Nicht herunterladbares Bild: {img_src}]"
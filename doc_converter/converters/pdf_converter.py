@@ -5,6 +5,9 @@ Konvertiert PDF-Dokumente in strukturierte Markdown-Dateien.
 
 import os
 import re
+import threading
+import multiprocessing
+import concurrent.futures
 import fitz  # PyMuPDF
 from pathlib import Path
 import logging
@@ -17,6 +20,57 @@ import tabula
 
 from .base_converter import BaseConverter
 
+# Anzahl der Seiten, aus denen die Dokumentstruktur (Fonts, Ränder, Spalten) abgeleitet wird
+STRUCTURE_SAMPLE_PAGES = 10
+
+# Textextraktion ohne eingebettete Bilddaten: Bildblöcke werden beim Layout ignoriert,
+# so bleiben die Seitenwörterbücher klein genug für die Übergabe an Worker-Prozesse
+PAGE_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# Absatzgrenzen im Markdown einer Seite (für das Zusammenführen der Seiten)
+BLOCK_SEPARATOR_PATTERN = re.compile(r'\n[ \t]*\n')
+TABLE_DELIMITER_PATTERN = re.compile(r'^\|[\s:|-]+\|$')
+
+# Vorfilter der Tabellenerkennung: Mindestlänge einer Linie in Punkt und Toleranz für
+# "waagerecht/senkrecht" bzw. gleiche Zeilen- und Spaltenpositionen
+MIN_RULE_LENGTH = 15
+RULE_TOLERANCE = 1.5
+ALIGN_TOLERANCE = 3
+
+
+def _merge_segments(segments: List[Tuple[float, float, float]]) -> List[Tuple[float, float, float]]:
+    """
+    Fasst Liniensegmente auf gleicher Position zusammen, die aneinanderstoßen oder sich
+    überlappen (z.B. die Oberkanten benachbarter Zellrahmen).
+
+    Args:
+        segments: Segmente als (Position, Anfang, Ende)
+
+    Returns:
+        Zusammengefasste Segmente
+    """
+    merged: List[Tuple[float, float, float]] = []
+    group: List[Tuple[float, float, float]] = []
+    for segment in sorted(segments) + [None]:
+        if segment is not None and (not group or segment[0] - group[-1][0] <= RULE_TOLERANCE):
+            group.append(segment)
+            continue
+        # Gruppe gleicher Position abschließen: nach Anfang sortiert verbinden
+        position = sum(item[0] for item in group) / len(group) if group else 0
+        current = None
+        for _, start, end in sorted(group, key=lambda item: item[1]):
+            if current is not None and start <= current[1] + RULE_TOLERANCE:
+                current[1] = max(current[1], end)
+            else:
+                if current is not None:
+                    merged.append((position, current[0], current[1]))
+                current = [start, end]
+        if current is not None:
+            merged.append((position, current[0], current[1]))
+        group = [segment] if segment is not None else []
+    return merged
+
+
 class PDFConverter(BaseConverter):
     """Konvertiert PDF-Dokumente in strukturierte Markdown-Dateien"""
     
@@ -38,13 +92,22 @@ class PDFConverter(BaseConverter):
         self.min_table_columns = self.config.get('min_table_columns', 2)
         self.ocr_enabled = self.config.get('ocr_enabled', False)  # OCR-Unterstützung (erfordert Tesseract)
         self.table_confidence_threshold = self.config.get('table_confidence_threshold', 0.6)
+        
+        # Seitenparallele Verarbeitung großer PDFs in Worker-Prozessen
+        self.parallel_pages = self.config.get('parallel_pages', True)
+        self.page_workers = self.config.get('page_workers', 0) or os.cpu_count() or 1
+        self.min_pages_for_parallel = self.config.get('min_pages_for_parallel', 24)
+        self.pages_per_task = max(1, self.config.get('pages_per_task', 8))
+        self.worker_start_method = self.config.get('worker_start_method')
     
-    def _convert_to_markdown(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path,
+                             assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine PDF-Datei in Markdown.
         
         Args:
             source_path: Pfad zur PDF-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -56,18 +119,25 @@ class PDFConverter(BaseConverter):
             # Metadaten extrahieren
             metadata = self._extract_metadata(pdf_doc)
             
-            # Struktur des Dokuments analysieren
-            doc_structure = self._analyze_document_structure(pdf_doc)
+            # Struktur des Dokuments analysieren; die dabei extrahierten Seitenwörterbücher
+            # werden bei der Seitenverarbeitung wiederverwendet
+            page_dicts: Dict[int, Dict[str, Any]] = {}
+            doc_structure = self._analyze_document_structure(pdf_doc, page_dicts)
             
             # Inhaltsverzeichnis extrahieren (falls vorhanden)
             toc = pdf_doc.get_toc()
             
             # Assets-Verzeichnis für Bilder
-            assets_dir = source_path.parent / 'assets'
+            assets_dir = assets_dir or source_path.parent / 'assets'
             os.makedirs(assets_dir, exist_ok=True)
             
             # Extrahiere und konvertiere Seiten
-            markdown_content = self._process_pages(pdf_doc, doc_structure, assets_dir)
+            if self._use_parallel_pages(len(pdf_doc)):
+                page_markdowns = self._process_pages_parallel(source_path, len(pdf_doc), doc_structure,
+                                                              assets_dir, page_dicts)
+                markdown_content = self._merge_pages(page_markdowns)
+            else:
+                markdown_content = self._process_pages(pdf_doc, doc_structure, assets_dir, page_dicts)
             
             # Füge Inhaltsverzeichnis hinzu, wenn vorhanden
             if toc and len(toc) > 0:
@@ -107,16 +177,34 @@ class PDFConverter(BaseConverter):
         
         return metadata
     
-    def _analyze_document_structure(self, pdf_doc: fitz.Document) -> Dict[str, Any]:
+    def _page_dict(self, page: fitz.Page) -> Dict[str, Any]:
+        """
+        Extrahiert das Seitenwörterbuch (Blöcke, Zeilen, Spans) ohne Bilddaten.
+        
+        Args:
+            page: PyMuPDF-Seite
+            
+        Returns:
+            PyMuPDF-Seitenwörterbuch
+        """
+        return page.get_text("dict", flags=PAGE_DICT_FLAGS)
+    
+    def _analyze_document_structure(self, pdf_doc: fitz.Document,
+                                    page_dicts: Optional[Dict[int, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Analysiert die Struktur des PDF-Dokuments für eine bessere Konvertierung.
         
         Args:
             pdf_doc: PyMuPDF-Dokument
+            page_dicts: Optionaler Cache der Seitenwörterbücher; fehlende Seiten werden
+                extrahiert und eingetragen, damit die Seitenverarbeitung sie wiederverwenden kann
             
         Returns:
             Dictionary mit Strukturinformationen
         """
+        if page_dicts is None:
+            page_dicts = {}
+        
         structure = {
             'font_stats': {},
             'heading_candidates': [],
@@ -125,14 +213,15 @@ class PDFConverter(BaseConverter):
             'column_layout': []
         }
         
-        # Analysiere die ersten 10 Seiten (oder alle, wenn weniger)
-        sample_pages = min(10, len(pdf_doc))
+        # Analysiere die ersten Seiten (oder alle, wenn weniger)
+        sample_pages = min(STRUCTURE_SAMPLE_PAGES, len(pdf_doc))
         
         # Sammle Fontstatistiken
         all_fonts = {}
         for page_num in range(sample_pages):
-            page = pdf_doc[page_num]
-            page_dict = page.get_text("dict")
+            if page_num not in page_dicts:
+                page_dicts[page_num] = self._page_dict(pdf_doc[page_num])
+            page_dict = page_dicts[page_num]
             
             # Seitenränder erkennen
             if 'width' in page_dict and 'height' in page_dict:
@@ -312,59 +401,223 @@ class PDFConverter(BaseConverter):
         else:
             return len(gaps) + 1
     
-    def _process_pages(self, pdf_doc: fitz.Document, doc_structure: Dict[str, Any], assets_dir: Path) -> str:
+    def _process_pages(self, pdf_doc: fitz.Document, doc_structure: Dict[str, Any], assets_dir: Path,
+                       page_dicts: Optional[Dict[int, Dict[str, Any]]] = None) -> str:
         """
-        Verarbeitet alle Seiten des PDF-Dokuments und konvertiert sie in Markdown.
+        Verarbeitet alle Seiten des PDF-Dokuments nacheinander und konvertiert sie in Markdown.
         
         Args:
             pdf_doc: PyMuPDF-Dokument
             doc_structure: Dokumentstruktur
             assets_dir: Verzeichnis für extrahierte Assets
+            page_dicts: Bereits extrahierte Seitenwörterbücher (aus der Strukturanalyse)
             
         Returns:
             Markdown-Inhalt
         """
-        markdown_parts = []
+        page_dicts = page_dicts if page_dicts is not None else {}
         processed_tables = set()  # Um doppelte Tabellen zu vermeiden
-        image_count = 0
-        
-        for page_num in range(len(pdf_doc)):
-            self.logger.info(f"Verarbeite Seite {page_num+1}/{len(pdf_doc)}")
-            page = pdf_doc[page_num]
-            
-            # Text extrahieren
-            page_text = page.get_text("dict")
-            
-            # Bestimme Layout-Typ für diese Seite
-            layout_type = 'single_column'
-            if page_num < len(doc_structure['column_layout']):
-                columns = doc_structure['column_layout'][page_num]['columns']
-                if columns == 2:
-                    layout_type = 'double_column'
-                elif columns > 2:
-                    layout_type = 'multi_column'
-            
-            # Tabellen erkennen und extrahieren (falls aktiviert)
-            tables = []
-            if self.detect_tables:
-                tables = self._extract_tables(page, page_num, pdf_doc.name, processed_tables)
-            
-            # Bilder extrahieren (falls aktiviert)
-            images = []
-            if self.extract_images:
-                images = self._extract_images(page, page_num, assets_dir, image_count)
-                image_count += len(images)
-            
-            # Verarbeite Text basierend auf Layout
-            if layout_type == 'single_column':
-                markdown_text = self._process_single_column(page_text, doc_structure, tables, images)
-            else:
-                markdown_text = self._process_multi_column(page_text, doc_structure, tables, images, columns)
-            
-            markdown_parts.append(markdown_text)
+        
+        # Abschnittsweise wie im parallelen Modus, damit die Ergebnisse übereinstimmen
+        markdown_parts = []
+        for start in range(0, len(pdf_doc), self.pages_per_task):
+            page_nums = list(range(start, min(start + self.pages_per_task, len(pdf_doc))))
+            markdown_parts.extend(self._process_page_chunk(pdf_doc, page_nums, doc_structure, assets_dir,
+                                                           processed_tables, page_dicts))
         
         # Kombiniere alle Seitenteile
-        return "\n\n".join(markdown_parts)
+        return self._merge_pages(markdown_parts)
+    
+    def _process_page_chunk(self, pdf_doc: fitz.Document, page_nums: List[int], doc_structure: Dict[str, Any],
+                            assets_dir: Path, processed_tables: Set[Tuple[int, Tuple[float, float, float, float]]],
+                            page_dicts: Dict[int, Dict[str, Any]]) -> List[str]:
+        """
+        Konvertiert einen Abschnitt zusammenhängender Seiten.
+        
+        Die Tabellenerkennung läuft vorab gesammelt für den ganzen Abschnitt: ein Vorfilter
+        wählt die Seiten aus, die Tabellen enthalten können, und Camelot wird je Modus
+        einmal für alle diese Seiten aufgerufen.
+        
+        Args:
+            pdf_doc: PyMuPDF-Dokument
+            page_nums: Seitennummern des Abschnitts (0-basiert)
+            doc_structure: Dokumentstruktur
+            assets_dir: Verzeichnis für extrahierte Assets
+            processed_tables: Set von bereits verarbeiteten Tabellen
+            page_dicts: Cache der Seitenwörterbücher; verarbeitete Seiten werden entfernt
+            
+        Returns:
+            Markdown-Text je Seite
+        """
+        for page_num in page_nums:
+            if page_num not in page_dicts:
+                page_dicts[page_num] = self._page_dict(pdf_doc[page_num])
+        
+        detected_tables = {}
+        if self.detect_tables:
+            detected_tables = self._detect_tables(pdf_doc, page_nums, page_dicts)
+        
+        return [
+            self._process_page(pdf_doc, page_num, doc_structure, assets_dir, processed_tables,
+                               page_dicts.pop(page_num), detected_tables.get(page_num))
+            for page_num in page_nums
+        ]
+    
+    def _process_page(self, pdf_doc: fitz.Document, page_num: int, doc_structure: Dict[str, Any],
+                      assets_dir: Path, processed_tables: Set[Tuple[int, Tuple[float, float, float, float]]],
+                      page_text: Optional[Dict[str, Any]] = None,
+                      detected_tables: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Konvertiert eine einzelne Seite in Markdown.
+        
+        Args:
+            pdf_doc: PyMuPDF-Dokument
+            page_num: Seitennummer (0-basiert)
+            doc_structure: Dokumentstruktur
+            assets_dir: Verzeichnis für extrahierte Assets
+            processed_tables: Set von bereits verarbeiteten Tabellen
+            page_text: Bereits extrahiertes Seitenwörterbuch (sonst wird es hier extrahiert)
+            detected_tables: Vorab erkannte Camelot-Tabellen der Seite (None = laut Vorfilter
+                keine Tabellenseite)
+            
+        Returns:
+            Markdown-Text der Seite
+        """
+        self.logger.info(f"Verarbeite Seite {page_num+1}/{len(pdf_doc)}")
+        page = pdf_doc[page_num]
+        
+        # Text extrahieren
+        if page_text is None:
+            page_text = self._page_dict(page)
+        
+        # Bestimme Layout-Typ für diese Seite
+        layout_type = 'single_column'
+        if page_num < len(doc_structure['column_layout']):
+            columns = doc_structure['column_layout'][page_num]['columns']
+            if columns == 2:
+                layout_type = 'double_column'
+            elif columns > 2:
+                layout_type = 'multi_column'
+        
+        # Tabellen erkennen und extrahieren (falls aktiviert)
+        tables = []
+        if self.detect_tables:
+            tables = self._extract_tables(page, page_num, pdf_doc.name, processed_tables, detected_tables)
+        
+        # Bilder extrahieren (falls aktiviert); die Nummerierung beginnt je Seite neu,
+        # damit Seiten unabhängig voneinander verarbeitet werden können
+        images = []
+        if self.extract_images:
+            images = self._extract_images(page, page_num, assets_dir, 0)
+        
+        # Verarbeite Text basierend auf Layout
+        if layout_type == 'single_column':
+            return self._process_single_column(page_text, doc_structure, tables, images)
+        return self._process_multi_column(page_text, doc_structure, tables, images, columns)
+    
+    def _use_parallel_pages(self, page_count: int) -> bool:
+        """
+        Prüft, ob die Seiten in Worker-Prozessen verarbeitet werden sollen.
+        
+        Nur im Hauptthread eines Prozesses, der nicht selbst Worker ist: in Worker-Prozessen
+        der Stapelkonvertierung (Daemon-Prozess) ist das nicht möglich, und in Threads
+        (Thread-Backend der Stapelkonvertierung, Jobs der Web-Anwendung) laufen mehrere
+        Konvertierungen gleichzeitig, von denen jede einen eigenen Pool mit page_workers
+        Prozessen starten würde. In beiden Fällen sind die Kerne bereits ausgelastet.
+        """
+        return (self.parallel_pages and self.page_workers > 1
+                and page_count >= self.min_pages_for_parallel
+                and not multiprocessing.current_process().daemon
+                and threading.current_thread() is threading.main_thread())
+    
+    def _process_pages_parallel(self, source_path: Path, page_count: int, doc_structure: Dict[str, Any],
+                                assets_dir: Path, page_dicts: Dict[int, Dict[str, Any]]) -> List[str]:
+        """
+        Verarbeitet die Seiten in Worker-Prozessen, die das Dokument jeweils selbst öffnen.
+        
+        Die Seiten werden in zusammenhängende Abschnitte aufgeteilt; Seitenwörterbücher
+        aus der Strukturanalyse werden mitgegeben statt erneut extrahiert.
+        
+        Args:
+            source_path: Pfad zur PDF-Datei
+            page_count: Anzahl der Seiten
+            doc_structure: Dokumentstruktur
+            assets_dir: Verzeichnis für extrahierte Assets
+            page_dicts: Bereits extrahierte Seitenwörterbücher
+            
+        Returns:
+            Markdown-Text je Seite in Seitenreihenfolge
+        """
+        chunks = [list(range(start, min(start + self.pages_per_task, page_count)))
+                  for start in range(0, page_count, self.pages_per_task)]
+        workers = min(self.page_workers, len(chunks))
+        self.logger.info(f"Verarbeite {page_count} Seiten in {len(chunks)} Abschnitten mit {workers} Prozessen")
+        
+        context = multiprocessing.get_context(self.worker_start_method)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                                    initializer=_init_page_worker,
+                                                    initargs=(self.config, str(source_path))) as executor:
+            futures = [
+                executor.submit(_process_page_range, chunk, doc_structure, assets_dir,
+                                {page_num: page_dicts[page_num] for page_num in chunk if page_num in page_dicts})
+                for chunk in chunks
+            ]
+            page_markdowns = []
+            for future in futures:
+                markdowns, asset_stats = future.result()
+                page_markdowns.extend(markdowns)
+                self.asset_store.merge_stats(asset_stats)
+            return page_markdowns
+    
+    def _merge_pages(self, page_markdowns: List[str]) -> str:
+        """
+        Führt die Seiten in Reihenfolge zusammen und bereinigt seitenübergreifende Tabellen.
+        
+        Wiederholte Kopf- und Fußtabellen entfallen: eine Tabelle, die als erster (bzw. letzter)
+        Block einer Seite identisch mit dem ersten (bzw. letzten) Block der vorherigen Seite
+        ist. Gleiche Tabellen an anderer Stelle bleiben erhalten. Beginnt eine Seite mit einer
+        Tabelle, deren Kopfzeile der Tabelle am Ende der vorherigen Seite entspricht, werden
+        ihre Datenzeilen an diese Tabelle angehängt.
+        
+        Args:
+            page_markdowns: Markdown-Text je Seite in Seitenreihenfolge
+            
+        Returns:
+            Markdown-Inhalt des Dokuments
+        """
+        parts: List[str] = []
+        previous_is_table = False
+        previous_blocks: List[str] = []
+        
+        for page_markdown in page_markdowns:
+            blocks = [block.strip('\n') for block in BLOCK_SEPARATOR_PATTERN.split(page_markdown)]
+            blocks = [block for block in blocks if block.strip()]
+            
+            page_start = True
+            for index, block in enumerate(blocks):
+                lines = block.split('\n')
+                is_table = (len(lines) >= 3 and TABLE_DELIMITER_PATTERN.match(lines[1]) is not None
+                            and all(line.startswith('|') for line in lines))
+                
+                if is_table:
+                    if previous_blocks and ((index == 0 and block == previous_blocks[0])
+                                            or (index == len(blocks) - 1 and block == previous_blocks[-1])):
+                        page_start = False
+                        continue
+                    
+                    # Fortsetzung einer Tabelle von der vorherigen Seite
+                    if page_start and previous_is_table and parts[-1].split('\n', 1)[0] == lines[0]:
+                        parts[-1] += '\n' + '\n'.join(lines[2:])
+                        page_start = False
+                        continue
+                
+                parts.append(block)
+                previous_is_table = is_table
+                page_start = False
+            
+            previous_blocks = blocks
+        
+        return "\n\n".join(parts)
     
     def _process_single_column(self, page_text: Dict[str, Any], doc_structure: Dict[str, Any], 
                               tables: List[Dict[str, Any]], images: List[Dict[str, Any]]) -> str:
@@ -565,8 +818,201 @@ class PDFConverter(BaseConverter):
         
         return "\n\n".join(result)
     
+    def _table_candidate(self, page: fitz.Page, page_dict: Dict[str, Any]) -> Optional[str]:
+        """
+        Schneller Vorfilter: prüft anhand von Linien und Textgeometrie, ob die Seite
+        eine Tabelle enthalten kann.
+        
+        Args:
+            page: PyMuPDF-Seite
+            page_dict: PyMuPDF-Seitenwörterbuch
+            
+        Returns:
+            'lattice' bei Tabellenlinien, 'stream' bei spaltenweise ausgerichtetem Text,
+            sonst None
+        """
+        # Tabellen mit Linien: ein Raster aus mindestens drei waagerechten und drei
+        # senkrechten Linien, die sich kreuzen (Seitenrahmen oder Farbbalken reichen nicht)
+        if self._has_ruling_grid(page):
+            return 'lattice'
+        
+        # Tabellen ohne Linien: Textsegmente (durch große Lücken getrennte Spans), die in
+        # mehreren Zeilen auf derselben Höhe nebeneinander und an denselben x-Positionen stehen
+        segments = []
+        for block in page_dict.get('blocks', []):
+            for line in block.get('lines', []):
+                previous = None
+                for span in line.get('spans', []):
+                    if not span['text'].strip():
+                        continue
+                    x0, _, x1, y1 = span['bbox']
+                    if previous is None or x0 - previous[1] > span['size'] * 1.5:
+                        previous = [x0, x1, y1]
+                        segments.append(previous)
+                    else:
+                        previous[1] = x1
+        
+        segments.sort(key=lambda segment: segment[2])
+        rows = []
+        for x0, x1, y1 in segments:
+            if rows and y1 - rows[-1][0] <= ALIGN_TOLERANCE:
+                rows[-1][1].append((x0, x1))
+            else:
+                rows.append((y1, [(x0, x1)]))
+        
+        table_rows = [cells for _, cells in rows if len(cells) >= self.min_table_columns]
+        if len(table_rows) < self.min_table_rows:
+            return None
+        
+        # Linke oder rechte Kanten (rechtsbündige Zahlen), die in mehreren Zeilen übereinstimmen
+        edges: Dict[Tuple[str, int], int] = {}
+        for cells in table_rows:
+            row_edges = {('left', round(x0 / ALIGN_TOLERANCE)) for x0, _ in cells}
+            row_edges.update(('right', round(x1 / ALIGN_TOLERANCE)) for _, x1 in cells)
+            for edge in row_edges:
+                edges[edge] = edges.get(edge, 0) + 1
+        aligned = sum(1 for count in edges.values() if count >= self.min_table_rows)
+        return 'stream' if aligned >= self.min_table_columns else None
+    
+    @staticmethod
+    def _has_ruling_grid(page: fitz.Page) -> bool:
+        """
+        Prüft, ob die Linien und Rechtecke der Seite ein Tabellenraster bilden.
+        
+        Linien, dünne Rechtecke und die Kanten von Zellrahmen werden zu waagerechten und
+        senkrechten Segmenten zusammengefasst. Ein Raster liegt vor, wenn eine waagerechte
+        Linie an mindestens drei verschiedenen Stellen von senkrechten Linien gekreuzt wird
+        und umgekehrt, also mindestens zwei Zeilen und zwei Spalten begrenzt sind.
+        
+        Args:
+            page: PyMuPDF-Seite
+            
+        Returns:
+            True, wenn ein Raster gefunden wurde
+        """
+        # Segmente als (Position, Anfang, Ende): waagerecht (y, x0, x1), senkrecht (x, y0, y1)
+        horizontal: List[Tuple[float, float, float]] = []
+        vertical: List[Tuple[float, float, float]] = []
+        for drawing in page.get_drawings():
+            for item in drawing['items']:
+                if item[0] == 'l':
+                    start, end = item[1], item[2]
+                    if abs(start.y - end.y) <= RULE_TOLERANCE and abs(start.x - end.x) >= MIN_RULE_LENGTH:
+                        horizontal.append(((start.y + end.y) / 2, min(start.x, end.x), max(start.x, end.x)))
+                    elif abs(start.x - end.x) <= RULE_TOLERANCE and abs(start.y - end.y) >= MIN_RULE_LENGTH:
+                        vertical.append(((start.x + end.x) / 2, min(start.y, end.y), max(start.y, end.y)))
+                elif item[0] == 're':
+                    rect = item[1]
+                    if rect.height <= RULE_TOLERANCE and rect.width >= MIN_RULE_LENGTH:
+                        horizontal.append(((rect.y0 + rect.y1) / 2, rect.x0, rect.x1))
+                    elif rect.width <= RULE_TOLERANCE and rect.height >= MIN_RULE_LENGTH:
+                        vertical.append(((rect.x0 + rect.x1) / 2, rect.y0, rect.y1))
+                    elif rect.width >= MIN_RULE_LENGTH and rect.height >= RULE_TOLERANCE * 4:
+                        # Zellrahmen: alle vier Kanten
+                        horizontal += [(rect.y0, rect.x0, rect.x1), (rect.y1, rect.x0, rect.x1)]
+                        vertical += [(rect.x0, rect.y0, rect.y1), (rect.x1, rect.y0, rect.y1)]
+        
+        if len(horizontal) < 3 or len(vertical) < 3:
+            return False
+        horizontal = _merge_segments(horizontal)
+        vertical = _merge_segments(vertical)
+        
+        def crossed(lines, others) -> bool:
+            for position, start, end in lines:
+                hits = {round(other[0] / ALIGN_TOLERANCE) for other in others
+                        if start - ALIGN_TOLERANCE <= other[0] <= end + ALIGN_TOLERANCE
+                        and other[1] - ALIGN_TOLERANCE <= position <= other[2] + ALIGN_TOLERANCE}
+                if len(hits) >= 3:
+                    return True
+            return False
+        
+        return crossed(horizontal, vertical) and crossed(vertical, horizontal)
+    
+    def _detect_tables(self, pdf_doc: fitz.Document, page_nums: List[int],
+                       page_dicts: Dict[int, Dict[str, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Erkennt Tabellen für mehrere Seiten mit je einem Camelot-Aufruf pro Modus.
+        
+        Nur Seiten, die der Vorfilter als mögliche Tabellenseiten meldet, werden an Camelot
+        übergeben: Seiten mit Linien zuerst im Lattice-Modus, danach alle Kandidaten ohne
+        Lattice-Treffer im Stream-Modus.
+        
+        Args:
+            pdf_doc: PyMuPDF-Dokument
+            page_nums: Seitennummern (0-basiert)
+            page_dicts: Seitenwörterbücher der Seiten
+            
+        Returns:
+            Dictionary Seitennummer -> erkannte Camelot-Tabellen; enthält genau die
+            Kandidatenseiten (ggf. mit leerer Liste)
+        """
+        candidates = {}
+        for page_num in page_nums:
+            kind = self._table_candidate(pdf_doc[page_num], page_dicts[page_num])
+            if kind:
+                candidates[page_num] = kind
+        
+        detected: Dict[int, List[Dict[str, Any]]] = {page_num: [] for page_num in candidates}
+        if not candidates or self.table_detection_method not in ('camelot', 'hybrid'):
+            return detected
+        
+        lattice_pages = [page_num for page_num, kind in candidates.items() if kind == 'lattice']
+        detected.update(self._read_camelot_tables(pdf_doc.name, lattice_pages, 'lattice'))
+        
+        stream_pages = [page_num for page_num in candidates if not detected[page_num]]
+        detected.update(self._read_camelot_tables(pdf_doc.name, stream_pages, 'stream'))
+        
+        self.logger.debug(f"Tabellen-Vorfilter: {len(candidates)}/{len(page_nums)} Seiten an Camelot übergeben "
+                          f"({len(lattice_pages)} Lattice, {len(stream_pages)} Stream)")
+        return detected
+    
+    def _read_camelot_tables(self, pdf_path: str, page_nums: List[int],
+                             flavor: str) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Ruft Camelot einmal für alle angegebenen Seiten auf.
+        
+        Schlägt der gemeinsame Aufruf fehl, werden die Seiten einzeln wiederholt, damit
+        eine fehlerhafte Seite die Erkennung der übrigen nicht verhindert.
+        
+        Args:
+            pdf_path: Pfad zur PDF-Datei
+            page_nums: Seitennummern (0-basiert)
+            flavor: Camelot-Modus ('lattice' oder 'stream')
+            
+        Returns:
+            Dictionary Seitennummer -> Tabellen (nur Seiten mit Treffern)
+        """
+        if not page_nums:
+            return {}
+        
+        try:
+            camelot_tables = camelot.read_pdf(
+                pdf_path,
+                pages=','.join(str(page_num + 1) for page_num in page_nums),  # 1-basierte Seitenzahlen
+                flavor=flavor
+            )
+        except Exception as e:
+            if len(page_nums) == 1:
+                self.logger.warning(f"Fehler bei Camelot-Tabellenerkennung ({flavor}) auf Seite {page_nums[0]+1}: {e}")
+                return {}
+            self.logger.warning(f"Fehler bei Camelot-Tabellenerkennung ({flavor}), wiederhole seitenweise: {e}")
+            tables = {}
+            for page_num in page_nums:
+                tables.update(self._read_camelot_tables(pdf_path, [page_num], flavor))
+            return tables
+        
+        tables: Dict[int, List[Dict[str, Any]]] = {}
+        for table in camelot_tables:
+            tables.setdefault(int(table.page) - 1, []).append({
+                'bbox': table._bbox,
+                'accuracy': table.accuracy,
+                'df': table.df
+            })
+        return tables
+    
     def _extract_tables(self, page: fitz.Page, page_num: int, pdf_path: str, 
-                       processed_tables: Set[Tuple[int, Tuple[float, float, float, float]]]) -> List[Dict[str, Any]]:
+                       processed_tables: Set[Tuple[int, Tuple[float, float, float, float]]],
+                       detected_tables: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """
         Extrahiert Tabellen von einer PDF-Seite.
         
@@ -575,62 +1021,41 @@ class PDFConverter(BaseConverter):
             page_num: Seitennummer
             pdf_path: Pfad zur PDF-Datei
             processed_tables: Set von bereits verarbeiteten Tabellen (zur Vermeidung von Duplikaten)
+            detected_tables: Vorab erkannte Camelot-Tabellen (siehe _detect_tables); None, wenn
+                die Seite laut Vorfilter keine Tabelle enthält (Camelot und Tabula entfallen)
             
         Returns:
             Liste der erkannten Tabellen mit Markdown-Darstellung
         """
         tables = []
+        candidate = detected_tables is not None
         
         try:
-            # Bestimme die zu verwendende Tabellenerkennung
-            if self.table_detection_method == 'camelot' or self.table_detection_method == 'hybrid':
-                try:
-                    # Versuche Tabellen mit Camelot zu erkennen
-                    camelot_tables = camelot.read_pdf(
-                        pdf_path, 
-                        pages=str(page_num + 1),  # Camelot verwendet 1-basierte Seitenzahlen
-                        flavor='lattice'  # Für Tabellen mit Linien
-                    )
-                    
-                    if len(camelot_tables) == 0:
-                        # Versuche mit Stream-Flavor (für Tabellen ohne Linien)
-                        camelot_tables = camelot.read_pdf(
-                            pdf_path,
-                            pages=str(page_num + 1),
-                            flavor='stream'
-                        )
-                    
-                    # Verarbeite die erkannten Tabellen
-                    for i, table in enumerate(camelot_tables):
-                        # Prüfe Qualität der Tabelle
-                        if table.accuracy < self.table_confidence_threshold * 100:
-                            continue
-                        
-                        # Hole die Bounding Box
-                        table_bbox = table._bbox
-                        
-                        # Prüfe, ob die Tabelle bereits verarbeitet wurde
-                        table_key = (page_num, table_bbox)
-                        if table_key in processed_tables:
-                            continue
-                        
-                        processed_tables.add(table_key)
-                        
-                        # Konvertiere die Tabelle in Markdown
-                        df = table.df
-                        markdown_table = self._dataframe_to_markdown(df)
-                        
-                        tables.append({
-                            'page': page_num,
-                            'bbox': table_bbox,
-                            'markdown': markdown_table,
-                            'method': 'camelot'
-                        })
+            # Vorab erkannte Camelot-Tabellen übernehmen
+            for table in detected_tables or []:
+                # Prüfe Qualität und Größe der Tabelle
+                if table['accuracy'] < self.table_confidence_threshold * 100:
+                    continue
                 
-                except Exception as e:
-                    self.logger.warning(f"Fehler bei Camelot-Tabellenerkennung: {e}")
+                df = table['df']
+                if len(df) < self.min_table_rows or len(df.columns) < self.min_table_columns:
+                    continue
+                
+                # Prüfe, ob die Tabelle bereits verarbeitet wurde
+                table_key = (page_num, table['bbox'])
+                if table_key in processed_tables:
+                    continue
+                
+                processed_tables.add(table_key)
+                
+                tables.append({
+                    'page': page_num,
+                    'bbox': table['bbox'],
+                    'markdown': self._dataframe_to_markdown(df),
+                    'method': 'camelot'
+                })
             
-            if (self.table_detection_method == 'tabula' or self.table_detection_method == 'hybrid') and not tables:
+            if candidate and (self.table_detection_method == 'tabula' or self.table_detection_method == 'hybrid') and not tables:
                 try:
                     # Versuche Tabellen mit Tabula zu erkennen
                     tabula_tables = tabula.read_pdf(
@@ -823,35 +1248,17 @@ class PDFConverter(BaseConverter):
                     if not base_image:
                         continue
                     
-                    image_bytes = base_image["image"]
                     image_ext = base_image["ext"]
                     
-                    # Ignoriere sehr kleine Bilder (wahrscheinlich Icons oder Hintergrundgrafiken)
-                    pil_img = Image.open(io.BytesIO(image_bytes))
-                    width, height = pil_img.size
-                    
-                    if width < 50 or height < 50:
+                    # Bekannte Bilder (z.B. Logos auf jeder Seite) kommen ohne PIL aus dem Bildspeicher
+                    asset = self.asset_store.add(base_image["image"], assets_dir,
+                                                 prepare=lambda data: self._prepare_image(data, image_ext),
+                                                 variant=f"pdf:{self.max_image_size}")
+                    if asset is None:
                         continue
                     
-                    # Skaliere große Bilder herunter
-                    if width > self.max_image_size or height > self.max_image_size:
-                        scale_factor = min(self.max_image_size / width, self.max_image_size / height)
-                        new_width = int(width * scale_factor)
-                        new_height = int(height * scale_factor)
-                        pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-                        
-                        # Konvertiere zurück zu Bytes
-                        buffer = io.BytesIO()
-                        pil_img.save(buffer, format=image_ext.upper())
-                        image_bytes = buffer.getvalue()
-                    
-                    # Generiere Dateiname für das Bild
-                    image_filename = f"image_{page_num+1}_{image_count+1}.{image_ext}"
-                    image_path = assets_dir / image_filename
-                    
-                    # Speichere das Bild
-                    with open(image_path, "wb") as f:
-                        f.write(image_bytes)
+                    image_filename = asset['filename']
+                    width, height = asset['width'], asset['height']
                     
                     # Finde die Position des Bildes auf der Seite
                     for img_rect in page.get_image_rects(xref):
@@ -876,6 +1283,38 @@ class PDFConverter(BaseConverter):
         
         return images
     
+    def _prepare_image(self, image_bytes: bytes, image_ext: str) -> Optional[Dict[str, Any]]:
+        """
+        Bereitet ein extrahiertes Bild für den Bildspeicher vor.
+        
+        Args:
+            image_bytes: Rohdaten des Bildes
+            image_ext: Dateiendung laut PDF
+            
+        Returns:
+            Dictionary mit Bilddaten, Endung und Originalgröße oder None für zu kleine Bilder
+        """
+        pil_img = Image.open(io.BytesIO(image_bytes))
+        width, height = pil_img.size
+        
+        # Ignoriere sehr kleine Bilder (wahrscheinlich Icons oder Hintergrundgrafiken)
+        if width < 50 or height < 50:
+            return None
+        
+        # Skaliere große Bilder herunter
+        if width > self.max_image_size or height > self.max_image_size:
+            scale_factor = min(self.max_image_size / width, self.max_image_size / height)
+            new_width = int(width * scale_factor)
+            new_height = int(height * scale_factor)
+            pil_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
+            
+            # Konvertiere zurück zu Bytes
+            buffer = io.BytesIO()
+            pil_img.save(buffer, format=image_ext.upper())
+            image_bytes = buffer.getvalue()
+        
+        return {'data': image_bytes, 'ext': image_ext, 'width': width, 'height': height}
+    
     def _format_toc(self, toc: List[List[Any]]) -> str:
         """
         Formatiert das Inhaltsverzeichnis als Markdown.
@@ -900,6 +1339,24 @@ class PDFConverter(BaseConverter):
         return "\n".join(markdown_parts)
 
 
+# Converter und geöffnetes Dokument eines Seiten-Worker-Prozesses
+_page_worker: Optional[Tuple[PDFConverter, fitz.Document]] = None
+
+
+def _init_page_worker(config: Dict[str, Any], pdf_path: str) -> None:
+    """Initialisiert einen Seiten-Worker: Converter erzeugen und Dokument einmalig öffnen"""
+    global _page_worker
+    _page_worker = (PDFConverter(config), fitz.open(pdf_path))
+
+
+def _process_page_range(page_nums: List[int], doc_structure: Dict[str, Any], assets_dir: Path,
+                        page_dicts: Dict[int, Dict[str, Any]]) -> Tuple[List[str], Dict[str, int]]:
+    """Konvertiert einen Abschnitt zusammenhängender Seiten im Worker-Prozess; liefert auch die Bildstatistik"""
+    converter, pdf_doc = _page_worker
+    markdowns = converter._process_page_chunk(pdf_doc, page_nums, doc_structure, assets_dir, set(), page_dicts)
+    return markdowns, converter.asset_store.drain_stats()
+
+
 if __name__ == "__main__":
     # Setup Logging
     logging.basicConfig(level=logging.INFO, 
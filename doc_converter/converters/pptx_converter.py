@@ -35,12 +35,14 @@ class PowerPointConverter(BaseConverter):
         self.max_image_size = self.config.get('max_image_size', 1024)
         self.preserve_animations = self.config.get('preserve_animations', False)
     
-    def _convert_to_markdown(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path,
+                             assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine PowerPoint-Präsentation in Markdown.
         
         Args:
             source_path: Pfad zur PowerPoint-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
@@ -55,7 +57,7 @@ class PowerPointConverter(BaseConverter):
             metadata = self._extract_pptx_metadata(presentation, source_path)
             
             # Erstelle Assets-Verzeichnis für Bilder
-            assets_dir = source_path.parent / 'assets'
+            assets_dir = assets_dir or source_path.parent / 'assets'
             assets_dir.mkdir(parents=True, exist_ok=True)
             
             # Konvertiere Folien
@@ -383,41 +385,51 @@ class PowerPointConverter(BaseConverter):
         if not image_bytes:
             return None
         
-        # Generiere Dateinamen
-        image_name = f"slide_{slide_idx+1}_image_{shape_idx+1}"
-        
         try:
-            # Öffne Bild mit PIL
-            with Image.open(io.BytesIO(image_bytes)) as img:
-                # Bestimme Dateiendung basierend auf Format
-                file_ext = img.format.lower() if img.format else "png"
-                
-                # Skaliere große Bilder herunter
-                width, height = img.size
-                if width > self.max_image_size or height > self.max_image_size:
-                    scale_factor = min(self.max_image_size / width, self.max_image_size / height)
-                    new_width = int(width * scale_factor)
-                    new_height = int(height * scale_factor)
-                    img = img.resize((new_width, new_height), Image.LANCZOS)
-                
-                # Speichere Bild
-                image_filename = f"{image_name}.{file_ext}"
-                image_path = assets_dir / image_filename
-                img.save(image_path)
-                
-                return {
-                    'path': f"assets/{image_filename}",
-                    'alt': f"Bild {slide_idx+1}-{shape_idx+1}",
-                    'width': width,
-                    'height': height,
-                    'filename': image_filename,
-                    'slide': slide_idx + 1,
-                    'shape': shape_idx + 1
-                }
+            # Bekannte Bilder (z.B. Logos aus dem Folienmaster) kommen ohne PIL aus dem Bildspeicher
+            asset = self.asset_store.add(image_bytes, assets_dir, prepare=self._prepare_image,
+                                         variant=f"pptx:{self.max_image_size}")
+            image_filename = asset['filename']
+            
+            return {
+                'path': f"assets/{image_filename}",
+                'alt': f"Bild {slide_idx+1}-{shape_idx+1}",
+                'width': asset['width'],
+                'height': asset['height'],
+                'filename': image_filename,
+                'slide': slide_idx + 1,
+                'shape': shape_idx + 1
+            }
         except Exception as e:
             self.logger.warning(f"Fehler beim Verarbeiten des Bildes: {e}")
             return None
     
+    def _prepare_image(self, image_bytes: bytes) -> Dict[str, Any]:
+        """
+        Bereitet ein Bild für den Bildspeicher vor; nur zu große Bilder werden neu kodiert.
+        
+        Args:
+            image_bytes: Rohdaten des Bildes
+            
+        Returns:
+            Dictionary mit Bilddaten, Endung und Originalgröße
+        """
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # Bestimme Dateiendung basierend auf Format
+            image_format = img.format or 'PNG'
+            
+            # Skaliere große Bilder herunter
+            width, height = img.size
+            if width > self.max_image_size or height > self.max_image_size:
+                scale_factor = min(self.max_image_size / width, self.max_image_size / height)
+                new_width = int(width * scale_factor)
+                new_height = int(height * scale_factor)
+                buffer = io.BytesIO()
+                img.resize((new_width, new_height), Image.LANCZOS).save(buffer, format=image_format)
+                image_bytes = buffer.getvalue()
+        
+        return {'data': image_bytes, 'ext': image_format.lower(), 'width': width, 'height': height}
+    
     def _extract_notes_text(self, notes_slide) -> str:
         """
         Extrahiert den Text aus den Notizen einer Folie.
@@ -5,6 +5,7 @@ Konvertiert Excel-Tabellen (XLSX, XLS) in strukturierte Markdown-Dateien.
 
 import os
 import re
+import math
 from pathlib import Path
 import logging
 from typing import Dict, Any, List, Tuple, Optional, Set
@@ -18,6 +19,9 @@ from .base_converter import BaseConverter
 class ExcelConverter(BaseConverter):
     """Konvertiert Excel-Tabellen (XLSX, XLS) in strukturierte Markdown-Dateien"""
     
+    # Blätter ohne gespeicherte Dimension werden ohne leere Ränder ausgegeben
+    version = '3'
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialisiert den Excel-Konverter.
@@ -36,28 +40,34 @@ class ExcelConverter(BaseConverter):
         self.convert_formulas = self.config.get('convert_formulas', True)
         self.extract_charts = self.config.get('extract_charts', False)  # Noch nicht implementiert
     
-    def _convert_to_markdown(self, source_path: Path) -> Tuple[str, Dict[str, Any]]:
+    def _convert_to_markdown(self, source_path: Path,
+                             assets_dir: Optional[Path] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine Excel-Datei in Markdown.
         
+        Das Workbook wird im Read-only-Modus einmal geöffnet und für Metadaten und
+        Tabellenblätter gemeinsam verwendet; gelesen werden nur die Zeilen und Spalten
+        innerhalb von max_rows/max_cols.
+        
         Args:
             source_path: Pfad zur Excel-Datei
+            assets_dir: Verzeichnis für extrahierte Bilder (Standard: 'assets' neben der Quelldatei)
             
         Returns:
             Tuple aus (markdown_content, metadata)
         """
         self.logger.info(f"Starte Konvertierung von Excel: {source_path}")
         
-        # Extrahiere Metadaten
-        metadata = self._extract_excel_metadata(source_path)
+        metadata = None
+        wb = None
         
         # Konvertiere Excel zu Markdown
         try:
-            # Lade das Workbook
-            wb = openpyxl.load_workbook(str(source_path), data_only=True, read_only=True)
+            # Lade das Workbook (Read-only: Zellen werden erst beim Iterieren gelesen)
+            wb = openpyxl.load_workbook(str(source_path), data_only=True, read_only=True, keep_links=False)
             
-            # Alternative mit Pandas (weniger Metadaten, aber robuster)
-            # excel_data = pd.read_excel(source_path, sheet_name=None, engine='openpyxl')
+            # Extrahiere Metadaten aus demselben Workbook
+            metadata = self._extract_excel_metadata(source_path, wb)
             
             # Sammle Ergebnisse aller Tabellenblätter
             sheets_markdown = []
@@ -87,6 +97,9 @@ class ExcelConverter(BaseConverter):
         except Exception as e:
             self.logger.error(f"Fehler bei der Excel-Konvertierung: {e}", exc_info=True)
             
+            if metadata is None:
+                metadata = self._extract_excel_metadata(source_path)
+            
             # Fallback mit Pandas
             try:
                 self.logger.info("Versuche Fallback mit Pandas")
@@ -94,11 +107,18 @@ class ExcelConverter(BaseConverter):
             except Exception as fallback_error:
                 self.logger.error(f"Auch Fallback mit Pandas fehlgeschlagen: {fallback_error}", exc_info=True)
                 return f"# Konvertierung fehlgeschlagen\n\nFehler: {str(e)}\nFallback-Fehler: {str(fallback_error)}", metadata
+        
+        finally:
+            # Read-only-Workbooks halten die Datei bis zum Schließen offen
+            if wb is not None:
+                wb.close()
     
     def _convert_with_pandas(self, source_path: Path, metadata: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
         Konvertiert eine Excel-Datei mit Pandas (Fallback-Methode).
         
+        Pro Tabellenblatt werden höchstens max_rows Datenzeilen eingelesen.
+        
         Args:
             source_path: Pfad zur Excel-Datei
             metadata: Bereits extrahierte Metadaten
@@ -107,26 +127,25 @@ class ExcelConverter(BaseConverter):
             Tuple aus (markdown_content, metadata)
         """
         try:
-            # Lade alle Tabellenblätter
-            excel_data = pd.read_excel(source_path, sheet_name=None)
-            
             sheets_markdown = []
             
-            for sheet_name, df in excel_data.items():
-                # Begrenze Größe
-                df_limited = df.iloc[:min(len(df), self.max_rows), :min(df.shape[1], self.max_cols)]
-                
-                # Tabelle zu Markdown konvertieren
-                table_md = self._dataframe_to_markdown(df_limited)
-                
-                if table_md:
-                    # Füge Tabellenblattname hinzu
-                    if self.include_sheet_names:
-                        sheet_md = f"## {sheet_name}\n\n{table_md}"
-                    else:
-                        sheet_md = table_md
+            with pd.ExcelFile(source_path) as excel_file:
+                for sheet_name in excel_file.sheet_names:
+                    # Lade nur die benötigten Zeilen und begrenze die Spalten
+                    df = excel_file.parse(sheet_name, nrows=self.max_rows)
+                    df_limited = df.iloc[:, :min(df.shape[1], self.max_cols)]
+                    
+                    # Tabelle zu Markdown konvertieren
+                    table_md = self._dataframe_to_markdown(df_limited)
                     
-                    sheets_markdown.append(sheet_md)
+                    if table_md:
+                        # Füge Tabellenblattname hinzu
+                        if self.include_sheet_names:
+                            sheet_md = f"## {sheet_name}\n\n{table_md}"
+                        else:
+                            sheet_md = table_md
+                        
+                        sheets_markdown.append(sheet_md)
             
             # Kombiniere alle Tabellenblatt-Markdown-Texte
             markdown_content = "\n\n".join(sheets_markdown)
@@ -144,6 +163,9 @@ class ExcelConverter(BaseConverter):
         """
         Konvertiert ein Excel-Tabellenblatt in Markdown.
         
+        Die Zeilen werden in einem Durchgang über die Blattdaten gelesen und direkt als
+        Tabellenzeilen ausgegeben; das Lesen endet nach max_rows Zeilen.
+        
         Args:
             sheet: openpyxl Worksheet-Objekt
             sheet_name: Name des Tabellenblatts
@@ -161,52 +183,28 @@ class ExcelConverter(BaseConverter):
             min_row, max_row, min_col, max_col = used_range
             
             # Begrenze die Größe
-            max_row = min(max_row, min_row + self.max_rows - 1)
-            max_col = min(max_col, min_col + self.max_cols - 1)
-            
-            # Sammle Zelldaten
-            rows = []
-            for row_idx in range(min_row, max_row + 1):
-                row_data = []
-                for col_idx in range(min_col, max_col + 1):
-                    cell = sheet.cell(row=row_idx, column=col_idx)
-                    value = cell.value
-                    
-                    # Konvertiere None zu leerem String
-                    if value is None:
-                        value = ""
-                    # Konvertiere Zahlen
-                    elif isinstance(value, (int, float)):
-                        if value == int(value):  # Ganze Zahl
-                            value = str(int(value))
-                        else:
-                            value = str(value)
-                    # Konvertiere alles andere zu String
-                    else:
-                        value = str(value)
-                    
-                    row_data.append(value)
-                
-                rows.append(row_data)
-            
-            # Erstelle Markdown-Tabelle
-            if not rows:
-                return ""
-            
-            table_rows = []
+            row_limit = min_row + self.max_rows - 1
+            col_limit = min_col + self.max_cols - 1
+            if max_row is not None:
+                row_limit = min(max_row, row_limit)
+            if max_col is not None:
+                col_limit = min(max_col, col_limit)
             
-            # Header-Zeile
-            header_row = "| " + " | ".join(rows[0]) + " |"
-            table_rows.append(header_row)
+            rows = sheet.iter_rows(min_row=min_row, max_row=row_limit,
+                                   min_col=min_col, max_col=col_limit, values_only=True)
             
-            # Trennzeile
-            separator_row = "| " + " | ".join(["---"] * len(rows[0])) + " |"
-            table_rows.append(separator_row)
+            if max_row is None or max_col is None:
+                # Blatt ohne gespeicherte Dimension: leere Ränder des begrenzten Ausschnitts entfernen
+                rows = self._trim_empty_edges(list(rows))
             
-            # Datenzeilen
-            for row in rows[1:]:
-                data_row = "| " + " | ".join(row) + " |"
-                table_rows.append(data_row)
+            # Erstelle Markdown-Tabelle: Header-Zeile, Trennzeile, Datenzeilen
+            table_rows = []
+            for row in rows:
+                values = [self._format_cell_value(value) for value in row]
+                table_rows.append("| " + " | ".join(values) + " |")
+                
+                if len(table_rows) == 1:
+                    table_rows.append("| " + " | ".join(["---"] * len(values)) + " |")
             
             return "\n".join(table_rows)
             
@@ -214,51 +212,79 @@ class ExcelConverter(BaseConverter):
             self.logger.error(f"Fehler bei der Konvertierung des Tabellenblatts {sheet_name}: {e}", exc_info=True)
             return f"*Fehler bei der Konvertierung des Tabellenblatts {sheet_name}: {str(e)}*"
     
-    def _get_used_range(self, sheet) -> Optional[Tuple[int, int, int, int]]:
+    @staticmethod
+    def _format_cell_value(value: Any) -> str:
+        """
+        Formatiert einen Zellwert für eine Markdown-Tabelle.
+        
+        Args:
+            value: Zellwert
+            
+        Returns:
+            Leerer String für leere Zellen, ganze Zahlen ohne Nachkommastellen (Wahrheitswerte
+            bleiben True/False), sonst str(value)
+        """
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return str(value)
+        if isinstance(value, (int, float)) and math.isfinite(value) and value == int(value):
+            return str(int(value))
+        return str(value)
+    
+    @staticmethod
+    def _trim_empty_edges(rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+        """
+        Entfernt leere Zeilen am Ende und leere Spalten am rechten Rand.
+        
+        Args:
+            rows: Zeilen mit Zellwerten
+            
+        Returns:
+            Gekürzte Zeilen
+        """
+        while rows and all(value is None for value in rows[-1]):
+            rows.pop()
+        
+        width = max((i + 1 for row in rows for i, value in enumerate(row) if value is not None), default=0)
+        return [row[:width] for row in rows]
+    
+    def _get_used_range(self, sheet) -> Optional[Tuple[int, Optional[int], int, Optional[int]]]:
         """
         Bestimmt den benutzten Bereich in einem Tabellenblatt.
         
+        Bei Read-only-Worksheets stammt der Bereich aus dem <dimension>-Eintrag der
+        Blattdaten, den openpyxl beim Öffnen liest; Zellen werden dafür nicht geladen.
+        
         Args:
             sheet: openpyxl Worksheet-Objekt
             
         Returns:
-            Tuple aus (min_row, max_row, min_col, max_col) oder None, wenn das Blatt leer ist
+            Tuple aus (min_row, max_row, min_col, max_col) oder None, wenn das Blatt leer ist.
+            max_row und max_col sind None, wenn das Blatt keine Dimension gespeichert hat.
         """
         try:
-            if hasattr(sheet, 'calculate_dimension') and callable(sheet.calculate_dimension):
-                # Für normale Worksheets
-                dimension = sheet.calculate_dimension()
-                if dimension == 'A1:A1' and sheet['A1'].value is None:
-                    # Leeres Blatt
-                    return None
-                
-                # Parse Dimension (z.B. 'A1:C10')
-                match = re.match(r'([A-Z]+)(\d+):([A-Z]+)(\d+)', dimension)
-                if match:
-                    min_col_letter, min_row, max_col_letter, max_row = match.groups()
-                    min_row = int(min_row)
-                    max_row = int(max_row)
-                    
-                    # Konvertiere Spaltenbuchstaben zu Zahlen
-                    min_col = self._column_letter_to_number(min_col_letter)
-                    max_col = self._column_letter_to_number(max_col_letter)
-                    
-                    return min_row, max_row, min_col, max_col
-            
-            # Fallback für read_only Worksheets oder wenn calculate_dimension fehlschlägt
-            min_row = min(sheet.min_row, 1)
+            min_row = sheet.min_row or 1
             max_row = sheet.max_row
-            min_col = min(sheet.min_column, 1)
+            min_col = sheet.min_column or 1
             max_col = sheet.max_column
             
+            if max_row is None or max_col is None:
+                # Unbekannte Größe (z.B. von anderen Programmen ohne <dimension> geschrieben)
+                return min_row, None, min_col, None
+            
             if min_row > max_row or min_col > max_col:
                 return None
             
+            if (min_row, max_row, min_col, max_col) == (1, 1, 1, 1) and sheet['A1'].value is None:
+                # Leeres Blatt
+                return None
+            
             return min_row, max_row, min_col, max_col
             
         except Exception as e:
             self.logger.warning(f"Fehler bei der Bestimmung des benutzten Bereichs: {e}")
-            return 1, 50, 1, 10  # Standardbereich als Fallback
+            return 1, None, 1, None  # Größe beim Lesen bestimmen
     
     def _column_letter_to_number(self, column_letter: str) -> int:
         """
@@ -297,7 +323,7 @@ class ExcelConverter(BaseConverter):
         
         # Erstelle Datenzeilen
         rows = []
-        for _, row in df.iterrows():
+        for row in df.itertuples(index=False, name=None):
             values = []
             for val in row:
                 if pd.isna(val):
@@ -314,12 +340,16 @@ class ExcelConverter(BaseConverter):
         # Kombiniere alle Teile
         return "\n".join([header, separator] + rows)
     
-    def _extract_excel_metadata(self, source_path: Path) -> Dict[str, Any]:
+    def _extract_excel_metadata(self, source_path: Path, wb=None) -> Dict[str, Any]:
         """
         Extrahiert Metadaten aus einer Excel-Datei.
         
+        Zeilen- und Spaltenzahlen stammen aus den gespeicherten Blattdimensionen; bei
+        Blättern ohne Dimension fehlen sie (None).
+        
         Args:
             source_path: Pfad zur Excel-Datei
+            wb: Bereits geöffnetes Workbook (Standard: Datei wird im Read-only-Modus geöffnet)
             
         Returns:
             Dictionary mit Metadaten
@@ -333,15 +363,18 @@ class ExcelConverter(BaseConverter):
             'sheets': []
         }
         
+        own_workbook = wb is None
+        
         try:
             # Lade Workbook für Metadaten
-            wb = openpyxl.load_workbook(
-                str(source_path), 
-                read_only=True, 
-                keep_vba=False, 
-                data_only=True,
-                keep_links=False
-            )
+            if own_workbook:
+                wb = openpyxl.load_workbook(
+                    str(source_path), 
+                    read_only=True, 
+                    keep_vba=False, 
+                    data_only=True,
+                    keep_links=False
+                )
             
             # Dokumenteigenschaften
             props = wb.properties
@@ -381,8 +414,8 @@ class ExcelConverter(BaseConverter):
                 if used_range:
                     min_row, max_row, min_col, max_col = used_range
                     sheet_data['has_data'] = True
-                    sheet_data['row_count'] = max_row - min_row + 1
-                    sheet_data['column_count'] = max_col - min_col + 1
+                    sheet_data['row_count'] = max_row - min_row + 1 if max_row is not None else None
+                    sheet_data['column_count'] = max_col - min_col + 1 if max_col is not None else None
                 
                 # Prüfe auf Bilder
                 if hasattr(sheet, '_images'):
@@ -403,8 +436,8 @@ class ExcelConverter(BaseConverter):
             # Berechne Gesamtzahl der Zeilen und Spalten
             data_sheets = [s for s in sheet_info if s['has_data']]
             if data_sheets:
-                metadata['total_rows'] = sum(s['row_count'] for s in data_sheets)
-                metadata['total_columns'] = sum(s['column_count'] for s in data_sheets)
+                metadata['total_rows'] = sum(s['row_count'] or 0 for s in data_sheets)
+                metadata['total_columns'] = sum(s['column_count'] or 0 for s in data_sheets)
             else:
                 metadata['total_rows'] = 0
                 metadata['total_columns'] = 0
@@ -416,17 +449,30 @@ class ExcelConverter(BaseConverter):
             self.logger.warning(f"Fehler beim Extrahieren der Excel-Metadaten: {e}")
             
             try:
-                # Fallback mit Pandas
-                excel_data = pd.read_excel(source_path, sheet_name=None)
-                metadata['sheet_count'] = len(excel_data)
-                metadata['sheets'] = [{'name': name, 'row_count': df.shape[0], 'column_count': df.shape[1]} 
-                                     for name, df in excel_data.items()]
-                metadata['total_rows'] = sum(df.shape[0] for df in excel_data.values())
-                metadata['total_columns'] = sum(df.shape[1] for df in excel_data.values())
+                # Fallback mit Pandas (z.B. XLS): Blattgrößen aus der Engine, ohne die Blätter
+                # als DataFrames zu laden
+                with pd.ExcelFile(source_path) as excel_file:
+                    sheets = []
+                    for name in excel_file.sheet_names:
+                        sheet_data = {'name': name, 'row_count': None, 'column_count': None}
+                        if hasattr(excel_file.book, 'sheet_by_name'):  # xlrd
+                            xls_sheet = excel_file.book.sheet_by_name(name)
+                            sheet_data['row_count'] = xls_sheet.nrows
+                            sheet_data['column_count'] = xls_sheet.ncols
+                        sheets.append(sheet_data)
+                
+                metadata['sheet_count'] = len(sheets)
+                metadata['sheets'] = sheets
+                metadata['total_rows'] = sum(s['row_count'] or 0 for s in sheets)
+                metadata['total_columns'] = sum(s['column_count'] or 0 for s in sheets)
                 metadata['pages'] = max(1, metadata['total_rows'] // 40)
             except Exception as fallback_error:
                 self.logger.error(f"Auch Fallback für Metadaten fehlgeschlagen: {fallback_error}")
         
+        finally:
+            if own_workbook and wb is not None:
+                wb.close()
+        
         return metadata
 
 
@@ -1,10 +1,15 @@
 import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
 
 class DocumentClassifier:
     """Klassifiziert und priorisiert Dokumente für die Konvertierung"""
     
+    # Spalten, die die Klassifizierung den Scannerdaten hinzufügt
+    CLASSIFICATION_COLUMNS = ['document_category', 'complexity_category', 'content_category',
+                              'priority', 'priority_group']
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialisiert den DocumentClassifier.
@@ -74,35 +79,79 @@ class DocumentClassifier:
         df['priority'] = df.apply(self._assign_priority, axis=1)
         
         # Prioritätsgruppen bilden
-        df['priority_group'] = df['priority'].apply(
-            lambda x: 'Gruppe 1 (Hohe Priorität)' if x <= 1 else
-                     'Gruppe 2 (Mittlere Priorität)' if x <= 3 else
-                     'Gruppe 3 (Niedrige Priorität)'
-        )
+        df['priority_group'] = df['priority'].apply(self._priority_group)
         
         # Statistik ausgeben
-        self.logger.info("Dokument-Kategorisierung:")
-        for cat in sorted(df['document_category'].unique()):
-            count = df[df['document_category'] == cat].shape[0]
-            self.logger.info(f"  - {cat}: {count} Dokumente")
-            
-        self.logger.info("Inhaltskategorisierung:")
-        for cat in sorted(df['content_category'].unique()):
-            count = df[df['content_category'] == cat].shape[0]
-            self.logger.info(f"  - {cat}: {count} Dokumente")
-            
-        self.logger.info("Komplexitätskategorien:")
-        for cat in sorted(df['complexity_category'].unique()):
-            count = df[df['complexity_category'] == cat].shape[0]
-            self.logger.info(f"  - {cat}: {count} Dokumente")
-            
-        self.logger.info("Prioritätsgruppen:")
-        for group in sorted(df['priority_group'].unique()):
-            count = df[df['priority_group'] == group].shape[0]
-            self.logger.info(f"  - {group}: {count} Dokumente")
+        self._log_statistics({column: Counter(df[column]) for column in
+                              ('document_category', 'content_category', 'complexity_category', 'priority_group')})
         
         return df
     
+    def classify_document(self, doc_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Klassifiziert und priorisiert ein einzelnes Dokument.
+        
+        Args:
+            doc_info: Dokumentenmetadaten des Scanners
+            
+        Returns:
+            Kopie der Metadaten mit Klassifikation und Priorität
+        """
+        doc = dict(doc_info)
+        doc['document_category'] = self._categorize_document_type(doc['file_type'])
+        doc['complexity_category'] = self._categorize_complexity(doc['complexity_score'])
+        doc['content_category'] = self._categorize_content(doc)
+        doc['priority'] = self._assign_priority(doc)
+        doc['priority_group'] = self._priority_group(doc['priority'])
+        return doc
+    
+    def classify_stream(self, documents: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Klassifiziert Dokumente einzeln, während sie geliefert werden (z.B. von
+        DocumentScanner.iter_documents), und protokolliert am Ende die Statistik.
+        
+        Args:
+            documents: Dokumentenmetadaten
+            
+        Yields:
+            Klassifizierte Dokumentenmetadaten
+        """
+        statistics = {column: Counter() for column in
+                      ('document_category', 'content_category', 'complexity_category', 'priority_group')}
+        
+        for doc_info in documents:
+            doc = self.classify_document(doc_info)
+            for column, counter in statistics.items():
+                counter[doc[column]] += 1
+            yield doc
+        
+        if statistics['document_category']:
+            self.logger.info(f"{sum(statistics['document_category'].values())} Dokumente klassifiziert")
+            self._log_statistics(statistics)
+    
+    def _log_statistics(self, statistics: Dict[str, Counter]) -> None:
+        """Protokolliert die Anzahl der Dokumente je Kategorie"""
+        titles = {
+            'document_category': "Dokument-Kategorisierung:",
+            'content_category': "Inhaltskategorisierung:",
+            'complexity_category': "Komplexitätskategorien:",
+            'priority_group': "Prioritätsgruppen:"
+        }
+        for column, title in titles.items():
+            self.logger.info(title)
+            for category, count in sorted(statistics[column].items()):
+                self.logger.info(f"  - {category}: {count} Dokumente")
+    
+    @staticmethod
+    def _priority_group(priority: int) -> str:
+        """Ordnet eine Priorität einer Prioritätsgruppe zu"""
+        if priority <= 1:
+            return 'Gruppe 1 (Hohe Priorität)'
+        elif priority <= 3:
+            return 'Gruppe 2 (Mittlere Priorität)'
+        else:
+            return 'Gruppe 3 (Niedrige Priorität)'
+    
     def _categorize_document_type(self, file_type: str) -> str:
         """Klassifiziert den Dokumenttyp basierend auf dem MIME-Typ"""
         if 'pdf' in file_type:
@@ -131,7 +180,7 @@ class DocumentClassifier:
         else:
             return 'Komplex'
     
-    def _categorize_content(self, row: pd.Series) -> str:
+    def _categorize_content(self, row: Union[pd.Series, Dict[str, Any]]) -> str:
         """Klassifiziert den Inhalt basierend auf Titel, Dateiname und Pfad"""
         title = str(row.get('title', '')).lower()
         path = str(row.get('path', '')).lower()
@@ -157,7 +206,7 @@ class DocumentClassifier:
         
         return 'Sonstige Dokumentation'
     
-    def _assign_priority(self, row: pd.Series) -> int:
+    def _assign_priority(self, row: Union[pd.Series, Dict[str, Any]]) -> int:
         """Weist eine Priorität basierend auf der Prioritätsmatrix zu"""
         # Erstelle den Schlüssel für die Prioritätsmatrix
         key = (row['content_category'], row['complexity_category'])
@@ -1,13 +1,18 @@
 
 import os
+import time
 import pandas as pd
 from datetime import datetime
 import magic
 import fitz  # PyMuPDF für PDF-Metadaten
 import docx  # für Word-Dokumente
 import logging
+import concurrent.futures
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+
+from .scan_cache import ScanCache
+from ..utils.worker_pool import WorkerPool
 
 class DocumentScanner:
     """Scanner für die Inventarisierung verschiedener Dokumenttypen"""
@@ -27,6 +32,19 @@ class DocumentScanner:
             '.pdf', '.docx', '.doc', '.xlsx', '.xls', 
             '.pptx', '.ppt', '.md', '.html', '.txt'
         ]
+        
+        # Parallelisierung: Verzeichnisse in Threads durchsuchen, Metadaten in Worker-Prozessen
+        self.parallel_processing = self.config.get('parallel_processing', True)
+        self.scan_backend = self.config.get('scan_backend', 'process')
+        self.scan_workers = self.config.get('scan_workers', 4)
+        self.scan_walk_threads = self.config.get('scan_walk_threads', 8)
+        self.scan_timeout = self.config.get('scan_timeout', 120)
+        
+        # Metadaten-Cache: unveränderte Dateien (Größe, Änderungszeit) werden nicht erneut gelesen
+        self.use_cache = self.config.get('inventory_cache', True)
+        self.cache_file = Path(self.config.get(
+            'inventory_cache_file',
+            Path(self.config.get('inventory_dir', 'doc_converter/data/inventory')) / 'scan_cache.sqlite'))
     
     def scan_directory(self, root_dir: Union[str, Path]) -> pd.DataFrame:
         """
@@ -34,52 +52,210 @@ class DocumentScanner:
         
         Args:
             root_dir: Pfad zum Stammverzeichnis
-            
+        
         Returns:
-            DataFrame mit Dokumentenmetadaten
+            DataFrame mit Dokumentenmetadaten, sortiert nach Pfad
+        """
+        document_inventory = sorted(self.iter_documents(root_dir), key=lambda doc_info: doc_info['path'])
+        
+        if not document_inventory:
+            return pd.DataFrame()
+        
+        # Konvertiere Liste zu DataFrame
+        return pd.DataFrame(document_inventory)
+    
+    def iter_documents(self, root_dir: Union[str, Path]) -> Iterator[Dict[str, Any]]:
         """
-        root_dir = Path(root_dir)
+        Scannt ein Verzeichnis und liefert die Metadaten der Dokumente, sobald sie vorliegen.
+        
+        Dokumente mit unveränderter Größe und Änderungszeit werden bereits während des
+        Durchsuchens aus dem Cache geliefert; neue und geänderte Dokumente werden danach
+        parallel gelesen. Die Reihenfolge ist daher nicht festgelegt.
+        
+        Args:
+            root_dir: Pfad zum Stammverzeichnis
+        
+        Yields:
+            Dictionary mit Dokumentenmetadaten
+        """
+        # Absoluter Pfad: die Cache-Einträge und das Präfix fürs Aufräumen hängen nicht
+        # vom Arbeitsverzeichnis oder von symbolischen Links im Aufrufpfad ab
+        root_dir = Path(root_dir).resolve()
         self.logger.info(f"Scanne Verzeichnis: {root_dir}")
+        started = time.perf_counter()
         
-        document_inventory = []
+        cache = ScanCache(self.cache_file) if self.use_cache else None
+        counts = {'documents': 0, 'cached': 0, 'extracted': 0, 'failed': 0, 'removed': 0}
         
-        # Verzeichnis rekursiv durchsuchen
-        for file_path in self._find_documents(root_dir):
-            try:
-                # Basismetadaten extrahieren
-                doc_info = self._extract_base_metadata(file_path)
-                
-                # Dokumentspezifische Metadaten
-                if file_path.suffix.lower() == '.pdf':
-                    self._extract_pdf_metadata(file_path, doc_info)
-                elif file_path.suffix.lower() == '.docx':
-                    self._extract_docx_metadata(file_path, doc_info)
-                # Weitere Dateitypen hier hinzufügen...
-                
-                document_inventory.append(doc_info)
-                
-            except Exception as e:
-                self.logger.error(f"Fehler bei {file_path}: {e}", exc_info=True)
+        try:
+            if cache is not None:
+                cache.load(root_dir)
+            
+            # Verzeichnis durchsuchen; unveränderte Dokumente sofort aus dem Cache liefern
+            seen = set()
+            changed = []
+            for path, size, mtime_ns in self._walk(root_dir):
+                seen.add(path)
+                doc_info = cache.lookup(path, size, mtime_ns) if cache is not None else None
+                if doc_info is None:
+                    changed.append((path, size, mtime_ns))
+                    continue
+                counts['documents'] += 1
+                counts['cached'] += 1
+                yield doc_info
+            
+            # Neue und geänderte Dokumente lesen
+            for (path, size, mtime_ns), doc_info in self._extract_documents(changed):
+                if doc_info is None:
+                    counts['failed'] += 1
+                    continue
+                if cache is not None:
+                    cache.put(path, size, mtime_ns, doc_info)
+                counts['documents'] += 1
+                counts['extracted'] += 1
+                yield doc_info
+            
+            # Einträge gelöschter Dateien entfernen
+            if cache is not None:
+                cache.flush()
+                counts['removed'] = cache.prune(root_dir, seen)
+        finally:
+            if cache is not None:
+                cache.close()
         
-        if not document_inventory:
+        if not counts['documents']:
             self.logger.warning(f"Keine unterstützten Dokumente in {root_dir} gefunden")
-            return pd.DataFrame()
         
-        # Konvertiere Liste zu DataFrame
-        document_df = pd.DataFrame(document_inventory)
+        self.logger.info(
+            f"Inventarisierung abgeschlossen: {counts['documents']} Dokumente gefunden in "
+            f"{time.perf_counter() - started:.1f}s ({counts['cached']} aus dem Cache, "
+            f"{counts['extracted']} neu gelesen, {counts['failed']} fehlgeschlagen, "
+            f"{counts['removed']} entfernt)")
+    
+    def _walk(self, root_dir: Path) -> Iterator[Tuple[str, int, int]]:
+        """
+        Durchsucht einen Verzeichnisbaum mit os.scandir, mehrere Verzeichnisse gleichzeitig.
+        
+        Symbolische Links auf Verzeichnisse werden nicht verfolgt.
+        
+        Args:
+            root_dir: Pfad zum Stammverzeichnis
+        
+        Yields:
+            Tuple aus (Pfad, Größe in Bytes, Änderungszeit in Nanosekunden) je Dokument
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.scan_walk_threads)) as executor:
+            pending = {executor.submit(self._scan_single_directory, str(root_dir))}
+            
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories = future.result()
+                    pending.update(executor.submit(self._scan_single_directory, directory)
+                                   for directory in subdirectories)
+                    yield from files
+    
+    def _scan_single_directory(self, directory: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+        """Liest ein Verzeichnis; liefert die unterstützten Dateien und die Unterverzeichnisse"""
+        files = []
+        subdirectories = []
         
-        self.logger.info(f"Inventarisierung abgeschlossen: {len(document_df)} Dokumente gefunden")
-        return document_df
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in self.supported_extensions and entry.is_file():
+                            stat = entry.stat()
+                            files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+                    except OSError as e:
+                        self.logger.warning(f"Überspringe {entry.path}: {e}")
+        except OSError as e:
+            self.logger.warning(f"Verzeichnis {directory} nicht lesbar: {e}")
+        
+        return files, subdirectories
     
-    def _find_documents(self, root_dir: Path) -> List[Path]:
-        """Findet alle Dokumente mit unterstützten Dateierweiterungen"""
-        documents = []
+    def _extract_documents(self, files: List[Tuple[str, int, int]]
+                           ) -> Iterator[Tuple[Tuple[str, int, int], Optional[Dict[str, Any]]]]:
+        """
+        Liest die Metadaten mehrerer Dokumente, bei Bedarf parallel.
         
-        for file_path in root_dir.glob('**/*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                documents.append(file_path)
+        Args:
+            files: Tupel aus (Pfad, Größe, Änderungszeit) aus _walk
+        
+        Yields:
+            Tuple aus (Eingabetupel, Metadaten oder None bei einem Fehler) in Fertigstellungsreihenfolge
+        """
+        if not files:
+            return
+        
+        if not self.parallel_processing or len(files) == 1:
+            for item in files:
+                yield item, self._extract_or_log(item[0])
         
-        return documents
+        elif self.scan_backend == 'process':
+            # Worker-Prozesse: python-docx und die Seitenanalyse laufen sonst unter der GIL
+            pool = WorkerPool(
+                _extract_in_worker,
+                max_workers=min(self.scan_workers, len(files)),
+                initializer=_init_scan_worker,
+                initargs=(self._worker_config(),),
+                task_timeout=self.scan_timeout,
+                start_method=self.config.get('worker_start_method')
+            )
+            with pool:
+                for item, success, value in pool.map_unordered(files):
+                    if not success:
+                        self.logger.error(f"Fehler bei {item[0]}: {value}")
+                        value = None
+                    yield item, value
+        
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.scan_workers) as executor:
+                future_to_item = {executor.submit(self._extract_or_log, item[0]): item for item in files}
+                for future in concurrent.futures.as_completed(future_to_item):
+                    yield future_to_item[future], future.result()
+    
+    def _worker_config(self) -> Dict[str, Any]:
+        """Konfiguration für Worker-Prozesse: ohne eigenen Cache und ohne weitere Parallelisierung"""
+        worker_config = dict(self.config)
+        worker_config.update({
+            'inventory_cache': False,
+            'parallel_processing': False,
+            'log_level': logging.getLevelName(logging.getLogger().getEffectiveLevel())
+        })
+        return worker_config
+    
+    def _extract_or_log(self, path: str) -> Optional[Dict[str, Any]]:
+        """Liest die Metadaten eines Dokuments; Fehler werden protokolliert"""
+        try:
+            return self.extract_document_metadata(Path(path))
+        except Exception as e:
+            self.logger.error(f"Fehler bei {path}: {e}", exc_info=True)
+            return None
+    
+    def extract_document_metadata(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Extrahiert die Metadaten eines einzelnen Dokuments.
+        
+        Args:
+            file_path: Pfad zum Dokument
+        
+        Returns:
+            Dictionary mit Dokumentenmetadaten
+        """
+        # Basismetadaten extrahieren
+        doc_info = self._extract_base_metadata(file_path)
+        
+        # Dokumentspezifische Metadaten
+        if file_path.suffix.lower() == '.pdf':
+            self._extract_pdf_metadata(file_path, doc_info)
+        elif file_path.suffix.lower() == '.docx':
+            self._extract_docx_metadata(file_path, doc_info)
+        # Weitere Dateitypen hier hinzufügen...
+        
+        return doc_info
     
     def _extract_base_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extrahiert Basis-Metadaten für alle Dateitypen"""
@@ -177,6 +353,23 @@ class DocumentScanner:
         doc_info['pages'] = paragraphs // 40 + 1  # Grobe Schätzung
 
 
+# DocumentScanner-Instanz eines Worker-Prozesses, einmalig pro Prozess erzeugt
+_worker_scanner: Optional[DocumentScanner] = None
+
+
+def _init_scan_worker(config: Dict[str, Any]) -> None:
+    """Initialisiert einen Worker-Prozess für die Inventarisierung"""
+    global _worker_scanner
+    
+    # Logging richtet der WorkerPool ein (Weiterleitung an den Parent), kein eigener Datei-Handler
+    _worker_scanner = DocumentScanner(config)
+
+
+def _extract_in_worker(item: Tuple[str, int, int]) -> Dict[str, Any]:
+    """Liest die Metadaten eines Dokuments im Worker-Prozess"""
+    return _worker_scanner.extract_document_metadata(Path(item[0]))
+
+
 if __name__ == "__main__":
     # Setup Logging
     logging.basicConfig(level=logging.INFO, 
@@ -4,7 +4,7 @@ import pandas as pd
 import logging
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterable, Optional, Union
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
@@ -27,18 +27,22 @@ class ReportGenerator:
         os.makedirs(self.report_path, exist_ok=True)
     
     def generate_inventory_report(self, 
-                                  document_df: pd.DataFrame, 
+                                  document_df: Union[pd.DataFrame, Iterable[Dict[str, Any]]], 
                                   report_name: Optional[str] = None) -> str:
         """
         Generiert einen Bericht über die inventarisierten und klassifizierten Dokumente.
         
         Args:
-            document_df: DataFrame mit klassifizierten Dokumentenmetadaten
+            document_df: DataFrame mit klassifizierten Dokumentenmetadaten oder die
+                klassifizierten Dokumente einzeln (z.B. aus DocumentClassifier.classify_stream)
             report_name: Optionaler Name für den Bericht
             
         Returns:
             Pfad zum generierten Berichtverzeichnis
         """
+        if not isinstance(document_df, pd.DataFrame):
+            document_df = self.collect_documents(document_df)
+        
         if document_df.empty:
             self.logger.warning("Leerer DataFrame übergeben, kein Bericht generiert")
             return ""
@@ -66,6 +70,20 @@ class ReportGenerator:
         self.logger.info(f"Bericht erfolgreich generiert: {report_dir}")
         return report_dir
     
+    @staticmethod
+    def collect_documents(documents: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Sammelt einzeln gelieferte Dokumente in einem nach Pfad sortierten DataFrame.
+        
+        Args:
+            documents: Dokumentenmetadaten, z.B. aus DocumentClassifier.classify_stream
+            
+        Returns:
+            DataFrame mit einer Zeile je Dokument
+        """
+        records = sorted(documents, key=lambda doc: doc['path'])
+        return pd.DataFrame(records) if records else pd.DataFrame()
+    
     def _generate_excel_report(self, df: pd.DataFrame, report_dir: str) -> None:
         """Erstellt einen detaillierten Excel-Bericht"""
         excel_path = os.path.join(report_dir, "dokument_inventar.xlsx")
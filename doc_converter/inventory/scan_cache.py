@@ -0,0 +1,143 @@
+"""
+Persistenter Metadaten-Cache für die Inventarisierung.
+Speichert die Metadaten jedes gescannten Dokuments zusammen mit Größe und Änderungszeit
+der Datei; bei einem erneuten Scan werden nur Dateien gelesen, deren Größe oder
+Änderungszeit sich geändert hat.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Bei Änderungen an den extrahierten Metadaten erhöhen; ältere Einträge gelten als veraltet
+SCAN_CACHE_VERSION = 1
+
+
+class ScanCache:
+    """
+    SQLite-Datei mit einem Eintrag je Dokument: (Pfad, Größe, Änderungszeit) → Metadaten.
+
+    Die Einträge unterhalb des gescannten Verzeichnisses werden zu Beginn eines Scans
+    in den Speicher geladen; neue Metadaten werden gesammelt und blockweise geschrieben.
+    Ein Cache-Objekt ist nur im erzeugenden Thread zu verwenden.
+    """
+
+    def __init__(self, cache_file: Path, batch_size: int = 500):
+        """
+        Öffnet den Cache und legt die Datei bei Bedarf an.
+
+        Args:
+            cache_file: Pfad der SQLite-Datei
+            batch_size: Anzahl neuer Einträge, nach der geschrieben wird
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_file = Path(cache_file)
+        self.batch_size = batch_size
+        self._index: Dict[str, Tuple[int, int, str]] = {}
+        self._pending: List[Tuple[str, int, int, int, str]] = []
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.cache_file))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            'path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, '
+            'version INTEGER NOT NULL, metadata TEXT NOT NULL)')
+        self.connection.commit()
+
+    def load(self, root_dir: Path) -> int:
+        """
+        Lädt die Einträge unterhalb eines Verzeichnisses.
+
+        Args:
+            root_dir: Gescanntes Verzeichnis
+
+        Returns:
+            Anzahl der geladenen Einträge
+        """
+        prefix = self._prefix(root_dir)
+        rows = self.connection.execute(
+            'SELECT path, size, mtime_ns, metadata FROM documents '
+            'WHERE version = ? AND path >= ? AND path < ?',
+            (SCAN_CACHE_VERSION, prefix, prefix + '\U0010ffff'))
+        self._index = {path: (size, mtime_ns, metadata) for path, size, mtime_ns, metadata in rows}
+        return len(self._index)
+
+    def lookup(self, path: str, size: int, mtime_ns: int) -> Optional[Dict[str, Any]]:
+        """
+        Liefert die gespeicherten Metadaten, sofern Größe und Änderungszeit übereinstimmen.
+
+        Args:
+            path: Pfad der Datei
+            size: Aktuelle Größe in Bytes
+            mtime_ns: Aktuelle Änderungszeit in Nanosekunden
+
+        Returns:
+            Metadaten oder None bei einem Fehltreffer
+        """
+        entry = self._index.get(path)
+        if entry is None or entry[0] != size or entry[1] != mtime_ns:
+            return None
+        try:
+            return json.loads(entry[2])
+        except ValueError:
+            return None
+
+    def put(self, path: str, size: int, mtime_ns: int, metadata: Dict[str, Any]) -> None:
+        """
+        Merkt neue Metadaten für eine Datei vor; geschrieben wird blockweise.
+
+        Args:
+            path: Pfad der Datei
+            size: Größe in Bytes beim Scan
+            mtime_ns: Änderungszeit in Nanosekunden beim Scan
+            metadata: Extrahierte Metadaten
+        """
+        self._pending.append((path, size, mtime_ns, SCAN_CACHE_VERSION,
+                              json.dumps(metadata, ensure_ascii=False, default=str)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Schreibt alle vorgemerkten Einträge in einer Transaktion"""
+        if not self._pending:
+            return
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO documents (path, size, mtime_ns, version, metadata) '
+                'VALUES (?, ?, ?, ?, ?)', self._pending)
+        self._pending = []
+
+    def prune(self, root_dir: Path, seen: Set[str]) -> int:
+        """
+        Entfernt Einträge unterhalb eines Verzeichnisses, deren Dateien nicht mehr existieren.
+
+        Args:
+            root_dir: Gescanntes Verzeichnis
+            seen: Pfade aller beim Scan gefundenen Dateien
+
+        Returns:
+            Anzahl der entfernten Einträge
+        """
+        prefix = self._prefix(root_dir)
+        rows = self.connection.execute(
+            'SELECT path FROM documents WHERE path >= ? AND path < ?', (prefix, prefix + '\U0010ffff'))
+        stale = [(path,) for (path,) in rows if path not in seen]
+        if stale:
+            with self.connection:
+                self.connection.executemany('DELETE FROM documents WHERE path = ?', stale)
+        return len(stale)
+
+    def close(self) -> None:
+        """Schreibt ausstehende Einträge und schließt die Datei"""
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    @staticmethod
+    def _prefix(root_dir: Path) -> str:
+        return str(Path(root_dir)).rstrip(os.sep) + os.sep
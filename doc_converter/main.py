@@ -7,11 +7,13 @@ import os
 import sys
 import json
 import time
+import shutil
 import logging
 import argparse
+import tempfile
 import concurrent.futures
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional, Set
+from typing import Dict, Any, List, Tuple, Optional, Set, Union
 
 # Importe für die Pipeline-Komponenten
 from .inventory.document_classifier import DocumentClassifier
@@ -29,26 +31,34 @@ from .processing.cleaner import MarkdownCleaner
 from .processing.validator import MarkdownValidator
 from .processing.structure_fixer import StructureFixer
 from .processing.table_formatter import TableFormatter
+from .processing.pipeline import PostProcessingPipeline
 
-from .utils.file_utils import get_files_in_directory, is_file_supported, create_directory
+from .utils.file_utils import get_files_in_directory, is_file_supported, create_directory, calculate_file_hash
 from .utils.config import ConfigManager
+from .utils.logger import PipelineLogger
+from .utils.worker_pool import WorkerPool
+from .utils.conversion_cache import ConversionCache, NEUTRAL_CONFIG_KEYS
+from .utils.asset_store import AssetStore
 
 
 class DocConverter:
     """Hauptklasse für die Dokumentenkonvertierungspipeline"""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[Union[str, Dict[str, Any]]] = None):
         """
         Initialisiert die Konvertierungspipeline.
         
         Args:
-            config_path: Pfad zur Konfigurationsdatei
+            config_path: Pfad zur Konfigurationsdatei oder bereits geladene Konfiguration
         """
         # Setup Logging
         self.logger = logging.getLogger(__name__)
         
         # Lade Konfiguration
-        self.config = ConfigManager.load_config(config_path)
+        if isinstance(config_path, dict):
+            self.config = config_path
+        else:
+            self.config = ConfigManager.load_config(config_path)
         
         # Verzeichnispfade
         self.source_dir = Path(self.config.get('source_dir', 'data/raw_docs'))
@@ -64,12 +74,28 @@ class DocConverter:
         self.max_workers = self.config.get('max_workers', 4)
         self.post_processing = self.config.get('post_processing', True)
         self.validate_results = self.config.get('validate_results', True)
+        self.conversion_backend = self.config.get('conversion_backend', 'process')
+        self.conversion_timeout = self.config.get('conversion_timeout', 600)
         self.supported_extensions = self.config.get('supported_extensions', 
             ['.pdf', '.docx', '.doc', '.xlsx', '.xls', '.pptx', '.ppt', '.html', '.htm', '.md', '.txt'])
         
         # Initialisiere Komponenten
         self._init_components()
         
+        # Konvertierungs-Cache: unveränderte Dokumente werden nicht erneut konvertiert
+        self.conversion_cache = None
+        if self.config.get('conversion_cache', True):
+            self.conversion_cache = ConversionCache(
+                Path(self.config.get('cache_dir', 'doc_converter/data/cache')),
+                link_mode=self.config.get('cache_link_mode', 'hardlink'))
+        
+        # Ergebnisrelevante Konfiguration für den Cache-Schlüssel, inklusive der Vorlagen
+        self.cache_config = {key: value for key, value in self.config.items() if key not in NEUTRAL_CONFIG_KEYS}
+        self.cache_config['templates'] = {
+            path.name: calculate_file_hash(path)
+            for path in (self.pdf_converter.markdown_template_path, self.pdf_converter.frontmatter_template_path)
+        }
+        
         # Converter-Mapping
         self.converters = {
             '.pdf': self.pdf_converter,
@@ -105,11 +131,34 @@ class DocConverter:
         self.html_converter = HTMLConverter(self.config)
         self.pptx_converter = PowerPointConverter(self.config)
         
+        # Ein Bildspeicher für alle Converter, damit Bilder dokument- und formatübergreifend
+        # nur einmal verarbeitet und gespeichert werden
+        self.asset_store = AssetStore(Path(self.config.get('asset_store_dir', 'doc_converter/data/assets')),
+                                      link_mode=self.config.get('cache_link_mode', 'hardlink'))
+        for converter in (self.pdf_converter, self.docx_converter, self.excel_converter,
+                          self.html_converter, self.pptx_converter):
+            converter.asset_store = self.asset_store
+        
         # Processing-Komponenten
         self.cleaner = MarkdownCleaner(self.config)
         self.validator = MarkdownValidator(self.config)
         self.structure_fixer = StructureFixer(self.config)
         self.table_formatter = TableFormatter(self.config)
+        
+        # Nachbearbeitung im Speicher: ein Dokumentobjekt, ein Schreibzugriff pro Datei
+        self.post_processing_logger = PipelineLogger('post_processing')
+        validator = self.validator.validate_document if self.validate_results else None
+        markdown_stages = [
+            ('structure', self.structure_fixer.improve_document),
+            ('clean', self.cleaner.clean_document)
+        ]
+        conversion_stages = markdown_stages + [('tables', self.table_formatter.format_document)]
+        self.markdown_pipeline = PostProcessingPipeline(
+            markdown_stages, validator=validator, pipeline_logger=self.post_processing_logger)
+        self.conversion_pipeline = PostProcessingPipeline(
+            conversion_stages, validator=validator, pipeline_logger=self.post_processing_logger)
+        self.directory_pipeline = PostProcessingPipeline(
+            conversion_stages, pipeline_logger=self.post_processing_logger)
     
     def inventory_directory(self) -> Dict[str, Any]:
         """
@@ -121,10 +170,11 @@ class DocConverter:
         try:
             self.logger.info(f"Starte Inventarisierung von: {self.source_dir}")
             
-            # Scanne das Verzeichnis
-            inventory_df = self.scanner.scan_directory(self.source_dir)
+            # Scanne das Verzeichnis und klassifiziere die Dokumente, sobald der Scanner sie liefert
+            documents = self.classifier.classify_stream(self.scanner.iter_documents(self.source_dir))
+            classified_df = self.report_generator.collect_documents(documents)
             
-            if inventory_df.empty:
+            if classified_df.empty:
                 self.logger.warning(f"Keine Dokumente in {self.source_dir} gefunden")
                 return {
                     'success': False,
@@ -132,8 +182,7 @@ class DocConverter:
                     'document_count': 0
                 }
             
-            # Klassifiziere die Dokumente
-            classified_df = self.classifier.classify_documents(inventory_df)
+            inventory_df = classified_df.drop(columns=DocumentClassifier.CLASSIFICATION_COLUMNS)
             
             # Speichere die Inventardaten
             inventory_file = self.inventory_dir / "document_inventory.csv"
@@ -216,6 +265,17 @@ class DocConverter:
                     results['converted'] += group_results['converted']
                     results['failed'] += group_results['failed']
                     results['details'].extend(group_results['details'])
+                    
+                    # Cache-Zusammenfassungen der Gruppen addieren (je Gruppe ein Manifest)
+                    if 'cache' in group_results:
+                        cache = results.setdefault('cache', dict.fromkeys(group_results['cache'], 0))
+                        for name, value in group_results['cache'].items():
+                            cache[name] += value
+                        results.setdefault('manifests', []).append(group_results['manifest'])
+                    
+                    assets = results.setdefault('assets', {})
+                    for name, value in group_results.get('assets', {}).items():
+                        assets[name] = assets.get(name, 0) + value
                 
                 return results
             
@@ -272,6 +332,7 @@ class DocConverter:
             }
         
         self.logger.info(f"Konvertiere {len(files)} Dateien")
+        started = time.perf_counter()
         
         results = {
             'success': True,
@@ -280,8 +341,15 @@ class DocConverter:
             'details': []
         }
         
-        if self.parallel_processing and len(files) > 1:
-            # Parallele Verarbeitung
+        # Unveränderte Dokumente direkt übernehmen; nur neue und geänderte gehen an die Worker
+        if self.conversion_cache is not None:
+            files = self._reuse_cached_documents(files, results)
+        
+        if self.parallel_processing and len(files) > 1 and self.conversion_backend == 'process':
+            # Parallele Verarbeitung in Worker-Prozessen (umgeht die GIL, mit Zeit- und Speicherlimits)
+            self._convert_files_in_processes(files, results)
+        elif self.parallel_processing and len(files) > 1:
+            # Parallele Verarbeitung in Threads
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
                 # Erstelle Future-Objekte für jede Datei
                 future_to_file = {
@@ -330,18 +398,306 @@ class DocConverter:
                         'error': str(e)
                     })
         
+        # Laufzeiten der Nachbearbeitungsstufen zusammenfassen
+        if self.post_processing:
+            self.post_processing_logger.log_metrics()
+        
+        # Deduplizierung der extrahierten Bilder
+        self.asset_store.log_stats()
+        results['assets'] = self.asset_store.drain_stats()
+        
+        # Wirkung des Konvertierungs-Caches auf die Laufzeit festhalten
+        if self.conversion_cache is not None:
+            self._write_cache_manifest(results, time.perf_counter() - started)
+        
         return results
     
-    def convert_document(self, source_path: Path) -> Dict[str, Any]:
+    def _reuse_cached_documents(self, files: List[Path], results: Dict[str, Any]) -> List[Path]:
+        """
+        Übernimmt alle Dokumente mit Cache-Treffer in die Ergebnisse.
+        
+        Args:
+            files: Liste von Dateipfaden
+            results: Ergebnis-Dictionary, das um die Treffer ergänzt wird
+            
+        Returns:
+            Dateien, die konvertiert werden müssen
+        """
+        remaining = []
+        for file in files:
+            _, result = self._lookup_cache(Path(file), self.target_dir)
+            if result is None:
+                remaining.append(file)
+            else:
+                results['converted'] += 1
+                results['details'].append(result)
+        
+        if len(remaining) < len(files):
+            self.logger.info(f"{len(files) - len(remaining)} Dateien unverändert, {len(remaining)} werden konvertiert")
+        return remaining
+    
+    def _write_cache_manifest(self, results: Dict[str, Any], wall_time: float) -> None:
+        """
+        Schreibt das Manifest eines Konvertierungslaufs und ergänzt die Ergebnisse um die Zusammenfassung.
+        
+        Args:
+            results: Ergebnis-Dictionary von _convert_files
+            wall_time: Gesamtlaufzeit des Laufs in Sekunden
+        """
+        summary = {
+            'documents': len(results['details']),
+            'reused': 0,
+            'converted': 0,
+            'uncached': 0,
+            'failed': results['failed'],
+            'wall_time': round(wall_time, 3),
+            'conversion_time': 0.0,
+            'reused_conversion_time': 0.0
+        }
+        documents = []
+        
+        for detail in results['details']:
+            cache = detail.get('cache', {})
+            status = cache.get('status', 'uncached')
+            conversion_time = cache.get('conversion_time', 0.0)
+            if status == 'hit':
+                summary['reused'] += 1
+                summary['reused_conversion_time'] += conversion_time
+            elif status == 'miss':
+                summary['converted'] += 1
+                summary['conversion_time'] += conversion_time
+            else:
+                summary['uncached'] += 1
+            
+            documents.append({
+                'source': detail.get('source', ''),
+                'target': detail.get('target', ''),
+                'success': detail.get('success', False),
+                'cache': status,
+                'elapsed': round(cache.get('elapsed', 0.0), 3),
+                'conversion_time': round(conversion_time, 3)
+            })
+        
+        summary['conversion_time'] = round(summary['conversion_time'], 3)
+        summary['reused_conversion_time'] = round(summary['reused_conversion_time'], 3)
+        
+        manifest_path = self.conversion_cache.write_manifest({
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'target_dir': str(self.target_dir),
+            'summary': summary,
+            'assets': results.get('assets', {}),
+            'documents': documents
+        })
+        
+        self.logger.info(
+            f"Konvertierungs-Cache: {summary['reused']} übernommen, {summary['converted']} konvertiert, "
+            f"{summary['failed']} fehlgeschlagen; Laufzeit {wall_time:.1f}s, "
+            f"eingesparte Konvertierungszeit {summary['reused_conversion_time']:.1f}s (Manifest: {manifest_path})")
+        
+        results['cache'] = summary
+        results['manifest'] = str(manifest_path)
+    
+    def _worker_config(self) -> Dict[str, Any]:
+        """Konfiguration für Worker-Prozesse inklusive nachträglich gesetzter Optionen (z.B. per CLI)"""
+        worker_config = dict(self.config)
+        worker_config.update({
+            'source_dir': str(self.source_dir),
+            'target_dir': str(self.target_dir),
+            'post_processing': self.post_processing,
+            'validate_results': self.validate_results,
+            'conversion_cache': self.conversion_cache is not None,
+            'parallel_processing': False,
+            'log_level': logging.getLevelName(logging.getLogger().getEffectiveLevel())
+        })
+        return worker_config
+    
+    def _convert_files_in_processes(self, files: List[Path], results: Dict[str, Any]) -> None:
+        """
+        Konvertiert Dateien in einem Pool von Worker-Prozessen.
+        
+        Jeder Worker erzeugt einmalig eine eigene DocConverter-Instanz. Dokumente, die das
+        Zeitlimit oder das Speicherlimit überschreiten, werden abgebrochen und als
+        fehlgeschlagen gemeldet; der betroffene Worker wird ersetzt.
+        
+        Args:
+            files: Liste von Dateipfaden
+            results: Ergebnis-Dictionary, das fortlaufend ergänzt wird
+        """
+        pool = WorkerPool(
+            _convert_in_worker,
+            max_workers=min(self.max_workers, len(files)),
+            initializer=_init_conversion_worker,
+            initargs=(self._worker_config(),),
+            task_timeout=self.conversion_timeout,
+            memory_limit_mb=self.config.get('worker_memory_limit_mb', 0),
+            recycle_memory_mb=self.config.get('worker_recycle_memory_mb', 0),
+            max_tasks_per_worker=self.config.get('worker_max_tasks', 0),
+            start_method=self.config.get('worker_start_method')
+        )
+        
+        with pool:
+            for file, success, value in pool.map_unordered(files):
+                if success:
+                    result, metrics, asset_stats = value
+                    self.post_processing_logger.merge_metrics(metrics)
+                    self.asset_store.merge_stats(asset_stats)
+                else:
+                    self.logger.error(f"Fehler bei der Konvertierung von {file}: {value}")
+                    result = {
+                        'success': False,
+                        'source': str(file),
+                        'error': value
+                    }
+                
+                if result['success']:
+                    results['converted'] += 1
+                else:
+                    results['failed'] += 1
+                
+                results['details'].append(result)
+    
+    def convert_document(self, source_path: Path, target_dir: Optional[Path] = None,
+                         post_processing: Optional[bool] = None) -> Dict[str, Any]:
         """
         Konvertiert ein einzelnes Dokument.
         
+        Mit Konvertierungs-Cache wird ein unverändertes Dokument (gleicher Inhalt, gleiche
+        Converter-Version und Konfiguration) nicht erneut konvertiert, sondern aus dem Cache
+        ins Zielverzeichnis verknüpft. Neue oder geänderte Dokumente werden in ein
+        temporäres Verzeichnis konvertiert und von dort in den Cache übernommen.
+        
+        Args:
+            source_path: Pfad zur Quelldatei
+            target_dir: Zielverzeichnis (Standard: konfiguriertes Zielverzeichnis)
+            post_processing: Nachbearbeitung für dieses Dokument (Standard: self.post_processing);
+                gilt nur für diesen Aufruf, sodass parallele Aufrufe sich nicht beeinflussen
+            
+        Returns:
+            Dictionary mit Informationen über die Konvertierung
+        """
+        source_path = Path(source_path)
+        target_dir = Path(target_dir) if target_dir is not None else self.target_dir
+        if post_processing is None:
+            post_processing = self.post_processing
+        if self.conversion_cache is None:
+            return self._convert_document(source_path, target_dir, post_processing)
+        
+        started = time.perf_counter()
+        key, cached_result = self._lookup_cache(source_path, target_dir, post_processing)
+        if cached_result is not None:
+            return cached_result
+        if key is None:
+            return self._convert_document(source_path, target_dir, post_processing)
+        
+        staging_dir = Path(tempfile.mkdtemp(prefix='convert_', dir=self.temp_dir))
+        try:
+            result = self._convert_document(source_path, staging_dir, post_processing)
+            if not result['success']:
+                return result
+            conversion_time = time.perf_counter() - started
+            
+            # Fallback-Ergebnisse nach Fehlern (z.B. reiner Text) nicht wiederverwenden
+            reusable = not result.get('metadata', {}).get('error')
+            entry = self.conversion_cache.store(key, staging_dir, Path(result['target']), result,
+                                                conversion_time, reusable=reusable)
+            target_path = self.conversion_cache.materialize(entry, target_dir)
+            
+            return {
+                **result,
+                'target': str(target_path),
+                'cache': {
+                    'status': 'miss' if reusable else 'uncached',
+                    'key': key,
+                    'elapsed': time.perf_counter() - started,
+                    'conversion_time': conversion_time
+                }
+            }
+        
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Konvertierung von {source_path}: {e}", exc_info=True)
+            return {
+                'success': False,
+                'source': str(source_path),
+                'error': str(e)
+            }
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    def _lookup_cache(self, source_path: Path, target_dir: Path,
+                      post_processing: Optional[bool] = None) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Sucht ein Dokument im Konvertierungs-Cache und legt es bei einem Treffer im Zielverzeichnis an.
+        
         Args:
             source_path: Pfad zur Quelldatei
+            target_dir: Zielverzeichnis
+            post_processing: Nachbearbeitung (Standard: self.post_processing)
+            
+        Returns:
+            Tuple aus (Cache-Schlüssel oder None, Ergebnis bei einem Treffer oder None)
+        """
+        started = time.perf_counter()
+        try:
+            key = self.conversion_cache.make_key(source_path, self._cache_fingerprint(source_path, post_processing))
+            entry = self.conversion_cache.lookup(key) if key else None
+            if entry is None:
+                return key, None
+            target_path = self.conversion_cache.materialize(entry, target_dir)
+        except Exception as e:
+            self.logger.warning(f"Konvertierungs-Cache für {source_path} nicht verfügbar: {e}")
+            return None, None
+        
+        self.logger.info(f"Unverändert, aus Cache übernommen: {source_path} -> {target_path}")
+        return key, {
+            **entry['result'],
+            'source': str(source_path),
+            'target': str(target_path),
+            'cache': {
+                'status': 'hit',
+                'key': key,
+                'elapsed': time.perf_counter() - started,
+                'conversion_time': entry['conversion_time']
+            }
+        }
+    
+    def _cache_fingerprint(self, source_path: Path, post_processing: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Beschreibt alles außer dem Dateiinhalt, was das Konvertierungsergebnis bestimmt.
+        
+        Args:
+            source_path: Pfad zur Quelldatei
+            post_processing: Nachbearbeitung (Standard: self.post_processing)
+            
+        Returns:
+            Dictionary für den Cache-Schlüssel
+        """
+        converter = self.converters.get(source_path.suffix.lower())
+        if post_processing is None:
+            post_processing = self.post_processing
+        return {
+            'converter': type(converter).__name__ if converter is not None else source_path.suffix.lower(),
+            'converter_version': converter.version if converter is not None else None,
+            'post_processing': post_processing and PostProcessingPipeline.version,
+            'validate_results': self.validate_results,
+            'config': self.cache_config
+        }
+    
+    def _convert_document(self, source_path: Path, target_dir: Path,
+                          post_processing: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Konvertiert ein einzelnes Dokument ohne Cache.
+        
+        Args:
+            source_path: Pfad zur Quelldatei
+            target_dir: Verzeichnis für Markdown-Datei und Assets
+            post_processing: Nachbearbeitung (Standard: self.post_processing)
             
         Returns:
             Dictionary mit Informationen über die Konvertierung
         """
+        if post_processing is None:
+            post_processing = self.post_processing
+        
         try:
             self.logger.info(f"Konvertiere Dokument: {source_path}")
             
@@ -355,8 +711,8 @@ class DocConverter:
                 }
             
             # Bestimme Zieldateiname
-            rel_path = source_path.relative_to(self.source_dir) if source_path.is_relative_to(self.source_dir) else source_path.name
-            target_path = self.target_dir / f"{rel_path.stem}.md"
+            rel_path = source_path.relative_to(self.source_dir) if source_path.is_relative_to(self.source_dir) else Path(source_path.name)
+            target_path = target_dir / f"{rel_path.stem}.md"
             
             # Erstelle Zielverzeichnis
             target_path.parent.mkdir(parents=True, exist_ok=True)
@@ -368,35 +724,20 @@ class DocConverter:
             if converter is None:
                 if source_path.suffix.lower() in ['.md', '.txt']:
                     # Kopiere Datei direkt (mit optionaler Verarbeitung)
-                    import shutil
-                    
-                    if self.post_processing and source_path.suffix.lower() == '.md':
-                        # Bei Markdown-Dateien: Verbessere Struktur und reinige
+                    if post_processing and source_path.suffix.lower() == '.md':
+                        # Bei Markdown-Dateien: Struktur verbessern, bereinigen und optional validieren
                         try:
-                            # Zuerst Struktur verbessern
-                            structure_result = self.structure_fixer.improve_structure(source_path, target_path)
-                            
-                            # Dann bereinigen
-                            clean_result = self.cleaner.clean(target_path)
-                            
-                            # Optional: Validieren
-                            if self.validate_results:
-                                validation = self.validator.validate(target_path)
-                                
-                                return {
-                                    'success': True,
-                                    'source': str(source_path),
-                                    'target': str(target_path),
-                                    'validation': validation,
-                                    'changes': structure_result.get('changes', []) + clean_result.get('changes', [])
-                                }
+                            pipeline_result = self.markdown_pipeline.process_file(source_path, target_path)
                             
-                            return {
+                            result = {
                                 'success': True,
                                 'source': str(source_path),
                                 'target': str(target_path),
-                                'changes': structure_result.get('changes', []) + clean_result.get('changes', [])
+                                'changes': pipeline_result['changes']
                             }
+                            if 'validation' in pipeline_result:
+                                result['validation'] = pipeline_result['validation']
+                            return result
                         
                         except Exception as e:
                             self.logger.error(f"Fehler bei der Verarbeitung von {source_path}: {e}")
@@ -419,45 +760,9 @@ class DocConverter:
                         'error': f"Kein Converter für Dateityp {source_path.suffix} verfügbar"
                     }
             
-            # Konvertiere das Dokument
-            convert_result = converter.convert(source_path, target_path.parent)
-            
-            # Wenn die Konvertierung erfolgreich war und Nachbearbeitung aktiviert ist
-            if convert_result.get('success', False) and self.post_processing:
-                try:
-                    # Hole den Pfad zur konvertierten Datei
-                    md_path = Path(convert_result.get('target', ''))
-                    
-                    if md_path.exists():
-                        # Verbessere die Struktur
-                        structure_result = self.structure_fixer.improve_structure(md_path)
-                        
-                        # Bereinige das Markdown
-                        clean_result = self.cleaner.clean(md_path)
-                        
-                        # Formatiere Tabellen
-                        table_result = self.table_formatter.format_tables(md_path)
-                        
-                        # Füge Änderungen hinzu
-                        if 'changes' not in convert_result:
-                            convert_result['changes'] = []
-                        
-                        convert_result['changes'].extend(structure_result.get('changes', []))
-                        convert_result['changes'].extend(clean_result.get('changes', []))
-                        convert_result['changes'].extend(table_result.get('changes', []))
-                        
-                        # Optional: Validiere das Ergebnis
-                        if self.validate_results:
-                            validation = self.validator.validate(md_path)
-                            convert_result['validation'] = validation
-                
-                except Exception as e:
-                    self.logger.error(f"Fehler bei der Nachbearbeitung von {source_path}: {e}")
-                    # Füge Fehlerinformation hinzu, aber Konvertierung bleibt erfolgreich
-                    if 'changes' not in convert_result:
-                        convert_result['changes'] = []
-                    
-                    convert_result['changes'].append(f"Fehler bei der Nachbearbeitung: {str(e)}")
+            # Konvertiere das Dokument; die Nachbearbeitung läuft im Speicher vor dem Schreiben
+            post_processor = self.conversion_pipeline if post_processing else None
+            convert_result = converter.convert(source_path, target_path.parent, post_processor=post_processor)
             
             return convert_result
             
@@ -643,25 +948,16 @@ class DocConverter:
             # Verarbeite jede Markdown-Datei
             for md_file in markdown_files:
                 try:
-                    # Führe alle Verarbeitungsschritte nacheinander aus
-                    structure_result = self.improve_structure(md_file)
-                    clean_result = self.clean_markdown(md_file)
-                    table_result = self.format_tables(md_file)
+                    # Alle Verarbeitungsschritte in einem Durchlauf (einmal lesen, einmal schreiben)
+                    pipeline_result = self.directory_pipeline.process_file(md_file)
                     
                     # Überprüfe, ob alle Schritte erfolgreich waren
-                    if (structure_result.get('success', False) and 
-                        clean_result.get('success', False) and 
-                        table_result.get('success', False)):
-                        
+                    if pipeline_result['success']:
                         results['processed'] += 1
                         results['details'].append({
                             'success': True,
                             'path': str(md_file),
-                            'changes': (
-                                structure_result.get('changes', []) + 
-                                clean_result.get('changes', []) + 
-                                table_result.get('changes', [])
-                            )
+                            'changes': pipeline_result['changes']
                         })
                     else:
                         results['failed'] += 1
@@ -680,6 +976,7 @@ class DocConverter:
                         'error': str(e)
                     })
             
+            self.post_processing_logger.log_metrics()
             return results
         
         except Exception as e:
@@ -692,6 +989,27 @@ class DocConverter:
             }
 
 
+# DocConverter-Instanz eines Worker-Prozesses, einmalig pro Prozess erzeugt
+_worker_converter: Optional[DocConverter] = None
+
+
+def _init_conversion_worker(config: Dict[str, Any]) -> None:
+    """Initialisiert einen Worker-Prozess: Converter aufwärmen"""
+    global _worker_converter
+    
+    # Kein LogManager.setup_logging() hier: der WorkerPool leitet das Logging bereits an den
+    # Parent weiter, ein eigener RotatingFileHandler pro Worker würde die Log-Datei
+    # gleichzeitig aus mehreren Prozessen schreiben und rotieren
+    _worker_converter = DocConverter(config)
+
+
+def _convert_in_worker(source_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, int]]:
+    """Konvertiert ein Dokument im Worker-Prozess; liefert Ergebnis, Metriken der Nachbearbeitung und Bildstatistik"""
+    result = _worker_converter.convert_document(Path(source_path))
+    return (result, _worker_converter.post_processing_logger.drain_metrics(),
+            _worker_converter.asset_store.drain_stats())
+
+
 def parse_args():
     """Parst die Kommandozeilenargumente"""
     parser = argparse.ArgumentParser(description='Dokumentenkonvertierungs-Pipeline')
@@ -702,6 +1020,8 @@ def parse_args():
     # Inventar-Befehl
     inventory_parser = subparsers.add_parser('inventory', help='Inventarisiert Dokumente')
     inventory_parser.add_argument('--source-dir', type=str, help='Quellverzeichnis')
+    inventory_parser.add_argument('--no-cache', action='store_true',
+                                  help='Metadaten aller Dokumente neu lesen, ohne den Inventar-Cache zu verwenden')
     
     # Konvertieren-Befehl
     convert_parser = subparsers.add_parser('convert', help='Konvertiert Dokumente')
@@ -710,6 +1030,11 @@ def parse_args():
     convert_parser.add_argument('--priority', type=str, help='Prioritätsgruppe (z.B. "Gruppe 1 (Hohe Priorität)")')
     convert_parser.add_argument('--parallel', action='store_true', help='Aktiviert parallele Verarbeitung')
     convert_parser.add_argument('--workers', type=int, default=4, help='Anzahl der Worker für parallele Verarbeitung')
+    convert_parser.add_argument('--backend', choices=['process', 'thread'],
+                                help='Worker-Prozesse (Standard) oder Threads für die parallele Verarbeitung')
+    convert_parser.add_argument('--timeout', type=float, help='Zeitlimit pro Dokument in Sekunden (0 = unbegrenzt)')
+    convert_parser.add_argument('--no-cache', action='store_true',
+                                help='Alle Dokumente neu konvertieren, ohne den Konvertierungs-Cache zu verwenden')
     
     # Einzelne Datei konvertieren
     file_parser = subparsers.add_parser('convert-file', help='Konvertiert eine einzelne Datei')
@@ -758,6 +1083,9 @@ def main():
         if args.source_dir:
             converter.source_dir = Path(args.source_dir)
         
+        if args.no_cache:
+            converter.scanner.use_cache = False
+        
         # Führe Inventarisierung durch
         result = converter.inventory_directory()
         
@@ -791,6 +1119,15 @@ def main():
         if args.workers:
             converter.max_workers = args.workers
         
+        if args.backend:
+            converter.conversion_backend = args.backend
+        
+        if args.timeout is not None:
+            converter.conversion_timeout = args.timeout
+        
+        if args.no_cache:
+            converter.conversion_cache = None
+        
         # Führe Konvertierung durch
         result = converter.convert_all(args.priority)
         
@@ -798,6 +1135,12 @@ def main():
         if result['success']:
             print(f"Konvertierung abgeschlossen. {result['converted']} Dokumente erfolgreich konvertiert, {result['failed']} fehlgeschlagen.")
             
+            if 'cache' in result:
+                cache = result['cache']
+                print(f"Davon {cache['reused']} unverändert aus dem Cache übernommen "
+                      f"({cache['reused_conversion_time']:.1f}s Konvertierungszeit eingespart), "
+                      f"Laufzeit {cache['wall_time']:.1f}s.")
+            
             if result['failed'] > 0:
                 print("\nFehlgeschlagene Dokumente:")
                 for detail in result.get('details', []):
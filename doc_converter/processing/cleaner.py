@@ -9,7 +9,326 @@ import yaml
 from pathlib import Path
 import logging
 import html
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+from .rules import (
+    Rule, LineRule, RuleEngine, RuleState,
+    BLANK, HEADING, BULLET, ORDERED, TABLE, FENCE, INDENTED, TEXT
+)
+
+
+# Trennzeile einer Markdown-Tabelle
+TABLE_DELIMITER_PATTERN = re.compile(r'^\|[-:| ]+\|$')
+# Unterstreichung einer Setext-Überschrift
+SETEXT_UNDERLINE_PATTERN = re.compile(r'[=\-]{3,}')
+# Eintrag einer nummerierten Liste
+ORDERED_ITEM_PATTERN = re.compile(r'([ \t]*)(\d+)\.[ \t]+')
+# ATX-Überschrift mit Inhalt
+ATX_HEADING_PATTERN = re.compile(r'#+\s+.')
+# Zeilen, die nicht umgebrochen werden (Überschriften, Code, Tabellen, Bilder, Listen)
+NO_WRAP_PATTERN = re.compile(r'\s*(?:#+\s|```|\||!\[|[*+-]\s|\d+\.\s)')
+# Einfache Heuristik für häufige Sprachen in Codeblöcken
+CODE_LANGUAGE_PATTERNS = [
+    (re.compile(r'function\s+\w+\s*\(.*\)\s*{'), 'javascript'),
+    (re.compile(r'def\s+\w+\s*\(.*\):'), 'python'),
+    (re.compile(r'public\s+static\s+void\s+main'), 'java'),
+    (re.compile(r'<\?php'), 'php'),
+    (re.compile(r'#include\s+<'), 'c'),
+    (re.compile(r'SELECT\s+.*\s+FROM\s+.*', re.IGNORECASE), 'sql'),
+]
+
+
+def detect_code_language(code: str) -> str:
+    """Errät die Sprache eines Codeblocks (leer, falls unbekannt)"""
+    for pattern, language in CODE_LANGUAGE_PATTERNS:
+        if pattern.search(code):
+            return language
+    return ''
+
+
+class SetextHeadingRule(LineRule):
+    """Wandelt Setext-Überschriften (Zeile mit === oder --- darunter) in ATX-Überschriften um"""
+    
+    kinds = frozenset({BULLET, TEXT})
+    messages = ("Konvertierte {count} Setext-Überschriften zu ATX-Überschriften",)
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.merged = -1  # Index der zuletzt umgewandelten Zeile
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if not out or not out[-1] or state.merged == len(out) - 1 or not SETEXT_UNDERLINE_PATTERN.fullmatch(line):
+            return line
+        out[-1] = f"{'#' if line[0] == '=' else '##'} {out[-1]}"
+        state.merged = len(out) - 1
+        state.add(self.messages[0])
+        return None
+
+
+class TableRepairRule(LineRule):
+    """Ergänzt fehlende Trennzeilen und gleicht die Spaltenanzahl jeder Tabellenzeile an den Tabellenkopf an"""
+    
+    messages = ("Korrigierte {count} Tabellen",)
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.rows = 0  # Länge der offenen Tabelle am Ende der Ausgabe
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if kind == TABLE and line.startswith('|') and line.rstrip().endswith('|'):
+            state.rows += 1
+            return line
+        self._close(out, state)
+        return line
+    
+    def finish(self, out: List[str], state: RuleState) -> None:
+        self._close(out, state)
+    
+    def _close(self, out: List[str], state: RuleState) -> None:
+        rows, state.rows = state.rows, 0
+        if rows < 2:
+            return
+        fixed = self._repair(out[-rows:])
+        if fixed is not None:
+            out[-rows:] = fixed
+            state.add(self.messages[0])
+    
+    @staticmethod
+    def _repair(rows: List[str]) -> Optional[List[str]]:
+        """Liefert die korrigierten Zeilen einer Tabelle oder None, wenn sie bereits korrekt ist"""
+        header_cols = rows[0].count('|') - 1
+        if header_cols < 1:
+            return None
+        delimiter = '|' + '|'.join([' --- '] * header_cols) + '|'
+        fixed = [rows[0]]
+        changed = False
+        
+        body = rows[1:]
+        if TABLE_DELIMITER_PATTERN.match(body[0].rstrip()):
+            if body[0].count('|') - 1 == header_cols:
+                fixed.append(body[0])
+            else:
+                fixed.append(delimiter)
+                changed = True
+            body = body[1:]
+        else:
+            fixed.append(delimiter)
+            changed = True
+        
+        for row in body:
+            cols = row.count('|') - 1
+            if cols == header_cols:
+                fixed.append(row)
+                continue
+            cells = row.strip().strip('|').split('|')
+            if cols < header_cols:
+                cells.extend([' '] * (header_cols - cols))
+            else:
+                cells = cells[:header_cols]
+            fixed.append('|' + '|'.join(cells) + '|')
+            changed = True
+        
+        return fixed if changed else None
+
+
+class OrderedListRule(LineRule):
+    """
+    Nummeriert nummerierte Listen fortlaufend ab 1.
+    
+    Eine Liste endet an der ersten nicht eingerückten Zeile, die weder Listeneintrag
+    noch Leerzeile ist; Einträge in Fenced-Codeblöcken bleiben unverändert.
+    """
+    
+    messages = ("Korrigierte {count} falsch nummerierte Listeneinträge",)
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.lists = {}  # Einrückung -> [(index in out, nummer)]
+        state.in_fence = False
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if kind == FENCE:
+            state.in_fence = not state.in_fence
+            return line
+        if state.in_fence or kind == BLANK:
+            return line
+        
+        match = ORDERED_ITEM_PATTERN.match(line) if kind == ORDERED else None
+        if match:
+            indent = match.group(1)
+            # Ein Eintrag schließt alle tiefer eingerückten Listen
+            for other in [other for other in state.lists if len(other) > len(indent)]:
+                self._close(out, state, other)
+            state.lists.setdefault(indent, []).append((len(out), int(match.group(2))))
+        elif line[0] not in ' \t':
+            for indent in list(state.lists):
+                self._close(out, state, indent)
+        return line
+    
+    def finish(self, out: List[str], state: RuleState) -> None:
+        for indent in list(state.lists):
+            self._close(out, state, indent)
+    
+    def _close(self, out: List[str], state: RuleState, indent: str) -> None:
+        items = state.lists.pop(indent)
+        if len(items) < 2:
+            return
+        for expected, (index, number) in enumerate(items, 1):
+            if number == expected:
+                continue
+            match = ORDERED_ITEM_PATTERN.match(out[index])
+            # Zeile kann inzwischen durch eine andere Regel umgeschrieben worden sein
+            if match and match.group(1) == indent and int(match.group(2)) == number:
+                out[index] = f"{indent}{expected}{out[index][match.end(2):]}"
+                state.add(self.messages[0])
+
+
+class CodeBlockRule(LineRule):
+    """Wandelt eingerückte Codeblöcke in Fenced-Codeblöcke um und ergänzt erkennbare Programmiersprachen"""
+    
+    messages = ("Konvertierte {count} eingerückte Codeblöcke zu Fenced-Codeblöcken",
+                "Programmiersprache bei {count} Codeblöcken ergänzt")
+    own_pass = True
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.block = None  # 'fenced' oder 'indented', solange ein Codeblock offen ist
+        state.start = 0  # Index der öffnenden Fence-Zeile in out
+        state.lang = ''
+        state.in_list = False
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if state.block == 'fenced':
+            if kind == FENCE:
+                self._close(out, state)
+            return line
+        if state.block == 'indented':
+            if kind != BLANK and line.startswith('    '):
+                return line[4:]
+            self._close(out, state)
+            out.append('```')
+        
+        if kind == FENCE:
+            state.block = 'fenced'
+            state.start = len(out)
+            state.lang = line.strip()[3:].strip()
+        elif kind == INDENTED and not state.in_list and (not out or not out[-1].strip()):
+            # Eingerückter Block nach einer Leerzeile, nicht als Fortsetzung eines Listeneintrags
+            state.block = 'indented'
+            state.start = len(out)
+            state.lang = ''
+            out.append('```')
+            state.add(self.messages[0])
+            return line[4:]
+        elif kind in (BULLET, ORDERED):
+            state.in_list = True
+        elif kind != BLANK and line[0] not in ' \t':
+            state.in_list = False
+        return line
+    
+    def finish(self, out: List[str], state: RuleState) -> None:
+        if state.block == 'indented':
+            self._close(out, state)
+            out.append('```')
+    
+    def _close(self, out: List[str], state: RuleState) -> None:
+        """Schließt den Codeblock und ergänzt die Sprache an der öffnenden Fence-Zeile"""
+        if not state.lang:
+            language = detect_code_language('\n'.join(out[state.start + 1:]))
+            if language:
+                out[state.start] = out[state.start].rstrip() + language
+                state.add(self.messages[1])
+        state.block = None
+
+
+class BlankLineRule(LineRule):
+    """Fasst mehrere aufeinanderfolgende Leerzeilen zu einer zusammen"""
+    
+    kinds = frozenset({BLANK})
+    messages = ("Entfernte {count} überflüssige Leerzeilen",)
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.run = -1  # Ausgabeposition des zuletzt gezählten Leerzeilenblocks
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if line or not out or out[-1]:
+            return line
+        if state.run != len(out):
+            state.run = len(out)
+            state.add(self.messages[0])
+        return None
+
+
+class HeadingSpacingRule(LineRule):
+    """Stellt Leerzeilen vor und nach Überschriften sicher (außerhalb von Codeblöcken)"""
+    
+    messages = ("Korrigierte Zeilenumbrüche um {count} Überschriften",)
+    
+    def begin(self) -> RuleState:
+        state = RuleState()
+        state.after_heading = False
+        state.counted = False
+        state.in_fence = False
+        return state
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if state.after_heading:
+            state.after_heading = False
+            if kind != BLANK:
+                out.append('')
+                if not state.counted:
+                    state.add(self.messages[0])
+        
+        if kind == FENCE:
+            state.in_fence = not state.in_fence
+        elif kind == HEADING and not state.in_fence and ATX_HEADING_PATTERN.match(line):
+            state.counted = False
+            if out and out[-1]:
+                out.append('')
+                state.counted = True
+                state.add(self.messages[0])
+            state.after_heading = True
+        return line
+
+
+class TrailingWhitespaceRule(LineRule):
+    """Entfernt Leerzeichen und Tabulatoren am Zeilenende"""
+    
+    messages = ("Entfernte Leerzeichen am Zeilenende in {count} Zeilen",)
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        stripped = line.rstrip(' \t')
+        if len(stripped) != len(line):
+            state.add(self.messages[0])
+            return stripped
+        return line
+
+
+class LineWrapRule(LineRule):
+    """Bricht Fließtextzeilen oberhalb der maximalen Zeilenlänge um"""
+    
+    messages = ("Umbruch von {count} langen Zeilen",)
+    
+    def __init__(self, max_length: int, wrap_line: Callable[[str, int], List[str]]):
+        self.max_length = max_length
+        self.wrap_line = wrap_line
+    
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        if len(line) <= self.max_length or NO_WRAP_PATTERN.match(line):
+            return line
+        wrapped = self.wrap_line(line, self.max_length)
+        if not wrapped:
+            return line
+        state.add(self.messages[0])
+        out.extend(wrapped[:-1])
+        return wrapped[-1]
+
 
 class MarkdownCleaner:
     """Bereinigt und optimiert konvertierte Markdown-Dateien"""
@@ -35,6 +354,9 @@ class MarkdownCleaner:
         self.remove_html = self.config.get('remove_html', False)
         self.max_line_length = self.config.get('max_line_length', 0)  # 0 = keine Zeilenbegrenzung
         self.list_marker = self.config.get('list_marker', '*')  # Standard-Aufzählungszeichen
+        
+        # Alle Muster werden einmalig kompiliert; die Engine hält keinen Zustand zwischen Aufrufen
+        self.engine = RuleEngine(self._build_rules())
     
     def clean(self, markdown_path: Path, output_path: Optional[Path] = None) -> Dict[str, Any]:
         """
@@ -97,6 +419,23 @@ class MarkdownCleaner:
                 'changes': []
             }
     
+    def clean_document(self, document) -> Dict[str, Any]:
+        """
+        Bereinigt ein Dokument der Nachbearbeitungspipeline im Speicher.
+        
+        Args:
+            document: MarkdownDocument aus processing.pipeline (Frontmatter bereits geparst)
+            
+        Returns:
+            Dictionary mit Informationen über die Bereinigung
+        """
+        try:
+            document.body, changes = self._clean_markdown(document.body)
+            return {'success': True, 'changes': changes}
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Bereinigung von {document.path}: {e}", exc_info=True)
+            return {'success': False, 'error': str(e), 'changes': []}
+    
     def _extract_frontmatter(self, content: str) -> Tuple[Dict[str, Any], str]:
         """
         Extrahiert das YAML-Frontmatter aus dem Markdown-Inhalt.
@@ -126,710 +465,112 @@ class MarkdownCleaner:
         # Wenn kein Frontmatter gefunden wurde oder ein Fehler auftrat
         return {}, content
     
-    def _clean_markdown(self, markdown_text: str) -> Tuple[str, List[str]]:
+    def _build_rules(self) -> List[Any]:
         """
-        Führt alle Bereinigungen am Markdown-Text durch.
+        Stellt die Regelliste in Ausführungsreihenfolge zusammen (einmalig pro Cleaner).
         
-        Args:
-            markdown_text: Markdown-Inhalt ohne Frontmatter
-            
         Returns:
-            Tuple aus (bereinigter_text, liste_der_änderungen)
+            Liste aus Rule-, LineRule- und Schrittobjekten für die RuleEngine
         """
-        changes = []
-        cleaned_text = markdown_text
+        rules: List[Any] = [
+            # Steuerzeichen und Windows-Zeilenumbrüche zuerst, damit alle Zeilenregeln saubere Zeilen sehen
+            Rule(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', "Entfernte {count} Steuerzeichen"),
+            Rule(r'[\uFFFD\uFFFE\uFFFF]', lambda m: f"\\u{ord(m.group(0)):04x}",
+                 "Ersetzte {count} nicht druckbare Unicode-Zeichen"),
+            Rule(r'\r\n', '\n', "Konvertierte {count} Windows-Zeilenumbrüche zu Unix-Zeilenumbrüchen", trigger='\r'),
+        ]
         
-        # 1. Korrigiere Überschriften
+        # Ein Zeilendurchlauf für Überschriften, Links, Tabellen und Listen
         if self.fix_headings:
-            new_text, heading_changes = self._fix_headings(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(heading_changes)
+            rules += [
+                Rule(r'^(#+)([^#\s])', r'\1 \2', "Korrigierte {count} Überschriften (fehlendes Leerzeichen nach #)",
+                     line=True, kinds=(HEADING,)),
+                Rule(r'^(#+\s+.*?)(\s+#+)$', r'\1', "Entfernte {count} überflüssige #-Zeichen am Ende von Überschriften",
+                     line=True, kinds=(HEADING,)),
+                SetextHeadingRule(),
+            ]
         
-        # 2. Korrigiere Links und Bilder
         if self.fix_links:
-            new_text, link_changes = self._fix_links(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(link_changes)
+            rules += [
+                Rule(r'\[([^\]]*)\]\(\(+([^)]+)\)+', r'[\1](\2)', "Korrigierte {count} Links mit doppelten Klammern",
+                     line=True, trigger=']('),
+                Rule(r'\[([^\]]*)\]\(\s+([^)]+?)\s+\)', r'[\1](\2)',
+                     "Entfernte Leerzeichen innerhalb der Link-Klammern bei {count} Links", line=True, trigger=']('),
+                Rule(r'\[([^\]]*)\]\(\\([^)]+)\)', r'[\1](\2)', "Entfernte Escape-Zeichen in {count} Link-URLs",
+                     line=True, trigger=']('),
+                Rule(r'\[\s*\]\(([^)]+)\)', r'[\1](\1)', "Ersetzte {count} leere Link-Texte durch die URL",
+                     line=True, trigger=']('),
+                Rule(r'\[([^\]]*)\]\(([^)]*&[^)]*;[^)]*)\)', lambda m: f"[{m.group(1)}]({html.unescape(m.group(2))})",
+                     "Korrigierte HTML-Entities in {count} URLs", line=True, trigger='&', count_changed=True),
+            ]
         
-        # 3. Korrigiere Tabellen
         if self.fix_tables:
-            new_text, table_changes = self._fix_tables(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(table_changes)
+            rules.append(TableRepairRule())
         
-        # 4. Korrigiere Listen
         if self.fix_lists:
-            new_text, list_changes = self._fix_lists(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(list_changes)
-        
-        # 5. Korrigiere Code-Blöcke
+            marker = re.escape(self.list_marker)
+            if self.list_marker in ['*', '-', '+']:
+                # Gemeinsame Meldung: die Treffer aller Zeichen werden zusammengezählt
+                message = f"Standardisierte {{count}} Aufzählungszeichen zu '{self.list_marker}'"
+                rules += [Rule(fr'^([ \t]*){re.escape(other)}[ \t]+', fr'\1{self.list_marker} ', message,
+                               line=True, kinds=(BULLET,))
+                          for other in '-*+' if other != self.list_marker]
+            # Das Zeichen selbst ist ausgenommen, damit **fett** am Zeilenanfang erhalten bleibt
+            rules += [
+                Rule(fr'^([ \t]*){marker}([^ \t{marker}])', fr'\1{self.list_marker} \2',
+                     "Korrigierte {count} Aufzählungszeichen mit fehlendem Leerzeichen", line=True, kinds=(BULLET,)),
+                OrderedListRule(),
+            ]
+        
+        # Eigener Durchlauf, da die Umwandlung Fence-Zeilen einfügt
         if self.fix_code_blocks:
-            new_text, code_changes = self._fix_code_blocks(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(code_changes)
+            rules.append(CodeBlockRule())
         
-        # 6. Standardisiere Hervorhebungen
         if self.standardize_emphasis:
-            new_text, emphasis_changes = self._standardize_emphasis(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(emphasis_changes)
+            rules += [
+                Rule(r'(?<!\w)(__?)([^_\n]+)\1(?!\w)', lambda m: f"{'**' if len(m.group(1)) == 2 else '*'}{m.group(2)}"
+                     f"{'**' if len(m.group(1)) == 2 else '*'}",
+                     "Standardisierte {count} Underscore-Hervorhebungen zu Asterisk-Hervorhebungen", trigger='_'),
+                # Leerzeichen nur dort ergänzen, wo die Hervorhebung direkt an ein Wort grenzt
+                Rule(r'(\w?)(?<!\*)\*(?!\s)([^*\n]+?)(?<!\s)\*(?!\*)(\w?)',
+                     lambda m: (f"{m.group(1)}{' ' if m.group(1) else ''}*{m.group(2)}*"
+                                f"{' ' if m.group(3) else ''}{m.group(3)}"),
+                     "Korrigierte {count} fehlerhafte Hervorhebungen", trigger='*', count_changed=True),
+                Rule(r'\*{4,}([^*]+?)\*{4,}', r'***\1***', "Korrigierte {count} überflüssige Asterisken", trigger='****'),
+            ]
         
-        # 7. Entferne HTML-Tags
         if self.remove_html:
-            new_text, html_changes = self._remove_html(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(html_changes)
-        
-        # 8. Korrigiere Zeilenumbrüche
+            rules += [
+                Rule(r'</?[a-zA-Z0-9]+(\s+[a-zA-Z0-9]+="[^"]*")*\s*/?>', '', "Entfernte {count} HTML-Tags", trigger='<'),
+                Rule(r'<!--[\s\S]*?-->', '', "Entfernte {count} HTML-Kommentare", trigger='<!--'),
+                Rule(r'&[a-zA-Z0-9]+;|&#[0-9]+;|&#x[a-fA-F0-9]+;', lambda m: html.unescape(m.group(0)),
+                     "Konvertierte {count} HTML-Entities", trigger='&'),
+            ]
+        
+        # Ein Zeilendurchlauf für Leerzeilen, Abstände um Überschriften und Zeilenumbruch
         if self.fix_line_breaks:
-            new_text, linebreak_changes = self._fix_line_breaks(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(linebreak_changes)
-        
-        # 9. Entferne Sonderzeichen und Steuerzeichen
-        new_text, char_changes = self._fix_special_chars(cleaned_text)
-        if new_text != cleaned_text:
-            cleaned_text = new_text
-            changes.extend(char_changes)
-        
-        # 10. Wende Zeilenlängenbegrenzung an, falls konfiguriert
-        if self.max_line_length > 0:
-            new_text, wrap_changes = self._wrap_lines(cleaned_text)
-            if new_text != cleaned_text:
-                cleaned_text = new_text
-                changes.extend(wrap_changes)
-        
-        return cleaned_text, changes
-    
-    def _fix_headings(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Überschriften im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Korrigiere fehlendes Leerzeichen nach #
-        pattern = r'^(#+)([^#\s])'
-        replacement = r'\1 \2'
-        fixed_text, count = re.subn(pattern, replacement, text, flags=re.MULTILINE)
-        
-        if count > 0:
-            changes.append(f"Korrigierte {count} Überschriften (fehlendes Leerzeichen nach #)")
-        
-        # Entferne überflüssige #-Zeichen am Ende von Überschriften
-        pattern = r'^(#+\s+.*?)(\s+#+)$'
-        replacement = r'\1'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text, flags=re.MULTILINE)
-        
-        if count > 0:
-            changes.append(f"Entfernte {count} überflüssige #-Zeichen am Ende von Überschriften")
-        
-        # Korrigiere zu lange Setext-Überschriften
-        pattern = r'^(.+)\n([=\-]{3,})$'
-        replacement = lambda m: f"{'#' if m.group(2)[0] == '=' else '##'} {m.group(1)}"
-        fixed_text, count = re.subn(pattern, replacement, fixed_text, flags=re.MULTILINE)
-        
-        if count > 0:
-            changes.append(f"Konvertierte {count} Setext-Überschriften zu ATX-Überschriften")
-        
-        return fixed_text, changes
-    
-    def _fix_links(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Links und Bilder im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        fixed_text = text
-        
-        # Korrigiere doppelte Klammern in Links
-        pattern = r'\[([^\]]*)\]\(+([^)]+)\)+'
-        replacement = r'[\1](\2)'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Korrigierte {count} Links mit doppelten Klammern")
-        
-        # Entferne Leerzeichen innerhalb der Link-Klammern
-        pattern = r'\[([^\]]*)\]\(\s+([^)]+?)\s+\)'
-        replacement = r'[\1](\2)'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Entfernte Leerzeichen innerhalb der Link-Klammern bei {count} Links")
-        
-        # Entferne Escape-Zeichen in URLs
-        pattern = r'\[([^\]]*)\]\(\\([^)]+)\)'
-        replacement = r'[\1](\2)'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Entfernte Escape-Zeichen in {count} Link-URLs")
-        
-        # Ersetze leere Link-Texte durch die URL
-        pattern = r'\[\s*\]\(([^)]+)\)'
-        replacement = r'[\1](\1)'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Ersetzte {count} leere Link-Texte durch die URL")
-        
-        # Korrigiere URLs mit HTML-Entities
-        def unescape_url(match):
-            url = match.group(2)
-            try:
-                unescaped = html.unescape(url)
-                return f"[{match.group(1)}]({unescaped})"
-            except:
-                return match.group(0)
-        
-        pattern = r'\[([^\]]*)\]\(([^)]*&[^)]*;[^)]*)\)'
-        fixed_text, count = re.subn(pattern, unescape_url, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Korrigierte HTML-Entities in {count} URLs")
-        
-        return fixed_text, changes
-    
-    def _fix_tables(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Tabellen im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Finde alle Tabellen
-        table_pattern = r'(?:^|\n)(\|.+\|)(?:\s*\n\|[-:| ]+\|(?:\s*\n\|.+\|)*)?'
-        tables = list(re.finditer(table_pattern, text, re.DOTALL))
-        
-        if not tables:
-            return text, changes
-        
-        fixed_text = text
-        replaced_count = 0
-        
-        for table_match in reversed(tables):  # Rückwärts, um Indizes zu erhalten
-            table = table_match.group(0)
-            table_lines = table.strip().split('\n')
-            
-            # Korrigiere fehlende Trennzeile nach dem Header
-            if len(table_lines) >= 1 and not (len(table_lines) >= 2 and re.match(r'^\|[-:| ]+\|$', table_lines[1])):
-                # Zähle Spalten in der ersten Zeile
-                header_cols = table_lines[0].count('|') - 1
-                
-                # Erstelle Trennzeile
-                delimiter = '|' + '|'.join([' --- '] * header_cols) + '|'
-                
-                # Füge Trennzeile ein
-                table_lines.insert(1, delimiter)
-                replaced_count += 1
-            
-            # Korrigiere inkonsistente Spaltenanzahl
-            if len(table_lines) >= 2:
-                header_cols = table_lines[0].count('|') - 1
-                
-                # Prüfe und korrigiere jede Zeile
-                fixed_lines = []
-                line_fixes = 0
-                
-                for i, line in enumerate(table_lines):
-                    cols = line.count('|') - 1
-                    
-                    if cols != header_cols:
-                        if i == 1 and re.match(r'^\|[-:| ]+\|$', line):  # Trennzeile
-                            # Korrigiere Trennzeile
-                            delimiter = '|' + '|'.join([' --- '] * header_cols) + '|'
-                            fixed_lines.append(delimiter)
-                            line_fixes += 1
-                        else:
-                            # Korrigiere reguläre Zeile
-                            cells = line.strip('|').split('|')
-                            
-                            if cols < header_cols:
-                                # Füge fehlende Zellen hinzu
-                                cells.extend([''] * (header_cols - cols))
-                                line_fixes += 1
-                            elif cols > header_cols:
-                                # Entferne überschüssige Zellen
-                                cells = cells[:header_cols]
-                                line_fixes += 1
-                            
-                            fixed_lines.append('|' + '|'.join(cells) + '|')
-                    else:
-                        fixed_lines.append(line)
-                
-                if line_fixes > 0:
-                    # Ersetze die Tabelle im Text
-                    fixed_table = '\n'.join(fixed_lines)
-                    start, end = table_match.span()
-                    fixed_text = fixed_text[:start] + fixed_table + fixed_text[end:]
-                    replaced_count += 1
-        
-        if replaced_count > 0:
-            changes.append(f"Korrigierte {replaced_count} Tabellen")
-        
-        return fixed_text, changes
-    
-    def _fix_lists(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Listen im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        fixed_text = text
-        
-        # Standardisiere Aufzählungszeichen, falls konfiguriert
-        if self.list_marker in ['*', '-', '+']:
-            # Ersetze alle Aufzählungszeichen durch das konfigurierte
-            pattern_dash = r'(?:^|\n)([ \t]*)-[ \t]+'
-            pattern_asterisk = r'(?:^|\n)([ \t]*)\*[ \t]+'
-            pattern_plus = r'(?:^|\n)([ \t]*)\+[ \t]+'
-            
-            replacement = fr'\1{self.list_marker} '
-            
-            # Zähle, wie viele Ersetzungen für jedes Zeichen
-            if self.list_marker != '-':
-                fixed_text, dash_count = re.subn(pattern_dash, replacement, fixed_text)
-            else:
-                dash_count = 0
-                
-            if self.list_marker != '*':
-                fixed_text, asterisk_count = re.subn(pattern_asterisk, replacement, fixed_text)
-            else:
-                asterisk_count = 0
-                
-            if self.list_marker != '+':
-                fixed_text, plus_count = re.subn(pattern_plus, replacement, fixed_text)
-            else:
-                plus_count = 0
-            
-            total_replacements = dash_count + asterisk_count + plus_count
-            if total_replacements > 0:
-                changes.append(f"Standardisierte {total_replacements} Aufzählungszeichen zu '{self.list_marker}'")
-        
-        # Korrigiere fehlendes Leerzeichen nach Aufzählungszeichen
-        pattern = fr'(?:^|\n)([ \t]*){re.escape(self.list_marker)}([^ \t])'
-        replacement = fr'\1{self.list_marker} \2'
-        fixed_text, count = re.subn(pattern, replacement, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Korrigierte {count} Aufzählungszeichen mit fehlendem Leerzeichen")
-        
-        # Korrigiere nummerierte Listen mit fortlaufender Nummerierung
-        pattern = r'(?:^|\n)([ \t]*)(\d+)\.[ \t]+'
-        
-        # Finde alle nummerierten Listen
-        list_starts = []
-        current_indent = None
-        list_items = []
-        
-        for match in re.finditer(pattern, fixed_text):
-            indent = match.group(1)
-            number = int(match.group(2))
-            pos = match.start()
-            
-            # Wenn neue Einrückungsebene oder erster Eintrag
-            if current_indent != indent:
-                # Speichere die vorherige Liste, falls vorhanden
-                if list_items:
-                    list_starts.append((current_indent, list_items))
-                
-                # Starte neue Liste
-                current_indent = indent
-                list_items = [(pos, number)]
-            else:
-                # Füge Eintrag zu aktueller Liste hinzu
-                list_items.append((pos, number))
-        
-        # Füge letzte Liste hinzu, falls vorhanden
-        if list_items:
-            list_starts.append((current_indent, list_items))
-        
-        # Korrigiere Listen mit falscher Nummerierung
-        result_text = fixed_text
-        offset = 0
-        list_fixes = 0
-        
-        for indent, items in list_starts:
-            # Wenn mehr als ein Eintrag und nicht korrekt nummeriert
-            if len(items) > 1:
-                should_fix = False
-                expected_numbers = list(range(1, len(items) + 1))
-                actual_numbers = [num for _, num in items]
-                
-                # Überprüfe, ob die Nummerierung inkonsistent ist
-                if actual_numbers != expected_numbers:
-                    should_fix = True
-                
-                if should_fix:
-                    # Korrigiere Nummerierung
-                    for i, (pos, num) in enumerate(items):
-                        expected = i + 1
-                        if num != expected:
-                            # Bereite Ersetzung vor
-                            adjusted_pos = pos + offset
-                            old_str = f"{indent}{num}. "
-                            new_str = f"{indent}{expected}. "
-                            
-                            # Ersetze die Nummer
-                            result_text = result_text[:adjusted_pos] + new_str + result_text[adjusted_pos + len(old_str):]
-                            
-                            # Aktualisiere den Offset
-                            offset += len(new_str) - len(old_str)
-                            list_fixes += 1
-        
-        if list_fixes > 0:
-            changes.append(f"Korrigierte {list_fixes} falsch nummerierte Listeneinträge")
-            fixed_text = result_text
-        
-        return fixed_text, changes
-    
-    def _fix_code_blocks(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Code-Blöcke im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Finde alle Codeblöcke
-        fenced_block_pattern = r'```([^\n`]*)\n([\s\S]*?)```'
-        indented_block_pattern = r'(?:(?:^|\n)    [^\n]+)+(?=\n|$)'
-        
-        # Ersetze Einrückungs-Codeblöcke durch Fenced-Codeblöcke
-        indented_blocks = list(re.finditer(indented_block_pattern, text))
-        
-        fixed_text = text
-        offset = 0
-        indented_fixes = 0
-        
-        for match in indented_blocks:
-            # Prüfe, ob der Block bereits innerhalb eines Fenced-Blocks ist
-            block_start = match.start() + offset
-            block_end = match.end() + offset
-            block_text = fixed_text[block_start:block_end]
-            
-            # Überprüfe, ob dieser Block innerhalb eines bestehenden Fenced-Codeblocks liegt
-            is_in_fenced_block = False
-            for fence_match in re.finditer(fenced_block_pattern, fixed_text):
-                fence_start = fence_match.start()
-                fence_end = fence_match.end()
-                
-                if fence_start <= block_start and fence_end >= block_end:
-                    is_in_fenced_block = True
-                    break
-            
-            if not is_in_fenced_block:
-                # Entferne die Einrückung von 4 Leerzeichen
-                unindented_lines = []
-                for line in block_text.split('\n'):
-                    if line.startswith('    '):
-                        unindented_lines.append(line[4:])
-                    else:
-                        unindented_lines.append(line)
-                
-                unindented_text = '\n'.join(unindented_lines)
-                
-                # Ersetze durch Fenced-Codeblock
-                replacement = f"```\n{unindented_text}\n```"
-                
-                fixed_text = fixed_text[:block_start] + replacement + fixed_text[block_end:]
-                
-                # Aktualisiere Offset
-                offset += len(replacement) - len(block_text)
-                indented_fixes += 1
-        
-        if indented_fixes > 0:
-            changes.append(f"Konvertierte {indented_fixes} eingerückte Codeblöcke zu Fenced-Codeblöcken")
-        
-        # Korrigiere fehlende Sprache bei Fenced-Codeblöcken
-        def fix_fenced_block(match):
-            lang = match.group(1).strip()
-            code = match.group(2)
-            
-            # Wenn keine Sprache angegeben ist, versuche sie zu erraten
-            if not lang:
-                # Einfache Heuristik für häufige Sprachen
-                if re.search(r'function\s+\w+\s*\(.*\)\s*{', code):
-                    lang = 'javascript'
-                elif re.search(r'def\s+\w+\s*\(.*\):', code):
-                    lang = 'python'
-                elif re.search(r'public\s+static\s+void\s+main', code):
-                    lang = 'java'
-                elif re.search(r'<\?php', code):
-                    lang = 'php'
-                elif re.search(r'#include\s+<', code):
-                    lang = 'c'
-                elif re.search(r'SELECT\s+.*\s+FROM\s+.*', code, re.IGNORECASE):
-                    lang = 'sql'
-                
-                if lang:
-                    return f"```{lang}\n{code}```"
-            
-            return match.group(0)
-        
-        fixed_text, count = re.subn(fenced_block_pattern, fix_fenced_block, fixed_text)
-        
-        if count > 0 and indented_fixes == 0:  # Nur zählen, wenn nicht bereits durch indented_fixes gezählt
-            changes.append(f"Verarbeitet {count} Fenced-Codeblöcke")
-        
-        return fixed_text, changes
-    
-    def _standardize_emphasis(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Standardisiert Hervorhebungen im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        fixed_text = text
-        
-        # Konvertiere Underscore-Hervorhebungen zu Asterisk-Hervorhebungen
-        underscore_bold_pattern = r'(?<!\w)__([^_]+)__(?!\w)'
-        underscore_italic_pattern = r'(?<!\w)_([^_]+)_(?!\w)'
-        
-        fixed_text, bold_count = re.subn(underscore_bold_pattern, r'**\1**', fixed_text)
-        fixed_text, italic_count = re.subn(underscore_italic_pattern, r'*\1*', fixed_text)
-        
-        total_emphasis = bold_count + italic_count
-        if total_emphasis > 0:
-            changes.append(f"Standardisierte {total_emphasis} Underscore-Hervorhebungen zu Asterisk-Hervorhebungen")
+            rules += [
+                BlankLineRule(),
+                HeadingSpacingRule(),
+                TrailingWhitespaceRule(),
+            ]
         
-        # Korrigiere falsche Hervorhebungen (z.B. fehlende Leerzeichen nach Asterisken)
-        asterisk_pattern = r'(?<!\*)\*(?!\s)([^\*]+?)(?<!\s)\*(?!\*)'
-        fixed_text, count = re.subn(asterisk_pattern, r' *\1* ', fixed_text)
-        
-        if count > 0:
-            changes.append(f"Korrigierte {count} fehlerhafte Hervorhebungen")
-        
-        # Entferne überflüssige Asterisken (mehr als 3)
-        excess_asterisks = r'\*{4,}([^*]+?)\*{4,}'
-        fixed_text, count = re.subn(excess_asterisks, r'***\1***', fixed_text)
-        
-        if count > 0:
-            changes.append(f"Korrigierte {count} überflüssige Asterisken")
-        
-        return fixed_text, changes
-    
-    def _remove_html(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Entfernt HTML-Tags im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Entferne alle HTML-Tags
-        html_pattern = r'</?[a-zA-Z0-9]+(\s+[a-zA-Z0-9]+="[^"]*")*\s*/?>'
-        fixed_text, count = re.subn(html_pattern, '', text)
-        
-        if count > 0:
-            changes.append(f"Entfernte {count} HTML-Tags")
-        
-        # Entferne HTML-Kommentare
-        comment_pattern = r'<!--[\s\S]*?-->'
-        fixed_text, count = re.subn(comment_pattern, '', fixed_text)
-        
-        if count > 0:
-            changes.append(f"Entfernte {count} HTML-Kommentare")
-        
-        # Konvertiere HTML-Entities
-        entity_pattern = r'&[a-zA-Z0-9]+;|&#[0-9]+;|&#x[a-fA-F0-9]+;'
-        
-        def unescape_entity(match):
-            entity = match.group(0)
-            try:
-                return html.unescape(entity)
-            except:
-                return entity
-        
-        fixed_text, count = re.subn(entity_pattern, unescape_entity, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Konvertierte {count} HTML-Entities")
-        
-        return fixed_text, changes
-    
-    def _fix_line_breaks(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Zeilenumbrüche im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Entferne überflüssige Leerzeilen (mehr als 2 aufeinanderfolgende)
-        excessive_newlines = r'\n{3,}'
-        fixed_text, count = re.subn(excessive_newlines, '\n\n', text)
-        
-        if count > 0:
-            changes.append(f"Entfernte {count} überflüssige Leerzeilen")
-        
-        # Stelle sicher, dass Überschriften mit einer Leerzeile davor und danach beginnen
-        heading_pattern = r'(?<!\n\n)(^|\n)(#+\s+[^\n]+)(?!\n\n)'
-        
-        def fix_heading_spacing(match):
-            prefix = match.group(1)
-            heading = match.group(2)
-            
-            # Wenn das Prefix ein Zeilenumbruch ist, füge einen weiteren hinzu
-            if prefix == '\n':
-                prefix = '\n\n'
-            # Wenn es der Anfang des Textes ist, kein zusätzlicher Umbruch nötig
-            else:
-                prefix = ''
-            
-            return f"{prefix}{heading}\n\n"
-        
-        fixed_text, count = re.subn(heading_pattern, fix_heading_spacing, fixed_text, flags=re.MULTILINE)
-        
-        if count > 0:
-            changes.append(f"Korrigierte Zeilenumbrüche um {count} Überschriften")
-        
-        # Entferne Leerzeichen am Zeilenende
-        trailing_spaces = r'[ \t]+\n'
-        fixed_text, count = re.subn(trailing_spaces, '\n', fixed_text)
-        
-        if count > 0:
-            changes.append(f"Entfernte Leerzeichen am Zeilenende in {count} Zeilen")
-        
-        return fixed_text, changes
-    
-    def _fix_special_chars(self, text: str) -> Tuple[str, List[str]]:
-        """
-        Korrigiert Sonderzeichen und Steuerzeichen im Markdown.
-        
-        Args:
-            text: Markdown-Text
-            
-        Returns:
-            Tuple aus (korrigierter_text, änderungen)
-        """
-        changes = []
-        
-        # Entferne unsichtbare Steuerzeichen
-        control_chars = r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]'
-        fixed_text, count = re.subn(control_chars, '', text)
-        
-        if count > 0:
-            changes.append(f"Entfernte {count} Steuerzeichen")
-        
-        # Konvertiere nicht-druckbare Unicode-Zeichen
-        def replace_non_printable(match):
-            char = match.group(0)
-            code = ord(char)
-            return f"\\u{code:04x}"
-        
-        non_printable = r'[\uFFFD\uFFFE\uFFFF]'
-        fixed_text, count = re.subn(non_printable, replace_non_printable, fixed_text)
-        
-        if count > 0:
-            changes.append(f"Ersetzte {count} nicht druckbare Unicode-Zeichen")
-        
-        # Konvertiere Windows-Zeilenumbrüche zu Unix-Zeilenumbrüchen
-        cr_lf = r'\r\n'
-        fixed_text, count = re.subn(cr_lf, '\n', fixed_text)
-        
-        if count > 0:
-            changes.append(f"Konvertierte {count} Windows-Zeilenumbrüche zu Unix-Zeilenumbrüchen")
+        if self.max_line_length > 0:
+            rules.append(LineWrapRule(self.max_line_length, self._wrap_line))
         
-        return fixed_text, changes
+        return rules
     
-    def _wrap_lines(self, text: str) -> Tuple[str, List[str]]:
+    def _clean_markdown(self, markdown_text: str) -> Tuple[str, List[str]]:
         """
-        Begrenzt die Zeilenlänge im Markdown.
+        Führt alle Bereinigungen am Markdown-Text durch.
         
         Args:
-            text: Markdown-Text
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             
         Returns:
-            Tuple aus (korrigierter_text, änderungen)
+            Tuple aus (bereinigter_text, liste_der_änderungen)
         """
-        if self.max_line_length <= 0:
-            return text, []
-        
-        changes = []
-        result_lines = []
-        wrap_count = 0
-        
-        # Splitten des Textes in Zeilen
-        lines = text.split('\n')
-        
-        # Spezielle Zeilen, die nicht umgebrochen werden sollten
-        no_wrap_patterns = [
-            r'^\s*#+\s+', # Überschriften
-            r'^\s*```', # Codeblock-Markierungen
-            r'^\s*\|', # Tabellen
-            r'^\s*!\[', # Bilder
-            r'^\s*[*+-]\s+', # Listen
-            r'^\s*\d+\.\s+' # Nummerierte Listen
-        ]
-        
-        for line in lines:
-            # Prüfen, ob die Zeile nicht umgebrochen werden sollte
-            should_wrap = True
-            for pattern in no_wrap_patterns:
-                if re.match(pattern, line):
-                    should_wrap = False
-                    break
-            
-            # Wenn die Zeile umgebrochen werden soll und länger als max_line_length ist
-            if should_wrap and len(line) > self.max_line_length:
-                wrapped_lines = self._wrap_line(line, self.max_line_length)
-                result_lines.extend(wrapped_lines)
-                wrap_count += 1
-            else:
-                result_lines.append(line)
-        
-        if wrap_count > 0:
-            changes.append(f"Umbruch von {wrap_count} langen Zeilen")
-        
-        return '\n'.join(result_lines), changes
+        return self.engine.apply(markdown_text)
     
     def _wrap_line(self, line: str, max_length: int) -> List[str]:
         """
@@ -0,0 +1,215 @@
+"""
+Nachbearbeitungspipeline für die Dokumentenkonvertierungspipeline.
+Führt Struktur-Fixer, Cleaner, Tabellen-Formatierer und Validator im Speicher
+auf einem Dokumentobjekt aus, statt jede Stufe die Datei lesen und schreiben zu lassen.
+"""
+
+import copy
+import os
+import re
+import time
+import yaml
+from pathlib import Path
+import logging
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+from ..utils.logger import PipelineLogger
+
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+logger = logging.getLogger(__name__)
+
+
+def extract_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Extrahiert das YAML-Frontmatter aus dem Markdown-Inhalt.
+
+    Args:
+        content: Markdown-Inhalt
+
+    Returns:
+        Tuple aus (frontmatter_dict, content_without_frontmatter)
+    """
+    frontmatter_match = FRONTMATTER_PATTERN.match(content)
+
+    if frontmatter_match:
+        try:
+            frontmatter = yaml.safe_load(frontmatter_match.group(1))
+            return frontmatter or {}, content[frontmatter_match.end():]
+        except Exception as e:
+            logger.warning(f"Fehler beim Parsen des Frontmatter: {e}")
+
+    return {}, content
+
+
+class MarkdownDocument:
+    """Markdown-Dokument mit geparstem Frontmatter, das durch alle Nachbearbeitungsstufen läuft"""
+
+    def __init__(self, path: Path, frontmatter: Optional[Dict[str, Any]] = None, body: str = '',
+                 always_frontmatter: bool = False):
+        """
+        Initialisiert das Dokument.
+
+        Args:
+            path: Pfad des Dokuments (Titel, relative Links, Zieldatei)
+            frontmatter: Geparstes Frontmatter
+            body: Markdown-Inhalt ohne Frontmatter
+            always_frontmatter: Frontmatter-Block auch dann schreiben, wenn es leer ist
+        """
+        self.path = Path(path)
+        self.frontmatter = frontmatter or {}
+        self.body = body
+        self.always_frontmatter = always_frontmatter
+        self.changes: List[str] = []
+        self.validation: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_text(cls, content: str, path: Path) -> 'MarkdownDocument':
+        """Erstellt ein Dokument aus Markdown-Text; das Frontmatter wird hier einmalig geparst"""
+        frontmatter, body = extract_frontmatter(content)
+        return cls(path, frontmatter, body)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'MarkdownDocument':
+        """Liest eine Markdown-Datei ein"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_text(f.read(), path)
+
+    def render(self) -> str:
+        """
+        Setzt Frontmatter und Inhalt zum finalen Markdown zusammen.
+
+        Returns:
+            Markdown-Inhalt inklusive Frontmatter-Block
+        """
+        if self.frontmatter or self.always_frontmatter:
+            frontmatter_yaml = yaml.dump(self.frontmatter, default_flow_style=False, allow_unicode=True)
+            return f"---\n{frontmatter_yaml}---\n\n{self.body}"
+        return self.body
+
+    def write(self, output_path: Optional[Path] = None) -> Path:
+        """
+        Schreibt das Dokument (einziger Schreibzugriff der Pipeline).
+
+        Args:
+            output_path: Zieldatei (Standard: Pfad des Dokuments)
+
+        Returns:
+            Pfad der geschriebenen Datei
+        """
+        output_path = Path(output_path) if output_path is not None else self.path
+        # Neue Datei anlegen und umbenennen statt überschreiben: die Zieldatei kann ein
+        # Hardlink in den Konvertierungs-Cache sein, dessen Inhalt unverändert bleiben muss
+        tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, output_path)
+        return output_path
+
+
+# Eine Stufe verändert das Dokument und liefert {'success', 'changes', ['error']}
+Stage = Callable[[MarkdownDocument], Dict[str, Any]]
+
+
+class PostProcessingPipeline:
+    """Verkettet Nachbearbeitungsstufen auf einem MarkdownDocument mit Zeitmessung je Stufe"""
+
+    # Wie BaseConverter.version: bei geänderten Ergebnissen der Stufen erhöhen (Konvertierungs-Cache)
+    version = '1'
+
+    def __init__(self, stages: Optional[List[Tuple[str, Stage]]] = None,
+                 validator: Optional[Callable[[MarkdownDocument], Dict[str, Any]]] = None,
+                 pipeline_logger: Optional[PipelineLogger] = None):
+        """
+        Initialisiert die Pipeline.
+
+        Args:
+            stages: Liste aus (name, stufe) in Ausführungsreihenfolge
+            validator: Optionale Validierung, läuft nach allen Stufen auf dem Endergebnis
+            pipeline_logger: PipelineLogger für Stufenzeiten und Dokumentmetriken
+        """
+        self.stages: List[Tuple[str, Stage]] = list(stages or [])
+        self.validator = validator
+        self.pipeline_logger = pipeline_logger or PipelineLogger('post_processing')
+
+    def add_stage(self, name: str, stage: Stage) -> 'PostProcessingPipeline':
+        """Hängt eine Stufe an und gibt die Pipeline zurück (verkettbar)"""
+        self.stages.append((name, stage))
+        return self
+
+    def run(self, document: MarkdownDocument) -> Dict[str, Any]:
+        """
+        Führt alle Stufen auf dem Dokument aus, ohne die Datei zu berühren.
+
+        Schlägt eine Stufe fehl, bleibt das Dokument für diese Stufe unverändert
+        und die übrigen Stufen laufen weiter.
+
+        Args:
+            document: Zu bearbeitendes Dokument
+
+        Returns:
+            Dictionary mit Änderungen, Stufenergebnissen und ggf. Validierung
+        """
+        document_path = str(document.path)
+        stage_results = {}
+        success = True
+        started = time.perf_counter()
+
+        for name, stage in self.stages:
+            stage_start = time.perf_counter()
+            body, frontmatter = document.body, copy.deepcopy(document.frontmatter)
+            try:
+                result = stage(document)
+            except Exception as e:
+                result = {'success': False, 'error': str(e), 'changes': []}
+            if not result.get('success', False):
+                # Teilweise Änderungen einer fehlgeschlagenen Stufe verwerfen
+                document.body, document.frontmatter = body, frontmatter
+            elapsed = time.perf_counter() - stage_start
+            self.pipeline_logger.log_stage(name, elapsed, document_path)
+
+            document.changes.extend(result.get('changes', []))
+            stage_results[name] = {'success': result.get('success', False), 'time': elapsed}
+            if not result.get('success', False):
+                success = False
+                stage_results[name]['error'] = result.get('error', '')
+                self.pipeline_logger.log_error(f"Stufe {name} fehlgeschlagen: {result.get('error', '')}",
+                                               document_path)
+
+        if self.validator is not None:
+            stage_start = time.perf_counter()
+            document.validation = self.validator(document)
+            elapsed = time.perf_counter() - stage_start
+            self.pipeline_logger.log_stage('validate', elapsed, document_path)
+            stage_results['validate'] = {'success': True, 'time': elapsed}
+
+        self.pipeline_logger.log_document_processed(document_path, success, time.perf_counter() - started)
+
+        result = {
+            'success': success,
+            'changes': document.changes,
+            'stages': stage_results
+        }
+        if document.validation is not None:
+            result['validation'] = document.validation
+        return result
+
+    def process_file(self, markdown_path: Path, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Liest eine Markdown-Datei einmal, führt alle Stufen aus und schreibt einmal.
+
+        Args:
+            markdown_path: Pfad zur Markdown-Datei
+            output_path: Zieldatei (falls nicht angegeben, wird die Originaldatei überschrieben)
+
+        Returns:
+            Ergebnis von run() ergänzt um source und target
+        """
+        document = MarkdownDocument.from_file(markdown_path)
+        if output_path is not None:
+            # Links und Dateiname beziehen sich auf den Zielort
+            document.path = Path(output_path)
+        result = self.run(document)
+        target = document.write()
+        result.update({'source': str(markdown_path), 'target': str(target)})
+        return result
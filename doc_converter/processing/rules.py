@@ -0,0 +1,265 @@
+"""
+Regel-Engine für die Markdown-Nachbearbeitung.
+Kompiliert alle Muster einmalig und wendet zeilenbasierte Regeln in einem
+gemeinsamen Durchlauf über die Zeilen des Dokuments an.
+"""
+
+import re
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable, Union
+
+# Zeilenarten des Tokenizers
+BLANK = 'blank'
+HEADING = 'heading'
+BULLET = 'bullet'
+ORDERED = 'ordered'
+TABLE = 'table'
+FENCE = 'fence'
+QUOTE = 'quote'
+INDENTED = 'indented'
+TEXT = 'text'
+LINE_KINDS = (BLANK, HEADING, BULLET, ORDERED, TABLE, FENCE, QUOTE, INDENTED, TEXT)
+
+
+def classify_line(line: str) -> str:
+    """
+    Bestimmt die Zeilenart anhand des ersten Zeichens.
+
+    Die Zeilenart dient als Vorfilter: Regeln werden nur auf Zeilen angewendet,
+    deren Art sie deklarieren; ob eine Regel greift, entscheidet ihr Muster.
+
+    Args:
+        line: Zeile ohne Zeilenumbruch
+
+    Returns:
+        Zeilenart (BLANK, HEADING, BULLET, ORDERED, TABLE, FENCE, QUOTE, INDENTED oder TEXT)
+    """
+    stripped = line.lstrip(' \t')
+    if not stripped:
+        return BLANK
+    first = stripped[0]
+    if first == '#' and line[0] == '#':
+        return HEADING
+    if first == '`' and stripped.startswith('```'):
+        return FENCE
+    if first == '|':
+        return TABLE
+    if first in '-*+':
+        return BULLET
+    if first.isdigit():
+        return ORDERED
+    if first == '>':
+        return QUOTE
+    if line.startswith('    '):
+        return INDENTED
+    return TEXT
+
+
+class RuleState:
+    """Zustand einer Regel während eines Durchlaufs (zählt Änderungen je Meldung)"""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+
+    def add(self, message: str, count: int = 1) -> None:
+        self.counts[message] = self.counts.get(message, 0) + count
+
+
+class Rule:
+    """Vorkompilierte Ersetzungsregel für den ganzen Text oder einzelne Zeilen"""
+
+    def __init__(self, pattern: str, replacement: Union[str, Callable], message: str, flags: int = 0,
+                 line: bool = False, kinds: Optional[Iterable[str]] = None, trigger: Optional[str] = None,
+                 count_changed: bool = False):
+        """
+        Initialisiert die Regel.
+
+        Args:
+            pattern: Regulärer Ausdruck (wird hier einmalig kompiliert)
+            replacement: Ersetzung als Vorlage oder Funktion
+            message: Änderungsmeldung mit Platzhalter {count}
+            flags: re-Flags
+            line: Regel zeilenweise im gemeinsamen Zeilendurchlauf anwenden
+            kinds: Zeilenarten, auf die die Regel angewendet wird (None = alle)
+            trigger: Zeichenkette, ohne die das Muster nicht greifen kann (schneller Vorfilter)
+            count_changed: Nur Treffer zählen, deren Ersetzung den Text tatsächlich ändert
+        """
+        self.pattern = re.compile(pattern, flags)
+        self.replacement = replacement
+        self.message = message
+        self.line = line
+        self.kinds = frozenset(kinds) if kinds is not None else None
+        self.trigger = trigger
+        self.count_changed = count_changed
+
+    def apply(self, text: str) -> Tuple[str, int]:
+        """
+        Wendet die Regel an.
+
+        Returns:
+            Tuple aus (neuer_text, anzahl_änderungen)
+        """
+        if self.trigger is not None and self.trigger not in text:
+            return text, 0
+        if not self.count_changed:
+            return self.pattern.subn(self.replacement, text)
+
+        changed = 0
+
+        def replace(match):
+            nonlocal changed
+            if callable(self.replacement):
+                result = self.replacement(match)
+            else:
+                result = match.expand(self.replacement)
+            if result != match.group(0):
+                changed += 1
+            return result
+
+        return self.pattern.sub(replace, text), changed
+
+
+class LineRule:
+    """
+    Basisklasse für zeilenbasierte Regeln mit Zustand (Tabellen, Listen, Codeblöcke).
+
+    Unterklassen erhalten jede Zeile samt Zeilenart und den bisher ausgegebenen
+    Zeilen; sie dürfen bereits ausgegebene Zeilen eines Blocks am Blockende
+    ersetzen. Der Zustand liegt im RuleState des Durchlaufs, damit eine Instanz
+    gleichzeitig von mehreren Threads genutzt werden kann.
+    """
+
+    line = True
+    kinds: Optional[frozenset] = None
+    # Regeln, die Zeilen einfügen, laufen in einem eigenen Durchlauf, damit
+    # gespeicherte Zeilenindizes anderer Regeln gültig bleiben
+    own_pass = False
+    # Änderungsmeldungen mit Platzhalter {count}, in Ausgabereihenfolge
+    messages: Tuple[str, ...] = ()
+
+    def begin(self) -> RuleState:
+        """Erzeugt den Zustand für einen Durchlauf"""
+        return RuleState()
+
+    def process(self, line: str, kind: str, out: List[str], state: RuleState) -> Optional[str]:
+        """
+        Verarbeitet eine Zeile.
+
+        Returns:
+            Die (ggf. geänderte) Zeile oder None, wenn sie entfallen soll
+        """
+        return line
+
+    def finish(self, out: List[str], state: RuleState) -> None:
+        """Schließt offene Blöcke am Dokumentende ab"""
+
+
+# Schritt, der den ganzen Text verarbeitet und eigene Meldungen liefert
+TextStep = Callable[[str], Tuple[str, List[str]]]
+
+
+class RuleEngine:
+    """
+    Wendet eine geordnete Regelliste an.
+
+    Aufeinanderfolgende Zeilenregeln werden zu einem Durchlauf zusammengefasst:
+    der Text wird einmal in Zeilen zerlegt, jede Zeile einmal klassifiziert und
+    nur durch die Regeln ihrer Zeilenart geschickt. Änderungen werden über die
+    Trefferzahl der Regeln erfasst, nicht über Vergleiche des Gesamttexts.
+    """
+
+    def __init__(self, rules: Iterable[Union[Rule, LineRule, TextStep]]):
+        """
+        Initialisiert die Engine.
+
+        Args:
+            rules: Regeln in Ausführungsreihenfolge
+        """
+        self.stages: List[Tuple[str, Any]] = []
+        joinable = False
+        for rule in rules:
+            if getattr(rule, 'line', False):
+                own_pass = getattr(rule, 'own_pass', False)
+                if joinable and not own_pass:
+                    self.stages[-1][1].append(rule)
+                else:
+                    self.stages.append(('lines', [rule]))
+                joinable = not own_pass
+                continue
+            joinable = False
+            if isinstance(rule, Rule):
+                self.stages.append(('rule', rule))
+            else:
+                self.stages.append(('step', rule))
+
+    def apply(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Wendet alle Regeln auf den Text an.
+
+        Args:
+            text: Markdown-Text
+
+        Returns:
+            Tuple aus (neuer_text, liste_der_änderungen)
+        """
+        changes = []
+        for stage, payload in self.stages:
+            if stage == 'rule':
+                text, count = payload.apply(text)
+                if count > 0:
+                    changes.append(payload.message.format(count=count))
+            elif stage == 'lines':
+                text, counts = self._apply_lines(text, payload)
+                changes.extend(message.format(count=count) for message, count in counts.items() if count > 0)
+            else:
+                text, step_changes = payload(text)
+                changes.extend(step_changes)
+        return text, changes
+
+    def _apply_lines(self, text: str, rules: List[Union[Rule, LineRule]]) -> Tuple[str, Dict[str, int]]:
+        """Ein Durchlauf über alle Zeilen mit allen Regeln der Gruppe"""
+        entries = [(rule, rule.begin() if isinstance(rule, LineRule) else None) for rule in rules]
+        counts: Dict[str, int] = {}
+        for rule in rules:
+            for message in ((rule.message,) if isinstance(rule, Rule) else rule.messages):
+                counts.setdefault(message, 0)
+
+        # Je Zeilenart: Index der nächsten zuständigen Regel ab Position i (len(rules) = keine mehr)
+        end = len(rules)
+        next_rule: Dict[str, List[int]] = {}
+        for kind in LINE_KINDS:
+            table = [end] * (end + 1)
+            for i in range(end - 1, -1, -1):
+                applies = rules[i].kinds is None or kind in rules[i].kinds
+                table[i] = i if applies else table[i + 1]
+            next_rule[kind] = table
+
+        out: List[str] = []
+        for line in text.split('\n'):
+            kind = classify_line(line)
+            i = next_rule[kind][0]
+            while i < end:
+                rule, state = entries[i]
+                if state is None:
+                    # Vorfilter hier statt in apply(), spart den Aufruf für die meisten Zeilen
+                    if rule.trigger is None or rule.trigger in line:
+                        line, count = rule.apply(line)
+                        if count:
+                            counts[rule.message] += count
+                            kind = classify_line(line)
+                else:
+                    new_line = rule.process(line, kind, out, state)
+                    if new_line is None:
+                        break
+                    if new_line is not line:
+                        line = new_line
+                        kind = classify_line(line)
+                i = next_rule[kind][i + 1]
+            else:
+                out.append(line)
+
+        for rule, state in entries:
+            if state is not None:
+                rule.finish(out, state)
+                for message, count in state.counts.items():
+                    counts[message] = counts.get(message, 0) + count
+        return '\n'.join(out), counts
@@ -22,6 +22,32 @@ except LookupError:
     except:
         pass  # Stille Fehlerbehandlung, falls keine Internetverbindung verfügbar ist
 
+# Muster werden einmalig beim Import kompiliert
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+HEADING_PATTERN = re.compile(r'^(#+) (.+)$', re.MULTILINE)
+SECTION_HEADING_PATTERN = re.compile(r'^(#+)\s+(.+)$', re.MULTILINE)
+FIRST_H1_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+SPECIAL_ELEMENTS_PATTERN = re.compile(
+    r'^(?:#+\s+.*|\s*[-*+]\s+.*|\s*\d+\.\s+.*|\s*>\s+.*|```[\s\S]*?```|\|.*\|.*|\!\[.*\]\(.*\)|\[.*\]\(.*\))')
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+# Einrückung und Abstand nur aus Leerzeichen/Tabs, damit kein Zeilenumbruch als Einrückung zählt
+LIST_MARKER_PATTERN = re.compile(r'^([ \t]*)([*\-+])([ \t]+)(.+)$', re.MULTILINE)
+LIST_ITEM_PATTERN = re.compile(r'^([ \t]*)([*\-+]|\d+\.)([ \t]+)(.+)$', re.MULTILINE)
+LIST_LINE_PATTERN = re.compile(r'^\s*(?:[*\-+]|\d+\.)\s+')
+
+
+def _replace_spans(text: str, corrections: List[Tuple[int, int, str]]) -> str:
+    """Ersetzt nicht überlappende Bereiche (start, end, neu) in einem Durchlauf"""
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(corrections):
+        parts.append(text[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
 class StructureFixer:
     """Verbessert die Struktur von konvertierten Markdown-Dateien"""
     
@@ -178,6 +204,33 @@ class StructureFixer:
                 'changes': []
             }
     
+    def improve_document(self, document) -> Dict[str, Any]:
+        """
+        Verbessert die Struktur eines Dokuments der Nachbearbeitungspipeline im Speicher.
+        
+        Args:
+            document: MarkdownDocument aus processing.pipeline (Frontmatter bereits geparst)
+            
+        Returns:
+            Dictionary mit Informationen über die Strukturverbesserungen
+        """
+        try:
+            improved_text, changes = self._improve_structure(document.body)
+            
+            # Frontmatter wird wie in improve_structure() aus dem ursprünglichen Text abgeleitet
+            if self.improve_frontmatter:
+                frontmatter, frontmatter_changes = self._improve_frontmatter(
+                    document.frontmatter, document.body, document.path)
+                document.frontmatter = frontmatter
+                changes.extend(frontmatter_changes)
+            
+            document.body = improved_text
+            document.always_frontmatter = True
+            return {'success': True, 'changes': changes}
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Strukturverbesserung von {document.path}: {e}", exc_info=True)
+            return {'success': False, 'error': str(e), 'changes': []}
+    
     def _extract_frontmatter(self, content: str) -> Tuple[Dict[str, Any], str]:
         """
         Extrahiert das YAML-Frontmatter aus dem Markdown-Inhalt.
@@ -188,8 +241,7 @@ class StructureFixer:
         Returns:
             Tuple aus (frontmatter_dict, content_without_frontmatter)
         """
-        frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-        frontmatter_match = re.match(frontmatter_pattern, content, re.DOTALL)
+        frontmatter_match = FRONTMATTER_PATTERN.match(content)
         
         if frontmatter_match:
             try:
@@ -220,40 +272,20 @@ class StructureFixer:
         changes = []
         improved_text = markdown_text
         
-        # 1. Korrigiere Überschriftenhierarchie
-        if self.fix_heading_hierarchy:
-            new_text, heading_changes = self._fix_heading_hierarchy(improved_text)
-            if new_text != improved_text:
-                improved_text = new_text
-                changes.extend(heading_changes)
-        
-        # 2. Korrigiere Überschriftsebenen (Title Case)
-        if self.fix_heading_capitalize:
-            new_text, capitalize_changes = self._fix_heading_capitalize(improved_text)
-            if new_text != improved_text:
-                improved_text = new_text
-                changes.extend(capitalize_changes)
-        
-        # 3. Korrigiere Absatzumbrüche
-        if self.fix_paragraph_breaks:
-            new_text, paragraph_changes = self._fix_paragraph_breaks(improved_text)
-            if new_text != improved_text:
-                improved_text = new_text
-                changes.extend(paragraph_changes)
-        
-        # 4. Korrigiere Listenformatierung
-        if self.fix_list_formatting:
-            new_text, list_changes = self._fix_list_formatting(improved_text)
-            if new_text != improved_text:
-                improved_text = new_text
-                changes.extend(list_changes)
-        
-        # 5. Erstelle fehlende Abschnitte
-        if self.create_missing_sections:
-            new_text, section_changes = self._create_missing_sections(improved_text)
-            if new_text != improved_text:
-                improved_text = new_text
-                changes.extend(section_changes)
+        # Jeder Schritt meldet nur tatsächlich durchgeführte Änderungen,
+        # daher entfällt der Vergleich des Gesamttexts nach jedem Schritt
+        steps = [
+            (self.fix_heading_hierarchy, self._fix_heading_hierarchy),  # 1. Überschriftenhierarchie
+            (self.fix_heading_capitalize, self._fix_heading_capitalize),  # 2. Großschreibung
+            (self.fix_paragraph_breaks, self._fix_paragraph_breaks),  # 3. Absatzumbrüche
+            (self.fix_list_formatting, self._fix_list_formatting),  # 4. Listenformatierung
+            (self.create_missing_sections, self._create_missing_sections),  # 5. Fehlende Abschnitte
+        ]
+        
+        for enabled, step in steps:
+            if enabled:
+                improved_text, step_changes = step(improved_text)
+                changes.extend(step_changes)
         
         return improved_text, changes
     
@@ -270,8 +302,7 @@ class StructureFixer:
         changes = []
         
         # Extrahiere alle Überschriften mit ihren Ebenen
-        heading_pattern = r'^(#+) (.+)$'
-        headings = list(re.finditer(heading_pattern, text, re.MULTILINE))
+        headings = list(HEADING_PATTERN.finditer(text))
         
         if not headings:
             return text, []  # Keine Überschriften zu korrigieren
@@ -309,10 +340,8 @@ class StructureFixer:
                 # Speichere Änderung
                 corrections.append((start, end, new_heading))
             
-            # Wende Änderungen an (von hinten nach vorne, um Indizes stabil zu halten)
-            result_text = text
-            for start, end, new_heading in sorted(corrections, reverse=True):
-                result_text = result_text[:start] + new_heading + result_text[end:]
+            # Wende alle Änderungen in einem Durchlauf an
+            result_text = _replace_spans(text, corrections)
             
             # Füge Änderungsbeschreibung hinzu
             if level_offset != 0:
@@ -325,8 +354,6 @@ class StructureFixer:
         
         # Prüfe auf Lücken in der Hierarchie und korrigiere sie
         if allowed_skips == 0:
-            # Extrahiere die Überschriften erneut aus dem Text, falls Änderungen vorgenommen wurden
-            headings = list(re.finditer(heading_pattern, text, re.MULTILINE))
             current_levels = [(len(h.group(1)), h.group(2), h.start(), h.end()) for h in headings]
             
             # Finde Lücken in der Hierarchie
@@ -356,10 +383,8 @@ class StructureFixer:
                     # Speichere Änderung
                     corrections.append((start, end, new_heading))
                 
-                # Wende Änderungen an (von hinten nach vorne)
-                result_text = text
-                for start, end, new_heading in sorted(corrections, reverse=True):
-                    result_text = result_text[:start] + new_heading + result_text[end:]
+                # Wende alle Änderungen in einem Durchlauf an
+                result_text = _replace_spans(text, corrections)
                 
                 changes.append(f"Lücken in der Überschriftenhierarchie korrigiert ({len(gaps)} Korrekturen)")
                 
@@ -386,8 +411,7 @@ class StructureFixer:
         if capitalize_mode == 'none':
             return text, []  # Keine Änderungen erforderlich
         
-        # Extrahiere alle Überschriften
-        heading_pattern = r'^(#+) (.+)$'
+        changed = 0
         
         def title_case(title):
             """Konvertiert Text in Title Case (jedes Wort groß)"""
@@ -412,6 +436,7 @@ class StructureFixer:
             return title[0].upper() + title[1:]
         
         def process_match(match):
+            nonlocal changed
             hashes = match.group(1)
             title = match.group(2)
             
@@ -425,14 +450,15 @@ class StructureFixer:
             
             # Wenn sich der Titel geändert hat
             if new_title != title:
+                changed += 1
                 return f"{hashes} {new_title}"
             else:
                 return match.group(0)
         
-        new_text, count = re.subn(heading_pattern, process_match, text, flags=re.MULTILINE)
+        new_text = HEADING_PATTERN.sub(process_match, text)
         
-        if count > 0 and new_text != text:
-            changes.append(f"Großschreibung bei {count} Überschriften korrigiert (Modus: {capitalize_mode})")
+        if changed > 0:
+            changes.append(f"Großschreibung bei {changed} Überschriften korrigiert (Modus: {capitalize_mode})")
         
         return new_text, changes
     
@@ -457,7 +483,7 @@ class StructureFixer:
         
         # Identifiziere Absätze (Text zwischen Überschriften, Listen, etc.)
         # Um Absätze zu finden, suchen wir nach Textblöcken, die keine speziellen Markdown-Elemente sind
-        special_elements_pattern = r'^(?:#+\s+.*|\s*[-*+]\s+.*|\s*\d+\.\s+.*|\s*>\s+.*|```[\s\S]*?```|\|.*\|.*|\!\[.*\]\(.*\)|\[.*\]\(.*\))'
+        is_special = SPECIAL_ELEMENTS_PATTERN.match
         
         # Teile den Text in Zeilen auf und finde Absätze
         lines = text.split('\n')
@@ -466,7 +492,7 @@ class StructureFixer:
         
         for line in lines:
             # Wenn die Zeile ein spezielles Element ist oder leer ist
-            if re.match(special_elements_pattern, line) or not line.strip():
+            if not line.strip() or is_special(line):
                 # Schließe den aktuellen Absatz ab, falls vorhanden
                 if current_paragraph:
                     paragraphs.append(('\n'.join(current_paragraph), len(lines) - len(current_paragraph)))
@@ -490,7 +516,7 @@ class StructureFixer:
         
         for paragraph, _ in paragraphs:
             # Wenn es ein normaler Textabsatz ist (kein spezielles Element)
-            if not re.match(special_elements_pattern, paragraph):
+            if not is_special(paragraph):
                 # Absatz in Sätze aufteilen, falls sentence_per_line aktiviert ist
                 if sentence_per_line:
                     try:
@@ -499,7 +525,7 @@ class StructureFixer:
                         paragraph_changes += 1
                     except:
                         # Fallback, wenn NLTK-Tokenizer nicht verfügbar ist
-                        simple_sentences = re.split(r'(?<=[.!?])\s+', paragraph)
+                        simple_sentences = SENTENCE_SPLIT_PATTERN.split(paragraph)
                         result_lines.extend(simple_sentences)
                         paragraph_changes += 1
                 else:
@@ -538,10 +564,12 @@ class StructureFixer:
         # Füge Leerzeilen zwischen Absätzen ein, falls gewünscht
         if ensure_blank_lines:
             final_lines = []
+            # Jede Zeile wird nur einmal klassifiziert
+            special = [bool(is_special(line)) for line in result_lines]
             
             for i, line in enumerate(result_lines):
                 # Prüfe, ob es sich um einen Absatzanfang handelt
-                is_paragraph_start = not re.match(special_elements_pattern, line) and (i == 0 or re.match(special_elements_pattern, result_lines[i-1]))
+                is_paragraph_start = not special[i] and (i == 0 or special[i-1])
                 
                 # Füge Leerzeile ein, falls erforderlich
                 if is_paragraph_start and i > 0 and final_lines and final_lines[-1] != '':
@@ -551,7 +579,7 @@ class StructureFixer:
                 final_lines.append(line)
                 
                 # Füge Leerzeile nach dem Absatz ein, falls erforderlich
-                is_paragraph_end = not re.match(special_elements_pattern, line) and (i == len(result_lines) - 1 or re.match(special_elements_pattern, result_lines[i+1]))
+                is_paragraph_end = not special[i] and (i == len(result_lines) - 1 or special[i+1])
                 
                 if is_paragraph_end and i < len(result_lines) - 1:
                     final_lines.append('')
@@ -559,14 +587,14 @@ class StructureFixer:
         else:
             final_lines = result_lines
         
-        # Entferne aufeinanderfolgende Leerzeilen
-        i = 0
-        while i < len(final_lines) - 1:
-            if final_lines[i] == '' and final_lines[i+1] == '':
-                final_lines.pop(i)
+        # Entferne aufeinanderfolgende Leerzeilen (linear statt pop() in der Schleife)
+        collapsed_lines = []
+        for line in final_lines:
+            if line == '' and collapsed_lines and collapsed_lines[-1] == '':
                 blank_line_changes += 1
-            else:
-                i += 1
+                continue
+            collapsed_lines.append(line)
+        final_lines = collapsed_lines
         
         # Erstelle den Ergebnistext
         result_text = '\n'.join(final_lines)
@@ -601,9 +629,10 @@ class StructureFixer:
         # Standardisiere Aufzählungszeichen
         if standard_marker in ['*', '-', '+']:
             # Ersetze alle verschiedenen Aufzählungszeichen durch das konfigurierte
-            list_marker_pattern = r'^(\s*)([*\-+])(\s+)(.+)$'
+            marker_count = 0
             
             def standardize_marker(match):
+                nonlocal marker_count
                 indent = match.group(1)
                 marker = match.group(2)
                 space = match.group(3)
@@ -613,119 +642,92 @@ class StructureFixer:
                 if marker == standard_marker:
                     return match.group(0)
                 else:
+                    marker_count += 1
                     return f"{indent}{standard_marker}{space}{content}"
             
-            new_text, marker_count = re.subn(list_marker_pattern, standardize_marker, text, flags=re.MULTILINE)
+            text = LIST_MARKER_PATTERN.sub(standardize_marker, text)
             
-            if marker_count > 0 and new_text != text:
+            if marker_count > 0:
                 changes.append(f"{marker_count} Listenmarkierungen standardisiert zu '{standard_marker}'")
-                text = new_text
         
         # Erhöhe die Einrückung für verschachtelte Listen, falls aktiviert
         if increase_indentation:
-            list_indent_pattern = r'^(\s*)([*\-+]|\d+\.)(\s+)(.+)$'
-            
             # Finde alle Listenelemente und ihre Einrückungsebenen
-            list_items = list(re.finditer(list_indent_pattern, text, re.MULTILINE))
+            list_items = list(LIST_ITEM_PATTERN.finditer(text))
             
             if list_items:
                 # Gruppiere nach Einrückungsebenen
                 indent_levels = {}
                 
                 for item in list_items:
-                    indent = item.group(1)
-                    indent_len = len(indent)
-                    
-                    if indent_len not in indent_levels:
-                        indent_levels[indent_len] = []
-                    
-                    indent_levels[indent_len].append(item)
+                    indent_levels.setdefault(len(item.group(1)), []).append(item)
                 
                 # Sortiere Einrückungsebenen
                 sorted_levels = sorted(indent_levels.keys())
                 
-                # Wenn mehrere Ebenen vorhanden sind, prüfe, ob die Einrückung korrekt ist
-                if len(sorted_levels) > 1:
-                    # Überprüfe, ob die Einrückungsschritte konsistent sind
-                    for i in range(1, len(sorted_levels)):
-                        prev_level = sorted_levels[i-1]
-                        curr_level = sorted_levels[i]
-                        
-                        # Wenn der Einrückungsschritt zu klein ist (weniger als 2 Leerzeichen)
-                        if curr_level - prev_level < 2:
-                            # Bereite Korrekturen vor
-                            corrections = []
-                            
-                            for level in sorted_levels[i:]:
-                                for item in indent_levels[level]:
-                                    start, end = item.span()
-                                    original = item.group(0)
-                                    
-                                    # Berechne neue Einrückung
-                                    new_indent_len = prev_level + (level - prev_level) * 2
-                                    new_indent = ' ' * new_indent_len
-                                    
-                                    marker = item.group(2)
-                                    space = item.group(3)
-                                    content = item.group(4)
-                                    
-                                    # Erstelle neues Listenelement
-                                    new_item = f"{new_indent}{marker}{space}{content}"
-                                    
-                                    # Speichere Korrektur
-                                    corrections.append((start, end, new_item))
-                            
-                            # Wende Korrekturen an (von hinten nach vorne)
-                            result_text = text
-                            for start, end, new_item in sorted(corrections, reverse=True):
-                                result_text = result_text[:start] + new_item + result_text[end:]
-                            
-                            changes.append(f"Listeneinrückung korrigiert ({len(corrections)} Änderungen)")
-                            text = result_text
+                # Neue Einrückung je Ebene; alle Korrekturen werden gesammelt und einmal angewendet
+                new_indents = {}
+                
+                # Überprüfe, ob die Einrückungsschritte konsistent sind
+                for i in range(1, len(sorted_levels)):
+                    prev_level = sorted_levels[i-1]
+                    curr_level = sorted_levels[i]
+                    
+                    # Wenn der Einrückungsschritt zu klein ist (weniger als 2 Leerzeichen)
+                    if curr_level - prev_level < 2:
+                        for level in sorted_levels[i:]:
+                            new_indents[level] = prev_level + (level - prev_level) * 2
+                
+                corrections = []
+                for level, new_indent_len in new_indents.items():
+                    for item in indent_levels[level]:
+                        start, end = item.span()
+                        marker = item.group(2)
+                        space = item.group(3)
+                        content = item.group(4)
+                        corrections.append((start, end, f"{' ' * new_indent_len}{marker}{space}{content}"))
+                
+                if corrections:
+                    text = _replace_spans(text, corrections)
+                    changes.append(f"Listeneinrückung korrigiert ({len(corrections)} Änderungen)")
         
         # Stelle sicher, dass Listen durch Leerzeilen umgeben sind
         if ensure_blank_lines:
-            # Finde den Anfang und das Ende von Listen
-            list_start_pattern = r'(?:^|\n\n)(\s*(?:[*\-+]|\d+\.)\s+.+)$'
-            list_items = re.findall(r'^(\s*(?:[*\-+]|\d+\.)\s+.+)$', text, re.MULTILINE)
-            
-            if list_items:
-                # Finde Listen im Text
-                list_blocks = []
-                current_block = []
-                lines = text.split('\n')
-                
-                for i, line in enumerate(lines):
-                    if re.match(r'^\s*(?:[*\-+]|\d+\.)\s+', line):
-                        # Listenelement
-                        if not current_block:
-                            # Neuer Listenblock
-                            list_blocks.append((i, []))
-                        current_block = list_blocks[-1][1]
-                        current_block.append(i)
-                    elif line.strip() == '' and current_block:
-                        # Leerzeile beendet den aktuellen Block
-                        current_block = []
-                
-                # Verarbeite jeden Listenblock
-                new_lines = lines.copy()
+            lines = text.split('\n')
+            
+            # Finde Listenblöcke (Leerzeilen beenden einen Block)
+            blank_before = set()
+            blank_after = set()
+            block_start = None
+            block_end = None
+            
+            for i, line in enumerate(lines):
+                if LIST_LINE_PATTERN.match(line):
+                    if block_start is None:
+                        block_start = i
+                    block_end = i
+                elif block_start is not None and not line.strip():
+                    blank_before.add(block_start)
+                    blank_after.add(block_end)
+                    block_start = None
+            if block_start is not None:
+                blank_before.add(block_start)
+                blank_after.add(block_end)
+            
+            if blank_before:
+                # Baue den Text in einem Durchlauf neu auf
+                new_lines = []
                 modifications = 0
                 
-                for start_idx, block_indices in list_blocks:
-                    if not block_indices:
-                        continue
-                    
+                for i, line in enumerate(lines):
                     # Prüfe, ob vor dem Block eine Leerzeile ist
-                    if start_idx > 0 and new_lines[start_idx - 1].strip() != '':
-                        new_lines.insert(start_idx, '')
-                        # Aktualisiere nachfolgende Indizes
-                        block_indices = [idx + 1 for idx in block_indices]
+                    if i in blank_before and i > 0 and lines[i - 1].strip() != '':
+                        new_lines.append('')
                         modifications += 1
-                    
+                    new_lines.append(line)
                     # Prüfe, ob nach dem Block eine Leerzeile ist
-                    end_idx = block_indices[-1]
-                    if end_idx < len(new_lines) - 1 and new_lines[end_idx + 1].strip() != '':
-                        new_lines.insert(end_idx + 1, '')
+                    if i in blank_after and i < len(lines) - 1 and lines[i + 1].strip() != '':
+                        new_lines.append('')
                         modifications += 1
                 
                 if modifications > 0:
@@ -755,8 +757,7 @@ class StructureFixer:
             return text, []  # Keine Änderungen erforderlich
         
         # Finde vorhandene Abschnitte
-        heading_pattern = r'^(#+)\s+(.+)$'
-        headings = list(re.finditer(heading_pattern, text, re.MULTILINE))
+        headings = list(SECTION_HEADING_PATTERN.finditer(text))
         
         existing_sections = [h.group(2).strip() for h in headings]
         existing_sections_lower = [s.lower() for s in existing_sections]
@@ -897,7 +898,7 @@ class StructureFixer:
             for field in missing_fields:
                 if field == 'title':
                     # Extrahiere Titel aus der ersten Überschrift oder aus dem Dateinamen
-                    heading_match = re.search(r'^#\s+(.+)$', markdown_text, re.MULTILINE)
+                    heading_match = FIRST_H1_PATTERN.search(markdown_text)
                     if heading_match:
                         title = heading_match.group(1).strip()
                     else:
@@ -81,6 +81,23 @@ class TableFormatter:
                 'changes': []
             }
     
+    def format_document(self, document) -> Dict[str, Any]:
+        """
+        Formatiert Tabellen eines Dokuments der Nachbearbeitungspipeline im Speicher.
+        
+        Args:
+            document: MarkdownDocument aus processing.pipeline
+            
+        Returns:
+            Dictionary mit Informationen über die Formatierung
+        """
+        try:
+            document.body, changes = self._format_tables(document.body)
+            return {'success': True, 'changes': changes}
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Tabellenformatierung von {document.path}: {e}", exc_info=True)
+            return {'success': False, 'error': str(e), 'changes': []}
+    
     def _format_tables(self, content: str) -> Tuple[str, List[str]]:
         """
         Formatiert alle Tabellen im Markdown-Text.
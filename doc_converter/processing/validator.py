@@ -13,6 +13,33 @@ from typing import Dict, Any, List, Tuple, Optional, Set
 import markdown
 from markdown.extensions import Extension
 
+# Muster werden einmalig beim Import kompiliert
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+WORD_PATTERN = re.compile(r'\b\w+\b')
+HEADING_PATTERN = re.compile(r'^(#{1,6}) .+$', re.MULTILINE)
+HEADING_LEVEL_PATTERN = re.compile(r'^(#+) (.+)$', re.MULTILINE)
+PARAGRAPH_PATTERN = re.compile(r'\n\n(?!#|\s*\*|\s*\d+\.|\s*>|\s*```|\s*\|)')
+LINK_STATS_PATTERN = re.compile(r'\[.+?\]\(.+?\)')
+IMAGE_STATS_PATTERN = re.compile(r'!\[.+?\]\(.+?\)')
+CODE_BLOCK_PATTERN = re.compile(r'```[\s\S]*?```')
+TABLE_STATS_PATTERN = re.compile(r'\|.+\|.+\n\|[-:| ]+\|')
+UNORDERED_ITEM_PATTERN = re.compile(r'(?:^|\n)[ \t]*\*[ \t]+')
+ORDERED_ITEM_PATTERN = re.compile(r'(?:^|\n)[ \t]*\d+\.[ \t]+')
+BLOCKQUOTE_PATTERN = re.compile(r'(?:^|\n)[ \t]*>[ \t]+')
+EMPHASIS_PROBLEM_PATTERN = re.compile(r'(\*\*\*|\*\*|\*)[^*\s].*[^*\s](\*\*\*|\*\*|\*)')
+EMPTY_SECTION_PATTERN = re.compile(r'^(#+)\s+(.+?)\s*\n+(?=#+|$)', re.MULTILINE)
+SHORT_SECTION_PATTERN = re.compile(r'^(#+)\s+(.+?)\s*\n+(.{1,50})\s*\n+(?=#+|$)', re.MULTILINE)
+INDENTED_CODE_PATTERN = re.compile(r'(?:^|\n)    [^\s]')
+UNDERSCORE_EMPHASIS_PATTERN = re.compile(r'(?<!\w)_[^_]+_(?!\w)')
+DASH_ITEM_PATTERN = re.compile(r'(?:^|\n)[ \t]*-[ \t]+')
+PLUS_ITEM_PATTERN = re.compile(r'(?:^|\n)[ \t]*\+[ \t]+')
+HTML_TAG_PATTERN = re.compile(r'<(/?)(\w+)[^>]*>')
+LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(([^)]+)\)')
+EMPTY_LINK_TEXT_PATTERN = re.compile(r'\[\s*\]\(([^)]+)\)')
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+TABLE_DELIMITER_PATTERN = re.compile(r'^\|[-:| ]+\|$')
+
+
 class MarkdownValidator:
     """Validiert konvertierte Markdown-Dateien und identifiziert Probleme"""
     
@@ -125,48 +152,39 @@ class MarkdownValidator:
             with open(markdown_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Sammle Validierungsergebnisse
-            issues = []
-            warnings = []
-            stats = self._collect_stats(content, markdown_path)
-            
-            # Validiere grundlegende Struktur
-            structure_issues, structure_warnings = self._validate_structure(content, markdown_path)
-            issues.extend(structure_issues)
-            warnings.extend(structure_warnings)
-            
-            # Validiere Inhalt
-            content_issues, content_warnings = self._validate_content(content, stats)
-            issues.extend(content_issues)
-            warnings.extend(content_warnings)
-            
-            # Validiere Formatierung
-            format_issues, format_warnings = self._validate_formatting(content)
-            issues.extend(format_issues)
-            warnings.extend(format_warnings)
-            
-            # Validiere Links und Bilder
-            link_issues, link_warnings = self._validate_links(content, markdown_path)
-            issues.extend(link_issues)
-            warnings.extend(link_warnings)
-            
-            # Validiere Tabellen
-            table_issues, table_warnings = self._validate_tables(content)
-            issues.extend(table_issues)
-            warnings.extend(table_warnings)
-            
-            # Bestimme Gesamtergebnis
-            is_valid = len(issues) == 0
-            
+            # Frontmatter nur einmal parsen, alle Prüfungen arbeiten auf dem Ergebnis
+            frontmatter, markdown_text = self._extract_frontmatter(content)
+            return self._validate_parts(frontmatter, markdown_text, markdown_path,
+                                        markdown_path.stat().st_size)
+        
+        except Exception as e:
+            self.logger.error(f"Fehler bei der Validierung von {markdown_path}: {e}", exc_info=True)
             return {
-                'is_valid': is_valid,
-                'issues': issues,
-                'warnings': warnings,
-                'stats': stats
+                'is_valid': False,
+                'issues': [f"Validierungsfehler: {str(e)}"],
+                'warnings': [],
+                'stats': {}
             }
+    
+    def validate_document(self, document) -> Dict[str, Any]:
+        """
+        Validiert ein Dokument der Nachbearbeitungspipeline im Speicher.
+        
+        Frontmatter und Text liegen bereits geparst vor; die Dateigröße wird aus
+        dem gerenderten Inhalt bestimmt, die Datei muss noch nicht geschrieben sein.
+        
+        Args:
+            document: MarkdownDocument aus processing.pipeline
+            
+        Returns:
+            Validierungsergebnis mit Problemen und Empfehlungen
+        """
+        try:
+            file_size = len(document.render().encode('utf-8'))
+            return self._validate_parts(document.frontmatter, document.body, document.path, file_size)
         
         except Exception as e:
-            self.logger.error(f"Fehler bei der Validierung von {markdown_path}: {e}", exc_info=True)
+            self.logger.error(f"Fehler bei der Validierung von {document.path}: {e}", exc_info=True)
             return {
                 'is_valid': False,
                 'issues': [f"Validierungsfehler: {str(e)}"],
@@ -174,60 +192,109 @@ class MarkdownValidator:
                 'stats': {}
             }
     
-    def _collect_stats(self, content: str, markdown_path: Path) -> Dict[str, Any]:
+    def _validate_parts(self, frontmatter: Dict[str, Any], markdown_text: str,
+                        markdown_path: Path, file_size: int) -> Dict[str, Any]:
+        """
+        Führt alle Prüfungen auf bereits getrenntem Frontmatter und Text aus.
+        
+        Args:
+            frontmatter: Geparstes Frontmatter
+            markdown_text: Markdown-Inhalt ohne Frontmatter
+            markdown_path: Pfad zur Markdown-Datei (für Dateiname und relative Links)
+            file_size: Größe des Dokuments in Bytes
+            
+        Returns:
+            Validierungsergebnis mit Problemen und Empfehlungen
+        """
+        # Sammle Validierungsergebnisse
+        issues = []
+        warnings = []
+        stats = self._collect_stats(frontmatter, markdown_text, markdown_path, file_size)
+        
+        # Validiere grundlegende Struktur
+        structure_issues, structure_warnings = self._validate_structure(frontmatter, markdown_text)
+        issues.extend(structure_issues)
+        warnings.extend(structure_warnings)
+        
+        # Validiere Inhalt
+        content_issues, content_warnings = self._validate_content(markdown_text, stats)
+        issues.extend(content_issues)
+        warnings.extend(content_warnings)
+        
+        # Validiere Formatierung
+        format_issues, format_warnings = self._validate_formatting(markdown_text)
+        issues.extend(format_issues)
+        warnings.extend(format_warnings)
+        
+        # Validiere Links und Bilder
+        link_issues, link_warnings = self._validate_links(markdown_text, markdown_path)
+        issues.extend(link_issues)
+        warnings.extend(link_warnings)
+        
+        # Validiere Tabellen
+        table_issues, table_warnings = self._validate_tables(markdown_text)
+        issues.extend(table_issues)
+        warnings.extend(table_warnings)
+        
+        # Bestimme Gesamtergebnis
+        is_valid = len(issues) == 0
+        
+        return {
+            'is_valid': is_valid,
+            'issues': issues,
+            'warnings': warnings,
+            'stats': stats
+        }
+    
+    def _collect_stats(self, frontmatter: Dict[str, Any], markdown_text: str,
+                       markdown_path: Path, file_size: int) -> Dict[str, Any]:
         """
         Sammelt Statistiken über den Markdown-Inhalt.
         
         Args:
-            content: Markdown-Inhalt
+            frontmatter: Geparstes Frontmatter
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             markdown_path: Pfad zur Markdown-Datei
+            file_size: Größe des Dokuments in Bytes
             
         Returns:
             Dictionary mit Statistiken
         """
-        # Extrahiere Frontmatter, falls vorhanden
-        frontmatter, markdown_text = self._extract_frontmatter(content)
-        
         # Zähle Zeilen, Zeichen und Wörter
         lines = markdown_text.split('\n')
         char_count = len(markdown_text)
-        word_count = len(re.findall(r'\b\w+\b', markdown_text))
-        
-        # Zähle Überschriften nach Ebene
-        headings = {
-            'h1': len(re.findall(r'^# .+$', markdown_text, re.MULTILINE)),
-            'h2': len(re.findall(r'^## .+$', markdown_text, re.MULTILINE)),
-            'h3': len(re.findall(r'^### .+$', markdown_text, re.MULTILINE)),
-            'h4': len(re.findall(r'^#### .+$', markdown_text, re.MULTILINE)),
-            'h5': len(re.findall(r'^##### .+$', markdown_text, re.MULTILINE)),
-            'h6': len(re.findall(r'^###### .+$', markdown_text, re.MULTILINE))
-        }
+        word_count = sum(1 for _ in WORD_PATTERN.finditer(markdown_text))
+        
+        # Zähle Überschriften nach Ebene (ein Durchlauf für alle Ebenen)
+        headings = {f'h{level}': 0 for level in range(1, 7)}
+        for match in HEADING_PATTERN.finditer(markdown_text):
+            headings[f'h{len(match.group(1))}'] += 1
         total_headings = sum(headings.values())
         
         # Zähle Absätze
-        paragraphs = len(re.findall(r'\n\n(?!#|\s*\*|\s*\d+\.|\s*>|\s*```|\s*\|)', markdown_text))
+        paragraphs = len(PARAGRAPH_PATTERN.findall(markdown_text))
         
         # Zähle Links und Bilder
-        links = len(re.findall(r'\[.+?\]\(.+?\)', markdown_text))
-        images = len(re.findall(r'!\[.+?\]\(.+?\)', markdown_text))
+        links = len(LINK_STATS_PATTERN.findall(markdown_text))
+        images = len(IMAGE_STATS_PATTERN.findall(markdown_text))
         
         # Zähle Codeblöcke
-        code_blocks = len(re.findall(r'```[\s\S]*?```', markdown_text))
+        code_blocks = len(CODE_BLOCK_PATTERN.findall(markdown_text))
         
         # Zähle Tabellen
-        tables = len(re.findall(r'\|.+\|.+\n\|[-:| ]+\|', markdown_text))
+        tables = len(TABLE_STATS_PATTERN.findall(markdown_text))
         
         # Zähle Listen
-        unordered_lists = len(re.findall(r'(?:^|\n)[ \t]*\*[ \t]+', markdown_text))
-        ordered_lists = len(re.findall(r'(?:^|\n)[ \t]*\d+\.[ \t]+', markdown_text))
+        unordered_lists = len(UNORDERED_ITEM_PATTERN.findall(markdown_text))
+        ordered_lists = len(ORDERED_ITEM_PATTERN.findall(markdown_text))
         
         # Zähle Blockzitate
-        blockquotes = len(re.findall(r'(?:^|\n)[ \t]*>[ \t]+', markdown_text))
+        blockquotes = len(BLOCKQUOTE_PATTERN.findall(markdown_text))
         
         # Erstelle Statistik-Dictionary
         return {
             'file_name': markdown_path.name,
-            'file_size': markdown_path.stat().st_size,
+            'file_size': file_size,
             'char_count': char_count,
             'word_count': word_count,
             'line_count': len(lines),
@@ -254,8 +321,7 @@ class MarkdownValidator:
         Returns:
             Tuple aus (frontmatter_dict, content_without_frontmatter)
         """
-        frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-        frontmatter_match = re.match(frontmatter_pattern, content, re.DOTALL)
+        frontmatter_match = FRONTMATTER_PATTERN.match(content)
         
         if frontmatter_match:
             try:
@@ -273,13 +339,13 @@ class MarkdownValidator:
         # Wenn kein Frontmatter gefunden wurde oder ein Fehler auftrat
         return {}, content
     
-    def _validate_structure(self, content: str, markdown_path: Path) -> Tuple[List[str], List[str]]:
+    def _validate_structure(self, frontmatter: Dict[str, Any], markdown_text: str) -> Tuple[List[str], List[str]]:
         """
         Validiert die Struktur der Markdown-Datei.
         
         Args:
-            content: Markdown-Inhalt
-            markdown_path: Pfad zur Markdown-Datei
+            frontmatter: Geparstes Frontmatter
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             
         Returns:
             Tuple aus (issues, warnings)
@@ -287,9 +353,6 @@ class MarkdownValidator:
         issues = []
         warnings = []
         
-        # Extrahiere Frontmatter
-        frontmatter, markdown_text = self._extract_frontmatter(content)
-        
         # Validiere Frontmatter, falls aktiviert
         if self.check_frontmatter:
             # Prüfe ob Frontmatter existiert
@@ -308,7 +371,7 @@ class MarkdownValidator:
             issues.extend(heading_issues)
         
         # Validiere Existenz von Überschriften
-        heading_match = re.search(r'^#+ .+$', markdown_text, re.MULTILINE)
+        heading_match = HEADING_LEVEL_PATTERN.search(markdown_text)
         if not heading_match:
             issues.append("Keine Überschrift im Dokument gefunden")
         
@@ -335,8 +398,7 @@ class MarkdownValidator:
         issues = []
         
         # Extrahiere alle Überschriften mit ihren Ebenen
-        heading_pattern = r'^(#+) (.+)$'
-        headings = re.findall(heading_pattern, markdown_text, re.MULTILINE)
+        headings = HEADING_LEVEL_PATTERN.findall(markdown_text)
         
         if not headings:
             return []  # Keine Überschriften zu validieren
@@ -367,12 +429,12 @@ class MarkdownValidator:
         
         return issues
     
-    def _validate_content(self, content: str, stats: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    def _validate_content(self, markdown_text: str, stats: Dict[str, Any]) -> Tuple[List[str], List[str]]:
         """
         Validiert den Inhalt der Markdown-Datei.
         
         Args:
-            content: Markdown-Inhalt
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             stats: Statistiken über den Inhalt
             
         Returns:
@@ -381,9 +443,6 @@ class MarkdownValidator:
         issues = []
         warnings = []
         
-        # Extrahiere Inhalt ohne Frontmatter
-        _, markdown_text = self._extract_frontmatter(content)
-        
         # Prüfe Mindestlänge
         min_content_length = self.rules['content'].get('min_length', self.min_content_length)
         if len(markdown_text) < min_content_length:
@@ -411,31 +470,29 @@ class MarkdownValidator:
                 issues.append(f"Fehlender erforderlicher Abschnitt: '{section}'")
         
         # Prüfe auf potenzielle Formatierungsprobleme
-        if re.search(r'(\*\*\*|\*\*|\*)[^*\s].*[^*\s](\*\*\*|\*\*|\*)', markdown_text):
+        if EMPHASIS_PROBLEM_PATTERN.search(markdown_text):
             warnings.append("Mögliche Formatierungsprobleme mit Markdown-Hervorhebungen gefunden")
         
         # Prüfe auf leere Abschnitte
-        empty_section_pattern = r'^(#+)\s+(.+?)\s*\n+(?=#+|$)'
-        for match in re.finditer(empty_section_pattern, markdown_text, re.MULTILINE):
+        for match in EMPTY_SECTION_PATTERN.finditer(markdown_text):
             heading_level = len(match.group(1))
             heading_text = match.group(2)
             warnings.append(f"Leerer Abschnitt: h{heading_level} '{heading_text}'")
         
         # Prüfe auf sehr kurze Abschnitte
-        short_section_content = r'^(#+)\s+(.+?)\s*\n+(.{1,50})\s*\n+(?=#+|$)'
-        for match in re.finditer(short_section_content, markdown_text, re.MULTILINE):
+        for match in SHORT_SECTION_PATTERN.finditer(markdown_text):
             heading_level = len(match.group(1))
             heading_text = match.group(2)
             warnings.append(f"Sehr kurzer Abschnitt: h{heading_level} '{heading_text}'")
         
         return issues, warnings
     
-    def _validate_formatting(self, content: str) -> Tuple[List[str], List[str]]:
+    def _validate_formatting(self, markdown_text: str) -> Tuple[List[str], List[str]]:
         """
         Validiert die Formatierung der Markdown-Datei.
         
         Args:
-            content: Markdown-Inhalt
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             
         Returns:
             Tuple aus (issues, warnings)
@@ -443,9 +500,6 @@ class MarkdownValidator:
         issues = []
         warnings = []
         
-        # Extrahiere Inhalt ohne Frontmatter
-        _, markdown_text = self._extract_frontmatter(content)
-        
         # Prüfe Zeilenlänge
         max_line_length = self.rules['formatting'].get('max_line_length', self.max_line_length)
         for i, line in enumerate(markdown_text.split('\n')):
@@ -460,7 +514,7 @@ class MarkdownValidator:
         code_block_style = self.rules['formatting'].get('code_block_style', 'fenced')
         if code_block_style == 'fenced':
             # Prüfe auf Indentation-Codeblöcke (die mit 4 Leerzeichen beginnen)
-            indented_code_blocks = re.findall(r'(?:^|\n)    [^\s]', markdown_text)
+            indented_code_blocks = INDENTED_CODE_PATTERN.findall(markdown_text)
             if indented_code_blocks:
                 warnings.append(f"Eingerückte Codeblöcke gefunden ({len(indented_code_blocks)}), bevorzuge aber Fenced-Codeblöcke (```)")
         
@@ -468,7 +522,7 @@ class MarkdownValidator:
         emphasis_style = self.rules['formatting'].get('emphasis_style', 'asterisk')
         if emphasis_style == 'asterisk':
             # Prüfe auf Underscore-Hervorhebungen
-            underscore_emphasis = re.findall(r'(?<!\w)_[^_]+_(?!\w)', markdown_text)
+            underscore_emphasis = UNDERSCORE_EMPHASIS_PATTERN.findall(markdown_text)
             if underscore_emphasis:
                 warnings.append(f"Underscore-Hervorhebungen gefunden ({len(underscore_emphasis)}), bevorzuge aber Asterisk-Hervorhebungen (*)")
         
@@ -476,27 +530,24 @@ class MarkdownValidator:
         list_item_style = self.rules['formatting'].get('list_item_style', 'consistent')
         if list_item_style == 'consistent':
             # Prüfe auf unterschiedliche Listenformate
-            dash_items = re.findall(r'(?:^|\n)[ \t]*-[ \t]+', markdown_text)
-            asterisk_items = re.findall(r'(?:^|\n)[ \t]*\*[ \t]+', markdown_text)
-            plus_items = re.findall(r'(?:^|\n)[ \t]*\+[ \t]+', markdown_text)
-            
-            list_styles_used = sum(1 for items in [dash_items, asterisk_items, plus_items] if items)
+            list_styles_used = sum(1 for pattern in (DASH_ITEM_PATTERN, UNORDERED_ITEM_PATTERN, PLUS_ITEM_PATTERN)
+                                   if pattern.search(markdown_text))
             if list_styles_used > 1:
                 warnings.append(f"Inkonsistente Aufzählungszeichen verwendet (-, *, +), bevorzuge eine konsistente Formatierung")
         
         # Prüfe HTML-Nutzung
-        html_tags = re.findall(r'<(/?)(\w+)[^>]*>', markdown_text)
+        html_tags = HTML_TAG_PATTERN.findall(markdown_text)
         if html_tags:
             warnings.append(f"HTML-Tags im Markdown gefunden ({len(html_tags)}), bevorzuge reine Markdown-Syntax")
         
         return issues, warnings
     
-    def _validate_links(self, content: str, markdown_path: Path) -> Tuple[List[str], List[str]]:
+    def _validate_links(self, markdown_text: str, markdown_path: Path) -> Tuple[List[str], List[str]]:
         """
         Validiert Links und Bilder in der Markdown-Datei.
         
         Args:
-            content: Markdown-Inhalt
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             markdown_path: Pfad zur Markdown-Datei
             
         Returns:
@@ -505,13 +556,9 @@ class MarkdownValidator:
         issues = []
         warnings = []
         
-        # Extrahiere Inhalt ohne Frontmatter
-        _, markdown_text = self._extract_frontmatter(content)
-        
         # Prüfe auf toten Links (nur lokale Dateien)
         if self.check_broken_links:
-            link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-            for match in re.finditer(link_pattern, markdown_text):
+            for match in LINK_PATTERN.finditer(markdown_text):
                 link_text = match.group(1)
                 link_url = match.group(2)
                 
@@ -530,15 +577,14 @@ class MarkdownValidator:
             
         # Prüfe auf leere Link-Texte
         if self.rules['links'].get('require_link_texts', True):
-            empty_link_texts = re.findall(r'\[\s*\]\(([^)]+)\)', markdown_text)
+            empty_link_texts = EMPTY_LINK_TEXT_PATTERN.findall(markdown_text)
             if empty_link_texts:
                 for url in empty_link_texts:
                     issues.append(f"Leerer Link-Text für URL: {url}")
         
         # Prüfe Bildpfade
         if self.check_images:
-            image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-            for match in re.finditer(image_pattern, markdown_text):
+            for match in IMAGE_PATTERN.finditer(markdown_text):
                 alt_text = match.group(1)
                 image_url = match.group(2)
                 
@@ -570,12 +616,12 @@ class MarkdownValidator:
         
         return issues, warnings
     
-    def _validate_tables(self, content: str) -> Tuple[List[str], List[str]]:
+    def _validate_tables(self, markdown_text: str) -> Tuple[List[str], List[str]]:
         """
         Validiert Tabellen in der Markdown-Datei.
         
         Args:
-            content: Markdown-Inhalt
+            markdown_text: Markdown-Inhalt ohne Frontmatter
             
         Returns:
             Tuple aus (issues, warnings)
@@ -583,29 +629,25 @@ class MarkdownValidator:
         issues = []
         warnings = []
         
-        # Extrahiere Inhalt ohne Frontmatter
-        _, markdown_text = self._extract_frontmatter(content)
-        
-        # Finde alle Tabellen
-        table_pattern = r'(?:^|\n)(\|.+?\|)(?:\s*\n\|[-:| ]+\|(?:\s*\n\|.+?\|)*)?'
-        tables = re.findall(table_pattern, markdown_text, re.DOTALL)
-        
-        for i, table_start in enumerate(tables):
-            # Extrahiere die vollständige Tabelle
-            table_match = re.search(rf'(?:^|\n)({re.escape(table_start)}(?:\s*\n\|[-:| ]+\|(?:\s*\n\|.+?\|)*)?)', markdown_text, re.DOTALL)
-            if not table_match:
-                continue
-                
-            table = table_match.group(1)
-            table_lines = table.strip().split('\n')
-            
+        # Finde alle Tabellen in einem Zeilendurchlauf (zusammenhängende Zeilen, die mit | beginnen)
+        tables = []
+        current_table = []
+        for line in markdown_text.split('\n'):
+            if line.startswith('|'):
+                current_table.append(line.strip())
+            elif current_table:
+                tables.append(current_table)
+                current_table = []
+        if current_table:
+            tables.append(current_table)
+        
+        for i, table_lines in enumerate(tables):
             # Prüfe, ob die Tabelle einen Header hat
             if len(table_lines) >= 2 and self.rules['tables'].get('require_headers', True):
-                header_row = table_lines[0]
-                delimiter_row = table_lines[1] if len(table_lines) > 1 else ""
+                delimiter_row = table_lines[1]
                 
                 # Prüfe, ob die zweite Zeile tatsächlich eine Trenner-Zeile ist
-                if not re.match(r'^\|[-:| ]+\|$', delimiter_row):
+                if not TABLE_DELIMITER_PATTERN.match(delimiter_row):
                     issues.append(f"Tabelle {i+1} hat keine Kopf-Trenner-Zeile (erwartet: |---| Zeile)")
             
             # Prüfe maximale Spaltenanzahl
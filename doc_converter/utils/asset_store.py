@@ -0,0 +1,214 @@
+"""
+Inhaltsadressierter Speicher für extrahierte Bilder.
+Ein Bild wird anhand seiner Rohdaten erkannt, bevor es dekodiert wird: bekannte Bilder
+(z.B. ein Logo auf jeder Seite oder in jedem Dokument) werden weder erneut mit PIL
+verarbeitet noch erneut gespeichert, sondern aus dem Speicher ins Assets-Verzeichnis
+des Dokuments verknüpft.
+
+Aufbau des Speicherverzeichnisses:
+    <ab>/<hash>.<ext>   verarbeitetes Bild
+    <ab>/<hash>.json    Dateiname, Abmessungen oder Vermerk "übersprungen"
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .file_utils import link_file
+
+# Länge des Hash-Präfixes in den Dateinamen der Assets
+ASSET_NAME_LENGTH = 20
+
+# Zähler der Deduplizierung (siehe AssetStore.stats)
+STAT_KEYS = ('images', 'stored', 'reused', 'skipped', 'bytes_stored', 'bytes_reused')
+
+
+class AssetStore:
+    """
+    Gemeinsamer Speicher für Bilder aller Converter, adressiert über den Hash der Rohdaten.
+
+    Der Speicher ist zwischen Threads teilbar; mehrere Prozesse können dasselbe
+    Verzeichnis verwenden, da alle Dateien atomar geschrieben werden.
+
+    Gespeicherte Bilder sind schreibgeschützt, weil die Assets der Dokumente Hardlinks
+    darauf sind. Bilder aus dem Speicherverzeichnis werden vor der ersten Verwendung
+    im Prozess gegen ihren Hash geprüft und bei Abweichung neu verarbeitet.
+    """
+
+    def __init__(self, store_dir: Path, link_mode: str = 'hardlink'):
+        """
+        Initialisiert den Speicher.
+
+        Args:
+            store_dir: Verzeichnis des Speichers
+            link_mode: 'hardlink' (Standard) oder 'copy' für die Assets der Dokumente
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store_dir = Path(store_dir)
+        self.link_mode = link_mode
+        self._index: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(STAT_KEYS, 0)
+
+    def add(self, data: bytes, assets_dir: Path,
+            prepare: Optional[Callable[[bytes], Optional[Dict[str, Any]]]] = None,
+            ext: str = 'png', variant: str = '') -> Optional[Dict[str, Any]]:
+        """
+        Legt ein Bild im Assets-Verzeichnis eines Dokuments an.
+
+        prepare wird nur für unbekannte Rohdaten aufgerufen und liefert
+        {'data': bytes, 'ext': str, 'width': int, 'height': int} oder None, wenn das
+        Bild übersprungen werden soll (z.B. zu klein). Auch übersprungene Bilder werden
+        vermerkt und beim nächsten Vorkommen ohne Dekodieren verworfen.
+
+        Args:
+            data: Rohdaten des Bildes
+            assets_dir: Assets-Verzeichnis des Dokuments
+            prepare: Verarbeitung der Rohdaten (Standard: unverändert übernehmen)
+            ext: Dateiendung, wenn prepare keine liefert
+            variant: Unterscheidet verschiedene Verarbeitungen derselben Rohdaten
+                (z.B. Converter und maximale Bildgröße)
+
+        Returns:
+            Dictionary mit 'filename', 'width', 'height' und 'reused' oder None, wenn
+            das Bild übersprungen wurde
+        """
+        digest_obj = hashlib.sha256(data)
+        digest_obj.update(variant.encode('utf-8'))
+        digest = digest_obj.hexdigest()
+
+        known, info = self._lookup(digest)
+        if not known:
+            prepared = prepare(data) if prepare is not None else {'data': data, 'ext': ext}
+            info = self._store(digest, prepared)
+
+        with self._lock:
+            self._stats['images'] += 1
+            if info is None:
+                self._stats['skipped'] += 1
+            elif known:
+                self._stats['reused'] += 1
+                self._stats['bytes_reused'] += info['size']
+            else:
+                self._stats['stored'] += 1
+                self._stats['bytes_stored'] += info['size']
+
+        if info is None:
+            return None
+
+        link_file(self._path(digest, info['filename']), Path(assets_dir) / info['filename'],
+                  hardlink=self.link_mode == 'hardlink')
+        return {
+            'filename': info['filename'],
+            'width': info.get('width'),
+            'height': info.get('height'),
+            'reused': known
+        }
+
+    def _path(self, digest: str, name: str) -> Path:
+        return self.store_dir / digest[:2] / name
+
+    def _lookup(self, digest: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Liefert (bekannt, Info) aus dem Index des Prozesses oder aus dem Speicherverzeichnis"""
+        with self._lock:
+            if digest in self._index:
+                return True, self._index[digest]
+
+        try:
+            with open(self._path(digest, f"{digest}.json"), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        if info is not None and not self._is_intact(self._path(digest, info['filename']), info):
+            return False, None
+
+        with self._lock:
+            self._index[digest] = info
+        return True, info
+
+    def _store(self, digest: str, prepared: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Speichert ein verarbeitetes Bild (oder den Vermerk 'übersprungen') unter seinem Hash"""
+        info = None
+        if prepared is not None:
+            filename = f"{digest[:ASSET_NAME_LENGTH]}.{prepared.get('ext') or 'png'}"
+            info = {
+                'filename': filename,
+                'width': prepared.get('width'),
+                'height': prepared.get('height'),
+                'size': len(prepared['data']),
+                'sha256': hashlib.sha256(prepared['data']).hexdigest()
+            }
+            self._write_atomic(self._path(digest, filename), prepared['data'], mode=0o444)
+
+        # Die Metadaten zuletzt schreiben: sie machen den Eintrag für andere Prozesse sichtbar
+        self._write_atomic(self._path(digest, f"{digest}.json"), json.dumps(info).encode('utf-8'))
+
+        with self._lock:
+            self._index[digest] = info
+        return info
+
+    def _is_intact(self, path: Path, info: Dict[str, Any]) -> bool:
+        """Prüft, ob ein gespeichertes Bild noch vorhanden und unverändert ist"""
+        try:
+            if path.stat().st_size != info['size']:
+                return False
+            if 'sha256' in info:
+                with open(path, 'rb') as f:
+                    return hashlib.sha256(f.read()).hexdigest() == info['sha256']
+        except OSError:
+            return False
+        return True
+
+    def _write_atomic(self, path: Path, data: bytes, mode: Optional[int] = None) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Liefert die Zähler der Deduplizierung seit dem Start bzw. dem letzten drain_stats.
+
+        Returns:
+            Dictionary mit 'images' (angefragte Bilder), 'stored' (neu verarbeitet und
+            gespeichert), 'reused' (ohne Verarbeitung wiederverwendet), 'skipped'
+            (verworfen), 'bytes_stored' und 'bytes_reused'
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def drain_stats(self) -> Dict[str, int]:
+        """Gibt die Zähler zurück und setzt sie zurück (Übergabe aus Worker-Prozessen)"""
+        with self._lock:
+            stats, self._stats = self._stats, dict.fromkeys(STAT_KEYS, 0)
+        return stats
+
+    def merge_stats(self, stats: Dict[str, int]) -> None:
+        """
+        Übernimmt die Zähler eines anderen Speichers (z.B. aus drain_stats eines Worker-Prozesses).
+
+        Args:
+            stats: Dictionary mit Zählern
+        """
+        with self._lock:
+            for key in STAT_KEYS:
+                self._stats[key] += stats.get(key, 0)
+
+    def log_stats(self) -> None:
+        """Protokolliert die Zähler der Deduplizierung"""
+        stats = self.stats()
+        if not stats['images']:
+            return
+        self.logger.info(
+            f"Bilder: {stats['images']} extrahiert, {stats['stored']} neu gespeichert "
+            f"({stats['bytes_stored'] / 1024:.0f} kB), {stats['reused']} wiederverwendet "
+            f"({stats['bytes_reused'] / 1024:.0f} kB), {stats['skipped']} übersprungen")
@@ -32,6 +32,34 @@ class ConfigManager:
         'post_processing': True,
         'validate_results': True,
         
+        # Parallele Konvertierung: 'process' (Worker-Prozesse mit Limits) oder 'thread'
+        'conversion_backend': 'process',
+        'conversion_timeout': 600,  # Sekunden pro Dokument, 0 = unbegrenzt
+        'worker_memory_limit_mb': 2048,  # Worker wird beendet, wenn er während eines Dokuments mehr belegt
+        'worker_recycle_memory_mb': 1024,  # Worker wird nach einem Dokument ersetzt, wenn er mehr belegt
+        'worker_max_tasks': 100,  # Worker nach dieser Anzahl Dokumente ersetzen, 0 = nie
+        'worker_start_method': 'spawn',
+        
+        # Konvertierungs-Cache: unveränderte Dokumente werden per Hardlink aus dem Cache übernommen
+        'conversion_cache': True,
+        'cache_dir': 'doc_converter/data/cache',
+        'asset_store_dir': 'doc_converter/data/assets',  # Bilder aller Dokumente, einmal pro Inhalt
+        'cache_link_mode': 'hardlink',  # 'copy', wenn Cache, Bildspeicher und Ziel nicht verknüpft werden sollen
+        
+        # Inventarisierung: Verzeichnisse parallel durchsuchen, Metadaten in Worker-Prozessen lesen
+        'scan_backend': 'process',  # oder 'thread'
+        'scan_workers': 4,
+        'scan_walk_threads': 8,  # gleichzeitig gelesene Verzeichnisse (lohnt v.a. auf Netzlaufwerken)
+        'scan_timeout': 120,  # Sekunden pro Dokument, 0 = unbegrenzt
+        'inventory_cache': True,  # Metadaten unveränderter Dateien wiederverwenden ('inventory_cache_file',
+                                  # Standard: <inventory_dir>/scan_cache.sqlite)
+        
+        # Web-App: persistente Auftragswarteschlange, übersteht Neustarts des Servers
+        'jobs_dir': 'doc_converter/data/jobs',
+        'web_max_workers': 2,  # gleichzeitig konvertierte Uploads
+        'web_max_queued': 100,  # weitere Uploads werden mit 429 abgelehnt, 0 = unbegrenzt
+        'job_max_attempts': 2,  # Starts eines Auftrags, bevor er nach Abbrüchen als fehlgeschlagen gilt
+        
         # Logging
         'log_level': 'INFO',
         'log_to_file': True,
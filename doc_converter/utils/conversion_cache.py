@@ -0,0 +1,237 @@
+"""
+Inhaltsadressierter Cache für die Dokumentenkonvertierung.
+Speichert Markdown und Assets einer Konvertierung unter dem SHA-256 ihres Inhalts und
+verknüpft sie bei unveränderter Quelldatei per Hardlink ins Zielverzeichnis, statt das
+Dokument erneut zu konvertieren. Objekte sind schreibgeschützt und werden vor jeder
+Wiederverwendung gegen ihren Hash geprüft.
+
+Aufbau des Cache-Verzeichnisses:
+    objects/<ab>/<sha256>   Dateiinhalte (Markdown, Bilder), einmal pro Inhalt
+    entries/<ab>/<key>.json Ergebnis einer Konvertierung: Dateiliste, Ergebnis, Laufzeit
+    manifests/<zeit>.json   Protokoll je Lauf: Treffer, Konvertierungen, Laufzeiten
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .file_utils import calculate_file_hash, link_file
+
+# Bei inkompatiblen Änderungen am Aufbau der Einträge erhöhen
+CACHE_FORMAT_VERSION = 1
+
+# Konfigurationsschlüssel ohne Einfluss auf das Konvertierungsergebnis; sie gehen nicht
+# in den Cache-Schlüssel ein (Pfade, Parallelisierung, Logging, der Cache selbst)
+NEUTRAL_CONFIG_KEYS = frozenset({
+    'source_dir', 'target_dir', 'inventory_dir', 'temp_dir', 'templates_dir',
+    'supported_extensions', 'post_processing', 'validate_results',
+    'parallel_processing', 'max_workers', 'conversion_backend', 'conversion_timeout',
+    'worker_memory_limit_mb', 'worker_recycle_memory_mb', 'worker_max_tasks', 'worker_start_method',
+    'parallel_pages', 'page_workers', 'min_pages_for_parallel', 'pages_per_task',
+    'scan_backend', 'scan_workers', 'scan_walk_threads', 'scan_timeout', 'inventory_cache', 'inventory_cache_file',
+    'jobs_dir', 'web_max_workers', 'web_max_queued', 'job_max_attempts',
+    'log_level', 'log_to_file', 'log_file', 'log_format',
+    'conversion_cache', 'cache_dir', 'asset_store_dir', 'cache_link_mode'
+})
+
+
+class ConversionCache:
+    """
+    Cache für Konvertierungsergebnisse, adressiert über Quelldatei-Hash, Converter-Version
+    und ergebnisrelevante Konfiguration.
+
+    Objekte werden nie verändert: Zieldateien werden per Hardlink (oder Kopie, falls
+    Cache und Ziel auf verschiedenen Dateisystemen liegen) angelegt und stets durch
+    Umbenennen ersetzt, nie überschrieben. Alle Schreibzugriffe sind atomar, sodass
+    mehrere Worker-Prozesse denselben Cache gleichzeitig verwenden können.
+
+    Weil ein Hardlink-Ziel dieselbe Datei wie das Objekt ist, werden Objekte beim
+    Speichern schreibgeschützt (0o444). Da das z.B. für root nicht gilt, prüft lookup()
+    zusätzlich den Hash jedes Objekts; ein verändertes Objekt wird verworfen und das
+    Dokument neu konvertiert.
+    """
+
+    def __init__(self, cache_dir: Path, link_mode: str = 'hardlink'):
+        """
+        Initialisiert den Cache und legt die Verzeichnisse an.
+
+        Args:
+            cache_dir: Wurzelverzeichnis des Caches
+            link_mode: 'hardlink' (Standard) oder 'copy' für die Zieldateien
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.entries_dir = self.cache_dir / 'entries'
+        self.manifests_dir = self.cache_dir / 'manifests'
+        self.link_mode = link_mode
+
+        for directory in (self.objects_dir, self.entries_dir, self.manifests_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, source_path: Path, fingerprint: Dict[str, Any]) -> Optional[str]:
+        """
+        Berechnet den Cache-Schlüssel eines Dokuments.
+
+        Args:
+            source_path: Pfad zur Quelldatei
+            fingerprint: Converter, Versionen und ergebnisrelevante Konfiguration
+
+        Returns:
+            Schlüssel als Hexadezimalstring oder None, wenn die Quelldatei nicht lesbar ist
+        """
+        source_hash = calculate_file_hash(Path(source_path))
+        if not source_hash:
+            return None
+
+        payload = json.dumps({'format': CACHE_FORMAT_VERSION, 'source_hash': source_hash,
+                              'fingerprint': fingerprint}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _entry_path(self, key: str) -> Path:
+        return self.entries_dir / key[:2] / f"{key}.json"
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Liefert den Eintrag zu einem Schlüssel, sofern alle zugehörigen Objekte vorhanden
+        und unverändert sind.
+
+        Args:
+            key: Cache-Schlüssel
+
+        Returns:
+            Eintrag oder None bei einem Fehltreffer
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cache-Eintrag {entry_path} nicht lesbar: {e}")
+            return None
+
+        # Fehlende oder veränderte Objekte machen den Eintrag unbrauchbar; der Hash wird
+        # erneut berechnet, weil ein Hardlink-Ziel an Ort und Stelle bearbeitet worden sein kann
+        for name, info in entry['files'].items():
+            object_path = self._object_path(info['hash'])
+            try:
+                if object_path.stat().st_size != info['size']:
+                    raise OSError("Größe weicht ab")
+                if calculate_file_hash(object_path) != info['hash']:
+                    raise OSError("Inhalt weicht ab")
+            except OSError as e:
+                self.logger.warning(f"Cache-Objekt für {name} ungültig ({e}), konvertiere neu")
+                self._discard_object(object_path)
+                return None
+
+        return entry
+
+    def store(self, key: str, output_dir: Path, target_path: Path, result: Dict[str, Any],
+              conversion_time: float, reusable: bool = True) -> Dict[str, Any]:
+        """
+        Übernimmt die Ausgabe einer Konvertierung in den Cache.
+
+        Die Dateien in output_dir werden in den Objektspeicher verschoben; output_dir
+        sollte daher ein temporäres Verzeichnis sein.
+
+        Args:
+            key: Cache-Schlüssel
+            output_dir: Verzeichnis mit Markdown-Datei und Assets der Konvertierung
+            target_path: Markdown-Datei innerhalb von output_dir
+            result: Ergebnis der Konvertierung
+            conversion_time: Dauer der Konvertierung in Sekunden
+            reusable: False legt nur die Objekte ab, ohne den Eintrag für spätere Läufe zu speichern
+
+        Returns:
+            Eintrag für materialize()
+        """
+        output_dir = Path(output_dir)
+        files = {}
+        for path in sorted(output_dir.rglob('*')):
+            if not path.is_file():
+                continue
+            digest = calculate_file_hash(path)
+            size = path.stat().st_size
+            object_path = self._object_path(digest)
+            # Vorhandene Objekte nur übernehmen, wenn ihr Inhalt noch zum Hash passt
+            if not object_path.exists() or calculate_file_hash(object_path) != digest:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = object_path.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+                shutil.move(str(path), str(tmp_path))
+                os.chmod(tmp_path, 0o444)
+                os.replace(tmp_path, object_path)
+            files[path.relative_to(output_dir).as_posix()] = {'hash': digest, 'size': size}
+
+        entry = {
+            'key': key,
+            'source': result.get('source', ''),
+            'target': Path(target_path).relative_to(output_dir).as_posix(),
+            'files': files,
+            'result': {name: value for name, value in result.items() if name not in ('source', 'target')},
+            'conversion_time': conversion_time,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        if reusable:
+            self._write_json(self._entry_path(key), entry)
+        return entry
+
+    def materialize(self, entry: Dict[str, Any], target_dir: Path) -> Path:
+        """
+        Legt die Dateien eines Eintrags im Zielverzeichnis an.
+
+        Bereits verknüpfte Dateien bleiben unverändert, alle anderen werden atomar ersetzt.
+
+        Args:
+            entry: Cache-Eintrag
+            target_dir: Zielverzeichnis
+
+        Returns:
+            Pfad der Markdown-Datei im Zielverzeichnis
+        """
+        target_dir = Path(target_dir)
+        for name, info in entry['files'].items():
+            link_file(self._object_path(info['hash']), target_dir / name, hardlink=self.link_mode == 'hardlink')
+
+        return target_dir / entry['target']
+
+    def _discard_object(self, object_path: Path) -> None:
+        """Entfernt ein beschädigtes Objekt; bereits verknüpfte Zieldateien behalten ihren Inhalt"""
+        try:
+            object_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Cache-Objekt {object_path} konnte nicht entfernt werden: {e}")
+
+    def write_manifest(self, manifest: Dict[str, Any]) -> Path:
+        """
+        Speichert das Manifest eines Konvertierungslaufs.
+
+        Args:
+            manifest: Manifest mit Zusammenfassung und Dokumentliste
+
+        Returns:
+            Pfad der Manifestdatei
+        """
+        manifest_path = self.manifests_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.json"
+        self._write_json(manifest_path, manifest)
+        return manifest_path
+
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        """Schreibt JSON atomar über eine temporäre Datei"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
@@ -6,6 +6,7 @@ import os
 import shutil
 import hashlib
 import re
+import uuid
 from pathlib import Path
 from typing import List, Set, Dict, Any, Optional, Tuple
 
@@ -106,7 +107,7 @@ def calculate_file_hash(file_path: Path) -> str:
     try:
         with open(file_path, 'rb') as f:
             # Lese die Datei in Blöcken, um Speicherprobleme bei großen Dateien zu vermeiden
-            for block in iter(lambda: f.read(4096), b''):
+            for block in iter(lambda: f.read(1024 * 1024), b''):
                 hash_obj.update(block)
                 
         return hash_obj.hexdigest()
@@ -114,6 +115,41 @@ def calculate_file_hash(file_path: Path) -> str:
         return ""
 
 
+def link_file(source_file: Path, target_file: Path, hardlink: bool = True) -> None:
+    """
+    Legt eine Datei per Hardlink (oder Kopie) am Ziel an und ersetzt eine vorhandene Datei atomar.
+    
+    Die vorhandene Zieldatei wird nie überschrieben, sondern durch Umbenennen ersetzt; ist
+    sie bereits ein Hardlink auf die Quelle, bleibt sie unverändert. So bleiben Dateien,
+    auf die weitere Hardlinks zeigen (Cache, Asset-Speicher), unverändert.
+    
+    Args:
+        source_file: Quelldatei
+        target_file: Zieldatei
+        hardlink: False erzwingt eine Kopie; schlägt der Hardlink fehl (z.B. anderes
+            Dateisystem), wird ebenfalls kopiert. Kopien erhalten die Standardrechte,
+            nicht den Schreibschutz der Quelle
+    """
+    if target_file.exists() and os.path.samefile(source_file, target_file):
+        return
+    
+    target_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = target_file.with_name(f".{target_file.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        if hardlink:
+            try:
+                os.link(source_file, tmp_file)
+            except OSError:
+                shutil.copyfile(source_file, tmp_file)
+        else:
+            # Nur den Inhalt kopieren: die Quelle ist schreibgeschützt, die Kopie nicht
+            shutil.copyfile(source_file, tmp_file)
+        os.replace(tmp_file, target_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Bereinigt einen Dateinamen, um ungültige Zeichen zu entfernen.
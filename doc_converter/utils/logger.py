@@ -100,6 +100,30 @@ class LogManager:
         
         return root_logger
     
+    @classmethod
+    def setup_forwarding(cls, handler: logging.Handler, log_level: int) -> logging.Logger:
+        """
+        Richtet das Logging eines Worker-Prozesses ein: alle Einträge gehen an handler.
+        
+        Ersetzt geerbte Handler (bei 'fork'), damit kein Worker die Log-Datei des
+        Parents selbst öffnet und rotiert; geschrieben wird nur im Parent.
+        
+        Args:
+            handler: Handler, der die Einträge an den Parent weiterreicht
+            log_level: Numerisches Logging-Level des Parents
+            
+        Returns:
+            Root-Logger-Instanz
+        """
+        root_logger = logging.getLogger()
+        root_logger.setLevel(log_level)
+        for existing in root_logger.handlers[:]:
+            root_logger.removeHandler(existing)
+        root_logger.addHandler(handler)
+        
+        cls._root_logger = root_logger
+        return root_logger
+    
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
@@ -218,7 +242,8 @@ class PipelineLogger:
             "warnings_count": 0,
             "errors_count": 0,
             "start_time": self.start_time.isoformat(),
-            "processing_times": []
+            "processing_times": [],
+            "stage_times": {}
         }
     
     def log_start(self, operation: str, details: Optional[Dict[str, Any]] = None) -> None:
@@ -288,6 +313,22 @@ class PipelineLogger:
         
         self.logger.log(level, message)
     
+    def log_stage(self, stage: str, processing_time: float, document_path: Optional[str] = None) -> None:
+        """
+        Protokolliert die Laufzeit einer Verarbeitungsstufe (z.B. der Nachbearbeitungspipeline).
+        
+        Args:
+            stage: Name der Stufe
+            processing_time: Laufzeit der Stufe in Sekunden
+            document_path: Optionaler Pfad zum Dokument
+        """
+        self.metrics["stage_times"].setdefault(stage, []).append(processing_time)
+        
+        if document_path:
+            self.logger.debug(f"STAGE: {stage} - {document_path} - Zeit: {processing_time * 1000:.1f}ms")
+        else:
+            self.logger.debug(f"STAGE: {stage} - Zeit: {processing_time * 1000:.1f}ms")
+    
     def log_warning(self, message: str, document_path: Optional[str] = None) -> None:
         """
         Protokolliert eine Warnung.
@@ -346,8 +387,49 @@ class PipelineLogger:
             metrics["min_processing_time"] = min(metrics["processing_times"])
             metrics["max_processing_time"] = max(metrics["processing_times"])
         
+        # Zusammenfassung je Verarbeitungsstufe
+        metrics["stages"] = {
+            stage: {
+                "count": len(times),
+                "total_time": sum(times),
+                "avg_time": sum(times) / len(times),
+                "max_time": max(times)
+            }
+            for stage, times in metrics["stage_times"].items() if times
+        }
+        
         return metrics
     
+    def drain_metrics(self) -> Dict[str, Any]:
+        """
+        Gibt die seit dem letzten Aufruf gesammelten Zähler und Zeiten zurück und setzt sie zurück.
+        Worker-Prozesse übergeben so ihre Metriken an den Logger des Hauptprozesses.
+        
+        Returns:
+            Dictionary mit Zählern, Verarbeitungs- und Stufenzeiten
+        """
+        drained = {key: value for key, value in self.metrics.items() if key != "start_time"}
+        for key in ("documents_processed", "documents_success", "documents_failed",
+                    "warnings_count", "errors_count"):
+            self.metrics[key] = 0
+        self.metrics["processing_times"] = []
+        self.metrics["stage_times"] = {}
+        return drained
+    
+    def merge_metrics(self, metrics: Dict[str, Any]) -> None:
+        """
+        Übernimmt Metriken eines anderen Loggers (z.B. aus drain_metrics eines Worker-Prozesses).
+        
+        Args:
+            metrics: Dictionary mit Zählern, Verarbeitungs- und Stufenzeiten
+        """
+        for key in ("documents_processed", "documents_success", "documents_failed",
+                    "warnings_count", "errors_count"):
+            self.metrics[key] += metrics.get(key, 0)
+        self.metrics["processing_times"].extend(metrics.get("processing_times", []))
+        for stage, times in metrics.get("stage_times", {}).items():
+            self.metrics["stage_times"].setdefault(stage, []).extend(times)
+    
     def log_metrics(self) -> None:
         """Protokolliert die aktuellen Metriken"""
         metrics = self.get_metrics()
@@ -368,6 +450,11 @@ class PipelineLogger:
             summary.append(f"Minimale Verarbeitungszeit: {metrics['min_processing_time']:.2f}s")
             summary.append(f"Maximale Verarbeitungszeit: {metrics['max_processing_time']:.2f}s")
         
+        for stage, stage_metrics in metrics["stages"].items():
+            summary.append(f"Stufe {stage}: {stage_metrics['count']}x, "
+                           f"gesamt {stage_metrics['total_time']:.2f}s, "
+                           f"Ø {stage_metrics['avg_time'] * 1000:.1f}ms")
+        
         self.logger.info(f"METRICS SUMMARY:\n" + "\n".join(summary))
 
 
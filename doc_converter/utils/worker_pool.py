@@ -0,0 +1,364 @@
+"""
+Prozess-Pool für die Dokumentenkonvertierung.
+Führt Aufgaben in langlebigen Worker-Prozessen aus, mit hartem Zeitlimit pro Aufgabe,
+Speicherlimit und automatischem Ersatz abgestürzter oder verbrauchter Worker.
+Log-Einträge der Worker werden an den Parent weitergereicht und dort geschrieben.
+"""
+
+import os
+import time
+import signal
+import logging
+import logging.handlers
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+from .logger import LogManager
+
+
+class _ConnectionQueue:
+    """Queue-Schnittstelle für QueueHandler: sendet Log-Einträge über die Log-Verbindung des Workers"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+
+    def put_nowait(self, record: logging.LogRecord) -> None:
+        with self.lock:
+            self.conn.send(record)
+
+
+class _LogForwarder(threading.Thread):
+    """
+    Empfängt im Parent die Log-Einträge aller Worker und gibt sie an die dortigen Logger.
+
+    Jeder Worker hat eine eigene Verbindung: wird ein Worker mitten im Senden beendet,
+    geht nur seine Verbindung verloren, nicht die der übrigen (anders als bei einer
+    gemeinsamen multiprocessing.Queue).
+    """
+
+    def __init__(self, context):
+        super().__init__(name='worker-log-forwarder', daemon=True)
+        self.connections: List[Any] = []
+        self.lock = threading.Lock()
+        self.stopped = False
+        self._wake_recv, self._wake_send = context.Pipe(duplex=False)
+
+    def add(self, conn) -> None:
+        with self.lock:
+            self.connections.append(conn)
+        self._wake_send.send(None)
+
+    def stop(self) -> None:
+        self.stopped = True
+        self._wake_send.send(None)
+        self.join(timeout=5)
+        self._wake_send.close()
+        self._wake_recv.close()
+
+    def run(self) -> None:
+        while True:
+            with self.lock:
+                connections = list(self.connections)
+            for conn in wait(connections + [self._wake_recv]):
+                if conn is self._wake_recv:
+                    self._wake_recv.recv()
+                    continue
+                try:
+                    record = conn.recv()
+                except Exception:
+                    # Worker beendet (auch mitten im Senden): Verbindung aufgeben
+                    with self.lock:
+                        self.connections.remove(conn)
+                    conn.close()
+                    continue
+                logger = logging.getLogger(record.name)
+                if logger.isEnabledFor(record.levelno):
+                    logger.handle(record)
+            if self.stopped:
+                break
+        # Beim Beenden noch gepufferte Einträge übernehmen
+        for conn in self.connections:
+            try:
+                while conn.poll():
+                    record = conn.recv()
+                    logging.getLogger(record.name).handle(record)
+            except Exception:
+                pass
+            conn.close()
+
+
+def _worker_loop(conn, task: Callable[[Any], Any], initializer: Optional[Callable[..., None]],
+                 initargs: Tuple, log_conn=None, log_level: int = logging.INFO) -> None:
+    """
+    Hauptschleife eines Worker-Prozesses.
+
+    Leitet das Logging an den Parent um, führt einmalig den Initializer aus (z.B.
+    Converter-Instanzen aufwärmen) und bearbeitet danach Aufgaben, bis der Parent
+    None sendet oder die Verbindung schließt.
+    """
+    # Abbruch per Strg+C übernimmt der Parent, er beendet die Worker geordnet
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if log_conn is not None:
+        LogManager.setup_forwarding(logging.handlers.QueueHandler(_ConnectionQueue(log_conn)), log_level)
+
+    if initializer is not None:
+        try:
+            initializer(*initargs)
+        except Exception as e:
+            conn.send((None, False, f"{type(e).__name__}: {e}"))
+            return
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        task_id, item = message
+        try:
+            conn.send((task_id, True, task(item)))
+        except Exception as e:
+            conn.send((task_id, False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """Verwaltungsdaten eines Worker-Prozesses im Parent"""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.task: Optional[Tuple[int, Any]] = None
+        self.started = 0.0
+        self.tasks_done = 0
+        self.stats = psutil.Process(process.pid) if PSUTIL_AVAILABLE else None
+
+    def rss_mb(self) -> float:
+        """Aktueller Speicherverbrauch des Worker-Prozesses in MB (0, wenn nicht messbar)"""
+        if self.stats is None:
+            return 0.0
+        try:
+            return self.stats.memory_info().rss / (1024 * 1024)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return 0.0
+
+
+class WorkerPool:
+    """
+    Pool langlebiger Worker-Prozesse mit Zeit- und Speicherlimits.
+
+    Anders als ProcessPoolExecutor kann der Pool eine einzelne hängende Aufgabe
+    abbrechen: der betroffene Worker wird beendet und durch einen neuen ersetzt,
+    die übrigen Aufgaben laufen weiter. Ergebnisse werden in Fertigstellungsreihenfolge
+    geliefert, sobald sie vorliegen.
+    """
+
+    def __init__(self, task: Callable[[Any], Any], max_workers: Optional[int] = None,
+                 initializer: Optional[Callable[..., None]] = None, initargs: Tuple = (),
+                 task_timeout: Optional[float] = None, memory_limit_mb: int = 0,
+                 recycle_memory_mb: int = 0, max_tasks_per_worker: int = 0,
+                 start_method: Optional[str] = None, poll_interval: float = 0.5):
+        """
+        Initialisiert den Pool; Worker werden erst bei Bedarf gestartet.
+
+        Args:
+            task: Funktion, die eine Aufgabe im Worker ausführt (muss picklebar sein)
+            max_workers: Anzahl der Worker-Prozesse (Standard: Anzahl der CPU-Kerne)
+            initializer: Funktion, die beim Start jedes Workers einmalig ausgeführt wird
+            initargs: Argumente für den Initializer
+            task_timeout: Hartes Zeitlimit pro Aufgabe in Sekunden (None/0 = unbegrenzt)
+            memory_limit_mb: Speicherlimit pro Worker; wird es während einer Aufgabe
+                überschritten, wird der Worker beendet (0 = kein Limit, erfordert psutil)
+            recycle_memory_mb: Worker, die nach einer Aufgabe mehr Speicher belegen,
+                werden durch neue ersetzt (0 = nie)
+            max_tasks_per_worker: Worker nach dieser Anzahl Aufgaben ersetzen (0 = nie)
+            start_method: multiprocessing-Startmethode ('fork', 'spawn', 'forkserver')
+            poll_interval: Intervall in Sekunden für die Prüfung des Speicherlimits
+        """
+        self.logger = logging.getLogger(__name__)
+        self.task = task
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.task_timeout = task_timeout or None
+        self.memory_limit_mb = memory_limit_mb
+        self.recycle_memory_mb = recycle_memory_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        self.context = multiprocessing.get_context(start_method)
+        self.workers: List[_Worker] = []
+        self.log_forwarder: Optional[_LogForwarder] = None
+
+        if (memory_limit_mb or recycle_memory_mb) and not PSUTIL_AVAILABLE:
+            self.logger.warning("psutil nicht verfügbar, Speicherlimits der Worker werden nicht überwacht")
+
+    def __enter__(self) -> 'WorkerPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _start_worker(self) -> _Worker:
+        """Startet einen neuen Worker-Prozess"""
+        if self.log_forwarder is None:
+            self.log_forwarder = _LogForwarder(self.context)
+            self.log_forwarder.start()
+        parent_conn, child_conn = self.context.Pipe()
+        log_recv, log_send = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=_worker_loop,
+                                       args=(child_conn, self.task, self.initializer, self.initargs,
+                                             log_send, logging.getLogger().getEffectiveLevel()),
+                                       daemon=True)
+        process.start()
+        child_conn.close()
+        log_send.close()
+        self.log_forwarder.add(log_recv)
+        worker = _Worker(process, parent_conn)
+        self.workers.append(worker)
+        return worker
+
+    def _stop_worker(self, worker: _Worker, kill: bool = False) -> None:
+        """Beendet einen Worker geordnet oder sofort und entfernt ihn aus dem Pool"""
+        if worker in self.workers:
+            self.workers.remove(worker)
+        if not kill:
+            try:
+                worker.conn.send(None)
+            except (OSError, ValueError):
+                kill = True
+        if kill:
+            worker.process.kill()
+        worker.process.join(timeout=None if kill else 5)
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join()
+        worker.conn.close()
+
+    def map_unordered(self, items: Iterable[Any]) -> Iterator[Tuple[Any, bool, Any]]:
+        """
+        Führt die Aufgabe für alle Elemente aus und liefert die Ergebnisse, sobald sie vorliegen.
+
+        Args:
+            items: Eingaben der Aufgaben (müssen picklebar sein)
+
+        Yields:
+            Tuple aus (element, erfolgreich, ergebnis_oder_fehlermeldung)
+
+        Raises:
+            RuntimeError: Wenn die Initialisierung eines Workers fehlschlägt
+        """
+        pending: Deque[Tuple[int, Any]] = deque(enumerate(items))
+        busy: Dict[Any, _Worker] = {}
+
+        try:
+            while pending or busy:
+                # Freie Worker (und bei Bedarf neue) mit Aufgaben versorgen
+                idle = [worker for worker in self.workers if worker.task is None]
+                while pending and (idle or len(self.workers) < self.max_workers):
+                    worker = idle.pop() if idle else self._start_worker()
+                    worker.task = pending.popleft()
+                    worker.started = time.monotonic()
+                    busy[worker.conn] = worker
+                    try:
+                        worker.conn.send(worker.task)
+                    except OSError:
+                        # Worker bereits beendet; Ursache wird beim Auslesen der Verbindung gemeldet
+                        pass
+
+                # Warten bis ein Ergebnis vorliegt, ein Worker stirbt oder ein Limit fällig wird
+                timeout = None
+                if self.task_timeout:
+                    now = time.monotonic()
+                    timeout = max(0.0, min(worker.started + self.task_timeout for worker in busy.values()) - now)
+                if self.memory_limit_mb and PSUTIL_AVAILABLE:
+                    timeout = self.poll_interval if timeout is None else min(timeout, self.poll_interval)
+
+                sentinels = {worker.process.sentinel: worker for worker in busy.values()}
+                ready = wait(list(busy) + list(sentinels), timeout)
+
+                finished: Dict[_Worker, None] = {}
+                for handle in ready:
+                    worker = busy.get(handle) or sentinels.get(handle)
+                    if worker is not None:
+                        finished[worker] = None
+
+                for worker in finished:
+                    item = worker.task[1]
+                    del busy[worker.conn]
+                    try:
+                        task_id, success, value = worker.conn.recv()
+                    except (EOFError, OSError):
+                        exitcode = worker.process.exitcode
+                        worker.process.join(timeout=1)
+                        if exitcode is None:
+                            exitcode = worker.process.exitcode
+                        self.logger.error(f"Worker-Prozess {worker.process.pid} unerwartet beendet "
+                                          f"(Exitcode {exitcode})")
+                        self._stop_worker(worker, kill=True)
+                        yield item, False, f"Worker-Prozess unerwartet beendet (Exitcode {exitcode})"
+                        continue
+
+                    if task_id is None:
+                        self._stop_worker(worker, kill=True)
+                        raise RuntimeError(f"Initialisierung des Worker-Prozesses fehlgeschlagen: {value}")
+
+                    worker.task = None
+                    worker.tasks_done += 1
+                    self._recycle_if_needed(worker)
+                    yield item, success, value
+
+                # Zeit- und Speicherlimits der noch laufenden Aufgaben prüfen
+                now = time.monotonic()
+                for worker in list(busy.values()):
+                    reason = None
+                    if self.task_timeout and now - worker.started >= self.task_timeout:
+                        reason = f"Zeitlimit von {self.task_timeout:g}s überschritten"
+                    elif self.memory_limit_mb:
+                        rss = worker.rss_mb()
+                        if rss > self.memory_limit_mb:
+                            reason = f"Speicherlimit von {self.memory_limit_mb} MB überschritten ({rss:.0f} MB)"
+                    if reason is None:
+                        continue
+
+                    item = worker.task[1]
+                    del busy[worker.conn]
+                    self.logger.error(f"Breche Aufgabe in Worker {worker.process.pid} ab: {reason}")
+                    self._stop_worker(worker, kill=True)
+                    yield item, False, reason
+        finally:
+            # Bei vorzeitigem Abbruch laufende Aufgaben verwerfen
+            for worker in busy.values():
+                self._stop_worker(worker, kill=True)
+
+    def _recycle_if_needed(self, worker: _Worker) -> None:
+        """Ersetzt Worker, die ihr Aufgabenkontingent oder Speicherbudget aufgebraucht haben"""
+        reason = None
+        if self.max_tasks_per_worker and worker.tasks_done >= self.max_tasks_per_worker:
+            reason = f"{worker.tasks_done} Aufgaben bearbeitet"
+        elif self.recycle_memory_mb:
+            rss = worker.rss_mb()
+            if rss > self.recycle_memory_mb:
+                reason = f"{rss:.0f} MB belegt"
+        if reason:
+            self.logger.info(f"Ersetze Worker-Prozess {worker.process.pid}: {reason}")
+            self._stop_worker(worker)
+
+    def close(self) -> None:
+        """Beendet alle Worker-Prozesse"""
+        for worker in list(self.workers):
+            self._stop_worker(worker, kill=worker.task is not None)
+        if self.log_forwarder is not None:
+            self.log_forwarder.stop()
+            self.log_forwarder = None
@@ -7,8 +7,8 @@ import os
 import sys
 import json
 import time
-import uuid
 import tempfile
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 
@@ -16,7 +16,8 @@ from typing import Dict, Any, List, Optional, Union
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 # FastAPI-Importe
-from fastapi import FastAPI, File, UploadFile, Form, BackgroundTasks, HTTPException, Depends
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -30,6 +31,7 @@ from pydantic import BaseModel
 from doc_converter.main import DocConverter
 from doc_converter.utils.config import ConfigManager
 from doc_converter.utils.logger import LogManager
+from doc_converter.web.job_queue import JobQueue, JobRunningError, QueueFullError
 
 # Konfiguration laden
 config = ConfigManager.load_config()
@@ -42,11 +44,28 @@ except Exception as e:
     logger.error(f"Fehler bei der Initialisierung des DocConverters: {e}", exc_info=True)
     converter = None
 
+# Persistente Warteschlange für Konvertierungsaufträge
+try:
+    job_queue = JobQueue(converter, config) if converter is not None else None
+except Exception as e:
+    logger.error(f"Fehler bei der Initialisierung der Auftragswarteschlange: {e}", exc_info=True)
+    job_queue = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Wartende und abgebrochene Aufträge früherer Läufe werden nach dem Start abgearbeitet
+    if job_queue is not None:
+        job_queue.start()
+    yield
+    if job_queue is not None:
+        await run_in_threadpool(job_queue.stop)
+
 # FastAPI-App erstellen
 app = FastAPI(
     title="Dokumentenkonverter API",
     description="API zur Konvertierung von Dokumenten in Markdown für den nscale DMS Assistenten",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS-Konfiguration
@@ -330,7 +349,24 @@ document.addEventListener('DOMContentLoaded', function() {
                 throw new Error(`HTTP-Fehler: ${response.status}`);
             }
             
-            const result = await response.json();
+            let result = await response.json();
+            
+            // Frage den Status ab, bis der Auftrag abgeschlossen ist
+            while (result.status === 'queued' || result.status === 'running') {
+                if (result.status === 'queued') {
+                    statusSpan.textContent = `In Warteschlange (Position ${result.queue_position})`;
+                } else if (result.progress !== null && result.progress !== undefined) {
+                    statusSpan.textContent = `Konvertierung läuft (${Math.round(result.progress * 100)} %)`;
+                } else {
+                    statusSpan.textContent = `Konvertierung läuft (${Math.round(result.processing_time)} s)`;
+                }
+                await new Promise(resolve => setTimeout(resolve, 1000));
+                const statusResponse = await fetch(`/api/status/${result.job_id}`);
+                if (!statusResponse.ok) {
+                    throw new Error(`HTTP-Fehler: ${statusResponse.status}`);
+                }
+                result = await statusResponse.json();
+            }
             
             // Verstecke Loading-Indikator
             loadingDiv.style.display = 'none';
@@ -455,15 +491,18 @@ class ConversionJob(BaseModel):
     job_id: str
     source_filename: str
     target_filename: Optional[str] = None
+    status: str  # queued, running, done, failed
     success: bool
     error: Optional[str] = None
+    progress: Optional[float] = None  # 0.0-1.0, bei laufenden Aufträgen geschätzt
+    queue_position: Optional[int] = None
+    attempts: int = 0
     processing_time: float
     timestamp: float
+    started: Optional[float] = None
+    finished: Optional[float] = None
     changes: List[str] = []
 
-# Speicher für Konvertierungsjobs
-conversion_jobs: Dict[str, ConversionJob] = {}
-
 # Hilfsfunktionen
 def get_credentials(credentials: HTTPBasicCredentials = Depends(security)):
     """Überprüft die Anmeldeinformationen"""
@@ -479,20 +518,61 @@ def get_credentials(credentials: HTTPBasicCredentials = Depends(security)):
     
     return credentials.username
 
+def get_job_queue() -> JobQueue:
+    """Liefert die Auftragswarteschlange oder einen Fehler, wenn der Konverter nicht verfügbar ist"""
+    if job_queue is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Dokumentenkonverter konnte nicht initialisiert werden"
+        )
+    return job_queue
+
+def get_job(job_id: str) -> Dict[str, Any]:
+    """Liefert einen Konvertierungsjob oder 404"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Konvertierungsjob nicht gefunden"
+        )
+    return job
+
+def get_target_file(job_id: str) -> Path:
+    """Liefert die konvertierte Datei eines abgeschlossenen Jobs oder 404"""
+    job = get_job(job_id)
+    
+    if not job['success'] or not job['target_filename']:
+        raise HTTPException(
+            status_code=404,
+            detail="Keine konvertierte Datei verfügbar"
+        )
+    
+    target_file = Path(job['target_dir']) / job['target_filename']
+    
+    if not target_file.exists():
+        raise HTTPException(
+            status_code=404,
+            detail="Zieldatei nicht gefunden"
+        )
+    
+    return target_file
+
 # Routen
 @app.get("/", response_class=HTMLResponse)
 async def get_index(request: Request):
     """Gibt die Index-Seite zurück"""
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/api/convert")
+@app.post("/api/convert", response_model=ConversionJob, status_code=202)
 async def convert_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     post_processing: bool = Form(True)
 ):
     """
-    Konvertiert ein hochgeladenes Dokument in Markdown.
+    Reiht ein hochgeladenes Dokument zur Konvertierung in Markdown ein.
+    
+    Die Konvertierung läuft in der Auftragswarteschlange; Fortschritt und Ergebnis
+    liefert /api/status/{job_id}.
     
     Args:
         file: Hochgeladene Datei
@@ -501,104 +581,26 @@ async def convert_document(
     Returns:
         Informationen über den Konvertierungsjob
     """
-    # Prüfe, ob DocConverter initialisiert wurde
-    if converter is None:
+    queue = get_job_queue()
+    
+    try:
+        # Speichern und Eintragen blockieren nicht die Event-Loop
+        job = await run_in_threadpool(
+            queue.submit,
+            file.filename,
+            file.file,
+            {"post_processing": post_processing}
+        )
+    except QueueFullError as e:
         raise HTTPException(
-            status_code=500,
-            detail="Dokumentenkonverter konnte nicht initialisiert werden"
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
         )
     
-    # Erstelle Job-ID
-    job_id = str(uuid.uuid4())
-    timestamp = time.time()
-    
-    # Erstelle temporäres Verzeichnis für die Konvertierung
-    temp_dir = Path(tempfile.mkdtemp(prefix=f"doc_converter_{job_id}_"))
-    source_dir = temp_dir / "source"
-    target_dir = temp_dir / "target"
-    source_dir.mkdir()
-    target_dir.mkdir()
-    
-    # Speichere hochgeladene Datei
-    source_filename = file.filename
-    source_path = source_dir / source_filename
-    
-    with open(source_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
-    
-    # Erstelle initialen Job-Status
-    job = ConversionJob(
-        job_id=job_id,
-        source_filename=source_filename,
-        success=False,
-        error="Konvertierung noch nicht abgeschlossen",
-        processing_time=0,
-        timestamp=timestamp,
-        changes=[]
-    )
-    conversion_jobs[job_id] = job
-    
-    # Starte Konvertierung als Hintergrundaufgabe
-    background_tasks.add_task(
-        process_conversion,
-        job_id,
-        source_path,
-        target_dir,
-        post_processing
-    )
-    
-    return {"job_id": job_id, "source_filename": source_filename, "success": True}
+    return ConversionJob(**job)
 
-async def process_conversion(job_id: str, source_path: Path, target_dir: Path, post_processing: bool):
-    """
-    Führt die Konvertierung im Hintergrund durch.
-    
-    Args:
-        job_id: Job-ID
-        source_path: Pfad zur Quelldatei
-        target_dir: Zielverzeichnis
-        post_processing: Ob Nachbearbeitung durchgeführt werden soll
-    """
-    start_time = time.time()
-    job = conversion_jobs[job_id]
-    
-    try:
-        # Setze post_processing-Option
-        original_post_processing = converter.post_processing
-        converter.post_processing = post_processing
-        
-        # Konvertiere Dokument
-        result = converter.convert_document(source_path, target_dir)
-        
-        # Stelle ursprüngliche Einstellung wieder her
-        converter.post_processing = original_post_processing
-        
-        # Aktualisiere Job-Status
-        processing_time = time.time() - start_time
-        
-        if result['success']:
-            target_path = Path(result['target'])
-            job.target_filename = target_path.name
-            job.success = True
-            job.error = None
-            job.processing_time = processing_time
-            job.changes = result.get('changes', [])
-        else:
-            job.success = False
-            job.error = result.get('error', "Unbekannter Fehler")
-            job.processing_time = processing_time
-    
-    except Exception as e:
-        # Bei Fehler, aktualisiere Job-Status
-        processing_time = time.time() - start_time
-        job.success = False
-        job.error = str(e)
-        job.processing_time = processing_time
-        logger.error(f"Fehler bei der Konvertierung von {source_path}: {e}", exc_info=True)
-
-@app.get("/api/status/{job_id}")
-async def get_job_status(job_id: str):
+@app.get("/api/status/{job_id}", response_model=ConversionJob)
+def get_job_status(job_id: str):
     """
     Gibt den Status eines Konvertierungsjobs zurück.
     
@@ -606,29 +608,12 @@ async def get_job_status(job_id: str):
         job_id: Job-ID
     
     Returns:
-        Status des Jobs
+        Status, Fortschritt und Ergebnis des Jobs
     """
-    if job_id not in conversion_jobs:
-        raise HTTPException(
-            status_code=404,
-            detail="Konvertierungsjob nicht gefunden"
-        )
-    
-    job = conversion_jobs[job_id]
-    
-    return {
-        "job_id": job.job_id,
-        "source_filename": job.source_filename,
-        "target_filename": job.target_filename,
-        "success": job.success,
-        "error": job.error,
-        "processing_time": job.processing_time,
-        "timestamp": job.timestamp,
-        "changes": job.changes
-    }
+    return ConversionJob(**get_job(job_id))
 
 @app.get("/api/download/{job_id}")
-async def download_converted_file(job_id: str):
+def download_converted_file(job_id: str):
     """
     Ermöglicht den Download einer konvertierten Datei.
     
@@ -638,48 +623,16 @@ async def download_converted_file(job_id: str):
     Returns:
         Konvertierte Datei als Download
     """
-    if job_id not in conversion_jobs:
-        raise HTTPException(
-            status_code=404,
-            detail="Konvertierungsjob nicht gefunden"
-        )
-    
-    job = conversion_jobs[job_id]
-    
-    if not job.success or not job.target_filename:
-        raise HTTPException(
-            status_code=404,
-            detail="Keine konvertierte Datei verfügbar"
-        )
-    
-    # Suche nach der Zieldatei
-    temp_dir = Path(tempfile.gettempdir())
-    job_dirs = list(temp_dir.glob(f"doc_converter_{job_id}_*"))
-    
-    if not job_dirs:
-        raise HTTPException(
-            status_code=404,
-            detail="Temporäres Verzeichnis nicht gefunden"
-        )
-    
-    job_dir = job_dirs[0]
-    target_dir = job_dir / "target"
-    target_file = target_dir / job.target_filename
-    
-    if not target_file.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Zieldatei nicht gefunden"
-        )
+    target_file = get_target_file(job_id)
     
     return FileResponse(
         path=target_file,
-        filename=job.target_filename,
+        filename=target_file.name,
         media_type="text/markdown"
     )
 
 @app.get("/api/preview/{job_id}")
-async def preview_converted_file(job_id: str):
+def preview_converted_file(job_id: str):
     """
     Gibt eine Vorschau einer konvertierten Datei zurück.
     
@@ -689,39 +642,7 @@ async def preview_converted_file(job_id: str):
     Returns:
         Inhalt der konvertierten Datei
     """
-    if job_id not in conversion_jobs:
-        raise HTTPException(
-            status_code=404,
-            detail="Konvertierungsjob nicht gefunden"
-        )
-    
-    job = conversion_jobs[job_id]
-    
-    if not job.success or not job.target_filename:
-        raise HTTPException(
-            status_code=404,
-            detail="Keine konvertierte Datei verfügbar"
-        )
-    
-    # Suche nach der Zieldatei
-    temp_dir = Path(tempfile.gettempdir())
-    job_dirs = list(temp_dir.glob(f"doc_converter_{job_id}_*"))
-    
-    if not job_dirs:
-        raise HTTPException(
-            status_code=404,
-            detail="Temporäres Verzeichnis nicht gefunden"
-        )
-    
-    job_dir = job_dirs[0]
-    target_dir = job_dir / "target"
-    target_file = target_dir / job.target_filename
-    
-    if not target_file.exists():
-        raise HTTPException(
-            status_code=404,
-            detail="Zieldatei nicht gefunden"
-        )
+    target_file = get_target_file(job_id)
     
     # Lese Inhalt der Datei
     with open(target_file, "r", encoding="utf-8") as f:
@@ -730,33 +651,28 @@ async def preview_converted_file(job_id: str):
     return content
 
 @app.get("/api/reports")
-async def get_reports():
+def get_reports():
     """
     Gibt eine Liste aller Konvertierungsjobs zurück.
     
     Returns:
-        Liste der Jobs
+        Liste der Jobs (neueste zuerst)
     """
-    # Sortiere Jobs nach Timestamp (neueste zuerst)
-    sorted_jobs = sorted(
-        conversion_jobs.values(),
-        key=lambda x: x.timestamp,
-        reverse=True
-    )
-    
     return [
         {
-            "job_id": job.job_id,
-            "source_filename": job.source_filename,
-            "target_filename": job.target_filename,
-            "success": job.success,
-            "timestamp": job.timestamp
+            "job_id": job["job_id"],
+            "source_filename": job["source_filename"],
+            "target_filename": job["target_filename"],
+            "status": job["status"],
+            "success": job["success"],
+            "progress": job["progress"],
+            "timestamp": job["timestamp"]
         }
-        for job in sorted_jobs
+        for job in get_job_queue().list()
     ]
 
-@app.get("/api/report/{job_id}")
-async def get_report(job_id: str):
+@app.get("/api/report/{job_id}", response_model=ConversionJob)
+def get_report(job_id: str):
     """
     Gibt einen detaillierten Bericht über einen Konvertierungsjob zurück.
     
@@ -766,27 +682,10 @@ async def get_report(job_id: str):
     Returns:
         Detaillierter Bericht
     """
-    if job_id not in conversion_jobs:
-        raise HTTPException(
-            status_code=404,
-            detail="Konvertierungsjob nicht gefunden"
-        )
-    
-    job = conversion_jobs[job_id]
-    
-    return {
-        "job_id": job.job_id,
-        "source_filename": job.source_filename,
-        "target_filename": job.target_filename,
-        "success": job.success,
-        "error": job.error,
-        "processing_time": job.processing_time,
-        "timestamp": job.timestamp,
-        "changes": job.changes
-    }
+    return ConversionJob(**get_job(job_id))
 
 @app.delete("/api/report/{job_id}")
-async def delete_report(
+def delete_report(
     job_id: str,
     username: str = Depends(get_credentials)
 ):
@@ -800,40 +699,38 @@ async def delete_report(
     Returns:
         Bestätigung
     """
-    if job_id not in conversion_jobs:
+    # Entfernt Job und Dateien; laufende Jobs können nicht gelöscht werden
+    try:
+        deleted = get_job_queue().delete(job_id)
+    except JobRunningError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e)
+        )
+    
+    if not deleted:
         raise HTTPException(
             status_code=404,
             detail="Konvertierungsjob nicht gefunden"
         )
     
-    # Entferne Job aus dem Speicher
-    del conversion_jobs[job_id]
-    
-    # Lösche temporäres Verzeichnis
-    temp_dir = Path(tempfile.gettempdir())
-    job_dirs = list(temp_dir.glob(f"doc_converter_{job_id}_*"))
-    
-    for job_dir in job_dirs:
-        try:
-            import shutil
-            shutil.rmtree(job_dir)
-        except Exception as e:
-            logger.warning(f"Fehler beim Löschen des temporären Verzeichnisses {job_dir}: {e}")
-    
     return {"success": True, "message": "Konvertierungsjob erfolgreich gelöscht"}
 
 @app.get("/api/health")
-async def health_check():
+def health_check():
     """
     Überprüft den Gesundheitszustand der Anwendung.
     
+    Synchron, damit FastAPI die Abfrage der Warteschlange (SQLite) im Threadpool ausführt.
+    
     Returns:
         Gesundheitsstatus
     """
     return {
-        "status": "OK" if converter is not None else "ERROR",
+        "status": "OK" if converter is not None and job_queue is not None else "ERROR",
         "version": "1.0.0",
         "timestamp": time.time(),
+        "jobs_queued": job_queue.count("queued") if job_queue else 0,
         "converters_available": {
             "pdf": hasattr(converter, "pdf_converter") if converter else False,
             "docx": hasattr(converter, "docx_converter") if converter else False,
@@ -874,11 +771,11 @@ async def clear_temp_files(
     }
 
 @app.post("/api/admin/clear-jobs")
-async def clear_jobs(
+def clear_jobs(
     username: str = Depends(get_credentials)
 ):
     """
-    Löscht alle Konvertierungsjobs.
+    Löscht alle Konvertierungsjobs außer den gerade laufenden.
     
     Args:
         username: Authentifizierter Benutzername
@@ -886,8 +783,7 @@ async def clear_jobs(
     Returns:
         Bestätigung
     """
-    job_count = len(conversion_jobs)
-    conversion_jobs.clear()
+    job_count = get_job_queue().clear()
     
     return {
         "success": True,
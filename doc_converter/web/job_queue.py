@@ -0,0 +1,510 @@
+"""
+Persistente Auftragswarteschlange für die Web-App.
+Hochgeladene Dokumente werden mit ihren Optionen in einer SQLite-Datei vorgemerkt und
+von einer festen Anzahl Dispatcher-Threads nacheinander konvertiert, je nach
+'conversion_backend' in einem eigenen Worker-Prozess (mit Zeit- und Speicherlimit) oder
+direkt im Thread. Aufträge überstehen einen Neustart des Servers: wartende Aufträge werden
+danach abgearbeitet, abgebrochene erneut eingereiht, bis 'job_max_attempts' erreicht ist.
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from doc_converter.main import DocConverter
+from doc_converter.utils.worker_pool import WorkerPool
+
+# Abstand, in dem laufende Aufträge als lebendig markiert werden; Aufträge ohne Lebenszeichen
+# seit STALE_AFTER Sekunden gelten als abgebrochen (z.B. nach Absturz eines anderen Servers)
+HEARTBEAT_INTERVAL = 10
+STALE_AFTER = 6 * HEARTBEAT_INTERVAL
+
+# Anzahl zuletzt abgeschlossener Aufträge, aus deren Dauer der Fortschritt geschätzt wird
+DURATION_SAMPLE = 20
+
+
+class QueueFullError(Exception):
+    """Die Warteschlange hat die maximale Anzahl wartender Aufträge erreicht"""
+    pass
+
+
+class JobRunningError(Exception):
+    """Ein laufender Auftrag kann nicht gelöscht werden"""
+    pass
+
+
+class JobQueue:
+    """
+    Warteschlange für Konvertierungsaufträge mit begrenzter Parallelität.
+
+    Jeder Auftrag trägt seine Optionen (z.B. post_processing) selbst, der gemeinsame
+    DocConverter wird nicht verändert. Zustände: queued → running → done | failed.
+    Die Datenbank wird je Zugriff neu geöffnet; mehrere Server-Prozesse können dieselbe
+    Warteschlange verwenden, ein Auftrag wird per BEGIN IMMEDIATE genau einmal vergeben.
+    """
+
+    def __init__(self, converter: DocConverter, config: Dict[str, Any]):
+        """
+        Initialisiert die Warteschlange und legt Verzeichnis und Datenbank an.
+
+        Args:
+            converter: DocConverter für Backend, Limits und Worker-Konfiguration
+            config: Konfigurationswörterbuch
+        """
+        self.logger = logging.getLogger(__name__)
+        self.converter = converter
+        self.config = config
+        self.jobs_dir = Path(config.get('jobs_dir', 'doc_converter/data/jobs')).resolve()
+        self.db_file = self.jobs_dir / 'jobs.sqlite'
+        self.max_workers = max(1, config.get('web_max_workers', 2))
+        self.max_queued = config.get('web_max_queued', 100)
+        self.max_attempts = max(1, config.get('job_max_attempts', 2))
+        self.poll_interval = 1.0
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._active: Dict[str, float] = {}
+        self._active_lock = threading.Lock()
+
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'job_id TEXT PRIMARY KEY, source_filename TEXT NOT NULL, job_dir TEXT NOT NULL, '
+                'options TEXT NOT NULL, status TEXT NOT NULL, target_filename TEXT, error TEXT, '
+                "changes TEXT NOT NULL DEFAULT '[]', attempts INTEGER NOT NULL DEFAULT 0, "
+                'owner TEXT, heartbeat REAL, created REAL NOT NULL, started REAL, finished REAL, '
+                'processing_time REAL NOT NULL DEFAULT 0)')
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Öffnet die Datenbank; mit write=True innerhalb einer exklusiven Schreibtransaktion"""
+        conn = sqlite3.connect(str(self.db_file), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not write:
+                yield conn
+                return
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def start(self) -> None:
+        """Reiht abgebrochene Aufträge wieder ein und startet Dispatcher- und Heartbeat-Threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        recovered = self.recover()
+        queued = self.count('queued')
+        self.logger.info(f"Auftragswarteschlange gestartet: {self.max_workers} Worker, "
+                         f"{queued} wartende Aufträge ({recovered} wiederaufgenommen)")
+
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._dispatch_loop, name=f"conversion-job-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat_loop, name="conversion-job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: float = 30) -> None:
+        """
+        Hält die Warteschlange an; laufende Aufträge werden bis zum Zeitlimit abgewartet.
+
+        Danach noch laufende Aufträge bleiben als 'running' stehen und werden beim
+        nächsten Start wieder eingereiht.
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden
+        """
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        if any(thread.is_alive() for thread in self._threads):
+            self.logger.warning(f"Auftragswarteschlange angehalten, {len(self._active)} Aufträge "
+                                f"noch in Bearbeitung; sie werden beim nächsten Start wiederholt")
+        self._threads = []
+
+    def submit(self, filename: str, data: BinaryIO, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Speichert eine hochgeladene Datei und reiht sie zur Konvertierung ein.
+
+        Args:
+            filename: Ursprünglicher Dateiname (Pfadanteile werden entfernt)
+            data: Geöffnete Datei mit dem Inhalt
+            options: Optionen des Auftrags, z.B. {'post_processing': False}
+
+        Returns:
+            Beschreibung des Auftrags wie bei get()
+
+        Raises:
+            QueueFullError: Wenn bereits 'web_max_queued' Aufträge warten
+        """
+        if self.max_queued and self.count('queued') >= self.max_queued:
+            raise QueueFullError(f"Warteschlange voll ({self.max_queued} wartende Aufträge)")
+
+        job_id = str(uuid.uuid4())
+        source_filename = os.path.basename((filename or '').replace('\\', '/')).strip() or 'upload'
+        if source_filename in ('.', '..'):
+            source_filename = 'upload'
+        job_dir = self.jobs_dir / job_id
+        (job_dir / 'source').mkdir(parents=True)
+        (job_dir / 'target').mkdir()
+        try:
+            with open(job_dir / 'source' / source_filename, 'wb') as f:
+                shutil.copyfileobj(data, f)
+
+            with self._connect(write=True) as conn:
+                if self.max_queued and self.count('queued', conn) >= self.max_queued:
+                    raise QueueFullError(f"Warteschlange voll ({self.max_queued} wartende Aufträge)")
+                conn.execute(
+                    'INSERT INTO jobs (job_id, source_filename, job_dir, options, status, created) '
+                    "VALUES (?, ?, ?, ?, 'queued', ?)",
+                    (job_id, source_filename, str(job_dir), json.dumps(options or {}), time.time()))
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        with self._wakeup:
+            self._wakeup.notify()
+        self.logger.info(f"Auftrag {job_id} eingereiht: {source_filename}")
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Liefert einen Auftrag mit Fortschritt und Position in der Warteschlange.
+
+        Args:
+            job_id: Auftrags-ID
+
+        Returns:
+            Beschreibung des Auftrags oder None, wenn er nicht existiert
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT rowid AS seq, * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row['status'] == 'queued':
+                position = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND rowid <= ?",
+                                        (row['seq'],)).fetchone()[0]
+            return self._describe(row, position, self._expected_duration(conn))
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Liefert alle Aufträge, neueste zuerst"""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT rowid AS seq, * FROM jobs ORDER BY created DESC').fetchall()
+            expected = self._expected_duration(conn)
+        queued = sorted(row['seq'] for row in rows if row['status'] == 'queued')
+        positions = {seq: index + 1 for index, seq in enumerate(queued)}
+        return [self._describe(row, positions.get(row['seq']), expected) for row in rows]
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Löscht einen wartenden oder abgeschlossenen Auftrag samt Dateien.
+
+        Args:
+            job_id: Auftrags-ID
+
+        Returns:
+            False, wenn der Auftrag nicht existiert
+
+        Raises:
+            JobRunningError: Wenn der Auftrag gerade konvertiert wird
+        """
+        with self._connect(write=True) as conn:
+            row = conn.execute('SELECT status, job_dir FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if row is None:
+                return False
+            if row['status'] == 'running':
+                raise JobRunningError(f"Auftrag {job_id} wird gerade konvertiert")
+            conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+        shutil.rmtree(row['job_dir'], ignore_errors=True)
+        return True
+
+    def clear(self) -> int:
+        """
+        Löscht alle Aufträge außer den laufenden.
+
+        Returns:
+            Anzahl der gelöschten Aufträge
+        """
+        with self._connect(write=True) as conn:
+            rows = conn.execute("SELECT job_dir FROM jobs WHERE status != 'running'").fetchall()
+            conn.execute("DELETE FROM jobs WHERE status != 'running'")
+        for row in rows:
+            shutil.rmtree(row['job_dir'], ignore_errors=True)
+        return len(rows)
+
+    def recover(self) -> int:
+        """
+        Reiht Aufträge wieder ein, deren Bearbeitung abgebrochen ist.
+
+        Als abgebrochen gilt ein laufender Auftrag, dessen Server-Prozess auf diesem Rechner
+        nicht mehr existiert, oder der seit STALE_AFTER Sekunden kein Lebenszeichen gegeben hat.
+        Aufträge, die bereits 'job_max_attempts' Mal gestartet wurden, werden als fehlgeschlagen
+        markiert, damit ein Dokument, das den Server zum Absturz bringt, das nicht wiederholt tut.
+
+        Returns:
+            Anzahl der wieder eingereihten Aufträge
+        """
+        now = time.time()
+        requeued = 0
+        with self._connect(write=True) as conn:
+            rows = conn.execute("SELECT job_id, owner, heartbeat, attempts FROM jobs "
+                                "WHERE status = 'running'").fetchall()
+            for row in rows:
+                if not self._is_abandoned(row['job_id'], row['owner'], row['heartbeat'], now):
+                    continue
+                if row['attempts'] >= self.max_attempts:
+                    self.logger.error(f"Auftrag {row['job_id']} nach {row['attempts']} abgebrochenen "
+                                      f"Versuchen als fehlgeschlagen markiert")
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', owner = NULL, finished = ?, error = ? "
+                        "WHERE job_id = ?",
+                        (now, f"Konvertierung {row['attempts']}-mal abgebrochen (Server-Neustart oder Absturz)",
+                         row['job_id']))
+                else:
+                    self.logger.warning(f"Auftrag {row['job_id']} abgebrochen, wird erneut eingereiht")
+                    conn.execute("UPDATE jobs SET status = 'queued', owner = NULL, started = NULL "
+                                 "WHERE job_id = ?", (row['job_id'],))
+                    requeued += 1
+        return requeued
+
+    def _is_abandoned(self, job_id: str, owner: Optional[str], heartbeat: Optional[float], now: float) -> bool:
+        """Prüft, ob ein laufender Auftrag keinen lebenden Bearbeiter mehr hat"""
+        with self._active_lock:
+            if job_id in self._active:
+                return False
+        host, _, pid = (owner or '').rpartition(':')
+        if host == socket.gethostname() and pid.isdigit():
+            # Eigene PID ohne aktiven Auftrag: Vorgänger mit derselben PID (z.B. im Container)
+            if int(pid) == os.getpid():
+                return True
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return True
+            except OSError:
+                pass
+        return heartbeat is None or now - heartbeat > STALE_AFTER
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """
+        Übernimmt den ältesten wartenden Auftrag.
+
+        Der Auftrag wird noch vor dem COMMIT in _active eingetragen: sonst könnte recover()
+        (Heartbeat-Thread) ihn im Moment dazwischen als 'running' mit eigener PID, aber ohne
+        aktiven Bearbeiter sehen und als abgebrochen wieder einreihen.
+        """
+        now = time.time()
+        row = None
+        try:
+            with self._connect(write=True) as conn:
+                row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY rowid LIMIT 1").fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, started = ?, "
+                             "attempts = attempts + 1 WHERE job_id = ?", (self.owner, now, now, row['job_id']))
+                with self._active_lock:
+                    self._active[row['job_id']] = now
+        except BaseException:
+            if row is not None:
+                with self._active_lock:
+                    self._active.pop(row['job_id'], None)
+            raise
+        return row
+
+    def _finish(self, job_id: str, result: Dict[str, Any], processing_time: float) -> None:
+        """Speichert das Ergebnis eines Auftrags"""
+        success = bool(result.get('success'))
+        target_filename = Path(result['target']).name if success and result.get('target') else None
+        try:
+            with self._connect(write=True) as conn:
+                conn.execute(
+                    'UPDATE jobs SET status = ?, target_filename = ?, error = ?, changes = ?, owner = NULL, '
+                    'finished = ?, processing_time = ? WHERE job_id = ? AND owner = ?',
+                    ('done' if success else 'failed', target_filename,
+                     None if success else result.get('error', "Unbekannter Fehler"),
+                     json.dumps(result.get('changes', []), default=str), time.time(), processing_time,
+                     job_id, self.owner))
+        finally:
+            with self._active_lock:
+                self._active.pop(job_id, None)
+
+    def _dispatch_loop(self) -> None:
+        """Hauptschleife eines Dispatcher-Threads: Aufträge übernehmen und konvertieren"""
+        pool = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    job = self._claim()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Fehler beim Lesen der Auftragswarteschlange: {e}")
+                    job = None
+                if job is None:
+                    with self._wakeup:
+                        self._wakeup.wait(self.poll_interval)
+                    continue
+
+                job_dir = Path(job['job_dir'])
+                source_path = job_dir / 'source' / job['source_filename']
+                target_dir = job_dir / 'target'
+                post_processing = json.loads(job['options']).get('post_processing')
+                self.logger.info(f"Konvertiere Auftrag {job['job_id']}: {job['source_filename']}")
+
+                started = time.monotonic()
+                try:
+                    if self.converter.conversion_backend == 'process':
+                        if pool is None:
+                            pool = self._create_pool()
+                        result = self._convert_in_pool(pool, source_path, target_dir, post_processing)
+                    else:
+                        result = self.converter.convert_document(source_path, target_dir,
+                                                                 post_processing=post_processing)
+                except Exception as e:
+                    self.logger.error(f"Fehler bei Auftrag {job['job_id']}: {e}", exc_info=True)
+                    result = {'success': False, 'error': str(e)}
+                    if pool is not None:
+                        pool.close()
+                        pool = None
+                self._finish(job['job_id'], result, time.monotonic() - started)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    def _create_pool(self) -> WorkerPool:
+        """Ein Worker-Prozess je Dispatcher-Thread, mit den Limits der Verzeichniskonvertierung"""
+        return WorkerPool(
+            _convert_job_in_worker,
+            max_workers=1,
+            initializer=_init_job_worker,
+            initargs=(self.converter._worker_config(),),
+            task_timeout=self.converter.conversion_timeout,
+            memory_limit_mb=self.config.get('worker_memory_limit_mb', 0),
+            recycle_memory_mb=self.config.get('worker_recycle_memory_mb', 0),
+            max_tasks_per_worker=self.config.get('worker_max_tasks', 0),
+            start_method=self.config.get('worker_start_method')
+        )
+
+    @staticmethod
+    def _convert_in_pool(pool: WorkerPool, source_path: Path, target_dir: Path,
+                         post_processing: Optional[bool]) -> Dict[str, Any]:
+        """Konvertiert ein Dokument im Worker-Prozess; Zeit- und Speicherlimit führen zu einem Fehlerergebnis"""
+        for _, success, value in pool.map_unordered([(str(source_path), str(target_dir), post_processing)]):
+            if success:
+                return value
+            return {'success': False, 'source': str(source_path), 'error': value}
+        return {'success': False, 'source': str(source_path), 'error': "Kein Ergebnis vom Worker-Prozess"}
+
+    def _heartbeat_loop(self) -> None:
+        """Markiert eigene Aufträge als lebendig und reiht abgebrochene fremde Aufträge wieder ein"""
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                with self._active_lock:
+                    active = list(self._active)
+                if active:
+                    with self._connect(write=True) as conn:
+                        conn.executemany('UPDATE jobs SET heartbeat = ? WHERE job_id = ? AND owner = ?',
+                                         [(time.time(), job_id, self.owner) for job_id in active])
+                if self.recover():
+                    with self._wakeup:
+                        self._wakeup.notify_all()
+            except sqlite3.Error as e:
+                self.logger.error(f"Fehler beim Aktualisieren der Auftragswarteschlange: {e}")
+
+    def count(self, status: str, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Anzahl der Aufträge mit einem Status"""
+        if conn is not None:
+            return conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (status,)).fetchone()[0]
+        with self._connect() as conn:
+            return self.count(status, conn)
+
+    @staticmethod
+    def _expected_duration(conn: sqlite3.Connection) -> Optional[float]:
+        """Mittlere Dauer der zuletzt erfolgreich abgeschlossenen Aufträge"""
+        return conn.execute(
+            "SELECT AVG(processing_time) FROM (SELECT processing_time FROM jobs WHERE status = 'done' "
+            'ORDER BY finished DESC LIMIT ?)', (DURATION_SAMPLE,)).fetchone()[0]
+
+    def _describe(self, row: sqlite3.Row, queue_position: Optional[int],
+                  expected_duration: Optional[float]) -> Dict[str, Any]:
+        """
+        Beschreibt einen Auftrag für die API.
+
+        Der Fortschritt laufender Aufträge wird aus der bisherigen Laufzeit und der mittleren
+        Dauer der letzten Aufträge geschätzt und bleibt unter 1.0, bis der Auftrag abgeschlossen ist.
+        """
+        status = row['status']
+        processing_time = row['processing_time']
+        progress = 0.0
+        if status in ('done', 'failed'):
+            progress = 1.0
+        elif status == 'running':
+            processing_time = max(0.0, time.time() - row['started'])
+            progress = min(0.95, processing_time / expected_duration) if expected_duration else None
+
+        job_dir = Path(row['job_dir'])
+        return {
+            'job_id': row['job_id'],
+            'source_filename': row['source_filename'],
+            'target_filename': row['target_filename'],
+            'status': status,
+            'success': status == 'done',
+            'error': row['error'],
+            'progress': progress,
+            'queue_position': queue_position,
+            'attempts': row['attempts'],
+            'processing_time': processing_time,
+            'timestamp': row['created'],
+            'started': row['started'],
+            'finished': row['finished'],
+            'changes': json.loads(row['changes']),
+            'options': json.loads(row['options']),
+            'target_dir': str(job_dir / 'target')
+        }
+
+
+# Converter des Worker-Prozesses, wird einmalig in _init_job_worker angelegt
+_worker_converter: Optional[DocConverter] = None
+
+
+def _init_job_worker(config: Dict[str, Any]) -> None:
+    """Initialisiert einen Worker-Prozess für Aufträge der Web-App"""
+    global _worker_converter
+
+    # Logging richtet der WorkerPool ein (Weiterleitung an den Parent), kein eigener Datei-Handler
+    _worker_converter = DocConverter(config)
+
+
+def _convert_job_in_worker(task: Tuple[str, str, Optional[bool]]) -> Dict[str, Any]:
+    """Konvertiert das Dokument eines Auftrags im Worker-Prozess"""
+    source_path, target_dir, post_processing = task
+    result = _worker_converter.convert_document(Path(source_path), Path(target_dir),
+                                                post_processing=post_processing)
+    # Metriken werden je Auftrag nicht ausgewertet; leeren, damit sie sich im Worker nicht ansammeln
+    _worker_converter.post_processing_logger.drain_metrics()
+    _worker_converter.asset_store.drain_stats()
+    return result
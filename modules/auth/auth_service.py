@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from ..core.config import Config
+from ..core.logging import LogManager
+from .password_hasher import hash_password, verify_password, needs_rehash
+from .user_model import UserManager
+
+logger = LogManager.setup_logging(__name__)
+
+# Vergleichshash für unbekannte Konten, damit Antwortzeiten keine E-Mails verraten;
+# wird beim ersten Bedarf im Hash-Pool berechnet statt beim Import
+_DUMMY_HASH: Optional[str] = None
+
+
+class LoginRateLimitError(Exception):
+    """Zu viele fehlgeschlagene Anmeldeversuche für ein Konto"""
+
+    def __init__(self, email: str, retry_after: int):
+        super().__init__(f"Zu viele Anmeldeversuche für {email}")
+        self.email = email
+        self.retry_after = retry_after
+
+
+class LoginRateLimiter:
+    """Begrenzt fehlgeschlagene Anmeldeversuche pro Konto in einem gleitenden Zeitfenster"""
+
+    def __init__(self, max_attempts: Optional[int] = None, window: Optional[int] = None,
+                 lockout: Optional[int] = None, max_accounts: int = 10000):
+        self.max_attempts = max_attempts or Config.LOGIN_MAX_ATTEMPTS
+        self.window = window or Config.LOGIN_ATTEMPT_WINDOW
+        self.lockout = lockout or Config.LOGIN_LOCKOUT_SECONDS
+        self.max_accounts = max_accounts
+        self._failures: Dict[str, deque] = {}
+        self._locked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def check(self, email: str) -> None:
+        """Wirft LoginRateLimitError, solange das Konto gesperrt ist"""
+        key = email.lower()
+        now = time.time()
+        with self._lock:
+            locked_until = self._locked_until.get(key)
+            if locked_until is None:
+                return
+            if now < locked_until:
+                raise LoginRateLimitError(email, int(locked_until - now) + 1)
+            del self._locked_until[key]
+
+    def record_failure(self, email: str) -> None:
+        key = email.lower()
+        now = time.time()
+        with self._lock:
+            if key not in self._failures and len(self._failures) >= self.max_accounts:
+                self._prune(now)
+            failures = self._failures.setdefault(key, deque())
+            failures.append(now)
+            while failures and failures[0] < now - self.window:
+                failures.popleft()
+            if len(failures) >= self.max_attempts:
+                self._locked_until[key] = now + self.lockout
+                failures.clear()
+                logger.warning(f"Konto {email} nach {self.max_attempts} Fehlversuchen für {self.lockout}s gesperrt")
+
+    def reset(self, email: str) -> None:
+        key = email.lower()
+        with self._lock:
+            self._failures.pop(key, None)
+            self._locked_until.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        """Entfernt abgelaufene Einträge (Lock muss gehalten werden)"""
+        for key in [k for k, f in self._failures.items() if not f or f[-1] < now - self.window]:
+            del self._failures[key]
+        for key in [k for k, until in self._locked_until.items() if until <= now]:
+            del self._locked_until[key]
+
+
+class AuthService:
+    """
+    Asynchrone Anmeldung: Passwort-Hashing läuft in einem eigenen Thread- oder
+    Prozess-Pool mit begrenzter Parallelität, damit laufende SSE-Streams nicht blockieren.
+    """
+
+    def __init__(self, user_manager: UserManager, executor: Optional[Executor] = None,
+                 max_concurrent: Optional[int] = None, rate_limiter: Optional[LoginRateLimiter] = None):
+        self.user_manager = user_manager
+        self.executor = executor or self._create_executor()
+        self.rate_limiter = rate_limiter or LoginRateLimiter()
+        self._max_concurrent = max_concurrent or Config.AUTH_MAX_CONCURRENT_HASHES
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def _create_executor() -> Executor:
+        workers = max(1, Config.AUTH_HASH_WORKERS)
+        if Config.AUTH_HASH_EXECUTOR == 'process':
+            return ProcessPoolExecutor(max_workers=workers)
+        # hashlib.pbkdf2_hmac gibt die GIL frei, Threads reichen daher in der Regel aus
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auth-hash')
+
+    async def _run(self, func, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _dummy_hash(self) -> str:
+        global _DUMMY_HASH
+        if _DUMMY_HASH is None:
+            _DUMMY_HASH = await self.hash_password('nscale-dummy-password')
+        return _DUMMY_HASH
+
+    async def hash_password(self, password: str) -> str:
+        """Berechnet einen versionierten Passwort-Hash außerhalb des Event-Loops"""
+        return await self._run(hash_password, password)
+
+    async def authenticate(self, email: str, password: str) -> Optional[str]:
+        """Authentifiziert einen Benutzer und gibt ein JWT-Token zurück; wirft LoginRateLimitError"""
+        self.rate_limiter.check(email)
+
+        user = self.user_manager.get_login_record(email)
+        stored_hash = user[3] if user else await self._dummy_hash()
+
+        if not await self._run(verify_password, password, stored_hash) or not user:
+            self.rate_limiter.record_failure(email)
+            logger.warning(f"Fehlgeschlagener Anmeldeversuch für E-Mail: {email}")
+            return None
+
+        self.rate_limiter.reset(email)
+
+        if needs_rehash(stored_hash):
+            self.user_manager.update_password_hash(user[0], await self.hash_password(password))
+
+        return self.user_manager.issue_token(user[0], user[1], user[2])
+
+    async def register_user(self, email: str, password: str, role: Optional[str] = None) -> bool:
+        """Registriert einen Benutzer, der Hash wird im Pool berechnet"""
+        password_hash = await self.hash_password(password)
+        return self.user_manager.register_user(email, password, role, password_hash=password_hash)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,60 @@
+import hashlib
+import hmac
+import secrets
+from typing import Optional
+
+from ..core.config import Config
+
+# Versionierte Hashes: "<algorithmus>$<iterationen>$<salt-hex>$<hash-hex>"
+# Alte Hashes (nur Hex, globaler Salt aus Config.PASSWORD_SALT) werden weiterhin erkannt.
+ALGORITHM_PBKDF2_SHA256 = 'pbkdf2_sha256'
+LEGACY_ITERATIONS = 100000
+SALT_BYTES = 16
+
+
+def hash_password(password: str, iterations: Optional[int] = None, salt: Optional[str] = None) -> str:
+    """Erstellt einen versionierten Hash mit eigenem Salt pro Benutzer"""
+    iterations = iterations or Config.PASSWORD_HASH_ITERATIONS
+    salt = salt or secrets.token_hex(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations).hex()
+    return f"{ALGORITHM_PBKDF2_SHA256}${iterations}${salt}${digest}"
+
+
+def legacy_hash_password(password: str) -> str:
+    """Bisheriges Format: PBKDF2 mit globalem Salt, ohne Versionsangabe"""
+    return hashlib.pbkdf2_hmac(
+        'sha256',
+        password.encode(),
+        Config.PASSWORD_SALT.encode(),
+        LEGACY_ITERATIONS
+    ).hex()
+
+
+def verify_password(password: str, stored_hash: Optional[str]) -> bool:
+    """Prüft ein Passwort gegen einen gespeicherten Hash (versioniert oder Legacy)"""
+    if not stored_hash:
+        return False
+
+    parts = stored_hash.split('$')
+    if len(parts) == 4 and parts[0] == ALGORITHM_PBKDF2_SHA256:
+        try:
+            iterations = int(parts[1])
+        except ValueError:
+            return False
+        candidate = hash_password(password, iterations=iterations, salt=parts[2])
+    elif len(parts) == 1:
+        candidate = legacy_hash_password(password)
+    else:
+        return False
+
+    return hmac.compare_digest(candidate, stored_hash)
+
+
+def needs_rehash(stored_hash: Optional[str]) -> bool:
+    """True, wenn der Hash nicht dem aktuell konfigurierten Algorithmus und Aufwand entspricht"""
+    if not stored_hash:
+        return False
+    parts = stored_hash.split('$')
+    if len(parts) != 4 or parts[0] != ALGORITHM_PBKDF2_SHA256:
+        return True
+    return parts[1] != str(Config.PASSWORD_HASH_ITERATIONS)
@@ -0,0 +1,306 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, List
+
+from ..core.config import Config
+from ..core.logging import LogManager
+
+logger = LogManager.setup_logging(__name__)
+
+
+class TokenError(Exception):
+    """Token ist ungültig, abgelaufen oder konnte nicht dekodiert werden"""
+    pass
+
+
+class TokenVerifier(ABC):
+    """Schnittstelle für JWT-Bibliotheken, damit Implementierungen austauschbar und vergleichbar sind"""
+
+    name = "base"
+
+    def __init__(self, secret_key: Optional[str] = None, algorithm: str = 'HS256'):
+        self.secret_key = secret_key or Config.SECRET_KEY
+        self.algorithm = algorithm
+
+    @abstractmethod
+    def encode(self, payload: Dict[str, Any]) -> str:
+        """Signiert die Claims und gibt das Token zurück"""
+
+    @abstractmethod
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Prüft Signatur und Ablauf und gibt die Claims zurück, sonst TokenError"""
+
+
+class JoseTokenVerifier(TokenVerifier):
+    """Bisherige Implementierung auf Basis von python-jose"""
+
+    name = "jose"
+
+    def __init__(self, secret_key: Optional[str] = None, algorithm: str = 'HS256'):
+        super().__init__(secret_key, algorithm)
+        from jose import jwt, JWTError
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._error as e:
+            raise TokenError(str(e)) from e
+
+
+class PyJWTTokenVerifier(TokenVerifier):
+    """Alternative Implementierung auf Basis von PyJWT"""
+
+    name = "pyjwt"
+
+    def __init__(self, secret_key: Optional[str] = None, algorithm: str = 'HS256'):
+        super().__init__(secret_key, algorithm)
+        import jwt
+        self._jwt = jwt
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return self._jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return self._jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except self._jwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+TOKEN_VERIFIERS = {
+    JoseTokenVerifier.name: JoseTokenVerifier,
+    PyJWTTokenVerifier.name: PyJWTTokenVerifier,
+}
+
+
+def create_token_verifier(name: Optional[str] = None) -> TokenVerifier:
+    """Erstellt den konfigurierten Verifizierer (Config.JWT_BACKEND), Fallback auf jose"""
+    name = (name or Config.JWT_BACKEND).lower()
+    verifier_class = TOKEN_VERIFIERS.get(name)
+    if verifier_class is None:
+        logger.warning(f"Unbekanntes JWT-Backend '{name}', verwende jose")
+        verifier_class = JoseTokenVerifier
+    try:
+        return verifier_class()
+    except ImportError as e:
+        logger.warning(f"JWT-Backend '{name}' nicht verfügbar ({e}), verwende jose")
+        return JoseTokenVerifier()
+
+
+def token_digest(token: str) -> str:
+    """Digest, unter dem ein Token gespeichert wird (das Token selbst wird nie abgelegt)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Begrenzter LRU-Cache für bereits verifizierte Tokens.
+    Einträge gelten exakt bis zum 'exp'-Claim; widerrufene Tokens und Benutzer
+    werden bis zu ihrem Ablauf in einer Sperrliste geführt.
+
+    Die Sperrliste liegt in der Benutzerdatenbank, damit ein Widerruf alle
+    uvicorn-Worker erreicht; jeder Prozess hält eine Kopie und übernimmt neue
+    Einträge anderer Worker spätestens nach sync_interval Sekunden (Standard 1 s,
+    0 = bei jeder Prüfung). Ein in einem anderen Worker widerrufenes Token kann hier
+    also bis zu sync_interval Sekunden weiter akzeptiert werden; Widerrufe im eigenen
+    Prozess gelten sofort. Dazwischen kommt die Prüfung ohne Datenbankzugriff aus.
+    Zeitstempel sind sekundengenau mit Nachkommastellen, sodass ein direkt nach
+    dem Widerruf ausgestelltes Token (z.B. erneuter Login) gültig bleibt.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, db_path: Optional[Path] = None,
+                 sync_interval: Optional[float] = None):
+        self.max_size = max_size if max_size is not None else Config.TOKEN_CACHE_SIZE
+        self.db_path = Path(db_path or Config.DB_PATH)
+        self.sync_interval = (sync_interval if sync_interval is not None
+                              else Config.TOKEN_REVOCATION_SYNC_INTERVAL)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._revoked_tokens: Dict[str, float] = {}
+        self._revoked_users: Dict[str, float] = {}
+        self._revocation_hooks: List[Callable[[Dict[str, Any]], bool]] = []
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_seq = 0
+        self._last_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            self._init_db()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Gemeinsame Token-Sperrliste nicht verfügbar, Widerrufe gelten nur in diesem Prozess: {e}")
+            self._conn = None
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Gibt die Claims eines gecachten, noch gültigen Tokens zurück"""
+        digest = token_digest(token)
+        now = int(time.time())
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expiry = entry
+            if now > expiry:
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Legt verifizierte Claims ab; Tokens ohne 'exp' werden nicht gecacht"""
+        expiry = claims.get('exp')
+        if not isinstance(expiry, (int, float)) or self.max_size <= 0:
+            return
+        digest = token_digest(token)
+        with self._lock:
+            self._entries[digest] = (dict(claims), int(expiry))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        """Prüft Sperrliste und registrierte Widerrufs-Hooks"""
+        digest = token_digest(token)
+        with self._lock:
+            self._sync()
+            if digest in self._revoked_tokens:
+                return True
+            # Tokens mit iat vor dem Widerruf sind gesperrt; ganzzahlige iat älterer Tokens
+            # aus derselben Sekunde liegen immer davor und bleiben damit gesperrt
+            revoked_at = self._revoked_users.get(str(claims.get('user_id')))
+            if revoked_at is not None and claims.get('iat', 0) < revoked_at:
+                return True
+            hooks = list(self._revocation_hooks)
+        return any(hook(claims) for hook in hooks)
+
+    def revoke(self, token: str, expiry: Optional[int] = None) -> None:
+        """Widerruft ein einzelnes Token (z.B. beim Logout)"""
+        digest = token_digest(token)
+        with self._lock:
+            entry = self._entries.pop(digest, None)
+            if expiry is None:
+                expiry = entry[1] if entry else int(time.time()) + Config.JWT_EXPIRATION
+            self._revoked_tokens[digest] = float(expiry)
+            self._persist('token', digest, time.time(), float(expiry))
+            self._prune_revocations()
+
+    def revoke_user(self, user_id: Any) -> None:
+        """Widerruft alle bis jetzt ausgestellten Tokens eines Benutzers"""
+        now = time.time()
+        with self._lock:
+            self._revoked_users[str(user_id)] = now
+            for digest in [d for d, (claims, _) in self._entries.items() if claims.get('user_id') == user_id]:
+                del self._entries[digest]
+            self._persist('user', str(user_id), now, now + Config.JWT_EXPIRATION)
+            self._prune_revocations()
+
+    def add_revocation_hook(self, hook: Callable[[Dict[str, Any]], bool]) -> None:
+        """Registriert eine Prüfung, die für jedes Token True liefern kann, um es abzulehnen"""
+        with self._lock:
+            self._revocation_hooks.append(hook)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revoked_tokens': len(self._revoked_tokens),
+                'revoked_users': len(self._revoked_users)
+            }
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+        self._conn.executescript('''
+        CREATE TABLE IF NOT EXISTS token_revocations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            revoked_at REAL NOT NULL,
+            expiry REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_token_revocations_expiry ON token_revocations (expiry);
+        ''')
+        self._conn.commit()
+        with self._lock:
+            self._sync(force=True)
+
+    def _sync(self, force: bool = False) -> None:
+        """Übernimmt neue Widerrufe anderer Worker (Lock muss gehalten werden)"""
+        if self._conn is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+        self._last_sync = now
+        try:
+            rows = self._conn.execute(
+                "SELECT seq, kind, subject, revoked_at, expiry FROM token_revocations "
+                "WHERE seq > ? AND expiry >= ? ORDER BY seq",
+                (self._last_seq, time.time())
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Fehler beim Abgleich der Token-Sperrliste: {e}")
+            return
+        for seq, kind, subject, revoked_at, expiry in rows:
+            if kind == 'token':
+                self._revoked_tokens[subject] = expiry
+            elif revoked_at > self._revoked_users.get(subject, 0):
+                self._revoked_users[subject] = revoked_at
+                for digest in [d for d, (claims, _) in self._entries.items()
+                               if str(claims.get('user_id')) == subject]:
+                    del self._entries[digest]
+            self._last_seq = seq
+
+    def _persist(self, kind: str, subject: str, revoked_at: float, expiry: float) -> None:
+        """Schreibt einen Widerruf in die gemeinsame Sperrliste (Lock muss gehalten werden)"""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT INTO token_revocations (kind, subject, revoked_at, expiry) VALUES (?, ?, ?, ?)",
+                (kind, subject, revoked_at, expiry)
+            )
+            self._conn.execute("DELETE FROM token_revocations WHERE expiry < ?", (time.time(),))
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Widerruf konnte nicht gespeichert werden, gilt nur in diesem Prozess: {e}")
+
+    def _prune_revocations(self) -> None:
+        """Entfernt Sperrlisteneinträge, deren Tokens ohnehin abgelaufen sind (Lock muss gehalten werden)"""
+        now = time.time()
+        for digest in [d for d, expiry in self._revoked_tokens.items() if now > expiry]:
+            del self._revoked_tokens[digest]
+        for user_id in [u for u, revoked_at in self._revoked_users.items()
+                        if now > revoked_at + Config.JWT_EXPIRATION]:
+            del self._revoked_users[user_id]
+
+
+_token_cache: Optional[VerifiedTokenCache] = None
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Prozessweiter Cache, gemeinsam für alle UserManager-Instanzen"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache()
+    return _token_cache
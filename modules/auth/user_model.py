@@ -1,12 +1,12 @@
 # In modules/auth/user_model.py
 import os
 import sqlite3
-import hashlib
 import secrets
 import time
-from jose import jwt
 from ..core.config import Config
 from ..core.logging import LogManager
+from .password_hasher import hash_password, verify_password, needs_rehash
+from .token_cache import TokenError, create_token_verifier, get_token_cache
 
 logger = LogManager.setup_logging(__name__)
 
@@ -24,6 +24,8 @@ class UserManager:
         admin_emails_str = os.getenv('ADMIN_EMAILS', '')
         self.ADMIN_EMAILS = [email.strip() for email in admin_emails_str.split(',') if email.strip()]
         print(f"Admin-E-Mails geladen: {self.ADMIN_EMAILS}")  # Debug-Ausgabe
+        self.token_verifier = create_token_verifier()
+        self.token_cache = get_token_cache()
         self.init_db()
         self._update_existing_admin_users()
     
@@ -72,21 +74,18 @@ class UserManager:
             conn.close()
     
     def _hash_password(self, password):
-        """Erstellt einen sicheren Hash für das Passwort"""
-        return hashlib.pbkdf2_hmac(
-            'sha256', 
-            password.encode(), 
-            Config.PASSWORD_SALT.encode(), 
-            100000
-        ).hex()
+        """Erstellt einen sicheren, versionierten Hash mit eigenem Salt für das Passwort"""
+        return hash_password(password)
     
-    def register_user(self, email, password, role=None):
+    def register_user(self, email, password, role=None, password_hash=None):
         """Registriert einen neuen Benutzer mit Rollenbestimmung anhand der E-Mail"""
         # Bestimme Rolle (Admin für spezielle E-Mails, sonst User)
         if role is None:
             role = UserRole.ADMIN if email.lower() in [e.lower() for e in self.ADMIN_EMAILS] else UserRole.USER
-            
-        password_hash = self._hash_password(password)
+        
+        # Der Hash kann bereits außerhalb (z.B. im Thread-Pool des AuthService) berechnet worden sein
+        if password_hash is None:
+            password_hash = self._hash_password(password)
         now = int(time.time())
         
         try:
@@ -112,45 +111,74 @@ class UserManager:
             logger.error(f"Fehler bei Benutzerregistrierung: {e}")
             return False
     
-    def authenticate(self, email, password):
-        """Authentifiziert einen Benutzer und gibt ein JWT-Token zurück"""
-        password_hash = self._hash_password(password)
+    def get_login_record(self, email):
+        """Gibt (id, email, role, password_hash) eines Benutzers für die Anmeldung zurück"""
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, email, role, password_hash FROM users WHERE email = ?",
+                (email,)
+            )
+            return cursor.fetchone()
+        finally:
+            conn.close()
+    
+    def update_password_hash(self, user_id, password_hash):
+        """Ersetzt den gespeicherten Passwort-Hash (z.B. nach Anpassung des Hash-Aufwands)"""
+        try:
+            conn = sqlite3.connect(Config.DB_PATH)
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE users SET password_hash = ? WHERE id = ?",
+                (password_hash, user_id)
+            )
+            conn.commit()
+            conn.close()
+            logger.info(f"Passwort-Hash für Benutzer ID {user_id} aktualisiert")
+            return True
+        except Exception as e:
+            logger.error(f"Fehler beim Aktualisieren des Passwort-Hashes: {e}")
+            return False
+    
+    def issue_token(self, user_id, email, role):
+        """Aktualisiert last_login und erstellt ein JWT-Token mit Rolleninformation"""
+        # iat mit Nachkommastellen, damit ein Widerruf in derselben Sekunde das neue Token nicht sperrt
+        issued_at = time.time()
+        now = int(issued_at)
         
         conn = sqlite3.connect(Config.DB_PATH)
         cursor = conn.cursor()
-        
         cursor.execute(
-            "SELECT id, email, role FROM users WHERE email = ? AND password_hash = ?",
-            (email, password_hash)
+            "UPDATE users SET last_login = ? WHERE id = ?",
+            (now, user_id)
         )
+        conn.commit()
+        conn.close()
         
-        user = cursor.fetchone()
+        payload = {
+            'user_id': user_id,
+            'email': email,
+            'role': role,
+            'iat': round(issued_at, 6),
+            'exp': now + Config.JWT_EXPIRATION,
+            'tokenExpiry': now + Config.JWT_EXPIRATION  # Add tokenExpiry for frontend compatibility
+        }
+        token = self.token_verifier.encode(payload)
         
-        if user:
-            # Aktualisiere last_login
-            cursor.execute(
-                "UPDATE users SET last_login = ? WHERE id = ?",
-                (int(time.time()), user[0])
-            )
-            conn.commit()
-            
-            # Erstelle JWT-Token mit Rolleninformation
-            payload = {
-                'user_id': user[0],
-                'email': user[1],
-                'role': user[2],
-                'exp': int(time.time()) + Config.JWT_EXPIRATION,
-                'tokenExpiry': int(time.time()) + Config.JWT_EXPIRATION  # Add tokenExpiry for frontend compatibility
-            }
-            token = jwt.encode(payload, Config.SECRET_KEY, algorithm='HS256')
-            
-            conn.close()
-            logger.info(f"Benutzer {email} erfolgreich authentifiziert mit Rolle {user[2]}")
-            logger.debug(f"Token payload: {payload}")
-            logger.debug(f"Token generated: {token[:20]}...")
-            return token
+        logger.info(f"Benutzer {email} erfolgreich authentifiziert mit Rolle {role}")
+        return token
+    
+    def authenticate(self, email, password):
+        """Authentifiziert einen Benutzer und gibt ein JWT-Token zurück (blockierend, siehe AuthService)"""
+        user = self.get_login_record(email)
+        
+        if user and verify_password(password, user[3]):
+            # Alte oder zu schwache Hashes beim erfolgreichen Login aktualisieren
+            if needs_rehash(user[3]):
+                self.update_password_hash(user[0], self._hash_password(password))
+            return self.issue_token(user[0], user[1], user[2])
         
-        conn.close()
         logger.warning(f"Fehlgeschlagener Anmeldeversuch für E-Mail: {email}")
         return None
     
@@ -245,6 +273,8 @@ class UserManager:
             conn.close()
             
             logger.info(f"Rolle für Benutzer ID {user_id} aktualisiert auf {new_role} durch Admin ID {admin_user_id}")
+            # Ausgestellte Tokens tragen noch die alte Rolle
+            self.revoke_user_tokens(user_id)
             return True
         except Exception as e:
             logger.error(f"Fehler beim Aktualisieren der Benutzerrolle: {e}")
@@ -328,34 +358,40 @@ class UserManager:
     
     def verify_token(self, token):
         """Überprüft ein JWT-Token und gibt Benutzerinformationen zurück"""
-        try:
-            logger.debug(f"Verifying token: {token[:20]}...")
-            logger.debug(f"Using secret key: {Config.SECRET_KEY[:20]}...")
-            
-            payload = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
-            logger.debug(f"Token decoded successfully: {payload}")
+        # Schneller Pfad: bereits verifizierte Tokens aus dem LRU-Cache
+        payload = self.token_cache.get(token)
+        
+        if payload is None:
+            try:
+                payload = self.token_verifier.decode(token)
+            except TokenError as e:
+                logger.warning(f"Fehler bei Token-Verifizierung: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"Unerwarteter Fehler bei Token-Verifizierung: {e}")
+                return None
             
             # Check if token is expired
-            if 'exp' in payload:
-                expiry = payload['exp']
-                current_time = int(time.time())
-                logger.debug(f"Token expiry: {expiry}, Current time: {current_time}")
-                
-                if current_time > expiry:
-                    logger.warning(f"Token has expired. Expiry: {expiry}, Current: {current_time}")
-                    return None
+            if 'exp' in payload and int(time.time()) > payload['exp']:
+                logger.warning(f"Token has expired. Expiry: {payload['exp']}")
+                return None
             
-            return payload
-        except jwt.ExpiredSignatureError as e:
-            logger.warning(f"Token ist abgelaufen: {e}")
-            return None
-        except jwt.JWTError as e:
-            logger.warning(f"Fehler bei Token-Verifizierung: {e}")
-            logger.debug(f"Token details: {token[:50]}...")
-            return None
-        except Exception as e:
-            logger.error(f"Unerwarteter Fehler bei Token-Verifizierung: {e}")
+            self.token_cache.put(token, payload)
+        
+        if self.token_cache.is_revoked(token, payload):
+            logger.warning(f"Widerrufenes Token für Benutzer-ID {payload.get('user_id')} abgelehnt")
             return None
+        
+        return payload
+    
+    def revoke_token(self, token):
+        """Widerruft ein einzelnes Token bis zu seinem Ablauf"""
+        self.token_cache.revoke(token)
+    
+    def revoke_user_tokens(self, user_id):
+        """Widerruft alle bisher ausgestellten Tokens eines Benutzers (z.B. nach Rollenänderung)"""
+        self.token_cache.revoke_user(user_id)
+        logger.info(f"Tokens für Benutzer ID {user_id} widerrufen")
             
     def get_all_users(self, admin_user_id):
         """Gibt eine Liste aller Benutzer zurück (nur für Admins)"""
@@ -439,6 +475,7 @@ class UserManager:
             conn.close()
             
             logger.info(f"Benutzer ID {user_id} wurde gelöscht durch Admin ID {admin_user_id}")
+            self.revoke_user_tokens(user_id)
             return True
                 
         except Exception as e:
@@ -34,12 +34,71 @@ class Config:
     
     # Caching
     CACHE_EXPIRE = int(os.getenv('CACHE_EXPIRE', '604800'))  # 7 Tage
+    RESPONSE_CACHE_PATH = CACHE_DIR / 'responses' / 'responses.db'  # Gemeinsam für alle Worker
+    RESPONSE_CACHE_SHARED = os.getenv('RESPONSE_CACHE_SHARED', 'true').lower() == 'true'
+    RESPONSE_CACHE_LOCAL_SIZE = int(os.getenv('RESPONSE_CACHE_LOCAL_SIZE', '2000'))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '60'))  # Sekunden frisch
+    RESPONSE_CACHE_STALE_TTL = int(os.getenv('RESPONSE_CACHE_STALE_TTL', '300'))  # danach veraltet ausgeliefert
+    RESPONSE_CACHE_SYNC_INTERVAL = float(os.getenv('RESPONSE_CACHE_SYNC_INTERVAL', '1.0'))  # Tag-Abgleich zwischen Workern
+    SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '4'))  # Verbindungen pro Cache-/Telemetrie-Datenbank
     
     # Sicherheit
     SECRET_KEY = os.getenv('SECRET_KEY', 'generate-a-secure-random-key-in-production')
     PASSWORD_SALT = os.getenv('PASSWORD_SALT', 'generate-a-secure-salt-in-production')
     JWT_EXPIRATION = int(os.getenv('JWT_EXPIRATION', '86400'))  # 24 Stunden
-    
+    JWT_BACKEND = os.getenv('JWT_BACKEND', 'jose')  # jose oder pyjwt
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))  # 0 deaktiviert den Cache
+    # Widerrufe anderer Worker greifen nach höchstens so vielen Sekunden; 0 = Datenbankabfrage bei jeder Prüfung
+    TOKEN_REVOCATION_SYNC_INTERVAL = float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', '1.0'))
+    PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '100000'))
+
+    # Anmeldung: Passwort-Hashing außerhalb des Event-Loops
+    AUTH_HASH_EXECUTOR = os.getenv('AUTH_HASH_EXECUTOR', 'thread')  # thread oder process
+    AUTH_HASH_WORKERS = int(os.getenv('AUTH_HASH_WORKERS', '2'))
+    AUTH_MAX_CONCURRENT_HASHES = int(os.getenv('AUTH_MAX_CONCURRENT_HASHES', '4'))
+    LOGIN_MAX_ATTEMPTS = int(os.getenv('LOGIN_MAX_ATTEMPTS', '5'))  # Fehlversuche pro Konto
+    LOGIN_ATTEMPT_WINDOW = int(os.getenv('LOGIN_ATTEMPT_WINDOW', '300'))  # Sekunden
+    LOGIN_LOCKOUT_SECONDS = int(os.getenv('LOGIN_LOCKOUT_SECONDS', '300'))
+
+    # Archivierung alter Chat-Sessions
+    SESSION_ARCHIVE_DIR = BASE_DIR / 'data' / 'archive'
+    SESSION_ARCHIVE_AFTER_DAYS = int(os.getenv('SESSION_ARCHIVE_AFTER_DAYS', '0'))  # 0 deaktiviert (archivierte Sessions fehlen in der Suche)
+    SESSION_ARCHIVE_INTERVAL = int(os.getenv('SESSION_ARCHIVE_INTERVAL', '3600'))  # Sekunden
+    SESSION_ARCHIVE_BATCH_SIZE = int(os.getenv('SESSION_ARCHIVE_BATCH_SIZE', '500'))
+    SESSION_ARCHIVE_SEGMENT_BYTES = int(os.getenv('SESSION_ARCHIVE_SEGMENT_BYTES', str(16 * 1024 * 1024)))
+    SESSION_ARCHIVE_VACUUM_RATIO = float(os.getenv('SESSION_ARCHIVE_VACUUM_RATIO', '0.25'))  # Anteil freier Seiten
+
+    # Telemetrie-Auswertung (vorverdichtete Rollups)
+    TELEMETRY_DB_PATH = BASE_DIR / 'data' / 'db' / 'telemetry.db'
+    TELEMETRY_MINUTE_RETENTION_DAYS = int(os.getenv('TELEMETRY_MINUTE_RETENTION_DAYS', '2'))
+    TELEMETRY_HOUR_RETENTION_DAYS = int(os.getenv('TELEMETRY_HOUR_RETENTION_DAYS', '90'))
+    TELEMETRY_DAY_RETENTION_DAYS = int(os.getenv('TELEMETRY_DAY_RETENTION_DAYS', '0'))  # 0 = unbegrenzt
+    TELEMETRY_CLIENT_METRICS = [m.strip() for m in os.getenv('TELEMETRY_CLIENT_METRICS', '').split(',') if m.strip()]  # Zusätzlich erlaubte Frontend-Metriken
+    TELEMETRY_MAX_DIMENSION_VALUES = int(os.getenv('TELEMETRY_MAX_DIMENSION_VALUES', '200'))  # Pro Metrik und Dimension, darüber 'other'
+
+    # Prometheus-Metriken (/metrics)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Bearer-Token für den Scraper; leer = nur Zugriff von localhost
+
+    # Systemstatistiken für das Admin-Dashboard (Hintergrund-Sampler)
+    SYSTEM_STATS_INTERVAL = float(os.getenv('SYSTEM_STATS_INTERVAL', '5'))  # CPU, Speicher, Prozess, Zähler
+    SYSTEM_STATS_SLOW_INTERVAL = float(os.getenv('SYSTEM_STATS_SLOW_INTERVAL', '60'))  # Festplatte, Cache, Datenbank
+
+    # Komprimierung dynamischer Antworten (SSE ausgenommen)
+    RESPONSE_COMPRESSION_ENABLED = os.getenv('RESPONSE_COMPRESSION_ENABLED', 'true').lower() == 'true'
+    RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+    RESPONSE_GZIP_LEVEL = int(os.getenv('RESPONSE_GZIP_LEVEL', '6'))
+    RESPONSE_BROTLI_QUALITY = int(os.getenv('RESPONSE_BROTLI_QUALITY', '4'))  # niedrig, da pro Anfrage
+
+    # Statische Dateien (Vite-Build mit Hash-Namen und Legacy-Frontend)
+    STATIC_BUILD_DIR = os.getenv('STATIC_BUILD_DIR', '')  # leer = api/frontend (Ausgabe von vite.config.ts)
+    STATIC_IMMUTABLE_MAX_AGE = int(os.getenv('STATIC_IMMUTABLE_MAX_AGE', '31536000'))  # nur Dateien mit Hash im Namen
+    STATIC_PRECOMPRESS = os.getenv('STATIC_PRECOMPRESS', 'true').lower() == 'true'  # fehlende .br/.gz beim Start erzeugen
+    STATIC_CACHE_DIR = CACHE_DIR / 'static'  # erzeugte .br/.gz-Varianten, nie im Quellbaum
+    STATIC_COMPRESS_MIN_BYTES = int(os.getenv('STATIC_COMPRESS_MIN_BYTES', '1024'))
+    STATIC_BROTLI_QUALITY = int(os.getenv('STATIC_BROTLI_QUALITY', '11'))
+    STATIC_MEMORY_MAX_FILE_BYTES = int(os.getenv('STATIC_MEMORY_MAX_FILE_BYTES', str(2 * 1024 * 1024)))  # größere werden gestreamt
+
     # Server-Konfiguration
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', '8080'))
@@ -53,5 +112,5 @@ class Config:
         """Initialisiert notwendige Verzeichnisse"""
         for directory in [cls.TXT_DIR, cls.CACHE_DIR, cls.RESULT_CACHE_DIR, 
                          cls.BASE_DIR / 'logs', cls.BASE_DIR / 'data' / 'db',
-                         cls.EMBED_CACHE_PATH.parent]:
+                         cls.EMBED_CACHE_PATH.parent, cls.SESSION_ARCHIVE_DIR, cls.STATIC_CACHE_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
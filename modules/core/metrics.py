@@ -0,0 +1,334 @@
+import hmac
+import ipaddress
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Feinauflösung der Histogramme: zwei signifikante Stellen pro Dekade (1.0, 1.1, ... 9.9),
+# von 10 µs bis 1000 s. Der relative Fehler der Perzentile liegt damit bei höchstens 10 %
+# am Dekadenanfang und rund 1 % am Dekadenende.
+_MIN_EXP = -5
+_MAX_EXP = 3
+_SUB_BUCKETS = 90
+_BUCKETS = (_MAX_EXP - _MIN_EXP) * _SUB_BUCKETS
+
+# Bucket-Grenzen für den Prometheus-Export; sie fallen auf Grenzen der Feinauflösung,
+# sodass die kumulierten Zähler exakt sind
+LATENCY_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                  1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0)
+RATE_BOUNDS = (1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0)
+
+
+_MIN_VALUE = 10.0 ** _MIN_EXP
+_MAX_VALUE = 10.0 ** _MAX_EXP
+_DECADES = tuple(10.0 ** exponent for exponent in range(_MIN_EXP, _MAX_EXP))
+_log10 = math.log10
+
+
+def _index(value: float) -> int:
+    # Hot Path: bewusst ohne min()/max()-Aufrufe
+    if value < _MIN_VALUE:
+        return 0
+    if value >= _MAX_VALUE:
+        return _BUCKETS - 1
+    decade = int(_log10(value) - _MIN_EXP)
+    if decade >= _MAX_EXP - _MIN_EXP:
+        decade = _MAX_EXP - _MIN_EXP - 1
+    sub = int(value / _DECADES[decade] * 10) - 10
+    if sub < 0:
+        sub = 0
+    elif sub >= _SUB_BUCKETS:
+        sub = _SUB_BUCKETS - 1
+    return decade * _SUB_BUCKETS + sub
+
+
+def _upper_bound(index: int) -> float:
+    exponent, sub = divmod(index, _SUB_BUCKETS)
+    return (sub + 11) / 10 * 10.0 ** (exponent + _MIN_EXP)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _HistogramSeries:
+    __slots__ = ('counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen > rank:
+                    lower = _upper_bound(index - 1) if index else 0.0
+                    return min(max((lower + _upper_bound(index)) / 2, self.min), self.max)
+        return self.max
+
+
+class Histogram:
+    """
+    Latenz-Histogramm mit fester logarithmisch-linearer Feinauflösung (HDR-Prinzip).
+
+    observe() kostet eine Logarithmus-Berechnung und einen Listenzugriff unter einem
+    unbestrittenen Lock; Perzentile werden erst bei der Abfrage aus den Buckets berechnet.
+    """
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 bounds: Sequence[float] = LATENCY_BOUNDS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(bounds)
+        self._cuts = [_index(bound) for bound in self.bounds]
+        self._series: Dict[Tuple[str, ...], _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str):
+        if value < 0:
+            return
+        index = _index(value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = _HistogramSeries()
+            series.counts[index] += 1
+            series.count += 1
+            series.sum += value
+            if value < series.min:
+                series.min = value
+            if value > series.max:
+                series.max = value
+
+    def total_count(self) -> int:
+        """Anzahl aller Beobachtungen über alle Labelkombinationen"""
+        with self._lock:
+            return sum(series.count for series in self._series.values())
+
+    def snapshot(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> List[Dict[str, object]]:
+        """Anzahl, Mittelwert und Perzentile pro Labelkombination"""
+        with self._lock:
+            items = [(labels, series) for labels, series in self._series.items()]
+            result = []
+            for labels, series in items:
+                entry = dict(zip(self.labelnames, labels))
+                entry['count'] = series.count
+                entry['avg'] = series.sum / series.count if series.count else None
+                for q in quantiles:
+                    entry[f'p{round(q * 100):g}'] = series.quantile(q)
+                entry['max'] = series.max if series.count else None
+                result.append(entry)
+        return result
+
+    def expose(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = [(labels, list(series.counts), series.count, series.sum)
+                     for labels, series in self._series.items()]
+        for labels, counts, count, total in sorted(items):
+            cumulative = 0
+            start = 0
+            for bound, cut in zip(self.bounds, self._cuts):
+                cumulative += sum(counts[start:cut])
+                start = cut
+                le = _format_labels(self.labelnames, labels, f'le="{bound:g}"')
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{le} {count}')
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_str} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_str} {count}')
+        return lines
+
+
+class Counter:
+    """Monoton steigender Zähler pro Labelkombination"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labelvalues: str):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def total(self, **match: str) -> float:
+        """Summe über alle Labelkombinationen, optional gefiltert (z.B. outcome='ok')"""
+        positions = [(self.labelnames.index(name), value) for name, value in match.items()]
+        with self._lock:
+            return sum(value for labels, value in self._values.items()
+                       if all(labels[i] == expected for i, expected in positions))
+
+    def expose(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}')
+        return lines
+
+
+class _StageTimer:
+    __slots__ = ('histogram', 'stage', 'started')
+
+    def __init__(self, histogram: Histogram, stage: str):
+        self.histogram = histogram
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, self.stage)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Prozessweite Metriken im Prometheus-Textformat.
+
+    Jeder uvicorn-Worker hat eine eigene Registry; Prometheus sollte die Worker
+    daher einzeln oder über einen Single-Worker-Port abfragen.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+        self.stage_duration = self.histogram(
+            'nscale_request_stage_duration_seconds',
+            'Dauer der Verarbeitungsschritte einer Anfrage (auth, embedding_search, ttft, ...)',
+            ('stage',)
+        )
+        self.http_duration = self.histogram(
+            'http_request_duration_seconds',
+            'Zeit bis zum Antwortkopf pro Route',
+            ('method', 'route', 'status')
+        )
+        self.llm_tokens_per_second = self.histogram(
+            'nscale_llm_tokens_per_second',
+            'Generierungsrate des Sprachmodells pro Stream',
+            ('model',), bounds=RATE_BOUNDS
+        )
+        self.llm_tokens = self.counter(
+            'nscale_llm_tokens_total', 'Vom Sprachmodell erzeugte Tokens', ('model',)
+        )
+        self.llm_streams = self.counter(
+            'nscale_llm_streams_total', 'Stream-Anfragen an das Sprachmodell nach Ergebnis', ('model', 'outcome')
+        )
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  bounds: Sequence[float] = LATENCY_BOUNDS) -> Histogram:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, labelnames, bounds)
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help_text, labelnames)
+            return self._metrics[name]
+
+    def stage(self, name: str) -> _StageTimer:
+        """Kontextmanager, der die Dauer eines Verarbeitungsschritts erfasst"""
+        return _StageTimer(self.stage_duration, name)
+
+    def observe_stage(self, name: str, seconds: float):
+        """Für Spannen, die sich nicht als Block fassen lassen (z.B. Zeit bis zum ersten Token)"""
+        self.stage_duration.observe(seconds, name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def scrape_allowed(client_host: Optional[str], authorization: Optional[str], token: str) -> bool:
+    """
+    Zugriffsprüfung für /metrics: mit gesetztem Token nur per passendem Bearer-Header,
+    ohne Token nur von Loopback-Adressen (Prometheus auf demselben Host). Hinter einem
+    Reverse-Proxy auf demselben Host deshalb immer ein Token setzen.
+    """
+    if token:
+        return hmac.compare_digest((authorization or '').encode(), f'Bearer {token}'.encode())
+    if client_host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(client_host or '').is_loopback
+    except ValueError:
+        return False
+
+
+class MetricsMiddleware:
+    """
+    ASGI-Middleware für http_request_duration_seconds.
+
+    Gemessen wird bis zum Antwortkopf, damit lange SSE-Streams die Latenz nicht
+    verfälschen. Als Label dient das Routen-Template (z.B. /api/session/{session_id}),
+    nicht der konkrete Pfad, damit die Anzahl der Zeitreihen begrenzt bleibt.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None, exclude: Sequence[str] = ('/metrics',)):
+        self.app = app
+        self.registry = registry or metrics
+        self.exclude = tuple(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        recorded = False
+
+        def record(status):
+            route = scope.get('route')
+            template = getattr(route, 'path', None) or '<unmatched>'
+            self.registry.http_duration.observe(time.perf_counter() - started, scope['method'], template, str(status))
+
+        async def send_wrapper(message):
+            nonlocal recorded
+            if message['type'] == 'http.response.start' and not recorded:
+                recorded = True
+                record(message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not recorded:
+                record(500)
@@ -0,0 +1,431 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .config import Config
+from .logging import LogManager
+from .sqlite_pool import SQLitePool
+
+logger = LogManager.setup_logging(__name__)
+
+# Tags für die Invalidierung bei Schreibzugriffen
+FEEDBACK_TAG = 'feedback'
+DOCUMENTS_TAG = 'documents'
+
+
+def sessions_tag(user_id: Any) -> str:
+    """Tag für alle Session-/Verlaufsdaten eines Benutzers"""
+    return f'sessions:u{user_id}'
+
+
+def tags_for_path(path: str, user: Optional[Dict[str, Any]] = None) -> Tuple[str, ...]:
+    """Leitet die Invalidierungs-Tags eines GET-Endpunkts aus dem Pfad ab"""
+    path = path.lower()
+    tags = []
+    if user and any(part in path for part in ('/session', '/chat', '/history')):
+        tags.append(sessions_tag(user.get('user_id')))
+    if '/feedback' in path:
+        tags.append(FEEDBACK_TAG)
+    if '/docs' in path or '/document' in path:
+        tags.append(DOCUMENTS_TAG)
+    return tuple(tags)
+
+
+class _Entry:
+    __slots__ = ('value', 'fresh_until', 'stale_until', 'tags')
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float, tags: Dict[str, int]):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.tags = tags
+
+
+class ResponseCache:
+    """
+    Zweistufiger Antwort-Cache mit Tag-Invalidierung und Stale-While-Revalidate.
+
+    Stufe 1 ist ein prozesslokaler LRU, Stufe 2 eine gemeinsame SQLite-Datei im
+    Cache-Verzeichnis, die alle uvicorn-Worker sehen. Invalidiert wird über
+    Versionszähler pro Tag: ein Eintrag ist nur gültig, solange alle seine Tags
+    noch die Version vom Zeitpunkt der Berechnung haben.
+
+    Invalidierungen gelten im eigenen Worker sofort; in die gemeinsame Datei werden
+    sie gesammelt geschrieben (spätestens nach sync_interval Sekunden oder vor der
+    nächsten Berechnung mit einem betroffenen Tag), sodass mehrere Schreibzugriffe
+    kurz hintereinander, z.B. pro Chat-Nachricht, nur eine Transaktion kosten.
+    Andere Worker sehen neue Tag-Versionen damit nach höchstens 2 * sync_interval.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: Optional[int] = None,
+                 default_ttl: Optional[int] = None, stale_ttl: Optional[int] = None,
+                 shared: Optional[bool] = None, sync_interval: Optional[float] = None):
+        self.path = Path(path or Config.RESPONSE_CACHE_PATH)
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_LOCAL_SIZE
+        self.default_ttl = default_ttl or Config.RESPONSE_CACHE_TTL
+        self.stale_ttl = stale_ttl if stale_ttl is not None else Config.RESPONSE_CACHE_STALE_TTL
+        self.shared = Config.RESPONSE_CACHE_SHARED if shared is None else shared
+        self.sync_interval = sync_interval if sync_interval is not None else Config.RESPONSE_CACHE_SYNC_INTERVAL
+
+        self._local: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+        self._epoch = 0
+        self._last_sync = 0.0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._pool = SQLitePool(self.path, timeout=5, pragmas=('journal_mode=WAL', 'synchronous=NORMAL'))
+        self._pending_tags: set = set()
+        self._flushing_tags: set = set()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {'local_hits': 0, 'shared_hits': 0, 'stale_hits': 0, 'misses': 0, 'invalidations': 0}
+
+        if self.shared:
+            try:
+                self._init_shared()
+            except sqlite3.Error as e:
+                logger.warning(f"Gemeinsamer Antwort-Cache nicht verfügbar, nur lokaler Cache aktiv: {e}")
+                self.shared = False
+
+    # ------------------------------------------------------------------
+    # Schlüssel
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(namespace: str, path: str, params: Optional[Dict[str, Any]] = None,
+                 user: Optional[Dict[str, Any]] = None, scope: str = 'user',
+                 vary: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Baut einen Cache-Schlüssel aus Pfad und Parametern.
+
+        scope='user' trennt nach Benutzer und Rolle, scope='role' nur nach Rolle,
+        scope='public' gar nicht. Rohe Header (Authorization) fließen nicht ein.
+        """
+        if scope == 'user':
+            identity = f"u{(user or {}).get('user_id')}:{(user or {}).get('role')}"
+        elif scope == 'role':
+            identity = f"r{(user or {}).get('role')}"
+        else:
+            identity = 'public'
+        raw = json.dumps([path, params or {}, vary or {}], sort_keys=True, default=str)
+        return f"{namespace}:{identity}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+    # ------------------------------------------------------------------
+    # Gemeinsame Stufe (SQLite)
+    # ------------------------------------------------------------------
+
+    def _init_shared(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._pool.connection() as conn:
+            conn.executescript('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO cache_meta (key, value) VALUES ('epoch', 0);
+            ''')
+            conn.commit()
+
+    def _sync_due(self) -> bool:
+        return self.shared and time.monotonic() - self._last_sync >= self.sync_interval
+
+    def _sync_tags(self, force: bool = False):
+        """Übernimmt Tag-Versionen anderer Worker (höchstens alle sync_interval Sekunden)"""
+        if not self.shared:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+        self._last_sync = now
+        try:
+            with self._pool.connection() as conn:
+                epoch = conn.execute("SELECT value FROM cache_meta WHERE key = 'epoch'").fetchone()[0]
+                versions = None
+                if epoch != self._epoch:
+                    versions = dict(conn.execute("SELECT tag, version FROM cache_tags").fetchall())
+            if versions is not None:
+                with self._lock:
+                    self._tag_versions = versions
+                    self._epoch = epoch
+        except sqlite3.Error as e:
+            logger.warning(f"Fehler beim Synchronisieren der Cache-Tags: {e}")
+
+    # ------------------------------------------------------------------
+    # Lesen und Schreiben
+    # ------------------------------------------------------------------
+
+    def _is_pending(self, tags: Iterable[str]) -> bool:
+        """Tag wurde invalidiert, die neue Version steht aber noch nicht fest"""
+        pending = self._pending_tags | self._flushing_tags
+        return bool(pending) and not pending.isdisjoint(tags)
+
+    def _is_valid(self, entry: _Entry, now: float) -> bool:
+        if now > entry.stale_until:
+            return False
+        if self._is_pending(entry.tags):
+            return False
+        return all(self._tag_versions.get(tag, 0) == version for tag, version in entry.tags.items())
+
+    def current_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Tag-Versionen vor einer Berechnung festhalten (verhindert Rennen mit Invalidierungen)"""
+        tags = tuple(tags)
+        if self._is_pending(tags):
+            self.flush_invalidations()
+        self._sync_tags()
+        return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Gibt (Wert, frisch) zurück oder None"""
+        self._sync_tags()
+        hit = self._get_local(key)
+        if hit is None and self.shared:
+            hit = self._get_shared(key)
+        if hit is None:
+            self._stats['misses'] += 1
+        return hit
+
+    def _get_local(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Nur der prozesslokale LRU, ohne Datenbankzugriff"""
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if self._is_valid(entry, now):
+                self._local.move_to_end(key)
+                fresh = now <= entry.fresh_until
+                self._stats['local_hits' if fresh else 'stale_hits'] += 1
+                return entry.value, fresh
+            del self._local[key]
+        return None
+
+    def _get_shared(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Liest aus der gemeinsamen SQLite-Stufe und übernimmt Treffer in den LRU"""
+        now = time.time()
+        try:
+            with self._pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT value, tags, fresh_until, stale_until FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Fehler beim Lesen aus dem gemeinsamen Cache: {e}")
+            return None
+        if not row:
+            return None
+        entry = _Entry(json.loads(row[0]), row[2], row[3], json.loads(row[1]))
+        with self._lock:
+            if self._is_valid(entry, now):
+                self._store_local(key, entry)
+                fresh = now <= entry.fresh_until
+                self._stats['shared_hits' if fresh else 'stale_hits'] += 1
+                return entry.value, fresh
+        return None
+
+    def _store_local(self, key: str, entry: _Entry):
+        """Lock muss gehalten werden"""
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: Optional[int] = None,
+            tags: Iterable[str] = (), versions: Optional[Dict[str, int]] = None):
+        """Speichert einen Wert; versions stammt idealerweise aus current_versions() vor der Berechnung"""
+        now = time.time()
+        ttl = ttl or self.default_ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        tag_versions = versions if versions is not None else self.current_versions(tags)
+        entry = _Entry(value, now + ttl, now + ttl + stale_ttl, tag_versions)
+
+        with self._lock:
+            self._store_local(key, entry)
+
+        if not self.shared:
+            return
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return  # Nicht serialisierbar: nur lokal cachen
+        try:
+            with self._pool.connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, tags, fresh_until, stale_until) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, json.dumps(tag_versions), entry.fresh_until, entry.stale_until)
+                )
+                self._writes += 1
+                if self._writes % 500 == 0:
+                    conn.execute("DELETE FROM cache_entries WHERE stale_until < ?", (now,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Fehler beim Schreiben in den gemeinsamen Cache: {e}")
+
+    def invalidate_tags(self, *tags: str):
+        """Macht alle Einträge mit einem der Tags ungültig (auch in anderen Workern)"""
+        tags = [tag for tag in tags if tag]
+        if not tags:
+            return
+        self._stats['invalidations'] += 1
+
+        if self.shared:
+            with self._lock:
+                self._pending_tags.update(tags)
+                if self._flush_timer is None and self.sync_interval > 0:
+                    self._flush_timer = threading.Timer(self.sync_interval, self.flush_invalidations)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            if self.sync_interval <= 0:
+                self.flush_invalidations()
+            return
+
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def flush_invalidations(self):
+        """Schreibt gesammelte Invalidierungen in einer Transaktion in den gemeinsamen Cache"""
+        with self._flush_lock:
+            with self._lock:
+                tags = sorted(self._pending_tags)
+                self._flushing_tags = set(tags)
+                self._pending_tags = set()
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if not tags:
+                return
+
+            try:
+                with self._pool.connection() as conn:
+                    conn.executemany(
+                        "INSERT INTO cache_tags (tag, version) VALUES (?, 1) "
+                        "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+                        [(tag,) for tag in tags]
+                    )
+                    conn.execute("UPDATE cache_meta SET value = value + 1 WHERE key = 'epoch'")
+                    placeholders = ','.join('?' * len(tags))
+                    versions = dict(conn.execute(
+                        f"SELECT tag, version FROM cache_tags WHERE tag IN ({placeholders})", tags
+                    ).fetchall())
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Fehler bei der Cache-Invalidierung: {e}")
+                versions = {tag: self._tag_versions.get(tag, 0) + 1 for tag in tags}
+
+            with self._lock:
+                self._tag_versions.update(versions)
+                self._flushing_tags = set()
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        if self.shared:
+            try:
+                with self._pool.connection() as conn:
+                    conn.execute("DELETE FROM cache_entries")
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Fehler beim Leeren des gemeinsamen Caches: {e}")
+
+    def close(self):
+        """Offene Invalidierungen schreiben und die Datenbankverbindungen schließen"""
+        if self.shared:
+            self.flush_invalidations()
+        self._pool.close()
+
+    # ------------------------------------------------------------------
+    # Stale-While-Revalidate
+    # ------------------------------------------------------------------
+
+    async def get_or_set(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: Optional[int] = None,
+                         stale_ttl: Optional[int] = None, tags: Iterable[str] = (),
+                         should_cache: Callable[[Any], bool] = lambda value: True) -> Tuple[Any, bool]:
+        """
+        Liefert (Wert, aus_cache). Frische Treffer kommen direkt aus dem Cache, veraltete
+        werden sofort ausgeliefert und im Hintergrund neu berechnet. Gleichzeitige
+        Fehlzugriffe auf denselben Schlüssel teilen sich eine Berechnung.
+        """
+        tags = tuple(tags)
+        # Nur der lokale LRU läuft auf dem Event-Loop; alles mit SQLite im Threadpool
+        if self._sync_due():
+            await self._run_blocking(self._sync_tags)
+        hit = self._get_local(key)
+        if hit is None and self.shared:
+            hit = await self._run_blocking(self._get_shared, key)
+        if hit is not None:
+            value, fresh = hit
+            if not fresh and key not in self._inflight:
+                self._start_refresh(key, compute, ttl, stale_ttl, tags, should_cache)
+            return value, True
+
+        self._stats['misses'] += 1
+        future = self._inflight.get(key) or self._start_refresh(key, compute, ttl, stale_ttl, tags, should_cache)
+        return await asyncio.shield(future), False
+
+    @staticmethod
+    async def _run_blocking(func: Callable[..., Any], *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def _start_refresh(self, key, compute, ttl, stale_ttl, tags, should_cache) -> asyncio.Future:
+        async def refresh():
+            if self._is_pending(tags) or self._sync_due():
+                versions = await self._run_blocking(self.current_versions, tags)
+            else:
+                versions = self.current_versions(tags)
+            try:
+                value = await compute()
+                if should_cache(value):
+                    if self.shared:
+                        await self._run_blocking(self.set, key, value, ttl, stale_ttl, tags, versions)
+                    else:
+                        self.set(key, value, ttl, stale_ttl, tags, versions)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        future = asyncio.ensure_future(refresh())
+        # Fehler einer Hintergrund-Aktualisierung nicht als "never retrieved" loggen lassen
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._stats['local_hits'] + self._stats['shared_hits'] + self._stats['stale_hits']
+        total = hits + self._stats['misses']
+        return {
+            **self._stats,
+            'local_entries': len(self._local),
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+            'shared': self.shared
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Prozessweite Instanz des Antwort-Caches"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
@@ -0,0 +1,222 @@
+import datetime
+import decimal
+import enum
+import gzip
+import json
+import uuid
+import zlib
+from pathlib import PurePath
+from typing import Any, Optional, Sequence, Set
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from .logging import LogManager
+
+logger = LogManager.setup_logging(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.info("orjson nicht installiert - JSON-Antworten werden mit der Standardbibliothek serialisiert")
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Bereits komprimierte oder gestreamte Formate, die nicht (erneut) komprimiert werden
+EXCLUDED_CONTENT_TYPES = (
+    'text/event-stream', 'image/', 'video/', 'audio/', 'font/woff',
+    'application/zip', 'application/gzip', 'application/x-gzip', 'application/octet-stream',
+    'application/vnd.openxmlformats', 'application/vnd.apache.parquet',
+)
+
+# Ab dieser Größe wird im Threadpool komprimiert, um den Event-Loop nicht zu blockieren
+# (gzip-6 braucht für 1 MB JSON einige 10 ms)
+THREADPOOL_MIN_BYTES = 128 * 1024
+
+
+def _default(value: Any) -> Any:
+    """Typen außerhalb von JSON (Pydantic-Modelle, Datumswerte, Mengen, ...)"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, (uuid.UUID, PurePath, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    raise TypeError(f"Typ {type(value).__name__} ist nicht JSON-serialisierbar")
+
+
+def dumps(content: Any) -> bytes:
+    """Kompaktes JSON als UTF-8; mit orjson, sonst mit der Standardbibliothek"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+                      default=_default).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON-Antwort für große Nutzlasten (Chatverläufe, Feedback-Listen, Dokumentgraph).
+
+    Wird die Antwort direkt aus der Route zurückgegeben, entfällt FastAPIs
+    jsonable_encoder-Durchlauf; serialisiert wird einmal mit orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def accepted_encodings(accept_encoding: str, supported: Sequence[str]) -> Set[str]:
+    """
+    Liest Accept-Encoding und liefert die Kodierungen aus supported, die der Client annimmt.
+
+    Mit q=0 abgelehnte Kodierungen gelten auch dann nicht, wenn '*' angegeben ist.
+    Wird auch von StaticAssetStore.select verwendet.
+    """
+    accepted, refused = set(), set()
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip()
+        if not name:
+            continue
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) <= 0:
+                    refused.add(name)
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name)
+    if '*' in accepted:
+        return {encoding for encoding in supported if encoding not in refused}
+    return accepted.intersection(supported)
+
+
+def _select_encoding(accept_encoding: str) -> Optional[str]:
+    """Wählt br (falls verfügbar) oder gzip nach Accept-Encoding"""
+    supported = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+    accepted = accepted_encodings(accept_encoding, supported)
+    return next((encoding for encoding in supported if encoding in accepted), None)
+
+
+class _StreamCompressor:
+    """Komprimiert Blöcke inkrementell; jeder Block wird geflusht, damit Streams nicht stocken"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI-Middleware für gzip/Brotli nach Accept-Encoding.
+
+    Vollständige Antworten werden erst ab minimum_size und nur bei tatsächlicher
+    Ersparnis komprimiert; gestreamte Antworten (z.B. Exporte) blockweise.
+    Server-Sent Events, Antworten mit gesetztem Content-Encoding und bereits
+    komprimierte Formate werden unverändert durchgereicht.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 exclude_content_types: Sequence[str] = EXCLUDED_CONTENT_TYPES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.exclude_content_types = tuple(exclude_content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = _select_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message['type'] == 'http.response.start':
+                start_message = message
+                headers = Headers(raw=message['headers'])
+                content_type = headers.get('content-type', '')
+                if ('content-encoding' in headers or content_type.startswith(self.exclude_content_types)
+                        or message['status'] in (204, 304)):
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if compressor is None and start_message is not None:
+                headers = MutableHeaders(raw=list(start_message['headers']))
+                start_message['headers'] = headers.raw
+                if not more_body:
+                    # Vollständige Antwort in einem Block
+                    compressed = None
+                    if len(body) >= THREADPOOL_MIN_BYTES:
+                        compressed = await run_in_threadpool(self._compress, body, encoding)
+                    elif len(body) >= self.minimum_size:
+                        compressed = self._compress(body, encoding)
+                    if compressed is not None and len(compressed) < len(body):
+                        headers['content-encoding'] = encoding
+                        headers['content-length'] = str(len(compressed))
+                        headers.add_vary_header('Accept-Encoding')
+                        body = compressed
+                    start_message, start = None, start_message
+                    await send(start)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+                compressor = _StreamCompressor(encoding, self.gzip_level, self.brotli_quality)
+                headers['content-encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                if 'content-length' in headers:
+                    del headers['content-length']
+                start_message, start = None, start_message
+                await send(start)
+
+            data = compressor.compress(body) if body else b''
+            if not more_body:
+                data += compressor.finish()
+            await send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
@@ -0,0 +1,82 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+from .config import Config
+
+
+class SQLitePool:
+    """
+    Begrenzter Pool von SQLite-Verbindungen für Threadpool- und Event-Loop-Zugriffe.
+
+    Statt einer Verbindung pro Thread (die bei jedem neuen Worker-Thread entsteht und
+    erst mit dem Garbage Collector wieder geschlossen wird) gibt es höchstens size
+    Verbindungen, die zwischen den Threads weitergereicht werden. close() schließt alle.
+    """
+
+    def __init__(self, path: Path, size: Optional[int] = None, timeout: float = 5,
+                 isolation_level: Optional[str] = '', pragmas: Sequence[str] = ()):
+        self.path = Path(path)
+        self.size = max(1, size or Config.SQLITE_POOL_SIZE)
+        self.timeout = timeout
+        self.isolation_level = isolation_level
+        self.pragmas = tuple(pragmas)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=self.isolation_level,
+                               check_same_thread=False)
+        for pragma in self.pragmas:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Verbindungspool ist geschlossen")
+            if len(self._all) < self.size:
+                conn = self._create()
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Keine freie Datenbankverbindung im Pool") from None
+
+    def _release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if self._closed:
+                conn.close()
+                return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Leiht eine Verbindung für die Dauer des with-Blocks aus"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Schließt alle freien Verbindungen; ausgeliehene werden bei der Rückgabe geschlossen"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,412 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import Config
+from .logging import LogManager
+from .responses import accepted_encodings
+
+logger = LogManager.setup_logging(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Content-Encoding -> Dateiendung der vorkomprimierten Variante, in Präferenzreihenfolge
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Vite-Hash im Dateinamen: index.3f9a1Bc2.js (vite.config.ts) oder index-2klL7PtE.js (Vite-Standard)
+_HASHED_NAME = re.compile(r'[.-]([A-Za-z0-9_-]{8,})\.[A-Za-z0-9]+$')
+
+_CONTENT_TYPES = {
+    '.js': 'application/javascript; charset=utf-8',
+    '.mjs': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+    '.json': 'application/json',
+    '.map': 'application/json',
+    '.svg': 'image/svg+xml',
+    '.woff2': 'font/woff2',
+    '.woff': 'font/woff',
+    '.ttf': 'font/ttf',
+    '.wasm': 'application/wasm',
+    '.ico': 'image/x-icon',
+}
+_COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml',
+                 'application/xml', 'application/wasm', 'font/ttf', 'image/x-icon')
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _is_hashed(name: str) -> bool:
+    match = _HASHED_NAME.search(name)
+    # Mindestens eine Ziffer oder ein Großbuchstabe, damit Namen wie css-path-fix.js nicht als Hash gelten
+    return bool(match) and any(c.isdigit() or c.isupper() for c in match.group(1))
+
+
+def _content_type(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in _CONTENT_TYPES:
+        return _CONTENT_TYPES[suffix]
+    guessed, _ = mimetypes.guess_type(path.name)
+    if guessed and guessed.startswith('text/'):
+        return f'{guessed}; charset=utf-8'
+    return guessed or 'application/octet-stream'
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _Variant:
+    __slots__ = ('path', 'size', 'etag', 'data')
+
+    def __init__(self, path: Optional[Path], size: int, etag: str, data: Optional[bytes] = None):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.data = data
+
+
+class _Asset:
+    __slots__ = ('path', 'content_type', 'immutable', 'mtime_ns', 'size', 'etag', 'variants', 'compressible')
+
+    def __init__(self, path: Path, stat: os.stat_result, immutable: bool):
+        self.path = path
+        self.content_type = _content_type(path)
+        self.immutable = immutable
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self.etag = f'"{_file_digest(path)}"'
+        self.compressible = self.content_type.startswith(_COMPRESSIBLE)
+        # encoding (None = unkomprimiert) -> Variante
+        self.variants: Dict[Optional[str], _Variant] = {None: _Variant(path, self.size, self.etag)}
+
+
+class StaticAssetStore:
+    """
+    Index der ausgelieferten statischen Dateien mit ETags und vorkomprimierten Varianten.
+
+    Dateien mit Vite-Hash im Namen aus einem Build-Verzeichnis gelten als unveränderlich
+    und werden ein Jahr lang gecacht; alle anderen müssen per ETag revalidiert werden.
+    Vorhandene .br/.gz-Dateien (vite-plugin-compression) werden übernommen, fehlende
+    beim Start einmalig erzeugt. Erzeugte Varianten landen nie neben der Originaldatei,
+    sondern unter dem ETag im cache_dir (ohne cache_dir nur im Speicher).
+    """
+
+    def __init__(self, compress_min_bytes: int = 1024, brotli_quality: int = 11,
+                 memory_max_file_bytes: int = 2 * 1024 * 1024, cache_dir: Optional[Path] = None):
+        # URL-Präfix -> Liste von (Verzeichnis, Hash-Namen unveränderlich)
+        self.mounts: List[Tuple[str, List[Tuple[Path, bool]]]] = []
+        self.compress_min_bytes = compress_min_bytes
+        self.brotli_quality = brotli_quality
+        self.memory_max_file_bytes = memory_max_file_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._assets: Dict[str, _Asset] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def prefixes(self) -> Tuple[str, ...]:
+        return tuple(prefix for prefix, _ in self.mounts)
+
+    def mount(self, url_prefix: str, directory: Path, build: bool = False):
+        """Registriert ein Verzeichnis; mehrere Verzeichnisse pro Präfix werden der Reihe nach durchsucht"""
+        url_prefix = '/' + url_prefix.strip('/')
+        directory = Path(directory).resolve()
+        for prefix, directories in self.mounts:
+            if prefix == url_prefix:
+                directories.append((directory, build))
+                break
+        else:
+            self.mounts.append((url_prefix, [(directory, build)]))
+            # Längere Präfixe zuerst, damit /static/css nicht von /static verdeckt wird
+            self.mounts.sort(key=lambda mount: len(mount[0]), reverse=True)
+
+    def match(self, url_path: str) -> bool:
+        for prefix, _ in self.mounts:
+            if url_path.startswith(prefix + '/'):
+                return True
+        return False
+
+    def _locate(self, url_path: str) -> Optional[Tuple[Path, os.stat_result, bool]]:
+        for prefix, directories in self.mounts:
+            if not url_path.startswith(prefix + '/'):
+                continue
+            relative = url_path[len(prefix) + 1:]
+            if not relative or '\\' in relative or '\x00' in relative:
+                return None
+            parts = relative.split('/')
+            if any(part in ('', '.', '..') for part in parts):
+                return None
+            for directory, build in directories:
+                candidate = directory.joinpath(*parts)
+                try:
+                    stat = candidate.stat()
+                except (OSError, ValueError):
+                    continue
+                if os.path.isfile(candidate):
+                    return candidate, stat, build and _is_hashed(candidate.name)
+            return None
+        return None
+
+    def cached(self, url_path: str) -> Optional[_Asset]:
+        """Liefert unveränderliche Einträge ohne Dateizugriff; alles andere muss resolve() prüfen"""
+        asset = self._assets.get(url_path)
+        return asset if asset is not None and asset.immutable else None
+
+    def resolve(self, url_path: str) -> Optional[_Asset]:
+        """
+        Liefert den Index-Eintrag zum URL-Pfad; veränderliche Dateien werden per stat() geprüft.
+
+        Blockiert (stat, Hash über den Inhalt) und wird daher im Threadpool aufgerufen.
+        """
+        asset = self._assets.get(url_path)
+        if asset is not None:
+            if asset.immutable:
+                return asset
+            try:
+                stat = asset.path.stat()
+            except OSError:
+                stat = None
+            if stat is not None and stat.st_mtime_ns == asset.mtime_ns and stat.st_size == asset.size:
+                return asset
+
+        located = self._locate(url_path)
+        if located is None:
+            with self._lock:
+                self._assets.pop(url_path, None)
+            return None
+        path, stat, immutable = located
+        asset = _Asset(path, stat, immutable)
+        self._attach_variants(asset, compress=False)
+        with self._lock:
+            self._assets[url_path] = asset
+        return asset
+
+    def _cache_file(self, asset: _Asset, suffix: str) -> Optional[Path]:
+        return self.cache_dir / f'{asset.etag[1:-1]}{suffix}' if self.cache_dir else None
+
+    def _attach_variants(self, asset: _Asset, compress: bool):
+        """Übernimmt aktuelle .br/.gz-Dateien; mit compress=True werden fehlende erzeugt"""
+        if not asset.compressible or asset.size < self.compress_min_bytes:
+            return
+        data = None
+        for encoding, suffix in ENCODINGS:
+            if encoding in asset.variants:
+                continue
+            sidecar = asset.path.with_name(asset.path.name + suffix)
+            try:
+                stat = sidecar.stat()
+                if stat.st_mtime_ns >= asset.mtime_ns and stat.st_size < asset.size:
+                    asset.variants[encoding] = _Variant(sidecar, stat.st_size, f'"{asset.etag[1:-1]}-{encoding}"')
+                    continue
+            except OSError:
+                pass
+            etag = f'"{asset.etag[1:-1]}-{encoding}"'
+            cache_file = self._cache_file(asset, suffix)
+            if cache_file is not None:
+                # Inhaltsadressiert: eine Datei aus einem früheren Start passt immer
+                try:
+                    asset.variants[encoding] = _Variant(cache_file, cache_file.stat().st_size, etag)
+                    continue
+                except OSError:
+                    pass
+            if not compress or (encoding == 'br' and not BROTLI_AVAILABLE):
+                continue
+
+            if data is None:
+                data = asset.path.read_bytes()
+            if encoding == 'br':
+                compressed = brotli.compress(data, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) >= asset.size:
+                continue
+            variant = _Variant(None, len(compressed), etag, compressed)
+            if cache_file is not None:
+                temp = cache_file.with_name(f'.{cache_file.name}.{os.getpid()}.tmp')
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    temp.write_bytes(compressed)
+                    os.replace(temp, cache_file)
+                    variant.path = cache_file
+                    if variant.size > self.memory_max_file_bytes:
+                        variant.data = None
+                except OSError:
+                    # Cache nicht beschreibbar: Variante bleibt im Speicher
+                    try:
+                        temp.unlink()
+                    except OSError:
+                        pass
+            asset.variants[encoding] = variant
+
+    def _walk(self) -> Iterable[str]:
+        seen = set()
+        for prefix, directories in self.mounts:
+            for directory, _ in directories:
+                if not directory.is_dir():
+                    continue
+                for root, dirnames, filenames in os.walk(directory):
+                    dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+                    relative_root = Path(root).relative_to(directory).as_posix()
+                    for name in filenames:
+                        if name.startswith('.') or name.endswith(('.br', '.gz')):
+                            continue
+                        relative = name if relative_root == '.' else f'{relative_root}/{name}'
+                        url_path = f'{prefix}/{relative}'
+                        if url_path not in seen:
+                            seen.add(url_path)
+                            yield url_path
+
+    def prepare(self) -> Dict[str, int]:
+        """Indiziert alle Dateien und erzeugt fehlende komprimierte Varianten (läuft im Hintergrund)"""
+        stats = {'files': 0, 'immutable': 0, 'compressed': 0}
+        for url_path in self._walk():
+            try:
+                asset = self.resolve(url_path)
+                if asset is None:
+                    continue
+                self._attach_variants(asset, compress=True)
+            except OSError as e:
+                logger.warning(f"Statische Datei {url_path} nicht vorbereitet: {e}")
+                continue
+            stats['files'] += 1
+            stats['immutable'] += asset.immutable
+            stats['compressed'] += len(asset.variants) > 1
+        self._prune_cache()
+        logger.info(f"Statische Dateien vorbereitet: {stats['files']} Dateien, "
+                    f"{stats['immutable']} unveränderlich, {stats['compressed']} mit komprimierten Varianten"
+                    f"{'' if BROTLI_AVAILABLE else ' (nur gzip, brotli nicht installiert)'}")
+        return stats
+
+    def _prune_cache(self):
+        """Entfernt Varianten früherer Dateistände aus dem cache_dir"""
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+        with self._lock:
+            in_use = {variant.path for asset in self._assets.values() for variant in asset.variants.values()}
+        for entry in self.cache_dir.iterdir():
+            if entry.suffix in ('.br', '.gz') and entry not in in_use:
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def select(self, asset: _Asset, accept_encoding: str) -> Tuple[Optional[str], _Variant]:
+        if len(asset.variants) > 1 and accept_encoding:
+            accepted = accepted_encodings(accept_encoding, [encoding for encoding, _ in ENCODINGS])
+            for encoding, _ in ENCODINGS:
+                if encoding in accepted and encoding in asset.variants:
+                    return encoding, asset.variants[encoding]
+        return None, asset.variants[None]
+
+    def read(self, variant: _Variant) -> Optional[bytes]:
+        """Liest kleine Varianten einmalig in den Speicher; große werden gestreamt (None)"""
+        if variant.data is None and variant.size <= self.memory_max_file_bytes:
+            variant.data = variant.path.read_bytes()
+        return variant.data
+
+
+class StaticAssetMiddleware:
+    """
+    Äußerste ASGI-Middleware für statische Dateien.
+
+    Anfragen unter den registrierten Präfixen werden direkt beantwortet, ohne die
+    übrige Middleware-Kette (CORS, Metriken) und den Router zu durchlaufen;
+    unbekannte Dateien werden an die Anwendung weitergereicht.
+    """
+
+    def __init__(self, app, store: StaticAssetStore, immutable_max_age: int = 31536000):
+        self.app = app
+        self.store = store
+        self.immutable_cache_control = f'public, max-age={immutable_max_age}, immutable'.encode('latin-1')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.store.match(scope['path']):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        if method not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        asset = self.store.cached(scope['path'])
+        if asset is None:
+            asset = await run_in_threadpool(self.store.resolve, scope['path'])
+        if asset is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope['headers'])
+        encoding, variant = self.store.select(asset, request_headers.get(b'accept-encoding', b'').decode('latin-1'))
+
+        headers = [
+            (b'etag', variant.etag.encode('latin-1')),
+            (b'cache-control', self.immutable_cache_control if asset.immutable else b'no-cache'),
+            (b'x-content-type-options', b'nosniff'),
+        ]
+        if len(asset.variants) > 1:
+            headers.append((b'vary', b'Accept-Encoding'))
+
+        if_none_match = request_headers.get(b'if-none-match')
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.decode('latin-1').split(',')}
+            if '*' in tags or variant.etag in tags:
+                await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+
+        headers.append((b'content-type', asset.content_type.encode('latin-1')))
+        headers.append((b'content-length', str(variant.size).encode('latin-1')))
+        if encoding:
+            headers.append((b'content-encoding', encoding.encode('latin-1')))
+
+        data = None
+        if method == 'GET':
+            try:
+                data = variant.data if variant.data is not None else await run_in_threadpool(self.store.read, variant)
+            except OSError:
+                # Zwischen Indizierung und Auslieferung gelöscht
+                await self.app(scope, receive, send)
+                return
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        if method == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+        elif data is not None:
+            await send({'type': 'http.response.body', 'body': data})
+        else:
+            with open(variant.path, 'rb') as f:
+                while True:
+                    chunk = await run_in_threadpool(f.read, _CHUNK_SIZE)
+                    more = len(chunk) == _CHUNK_SIZE
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': more})
+                    if not more:
+                        break
+
+
+def create_static_store(mounts: Sequence[Tuple[str, Path, bool]]) -> StaticAssetStore:
+    """Erzeugt den Store mit den Einstellungen aus Config; mounts: (URL-Präfix, Verzeichnis, Build-Verzeichnis)"""
+    store = StaticAssetStore(
+        compress_min_bytes=Config.STATIC_COMPRESS_MIN_BYTES,
+        brotli_quality=Config.STATIC_BROTLI_QUALITY,
+        memory_max_file_bytes=Config.STATIC_MEMORY_MAX_FILE_BYTES,
+        cache_dir=Config.STATIC_CACHE_DIR,
+    )
+    for url_prefix, directory, build in mounts:
+        store.mount(url_prefix, directory, build=build)
+    return store
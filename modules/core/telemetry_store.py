@@ -0,0 +1,442 @@
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .config import Config
+from .logging import LogManager
+from .sqlite_pool import SQLitePool
+
+logger = LogManager.setup_logging(__name__)
+
+# Rollup-Auflösungen in Sekunden
+RESOLUTIONS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Dimensionen, nach denen gruppiert werden kann; alles andere wird verworfen,
+# damit die Anzahl der Rollup-Zeilen begrenzt bleibt
+DIMENSIONS = ('model', 'endpoint', 'component', 'type', 'status')
+
+# Serverseitig erfasste Metriken; Client-Meldungen mit diesen Namen werden verworfen
+SERVER_METRICS = frozenset({'stream_latency', 'stream_ttft'})
+
+# Metriken, die das Frontend melden darf, mit den jeweils übernommenen Dimensionen
+# (src/services/telemetry.ts); Config.TELEMETRY_CLIENT_METRICS ergänzt weitere Namen
+CLIENT_METRICS = {
+    'initial_load': ('type',),
+    'time_to_interactive': ('type',),
+    'memory_usage': ('type',),
+    'api_call_duration': ('endpoint', 'status'),
+    'api_call_error': ('endpoint', 'status'),
+    'component_render': ('component',),
+}
+_CLIENT_DEFAULT_DIMENSIONS = ('endpoint', 'component', 'type', 'status')
+
+# Ausprägungen pro Metrik und Dimension, danach wird der Wert zu 'other' zusammengefasst
+_OTHER = 'other'
+
+# Felder, aus denen bei Ereignissen (eventType) ein Messwert gelesen wird
+_VALUE_FIELDS = ('duration', 'durationMs', 'latency', 'latencyMs', 'value')
+
+# Relative Genauigkeit der Perzentile: Werte landen in logarithmischen Buckets
+# mit Faktor GAMMA, der Fehler liegt damit unter (GAMMA - 1) / 2
+GAMMA = 1.02
+_LOG_GAMMA = math.log(GAMMA)
+_MIN_VALUE = 1e-3
+_ZERO_BUCKET = 'z'
+
+_ID_SEGMENT = re.compile(r'/(?:\d+|[0-9a-f]{8,}(?:-[0-9a-f]{4,}){0,4})(?=/|$)', re.IGNORECASE)
+
+
+def _bucket_index(value: float) -> str:
+    if value <= _MIN_VALUE:
+        return _ZERO_BUCKET
+    return str(math.ceil(math.log(value) / _LOG_GAMMA))
+
+
+def _bucket_value(index: str) -> float:
+    if index == _ZERO_BUCKET:
+        return 0.0
+    # Mittelpunkt des Buckets (GAMMA^(i-1), GAMMA^i]
+    return 2 * GAMMA ** int(index) / (GAMMA + 1)
+
+
+def _normalize_endpoint(endpoint: str) -> str:
+    """Entfernt Query-String und ersetzt IDs im Pfad, z.B. /api/session/42 -> /api/session/:id"""
+    path = str(endpoint).split('?', 1)[0]
+    return _ID_SEGMENT.sub('/:id', path)[:120]
+
+
+def _timestamp_seconds(value: Any) -> Optional[float]:
+    """Akzeptiert Sekunden, Millisekunden oder ISO-Zeitstempel"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    try:
+        from datetime import datetime
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def extract_samples(event: Dict[str, Any]) -> List[Tuple[str, float, float, Dict[str, str]]]:
+    """
+    Liefert die Messwerte eines Telemetrie-Ereignisses als (metric, value, ts, dims).
+
+    Unterstützt Frontend-Metriken (eventType 'metric' mit name/value/tags) sowie
+    Ereignisse mit numerischer Dauer; Ereignisse ohne Messwert ergeben keine Samples.
+    """
+    if event.get('eventType') == 'metric' or ('name' in event and 'eventType' not in event):
+        metric = event.get('name')
+        raw_value = event.get('value')
+    else:
+        metric = event.get('eventType')
+        raw_value = next((event[f] for f in _VALUE_FIELDS if isinstance(event.get(f), (int, float))), None)
+
+    if not metric or isinstance(raw_value, bool) or not isinstance(raw_value, (int, float)):
+        return []
+    if not math.isfinite(raw_value) or raw_value < 0:
+        return []
+
+    ts = _timestamp_seconds(event.get('timestamp')) or time.time()
+
+    tags = event.get('tags') if isinstance(event.get('tags'), dict) else {}
+    dims = {}
+    for dim in DIMENSIONS:
+        value = tags.get(dim, event.get(dim))
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        value = str(value)
+        dims[dim] = _normalize_endpoint(value) if dim == 'endpoint' else value[:64]
+
+    return [(str(metric)[:64], float(raw_value), ts, dims)]
+
+
+class _Aggregate:
+    __slots__ = ('count', 'sum', 'min', 'max', 'hist')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.hist: Dict[str, int] = defaultdict(int)
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.hist[_bucket_index(value)] += 1
+
+    def merge(self, count: int, total: float, minimum: float, maximum: float, hist: Dict[str, int]):
+        self.count += count
+        self.sum += total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+        for index, n in hist.items():
+            self.hist[index] += n
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        ordered = sorted(self.hist.items(), key=lambda item: -math.inf if item[0] == _ZERO_BUCKET else int(item[0]))
+        for index, n in ordered:
+            seen += n
+            if seen > rank:
+                return min(max(_bucket_value(index), self.min), self.max)
+        return self.max
+
+
+class TelemetryStore:
+    """
+    Abfragbarer Telemetrie-Speicher mit vorverdichteten Rollups.
+
+    Beim Ingest wird jeder Messwert in Minuten-, Stunden- und Tagesbuckets pro
+    Metrik und Dimensionskombination eingerechnet (Anzahl, Summe, Min, Max und ein
+    logarithmisches Histogramm für Perzentile). Abfragen lesen nur die wenigen
+    Rollup-Zeilen des Zeitraums statt der Rohdaten; die Rohereignisse bleiben
+    unverändert in den Segmentdateien des Telemetrie-Handlers.
+    """
+
+    # Spätestens nach so vielen Sekunden werden serverseitige Messwerte geschrieben
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or Config.TELEMETRY_DB_PATH)
+        self.retention = {
+            'minute': Config.TELEMETRY_MINUTE_RETENTION_DAYS,
+            'hour': Config.TELEMETRY_HOUR_RETENTION_DAYS,
+            'day': Config.TELEMETRY_DAY_RETENTION_DAYS,
+        }
+        self._lock = threading.Lock()
+        self._pool = SQLitePool(self.path, timeout=10, isolation_level=None,
+                                pragmas=('journal_mode=WAL', 'synchronous=NORMAL'))
+        self._pending: List[Tuple[str, float, float, Dict[str, str]]] = []
+        self._last_prune = 0.0
+        self._last_flush = time.monotonic()
+        self._flush_scheduled = False
+        self.client_metrics = {
+            **{name: _CLIENT_DEFAULT_DIMENSIONS for name in Config.TELEMETRY_CLIENT_METRICS},
+            **CLIENT_METRICS,
+        }
+        self.max_dimension_values = Config.TELEMETRY_MAX_DIMENSION_VALUES
+        self._dimension_values: Dict[Tuple[str, str], set] = defaultdict(set)
+        self.init_db()
+
+    def init_db(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._pool.connection() as conn:
+            conn.executescript('''
+            CREATE TABLE IF NOT EXISTS telemetry_rollups (
+                resolution TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                dim_key TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                sum REAL NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                hist TEXT NOT NULL,
+                PRIMARY KEY (resolution, metric, bucket, dim_key)
+            ) WITHOUT ROWID;
+            ''')
+            conn.commit()
+
+    def close(self):
+        """Gepufferte Messwerte schreiben und die Datenbankverbindungen schließen"""
+        self.flush()
+        self._pool.close()
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def _client_sample(self, sample: Tuple[str, float, float, Dict[str, str]]):
+        """
+        Begrenzt vom Client gemeldete Messwerte: nur freigegebene Metriknamen und deren
+        Dimensionen, höchstens max_dimension_values Ausprägungen pro Dimension.
+        """
+        metric, value, ts, dims = sample
+        allowed = self.client_metrics.get(metric)
+        if allowed is None or metric in SERVER_METRICS:
+            return None
+        limited = {}
+        for dim in allowed:
+            if dim not in dims:
+                continue
+            seen = self._dimension_values[(metric, dim)]
+            if dims[dim] not in seen and len(seen) >= self.max_dimension_values:
+                limited[dim] = _OTHER
+                continue
+            seen.add(dims[dim])
+            limited[dim] = dims[dim]
+        return metric, value, ts, limited
+
+    def ingest(self, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Sink für die Telemetrie-Pipeline: rechnet einen Batch vom Client gemeldeter
+        Ereignisse in die Rollups ein (siehe _client_sample).
+        """
+        extracted = [sample for event in events for sample in extract_samples(event)]
+        with self._lock:
+            samples = [sample for sample in map(self._client_sample, extracted) if sample is not None]
+            if self._pending:
+                samples.extend(self._pending)
+                self._pending = []
+        return self._write(samples)
+
+    def record(self, metric: str, value: float, **dims: Any):
+        """
+        Erfasst einen serverseitigen Messwert (z.B. Stream-Latenz).
+
+        Die Werte werden gepuffert und mit dem nächsten Batch der Pipeline, vor der
+        nächsten Abfrage oder spätestens nach FLUSH_INTERVAL Sekunden in einem
+        Hintergrund-Thread geschrieben; der Aufrufer (z.B. das finally eines
+        SSE-Generators im Event-Loop) wartet nie auf die Datenbank.
+        """
+        event = {'eventType': 'metric', 'name': metric, 'value': value, 'tags': dims}
+        with self._lock:
+            self._pending.extend(extract_samples(event))
+            flush = not self._flush_scheduled and (
+                len(self._pending) >= 500 or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL
+            )
+            if flush:
+                self._flush_scheduled = True
+        if flush:
+            threading.Thread(target=self._background_flush, name='telemetry-flush', daemon=True).start()
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Fehler beim Schreiben gepufferter Telemetrie: {e}")
+        finally:
+            with self._lock:
+                self._flush_scheduled = False
+
+    def flush(self) -> int:
+        with self._lock:
+            samples, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        return self._write(samples)
+
+    def _write(self, samples: List[Tuple[str, float, float, Dict[str, str]]]) -> int:
+        if not samples:
+            return 0
+
+        aggregates: Dict[Tuple[str, int, str, str], _Aggregate] = defaultdict(_Aggregate)
+        for metric, value, ts, dims in samples:
+            dim_key = json.dumps(dims, sort_keys=True, separators=(',', ':'))
+            for resolution, seconds in RESOLUTIONS.items():
+                bucket = int(ts // seconds * seconds)
+                aggregates[(resolution, bucket, metric, dim_key)].add(value)
+
+        with self._pool.connection() as conn:
+            try:
+                # IMMEDIATE: mehrere Worker rechnen dieselben Buckets hoch
+                conn.execute("BEGIN IMMEDIATE")
+                for (resolution, bucket, metric, dim_key), agg in aggregates.items():
+                    row = conn.execute(
+                        "SELECT count, sum, min, max, hist FROM telemetry_rollups "
+                        "WHERE resolution = ? AND metric = ? AND bucket = ? AND dim_key = ?",
+                        (resolution, metric, bucket, dim_key)
+                    ).fetchone()
+                    if row:
+                        agg.merge(row[0], row[1], row[2], row[3], json.loads(row[4]))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO telemetry_rollups "
+                        "(resolution, bucket, metric, dim_key, count, sum, min, max, hist) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (resolution, bucket, metric, dim_key, agg.count, agg.sum, agg.min, agg.max,
+                         json.dumps(agg.hist, separators=(',', ':')))
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"Fehler beim Schreiben der Telemetrie-Rollups: {e}")
+                return 0
+
+        if time.time() - self._last_prune > 3600:
+            self.prune()
+        return len(samples)
+
+    def prune(self) -> int:
+        """Löscht Rollups, die älter als die Aufbewahrungsdauer ihrer Auflösung sind"""
+        self._last_prune = time.time()
+        deleted = 0
+        with self._pool.connection() as conn:
+            for resolution, days in self.retention.items():
+                if not days:
+                    continue
+                cursor = conn.execute(
+                    "DELETE FROM telemetry_rollups WHERE resolution = ? AND bucket < ?",
+                    (resolution, int(time.time() - days * 86400))
+                )
+                deleted += cursor.rowcount
+        if deleted:
+            logger.info(f"{deleted} abgelaufene Telemetrie-Rollups gelöscht")
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    def _pick_resolution(self, since: float, until: float) -> str:
+        span = until - since
+        if span <= 6 * 3600 and self.retention['minute'] * 86400 >= time.time() - since:
+            return 'minute'
+        if span <= 14 * 86400 and (not self.retention['hour'] or self.retention['hour'] * 86400 >= time.time() - since):
+            return 'hour'
+        return 'day'
+
+    def query(self, metric: str, hours: float = 24, since: Optional[float] = None,
+              until: Optional[float] = None, group_by: Optional[List[str]] = None,
+              filters: Optional[Dict[str, str]] = None, resolution: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregiert eine Metrik über einen Zeitraum, optional gruppiert nach Dimensionen.
+
+        Beispiel: query('stream_latency', hours=24, group_by=['model']) liefert pro
+        Modell Anzahl, Mittelwert, p50/p95/p99 und Maximum. Der Zeitraum wird auf
+        Bucket-Grenzen der gewählten Auflösung abgerundet.
+        """
+        self.flush()
+
+        until = until or time.time()
+        since = since or until - hours * 3600
+        resolution = resolution or self._pick_resolution(since, until)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unbekannte Auflösung: {resolution}")
+        group_by = [dim for dim in (group_by or []) if dim in DIMENSIONS]
+        filters = {dim: str(value) for dim, value in (filters or {}).items() if dim in DIMENSIONS}
+
+        seconds = RESOLUTIONS[resolution]
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT dim_key, count, sum, min, max, hist FROM telemetry_rollups "
+                "WHERE resolution = ? AND metric = ? AND bucket >= ? AND bucket <= ?",
+                (resolution, metric, int(since // seconds * seconds), int(until))
+            ).fetchall()
+
+        groups: Dict[Tuple[str, ...], _Aggregate] = defaultdict(_Aggregate)
+        for dim_key, count, total, minimum, maximum, hist in rows:
+            dims = json.loads(dim_key)
+            if any(dims.get(dim) != value for dim, value in filters.items()):
+                continue
+            key = tuple(dims.get(dim, '') for dim in group_by)
+            groups[key].merge(count, total, minimum, maximum, json.loads(hist))
+
+        results = []
+        for key, agg in sorted(groups.items(), key=lambda item: -item[1].count):
+            results.append({
+                **dict(zip(group_by, key)),
+                'count': agg.count,
+                'avg': round(agg.sum / agg.count, 3),
+                'p50': round(agg.quantile(0.50), 3),
+                'p95': round(agg.quantile(0.95), 3),
+                'p99': round(agg.quantile(0.99), 3),
+                'min': round(agg.min, 3),
+                'max': round(agg.max, 3),
+            })
+
+        return {
+            'metric': metric,
+            'since': int(since),
+            'until': int(until),
+            'resolution': resolution,
+            'group_by': group_by,
+            'groups': results,
+        }
+
+    def list_metrics(self, hours: float = 24) -> List[Dict[str, Any]]:
+        """Metriken mit Anzahl der Messwerte im Zeitraum (Stundenauflösung)"""
+        self.flush()
+        since = int((time.time() - hours * 3600) // 3600 * 3600)
+        with self._pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT metric, SUM(count) FROM telemetry_rollups WHERE resolution = 'hour' AND bucket >= ? "
+                "GROUP BY metric ORDER BY 2 DESC",
+                (since,)
+            ).fetchall()
+        return [{'metric': metric, 'count': count} for metric, count in rows]
+
+
+_telemetry_store: Optional[TelemetryStore] = None
+_telemetry_store_lock = threading.Lock()
+
+
+def get_telemetry_store() -> TelemetryStore:
+    """Prozessweite Instanz des Telemetrie-Speichers"""
+    global _telemetry_store
+    if _telemetry_store is None:
+        with _telemetry_store_lock:
+            if _telemetry_store is None:
+                _telemetry_store = TelemetryStore()
+    return _telemetry_store
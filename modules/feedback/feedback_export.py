@@ -0,0 +1,493 @@
+import csv
+import io
+import json
+import re
+import time
+import zipfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+from xml.sax.saxutils import escape as xml_escape
+
+from ..core.logging import LogManager
+
+logger = LogManager.setup_logging(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    logger.info("pyarrow nicht installiert - Parquet-Export deaktiviert")
+
+# Exportierbare Felder in Standardreihenfolge; alles andere wird abgelehnt
+EXPORT_FIELDS = ('id', 'message_id', 'session_id', 'user_id', 'user_email', 'is_positive',
+                 'comment', 'question', 'answer', 'sources', 'created_at')
+DEFAULT_EXPORT_FIELDS = ('id', 'user_email', 'question', 'answer', 'comment', 'created_at')
+
+# Größe der an den Client übergebenen Blöcke
+CHUNK_SIZE = 64 * 1024
+
+# Zeilen pro Parquet-Row-Group; bestimmt den Speicherbedarf des Parquet-Exports
+PARQUET_ROW_GROUP_SIZE = 10000
+
+# Excel begrenzt Zellinhalte auf 32767 Zeichen
+XLSX_MAX_CELL = 32767
+
+_XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+_INT_FIELDS = ('id', 'message_id', 'session_id', 'user_id')
+
+
+def _created_seconds(value: Any) -> Optional[float]:
+    """created_at liegt in der DB in Sekunden, in formatierten Einträgen in Millisekunden"""
+    if value is None or value == '':
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value / 1000.0 if value > 1e11 else value
+
+
+def _format_time(value: Any) -> str:
+    seconds = _created_seconds(value)
+    if seconds is None:
+        return str(value or '')
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def _text_value(row: Dict[str, Any], field: str) -> str:
+    """Feldwert als Text für tabellarische Formate (CSV, XLSX, PDF)"""
+    value = row.get(field)
+    if field == 'created_at':
+        return _format_time(value)
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'ja' if value else 'nein'
+    return str(value)
+
+
+def _json_value(row: Dict[str, Any], field: str) -> Any:
+    """Feldwert für JSON/NDJSON: Zeitstempel in Millisekunden, Quellen als Liste"""
+    value = row.get(field)
+    if field == 'created_at':
+        seconds = _created_seconds(value)
+        return int(seconds * 1000) if seconds is not None else None
+    if field == 'sources' and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+class _ChunkSink:
+    """
+    Schreibziel, das geschriebene Bytes bis zur Abholung puffert.
+
+    tell() ist vorhanden (pyarrow benötigt es), seek() bewusst nicht: zipfile schreibt
+    dann Data Descriptors hinter die Einträge, statt zurückzuspringen.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._size = 0
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._size += len(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts = []
+        self._size = 0
+        return data
+
+
+def _iter_csv(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow([_text_value(row, field) for field in fields])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _iter_ndjson(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    parts: List[str] = []
+    size = 0
+    for row in rows:
+        line = json.dumps({field: _json_value(row, field) for field in fields}, ensure_ascii=False) + '\n'
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield ''.join(parts).encode('utf-8')
+            parts, size = [], 0
+    if parts:
+        yield ''.join(parts).encode('utf-8')
+
+
+def _iter_json(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    # JSON-Array zeilenweise aufgebaut: '[', Objekte mit ',\n' getrennt, ']'
+    separator = '[\n'
+    for chunk in _iter_ndjson(rows, fields):
+        lines = chunk.decode('utf-8').rstrip('\n').split('\n')
+        yield (separator + ',\n'.join(lines)).encode('utf-8')
+        separator = ',\n'
+    yield b'[\n]\n' if separator == '[\n' else b'\n]\n'
+
+
+# --- XLSX (Office Open XML, ohne Fremdbibliothek) ---
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Feedback" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Stil 0: Standard, Stil 1: fett (Kopfzeile)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_XLSX_WIDTHS = {'question': 60, 'answer': 80, 'comment': 40, 'sources': 40, 'user_email': 30, 'created_at': 20}
+
+
+def _column_letter(index: int) -> str:
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_cell(ref: str, value: Any, style: str = '') -> str:
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style}><v>{value}</v></c>'
+    text = _XML_ILLEGAL.sub('', str(value))[:XLSX_MAX_CELL]
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{xml_escape(text)}</t></is></c>'
+
+
+def _xlsx_value(row: Dict[str, Any], field: str) -> Any:
+    value = row.get(field)
+    if field in _INT_FIELDS and isinstance(value, int) or field == 'is_positive' and isinstance(value, bool):
+        return value
+    return _text_value(row, field)
+
+
+def _iter_xlsx(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    """
+    Schreibt eine XLSX-Datei mit Inline-Strings direkt in das ZIP-Archiv.
+
+    Ohne Shared-Strings-Tabelle muss nichts über alle Zeilen hinweg gesammelt werden;
+    das Tabellenblatt wird komprimiert und blockweise ausgeliefert.
+    """
+    sink = _ChunkSink()
+    letters = [_column_letter(i) for i in range(len(fields))]
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        archive.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _XLSX_WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', _XLSX_STYLES)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            cols = ''.join(f'<col min="{i + 1}" max="{i + 1}" width="{_XLSX_WIDTHS.get(field, 12)}" customWidth="1"/>'
+                           for i, field in enumerate(fields))
+            header = ''.join(_xlsx_cell(f'{letter}1', field, ' s="1"') for letter, field in zip(letters, fields))
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" '
+                'activePane="bottomLeft" state="frozen"/></sheetView></sheetViews>'
+                f'<cols>{cols}</cols><sheetData><row r="1">{header}</row>'
+            ).encode('utf-8'))
+
+            parts: List[str] = []
+            size = 0
+            for number, row in enumerate(rows, start=2):
+                cells = ''.join(_xlsx_cell(f'{letter}{number}', _xlsx_value(row, field))
+                                for letter, field in zip(letters, fields))
+                line = f'<row r="{number}">{cells}</row>'
+                parts.append(line)
+                size += len(line)
+                if size >= CHUNK_SIZE:
+                    sheet.write(''.join(parts).encode('utf-8'))
+                    parts, size = [], 0
+                    if sink.size >= CHUNK_SIZE:
+                        yield sink.drain()
+            parts.append('</sheetData></worksheet>')
+            sheet.write(''.join(parts).encode('utf-8'))
+    yield sink.drain()
+
+
+# --- Parquet (optional, pyarrow) ---
+
+def _parquet_schema(fields: Sequence[str]):
+    types = {
+        'id': pa.int64(), 'message_id': pa.int64(), 'session_id': pa.int64(), 'user_id': pa.int64(),
+        'is_positive': pa.bool_(), 'created_at': pa.timestamp('ms', tz='UTC'),
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in fields])
+
+
+def _parquet_value(row: Dict[str, Any], field: str) -> Any:
+    value = row.get(field)
+    if field == 'created_at':
+        seconds = _created_seconds(value)
+        return int(seconds * 1000) if seconds is not None else None
+    if field in _INT_FIELDS:
+        # Formatierte Einträge tragen Präfixe wie "f-12"
+        if isinstance(value, str):
+            value = value.rsplit('-', 1)[-1]
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+    if field == 'is_positive':
+        return bool(value) if value is not None else None
+    return None if value is None else str(value)
+
+
+def _iter_parquet(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    """Schreibt je PARQUET_ROW_GROUP_SIZE Zeilen eine Row-Group und gibt sie sofort weiter"""
+    sink = _ChunkSink()
+    schema = _parquet_schema(fields)
+    columns: Dict[str, List[Any]] = {field: [] for field in fields}
+    count = 0
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for row in rows:
+            for field in fields:
+                columns[field].append(_parquet_value(row, field))
+            count += 1
+            if count >= PARQUET_ROW_GROUP_SIZE:
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                columns = {field: [] for field in fields}
+                count = 0
+                yield sink.drain()
+        if count:
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    yield sink.drain()
+
+
+# --- PDF (Tabellenliste, Helvetica, A4 quer) ---
+
+_PDF_PAGE_WIDTH = 842
+_PDF_PAGE_HEIGHT = 595
+_PDF_MARGIN = 36
+_PDF_FONT_SIZE = 8
+_PDF_LINE_HEIGHT = 10
+_PDF_CHAR_WIDTH = 4.4  # mittlere Zeichenbreite von Helvetica bei 8 pt
+_PDF_WEIGHTS = {'question': 4, 'answer': 5, 'comment': 3, 'sources': 3, 'user_email': 2.5, 'created_at': 2.2}
+
+
+def _pdf_text(value: str, max_chars: int) -> str:
+    value = ' '.join(str(value).split())
+    if len(value) > max_chars:
+        value = value[:max(max_chars - 3, 0)] + '...'
+    return value.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _iter_pdf(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[bytes]:
+    """
+    Erzeugt ein PDF seitenweise: jede Seite wird sofort ausgegeben, nur die
+    Objekt-Offsets für die Xref-Tabelle bleiben im Speicher.
+    Der Seitenbaum (Objekt 2) wird als letztes Objekt geschrieben.
+    """
+    offsets: Dict[int, int] = {}
+    position = 0
+    page_ids: List[int] = []
+    next_id = 5
+
+    def obj(number: int, body: bytes) -> bytes:
+        nonlocal position
+        offsets[number] = position
+        data = f'{number} 0 obj\n'.encode('latin-1') + body + b'\nendobj\n'
+        position += len(data)
+        return data
+
+    def emit(data: bytes) -> bytes:
+        nonlocal position
+        position += len(data)
+        return data
+
+    usable = _PDF_PAGE_WIDTH - 2 * _PDF_MARGIN
+    weights = [_PDF_WEIGHTS.get(field, 1.2) for field in fields]
+    widths = [usable * w / sum(weights) for w in weights]
+    xs = [_PDF_MARGIN + sum(widths[:i]) for i in range(len(fields))]
+    max_chars = [max(int(w / _PDF_CHAR_WIDTH) - 1, 1) for w in widths]
+    lines_per_page = (_PDF_PAGE_HEIGHT - 2 * _PDF_MARGIN) // _PDF_LINE_HEIGHT - 2
+    title = _pdf_text(f'Feedback-Export {time.strftime("%Y-%m-%d %H:%M:%S")}', 200)
+
+    def page(lines: List[List[str]], number: int) -> bytes:
+        nonlocal next_id
+        y = _PDF_PAGE_HEIGHT - _PDF_MARGIN
+        ops = [f'BT /F2 10 Tf {_PDF_MARGIN} {y} Td ({title} - Seite {number}) Tj ET']
+        y -= 2 * _PDF_LINE_HEIGHT
+        for index, line in enumerate(lines):
+            font = '/F2' if index == 0 else '/F1'
+            for x, text in zip(xs, line):
+                if text:
+                    ops.append(f'BT {font} {_PDF_FONT_SIZE} Tf {x:.1f} {y} Td ({text}) Tj ET')
+            y -= _PDF_LINE_HEIGHT
+        stream = '\n'.join(ops).encode('latin-1', errors='replace')
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        return (
+            obj(content_id, f'<< /Length {len(stream)} >>\nstream\n'.encode('latin-1') + stream + b'\nendstream')
+            + obj(page_id, (f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PDF_PAGE_WIDTH} {_PDF_PAGE_HEIGHT}] '
+                            f'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>'
+                            ).encode('latin-1'))
+        )
+
+    yield (emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+           + obj(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+           + obj(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+           + obj(4, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>'))
+
+    header = [_pdf_text(field, limit) for field, limit in zip(fields, max_chars)]
+    lines = [header]
+    pending = b''
+    for row in rows:
+        lines.append([_pdf_text(_text_value(row, field), limit) for field, limit in zip(fields, max_chars)])
+        if len(lines) > lines_per_page:
+            pending += page(lines, len(page_ids) + 1)
+            lines = [header]
+            if len(pending) >= CHUNK_SIZE:
+                yield pending
+                pending = b''
+    if len(lines) > 1 or not page_ids:
+        pending += page(lines, len(page_ids) + 1)
+
+    kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids)
+    pending += obj(2, f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode('latin-1'))
+
+    xref_start = position
+    size = next_id
+    xref = [f'xref\n0 {size}\n', '0000000000 65535 f \n']
+    for number in range(1, size):
+        xref.append(f'{offsets[number]:010d} 00000 n \n')
+    xref.append(f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_start}\n%%EOF\n')
+    yield pending + ''.join(xref).encode('latin-1')
+
+
+# Format -> (MIME-Typ, Dateiendung, Writer)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'csv': ('text/csv; charset=utf-8', 'csv', _iter_csv),
+    'json': ('application/json', 'json', _iter_json),
+    'ndjson': ('application/x-ndjson', 'ndjson', _iter_ndjson),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx', _iter_xlsx),
+    'parquet': ('application/vnd.apache.parquet', 'parquet', _iter_parquet),
+    'pdf': ('application/pdf', 'pdf', _iter_pdf),
+}
+
+
+def validate_export(fmt: str, fields: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Prüft Format und Feldliste und gibt die bereinigte Feldliste zurück.
+
+    Raises:
+        ValueError: Unbekanntes Format oder Feld, oder Parquet ohne pyarrow
+    """
+    fmt = (fmt or '').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}")
+    if fmt == 'parquet' and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet-Export nicht verfügbar (pyarrow nicht installiert)")
+    selected = [field.strip() for field in (fields or DEFAULT_EXPORT_FIELDS) if field and field.strip()]
+    unknown = [field for field in selected if field not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unbekannte Exportfelder: {', '.join(unknown)}")
+    return selected or list(DEFAULT_EXPORT_FIELDS)
+
+
+def export_filename(fmt: str) -> str:
+    return f"feedback_export_{time.strftime('%Y%m%d_%H%M%S')}.{EXPORT_FORMATS[fmt.lower()][1]}"
+
+
+def export_media_type(fmt: str) -> str:
+    return EXPORT_FORMATS[fmt.lower()][0]
+
+
+def iter_export(rows: Iterable[Dict[str, Any]], fmt: str,
+                fields: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """
+    Wandelt Feedback-Zeilen in Blöcke der Exportdatei um.
+
+    rows wird genau einmal durchlaufen; der Speicherbedarf hängt nur von der
+    Blockgröße (bzw. der Row-Group-Größe bei Parquet) ab, nicht von der Zeilenzahl.
+    """
+    fields = validate_export(fmt, fields)
+    writer: Callable[[Iterable[Dict[str, Any]], Sequence[str]], Iterator[bytes]] = EXPORT_FORMATS[fmt.lower()][2]
+    for chunk in writer(rows, fields):
+        if chunk:
+            yield chunk
@@ -1,10 +1,11 @@
 import sqlite3
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import json
 
 from ..core.config import Config
 from ..core.logging import LogManager
+from ..core.response_cache import get_response_cache, FEEDBACK_TAG
 
 logger = LogManager.setup_logging(__name__)
 
@@ -12,6 +13,8 @@ class FeedbackManager:
     """Verwaltet Feedback zu Chat-Antworten (Daumen hoch/runter)"""
     
     def __init__(self):
+        self.fts_enabled = False
+        self.answer_counters_ready = False
         self.init_db()
     
     def init_db(self):
@@ -52,6 +55,18 @@ class FeedbackManager:
                 cursor.execute("ALTER TABLE message_feedback ADD COLUMN answer TEXT")
                 logger.info("Spalte 'answer' zur message_feedback-Tabelle hinzugefügt")
             
+            if 'sources' not in column_names:
+                cursor.execute("ALTER TABLE message_feedback ADD COLUMN sources TEXT")  # JSON-Liste der Quelldokumente
+                logger.info("Spalte 'sources' zur message_feedback-Tabelle hinzugefügt")
+            
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_message_feedback_created_at ON message_feedback(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_message_feedback_message ON message_feedback(message_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_message_feedback_user ON message_feedback(user_id, created_at)")
+            
+            self._init_aggregates(cursor)
+            self._init_answer_counters(cursor)
+            self._init_fts(cursor)
+            
             conn.commit()
             logger.info("Feedback-Datenbank initialisiert")
         except Exception as e:
@@ -60,8 +75,188 @@ class FeedbackManager:
         finally:
             conn.close()
     
+    def _init_aggregates(self, cursor):
+        """
+        Materialisierte Zähler (gesamt, pro Tag, pro Quelldokument), die per Trigger
+        bei jedem Insert/Update/Delete auf message_feedback gepflegt werden
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='feedback_counters'")
+        is_new = cursor.fetchone() is None
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS feedback_counters (
+            scope TEXT NOT NULL,      -- 'total', 'day' oder 'source'
+            bucket TEXT NOT NULL,     -- '' bzw. Datum (YYYY-MM-DD, UTC) bzw. Dokumentname
+            total INTEGER NOT NULL DEFAULT 0,
+            positive INTEGER NOT NULL DEFAULT 0,
+            negative INTEGER NOT NULL DEFAULT 0,
+            with_comments INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, bucket)
+        )
+        ''')
+        
+        for trigger, event, rows in (
+            ('feedback_counters_ai', 'AFTER INSERT', [('NEW', 1)]),
+            ('feedback_counters_ad', 'AFTER DELETE', [('OLD', -1)]),
+            ('feedback_counters_au', 'AFTER UPDATE OF is_positive, comment, sources, created_at', [('OLD', -1), ('NEW', 1)]),
+        ):
+            body = "".join(self._counter_upserts(row, sign) for row, sign in rows)
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {trigger} {event} ON message_feedback BEGIN {body} END")
+        
+        if is_new:
+            self._rebuild_aggregates(cursor)
+    
+    @staticmethod
+    def _counter_upserts(row: str, sign: int) -> str:
+        """Erzeugt die UPSERT-Statements eines Triggers für die Zeile NEW bzw. OLD"""
+        values = (
+            f"{sign}, {sign} * ({row}.is_positive = 1), {sign} * ({row}.is_positive = 0), "
+            f"{sign} * ({row}.comment IS NOT NULL AND {row}.comment != '')"
+        )
+        update = (
+            "ON CONFLICT(scope, bucket) DO UPDATE SET "
+            "total = total + excluded.total, positive = positive + excluded.positive, "
+            "negative = negative + excluded.negative, with_comments = with_comments + excluded.with_comments;"
+        )
+        columns = "INSERT INTO feedback_counters (scope, bucket, total, positive, negative, with_comments)"
+        return (
+            f"{columns} VALUES ('total', '', {values}) {update} "
+            f"{columns} VALUES ('day', date({row}.created_at, 'unixepoch'), {values}) {update} "
+            f"{columns} SELECT 'source', value, {values} FROM json_each(COALESCE({row}.sources, '[]')) WHERE true {update} "
+        )
+    
+    def _rebuild_aggregates(self, cursor):
+        """Baut die Zähler einmalig aus dem vorhandenen Feedback auf"""
+        cursor.execute("DELETE FROM feedback_counters WHERE scope IN ('total', 'day', 'source')")
+        aggregates = """SUM(is_positive = 1), SUM(is_positive = 0),
+                        SUM(comment IS NOT NULL AND comment != '')"""
+        cursor.execute(f"""
+            INSERT INTO feedback_counters (scope, bucket, total, positive, negative, with_comments)
+            SELECT 'total', '', COUNT(*), {aggregates} FROM message_feedback HAVING COUNT(*) > 0
+        """)
+        cursor.execute(f"""
+            INSERT INTO feedback_counters (scope, bucket, total, positive, negative, with_comments)
+            SELECT 'day', date(created_at, 'unixepoch'), COUNT(*), {aggregates}
+            FROM message_feedback GROUP BY date(created_at, 'unixepoch')
+        """)
+        cursor.execute(f"""
+            INSERT INTO feedback_counters (scope, bucket, total, positive, negative, with_comments)
+            SELECT 'source', s.value, COUNT(*), {aggregates}
+            FROM message_feedback, json_each(COALESCE(message_feedback.sources, '[]')) AS s
+            GROUP BY s.value
+        """)
+        logger.info("Feedback-Zähler aus bestehenden Einträgen aufgebaut")
+    
+    def _init_answer_counters(self, cursor):
+        """
+        Zähler für die Feedback-Quote: 'answers' zählt die vorhandenen Assistentenantworten,
+        'rated' die davon mit mindestens einem Feedback. Beide werden per Trigger auf
+        chat_messages und message_feedback gepflegt, damit die Statistik nie scannt.
+        Die Trigger setzen chat_messages voraus; fehlt die Tabelle beim Start noch
+        (ChatHistoryManager wird später angelegt), holt get_feedback_stats das nach.
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chat_messages'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name='feedback_answers_ai'")
+        is_new = cursor.fetchone() is None
+        
+        def bump(scope: str, sign: int) -> str:
+            return (
+                f"INSERT INTO feedback_counters (scope, bucket, total) VALUES ('{scope}', '', {sign}) "
+                f"ON CONFLICT(scope, bucket) DO UPDATE SET total = total + excluded.total;"
+            )
+        
+        has_feedback = "EXISTS (SELECT 1 FROM message_feedback WHERE message_id = {row}.id)"
+        is_answer = "EXISTS (SELECT 1 FROM chat_messages WHERE id = {row}.message_id AND is_user = 0)"
+        only_feedback = (
+            "NOT EXISTS (SELECT 1 FROM message_feedback WHERE message_id = {row}.message_id AND id != {row}.id)"
+        )
+        for trigger, event, when, body in (
+            ('feedback_answers_ai', 'AFTER INSERT ON chat_messages', "NEW.is_user = 0",
+             bump('answers', 1) + f" INSERT INTO feedback_counters (scope, bucket, total) "
+             f"SELECT 'rated', '', 1 WHERE {has_feedback.format(row='NEW')} "
+             f"ON CONFLICT(scope, bucket) DO UPDATE SET total = total + excluded.total;"),
+            ('feedback_answers_ad', 'AFTER DELETE ON chat_messages', "OLD.is_user = 0",
+             bump('answers', -1) + f" INSERT INTO feedback_counters (scope, bucket, total) "
+             f"SELECT 'rated', '', -1 WHERE {has_feedback.format(row='OLD')} "
+             f"ON CONFLICT(scope, bucket) DO UPDATE SET total = total + excluded.total;"),
+            ('feedback_rated_ai', 'AFTER INSERT ON message_feedback',
+             f"{only_feedback.format(row='NEW')} AND {is_answer.format(row='NEW')}", bump('rated', 1)),
+            ('feedback_rated_ad', 'AFTER DELETE ON message_feedback',
+             f"{only_feedback.format(row='OLD')} AND {is_answer.format(row='OLD')}", bump('rated', -1)),
+        ):
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {trigger} {event} WHEN {when} BEGIN {body} END")
+        
+        if is_new:
+            # Einmaliger Aufbau aus dem Bestand
+            cursor.execute("DELETE FROM feedback_counters WHERE scope IN ('answers', 'rated')")
+            cursor.execute("""
+                INSERT INTO feedback_counters (scope, bucket, total)
+                SELECT 'answers', '', COUNT(*) FROM chat_messages WHERE is_user = 0
+            """)
+            cursor.execute("""
+                INSERT INTO feedback_counters (scope, bucket, total)
+                SELECT 'rated', '', COUNT(DISTINCT f.message_id) FROM message_feedback f
+                JOIN chat_messages m ON m.id = f.message_id WHERE m.is_user = 0
+            """)
+            logger.info("Zähler für die Feedback-Quote aufgebaut")
+        self.answer_counters_ready = True
+    
+    def _ensure_answer_counters(self, conn):
+        """Legt die Zähler der Feedback-Quote an, sobald chat_messages existiert"""
+        if self.answer_counters_ready:
+            return
+        cursor = conn.cursor()
+        self._init_answer_counters(cursor)
+        conn.commit()
+    
+    def _init_fts(self, cursor):
+        """FTS5-Volltextindex über Kommentar, Frage und Antwort (External-Content-Tabelle)"""
+        try:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='feedback_fts'")
+            is_new = cursor.fetchone() is None
+            
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+                comment, question, answer,
+                content='message_feedback', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_ai AFTER INSERT ON message_feedback BEGIN
+                INSERT INTO feedback_fts(rowid, comment, question, answer)
+                VALUES (NEW.id, NEW.comment, NEW.question, NEW.answer);
+            END
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_ad AFTER DELETE ON message_feedback BEGIN
+                INSERT INTO feedback_fts(feedback_fts, rowid, comment, question, answer)
+                VALUES ('delete', OLD.id, OLD.comment, OLD.question, OLD.answer);
+            END
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS feedback_fts_au AFTER UPDATE OF comment, question, answer ON message_feedback BEGIN
+                INSERT INTO feedback_fts(feedback_fts, rowid, comment, question, answer)
+                VALUES ('delete', OLD.id, OLD.comment, OLD.question, OLD.answer);
+                INSERT INTO feedback_fts(rowid, comment, question, answer)
+                VALUES (NEW.id, NEW.comment, NEW.question, NEW.answer);
+            END
+            ''')
+            
+            if is_new:
+                cursor.execute("INSERT INTO feedback_fts(feedback_fts) VALUES ('rebuild')")
+                logger.info("Feedback-Volltextindex aufgebaut")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # SQLite ohne FTS5: Suche fällt auf LIKE zurück
+            logger.warning(f"FTS5 nicht verfügbar, Feedback-Suche ohne Volltextindex: {e}")
+            self.fts_enabled = False
+    
     def add_feedback(self, message_id: int, session_id: int, user_id: int, 
-                     is_positive: bool, comment: Optional[str] = None) -> bool:
+                     is_positive: bool, comment: Optional[str] = None,
+                     sources: Optional[List[str]] = None) -> bool:
         """Fügt Feedback zu einer Nachricht hinzu oder aktualisiert es"""
         try:
             now = int(time.time())
@@ -107,26 +302,28 @@ class FeedbackManager:
                 (message_id, user_id)
             )
             existing = cursor.fetchone()
+            sources_json = json.dumps(sources, ensure_ascii=False) if sources else None
             
             if existing:
                 # Feedback aktualisieren
                 cursor.execute(
-                    "UPDATE message_feedback SET is_positive = ?, comment = ?, question = ?, answer = ? WHERE id = ?",
-                    (is_positive, comment, question, answer, existing[0])
+                    "UPDATE message_feedback SET is_positive = ?, comment = ?, question = ?, answer = ?, sources = ? WHERE id = ?",
+                    (is_positive, comment, question, answer, sources_json, existing[0])
                 )
                 logger.info(f"Feedback für Nachricht {message_id} aktualisiert")
             else:
                 # Neues Feedback erstellen
                 cursor.execute(
                     """INSERT INTO message_feedback 
-                       (message_id, session_id, user_id, is_positive, comment, question, answer, created_at) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (message_id, session_id, user_id, is_positive, comment, question, answer, now)
+                       (message_id, session_id, user_id, is_positive, comment, question, answer, sources, created_at) 
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (message_id, session_id, user_id, is_positive, comment, question, answer, sources_json, now)
                 )
                 logger.info(f"Neues Feedback für Nachricht {message_id} erstellt")
             
             conn.commit()
             conn.close()
+            get_response_cache().invalidate_tags(FEEDBACK_TAG)
             return True
         
         except Exception as e:
@@ -200,34 +397,66 @@ class FeedbackManager:
             logger.error(f"Fehler beim Abrufen des Benutzer-Feedbacks: {e}")
             return []
     
-    def get_feedback_stats(self) -> Dict[str, Any]:
-        """Gibt Statistiken zum gesammelten Feedback zurück (für Admins)"""
+    def get_feedback_stats(self, days: int = 7, top_sources: int = 10) -> Dict[str, Any]:
+        """Gibt Statistiken zum gesammelten Feedback zurück (für Admins), gelesen aus den materialisierten Zählern"""
         try:
             conn = sqlite3.connect(Config.DB_PATH)
+            self._ensure_answer_counters(conn)
             cursor = conn.cursor()
             
-            # Gesamtanzahl der Feedbacks
-            cursor.execute("SELECT COUNT(*) FROM message_feedback")
-            total = cursor.fetchone()[0]
+            cursor.execute(
+                "SELECT total, positive, negative, with_comments FROM feedback_counters WHERE scope = 'total'"
+            )
+            total, positive, negative, with_comments = cursor.fetchone() or (0, 0, 0, 0)
             
-            # Anzahl positiver Feedbacks
-            cursor.execute("SELECT COUNT(*) FROM message_feedback WHERE is_positive = 1")
-            positive = cursor.fetchone()[0]
+            # Zeitreihe der letzten Tage (UTC), fehlende Tage mit 0 auffüllen
+            today = int(time.time()) // 86400
+            day_keys = [time.strftime("%Y-%m-%d", time.gmtime((today - i) * 86400)) for i in range(days - 1, -1, -1)]
+            cursor.execute(
+                "SELECT bucket, total, positive, negative FROM feedback_counters WHERE scope = 'day' AND bucket >= ?",
+                (day_keys[0] if day_keys else '',)
+            )
+            by_day = {row[0]: row for row in cursor.fetchall()}
+            feedback_by_day = [{
+                'date': day,
+                'count': by_day[day][1] if day in by_day else 0,
+                'positive': by_day[day][2] if day in by_day else 0,
+                'negative': by_day[day][3] if day in by_day else 0
+            } for day in day_keys]
             
-            # Anzahl negativer Feedbacks
-            cursor.execute("SELECT COUNT(*) FROM message_feedback WHERE is_positive = 0")
-            negative = cursor.fetchone()[0]
+            cursor.execute(
+                """SELECT bucket, total, positive, negative FROM feedback_counters
+                   WHERE scope = 'source' AND total > 0 ORDER BY negative DESC, total DESC LIMIT ?""",
+                (top_sources,)
+            )
+            feedback_by_source = [
+                {'source': row[0], 'count': row[1], 'positive': row[2], 'negative': row[3]}
+                for row in cursor.fetchall()
+            ]
             
             # Prozentsatz
             positive_percent = (positive / total * 100) if total > 0 else 0
             
+            # Anteil der (noch vorhandenen) Assistentenantworten mit mindestens einem Feedback
+            cursor.execute(
+                """SELECT COALESCE(SUM(CASE scope WHEN 'answers' THEN total END), 0),
+                          COALESCE(SUM(CASE scope WHEN 'rated' THEN total END), 0)
+                   FROM feedback_counters WHERE scope IN ('answers', 'rated') AND bucket = ''"""
+            )
+            answers, answers_with_feedback = cursor.fetchone()
+            feedback_rate = (answers_with_feedback / answers * 100) if answers > 0 else 0
+            
             conn.close()
             
             return {
                 'total': total,
                 'positive': positive,
                 'negative': negative,
-                'positive_percent': round(positive_percent, 2)
+                'positive_percent': round(positive_percent, 2),
+                'with_comments': with_comments,
+                'feedback_rate': round(feedback_rate, 2),
+                'feedback_by_day': feedback_by_day,
+                'feedback_by_source': feedback_by_source
             }
         
         except Exception as e:
@@ -236,9 +465,152 @@ class FeedbackManager:
                 'total': 0,
                 'positive': 0,
                 'negative': 0,
-                'positive_percent': 0
+                'positive_percent': 0,
+                'with_comments': 0,
+                'feedback_rate': 0,
+                'feedback_by_day': [],
+                'feedback_by_source': []
             }
     
+    @staticmethod
+    def _fts_query(search_term: str) -> str:
+        """Wandelt eine Benutzereingabe in eine sichere FTS5-Abfrage um (alle Wörter als Präfix)"""
+        tokens = [t for t in search_term.split() if t]
+        return " ".join('"' + t.replace('"', '""') + '"*' for t in tokens)
+    
+    def search_feedback(self, search_term: Optional[str] = None, is_positive: Optional[bool] = None,
+                        has_comment: Optional[bool] = None, date_from: Optional[int] = None,
+                        date_to: Optional[int] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Durchsucht Feedback über den Volltextindex und filtert in SQL.
+        Enthält der Suchbegriff ein '@', wird stattdessen nach der E-Mail-Adresse gefiltert.
+        date_from/date_to sind Unix-Zeitstempel in Sekunden.
+        """
+        try:
+            conditions = []
+            params: List[Any] = []
+            
+            if search_term and search_term.strip():
+                if '@' in search_term:
+                    # Sieht nach einer E-Mail-Adresse aus: nur über die (kleine) Benutzertabelle filtern
+                    conditions.append("f.user_id IN (SELECT id FROM users WHERE email LIKE ?)")
+                    params.append(f"%{search_term.strip()}%")
+                elif self.fts_enabled and self._fts_query(search_term):
+                    conditions.append("f.id IN (SELECT rowid FROM feedback_fts WHERE feedback_fts MATCH ?)")
+                    params.append(self._fts_query(search_term))
+                else:
+                    like = f"%{search_term.strip()}%"
+                    conditions.append("(u.email LIKE ? OR f.comment LIKE ? OR f.question LIKE ? OR f.answer LIKE ?)")
+                    params.extend([like] * 4)
+            
+            if is_positive is not None:
+                conditions.append("f.is_positive = ?")
+                params.append(1 if is_positive else 0)
+            
+            if has_comment is True:
+                conditions.append("f.comment IS NOT NULL AND f.comment != ''")
+            elif has_comment is False:
+                conditions.append("(f.comment IS NULL OR f.comment = '')")
+            
+            if date_from:
+                conditions.append("f.created_at >= ?")
+                params.append(int(date_from))
+            if date_to:
+                conditions.append("f.created_at <= ?")
+                params.append(int(date_to))
+            
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            
+            conn = sqlite3.connect(Config.DB_PATH)
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                f"""SELECT f.id, f.message_id, f.session_id, f.user_id, f.is_positive, f.comment,
+                          f.created_at, f.question, f.answer, u.email
+                   FROM message_feedback f
+                   JOIN users u ON f.user_id = u.id
+                   {where}
+                   ORDER BY f.created_at DESC
+                   LIMIT ? OFFSET ?""",
+                (*params, limit, offset)
+            )
+            
+            feedback_list = []
+            for row in cursor.fetchall():
+                feedback_list.append({
+                    'id': row[0],
+                    'message_id': row[1],
+                    'session_id': row[2],
+                    'user_id': row[3],
+                    'is_positive': bool(row[4]),
+                    'comment': row[5],
+                    'created_at': row[6],
+                    'question': row[7],
+                    'answer': row[8],
+                    'user_email': row[9]
+                })
+            
+            conn.close()
+            return feedback_list
+        
+        except Exception as e:
+            logger.error(f"Fehler bei der Feedback-Suche: {e}")
+            return []
+    
+    def iter_feedback(self, is_positive: Optional[bool] = None, date_from: Optional[int] = None,
+                      date_to: Optional[int] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Liefert Feedback-Einträge zeilenweise direkt vom Cursor (für Exporte).
+
+        Es sind nie mehr als batch_size Zeilen gleichzeitig im Speicher. Die Verbindung
+        darf den Thread wechseln, weil Streaming-Antworten jeden Schritt in einem
+        beliebigen Threadpool-Thread ausführen; sie wird beim Beenden des Generators geschlossen.
+        """
+        conditions = []
+        params: List[Any] = []
+        if is_positive is not None:
+            conditions.append("f.is_positive = ?")
+            params.append(1 if is_positive else 0)
+        if date_from:
+            conditions.append("f.created_at >= ?")
+            params.append(int(date_from))
+        if date_to:
+            conditions.append("f.created_at <= ?")
+            params.append(int(date_to))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = sqlite3.connect(Config.DB_PATH, check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f"""SELECT f.id, f.message_id, f.session_id, f.user_id, f.is_positive, f.comment,
+                          f.created_at, f.question, f.answer, f.sources, u.email
+                   FROM message_feedback f
+                   LEFT JOIN users u ON f.user_id = u.id
+                   {where}
+                   ORDER BY f.created_at DESC""",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield {
+                        'id': row[0],
+                        'message_id': row[1],
+                        'session_id': row[2],
+                        'user_id': row[3],
+                        'is_positive': bool(row[4]),
+                        'comment': row[5],
+                        'created_at': row[6],
+                        'question': row[7],
+                        'answer': row[8],
+                        'sources': row[9],
+                        'user_email': row[10]
+                    }
+        finally:
+            conn.close()
+
     def get_all_feedback_messages(self, limit: int = 1000) -> List[Dict[str, Any]]:
         """Gibt alle Feedback-Nachrichten zurück (für Admins)"""
         try:
@@ -10,6 +10,7 @@ import httpx
 
 from ..core.config import Config
 from ..core.logging import LogManager
+from ..core.metrics import metrics
 
 logger = LogManager.setup_logging(__name__)
 
@@ -86,6 +87,8 @@ class OllamaClient:
                     
                     try:
                         logger.info(f"Sende Anfrage an {Config.OLLAMA_URL}/api/generate (Versuch {retry+1}/{connection_retries})")
+                        attempt_start = time.perf_counter()
+                        first_token_at = None
                         async with client_session.post(
                             f"{Config.OLLAMA_URL}/api/generate",
                             json=payload,
@@ -94,10 +97,12 @@ class OllamaClient:
                         ) as resp:
                             
                             logger.info(f"Ollama-Server-Antwort: Status {resp.status}")
+                            metrics.observe_stage("llm_connect", time.perf_counter() - attempt_start)
                             
                             if resp.status != 200:
                                 error_text = await resp.text()
                                 logger.error(f"Fehler bei Ollama-Anfrage: {resp.status} {error_text}")
+                                metrics.llm_streams.inc(1, Config.MODEL_NAME, "http_error")
                                 yield f"[ERROR] Fehler bei der Verbindung zum Sprachmodell: {resp.status}"
                                 # Stream für diesen Versuch beenden
                                 if stream_id in self._active_streams:
@@ -138,6 +143,9 @@ class OllamaClient:
                                             if 'response' in data:
                                                 token = data['response']
                                                 token_count += 1
+                                                if first_token_at is None:
+                                                    first_token_at = time.perf_counter()
+                                                    metrics.observe_stage("llm_first_token", first_token_at - attempt_start)
                                                 
                                                 # Korrigiere Abkürzungen für bessere Lesbarkeit
                                                 token = self._fix_common_abbreviations(token)
@@ -151,6 +159,7 @@ class OllamaClient:
                                                 tokens_per_second = token_count / duration if duration > 0 else 0
                                                 logger.info(f"Stream abgeschlossen in {duration:.2f}s mit {token_count} Tokens "
                                                         f"({tokens_per_second:.1f} Tokens/s)")
+                                                self._record_stream_metrics(data, token_count, first_token_at)
                                                 
                                                 stream_done = True
                                                 break
@@ -174,6 +183,7 @@ class OllamaClient:
                                 
                             except asyncio.TimeoutError:
                                 logger.error(f"Timeout bei der Stream-Verarbeitung (Versuch {retry+1})")
+                                metrics.llm_streams.inc(1, Config.MODEL_NAME, "timeout")
                                 stream_timeout = True
                                 yield "[TIMEOUT]"
                                 
@@ -218,6 +228,7 @@ class OllamaClient:
                     
                     except aiohttp.ClientError as e:
                         logger.error(f"Verbindungsfehler zu Ollama (Versuch {retry+1}): {e}")
+                        metrics.llm_streams.inc(1, Config.MODEL_NAME, "conn_error")
                         # Stream-Verbindung schließen
                         if stream_id in self._active_streams:
                             await self._active_streams[stream_id].close()
@@ -253,6 +264,19 @@ class OllamaClient:
                     pass
                 del self._active_streams[stream_id]
     
+    def _record_stream_metrics(self, done_data: Dict[str, Any], token_count: int, first_token_at: Optional[float]):
+        """Generierungsdauer und Tokenrate eines abgeschlossenen Streams erfassen"""
+        metrics.llm_streams.inc(1, Config.MODEL_NAME, "ok")
+        # Ollama liefert im done-Objekt die exakte Anzahl und Dauer (ns) der Generierung
+        eval_count = done_data.get('eval_count') or token_count
+        eval_duration = (done_data.get('eval_duration') or 0) / 1e9
+        if not eval_duration and first_token_at is not None:
+            eval_duration = time.perf_counter() - first_token_at
+        metrics.llm_tokens.inc(eval_count, Config.MODEL_NAME)
+        if eval_duration > 0:
+            metrics.observe_stage("llm_generation", eval_duration)
+            metrics.llm_tokens_per_second.observe(eval_count / eval_duration, Config.MODEL_NAME)
+
     def _fix_common_abbreviations(self, token: str) -> str:
         """Korrigiert häufige abgekürzte Wortfragmente im Streaming"""
         corrections = {
@@ -1,9 +1,12 @@
 import asyncio
 import json
+import time
 from sse_starlette.sse import EventSourceResponse
 from typing import Dict, Any, List, Optional, Tuple, AsyncGenerator
 from ..core.config import Config
 from ..core.logging import LogManager
+from ..core.telemetry_store import get_telemetry_store
+from ..core.metrics import metrics
 from ..retrieval.document_store import DocumentStore
 from ..retrieval.embedding import EmbeddingManager
 from ..llm.model import OllamaClient
@@ -94,11 +97,16 @@ class RAGEngine:
         
         logger.info(f"Stream-ID: {stream_id}")
 
+        started = time.monotonic()
+        first_token_at = None
+        status = "error"
         try:
             # Chunks suchen
-            relevant_chunks = self.embedding_manager.search(question, top_k=Config.TOP_K)
+            with metrics.stage("embedding_search"):
+                relevant_chunks = self.embedding_manager.search(question, top_k=Config.TOP_K)
             if not relevant_chunks:
                 logger.warning(f"Keine relevanten Chunks für Streaming-Frage gefunden: {question[:50]}...")
+                status = "no_results"
                 yield json.dumps({"error": "Keine relevanten Informationen gefunden"})
                 return
 
@@ -117,7 +125,8 @@ class RAGEngine:
                 unique_chunks = unique_chunks[:5]
 
             # Prompt bauen mit Spracheinstellung
-            prompt = self._format_prompt(question, unique_chunks, use_simple_language)
+            with metrics.stage("prompt_build"):
+                prompt = self._format_prompt(question, unique_chunks, use_simple_language)
             logger.info(f"Starte Streaming für Frage: {question[:50]}... (Einfache Sprache: {use_simple_language})")
 
             # Variable zur Nachverfolgung, ob Daten gesendet wurden
@@ -132,6 +141,8 @@ class RAGEngine:
             async for chunk in self.ollama_client.stream_generate(prompt, stream_id=stream_id):
                 # Auch leere Tokens werden berücksichtigt
                 found_data = True
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
                 # Füge zum Buffer hinzu 
                 complete_answer += chunk
                 
@@ -144,14 +155,17 @@ class RAGEngine:
             # Wenn keine Antwort empfangen wurde
             if not found_data:
                 logger.warning("Keine Antwort vom Modell empfangen")
+                status = "empty"
                 yield json.dumps({"error": "Das Modell hat keine Ausgabe erzeugt."})
             else:
+                status = "ok"
                 # Speichern der kompletten Antwort in der Chathistorie
                 if session_id and complete_answer.strip():
                     logger.info(f"Speichere vollständige Antwort ({len(complete_answer)} Zeichen) in Session {session_id}")
                     from ..session.chat_history import ChatHistoryManager
                     chat_history = ChatHistoryManager()
-                    chat_history.add_message(session_id, complete_answer, is_user=False)
+                    with metrics.stage("persist_answer"):
+                        chat_history.add_message(session_id, complete_answer, is_user=False)
 
             # Für Streaming-Abschluss
             yield json.dumps({"done": True})
@@ -159,6 +173,8 @@ class RAGEngine:
         except Exception as e:
             logger.error(f"Fehler beim Streaming der Antwort: {e}", exc_info=True)
             yield json.dumps({"error": f"Fehler beim Streaming: {str(e)}"})
+        finally:
+            self._record_stream_latency(started, first_token_at, status)
     
     async def stream_answer(self, question: str, session_id: Optional[int] = None, 
                            use_simple_language: bool = False, stream_id: Optional[str] = None) -> EventSourceResponse:
@@ -187,11 +203,16 @@ class RAGEngine:
         logger.info(f"Stream-ID: {stream_id}")
 
         async def event_generator(question: str, use_simple_language: bool) -> AsyncGenerator[str, None]:
+            started = time.monotonic()
+            first_token_at = None
+            status = "error"
             try:
                 # Chunks suchen
-                relevant_chunks = self.embedding_manager.search(question, top_k=Config.TOP_K)
+                with metrics.stage("embedding_search"):
+                    relevant_chunks = self.embedding_manager.search(question, top_k=Config.TOP_K)
                 if not relevant_chunks:
                     logger.warning(f"Keine relevanten Chunks für Streaming-Frage gefunden: {question[:50]}...")
+                    status = "no_results"
                     yield f"data: {json.dumps({'error': 'Keine relevanten Informationen gefunden'})}\n\n"
                     yield "event: done\ndata: \n\n"
                     return
@@ -211,7 +232,8 @@ class RAGEngine:
                     unique_chunks = unique_chunks[:5]
 
                 # Prompt bauen mit Spracheinstellung
-                prompt = self._format_prompt(question, unique_chunks, use_simple_language)
+                with metrics.stage("prompt_build"):
+                    prompt = self._format_prompt(question, unique_chunks, use_simple_language)
                 logger.info(f"Starte Streaming für Frage: {question[:50]}... (Einfache Sprache: {use_simple_language})")
 
                 # Variable zur Nachverfolgung, ob Daten gesendet wurden
@@ -226,6 +248,8 @@ class RAGEngine:
                 async for chunk in self.ollama_client.stream_generate(prompt, stream_id=stream_id):
                     # Auch leere Tokens werden berücksichtigt
                     found_data = True
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
                     # Füge zum Buffer hinzu 
                     complete_answer += chunk
                     # SSE-Event formatieren - WICHTIG: Korrektes Format mit \n\n am Ende
@@ -240,14 +264,17 @@ class RAGEngine:
                 # Wenn keine Antwort empfangen wurde
                 if not found_data:
                     logger.warning("Keine Antwort vom Modell empfangen")
+                    status = "empty"
                     yield f"data: {json.dumps({'error': 'Das Modell hat keine Ausgabe erzeugt.'})}\n\n"
                 else:
+                    status = "ok"
                     # Speichern der kompletten Antwort in der Chathistorie
                     if session_id and complete_answer.strip():
                         logger.info(f"Speichere vollständige Antwort ({len(complete_answer)} Zeichen) in Session {session_id}")
                         from ..session.chat_history import ChatHistoryManager
                         chat_history = ChatHistoryManager()
-                        chat_history.add_message(session_id, complete_answer, is_user=False)
+                        with metrics.stage("persist_answer"):
+                            chat_history.add_message(session_id, complete_answer, is_user=False)
 
                 # KRITISCH: Korrektes done-Event senden (separates Event)
                 # Das Format muss exakt sein: "event: done\ndata: \n\n"
@@ -259,6 +286,8 @@ class RAGEngine:
                 error_msg = json.dumps({"error": f"Fehler beim Streaming: {str(e)}"})
                 yield f"data: {error_msg}\n\n"
                 yield "event: done\ndata: \n\n"
+            finally:
+                self._record_stream_latency(started, first_token_at, status)
 
         # Ping-Interval setzen, um Verbindungsabbrüche zu vermeiden
         return EventSourceResponse(
@@ -267,6 +296,21 @@ class RAGEngine:
             media_type="text/event-stream"  # Expliziter MIME-Typ
         )
 
+    def _record_stream_latency(self, started: float, first_token_at: Optional[float], status: str):
+        """Erfasst Gesamtdauer und Zeit bis zum ersten Token eines Streams für die Telemetrie"""
+        metrics.observe_stage("stream_total", time.monotonic() - started)
+        if first_token_at is not None:
+            metrics.observe_stage("ttft", first_token_at - started)
+        try:
+            store = get_telemetry_store()
+            store.record("stream_latency", (time.monotonic() - started) * 1000,
+                         model=Config.MODEL_NAME, status=status)
+            if first_token_at is not None:
+                store.record("stream_ttft", (first_token_at - started) * 1000,
+                             model=Config.MODEL_NAME, status=status)
+        except Exception as e:
+            logger.warning(f"Stream-Latenz konnte nicht erfasst werden: {e}")
+
     def _format_error_event(self, error_message: str) -> AsyncGenerator[str, None]:
         """Formatiert eine Fehlermeldung als SSE-Event"""
         async def error_generator():
@@ -303,7 +347,8 @@ class RAGEngine:
                 }
         
         # Suche relevante Chunks
-        chunks = self.embedding_manager.search(question)
+        with metrics.stage("embedding_search"):
+            chunks = self.embedding_manager.search(question)
         
         if not chunks:
             return {
@@ -329,10 +374,12 @@ class RAGEngine:
             unique_chunks = unique_chunks[:5]
         
         # Formatiere Prompt mit Chunks und Spracheinstellung
-        prompt = self._format_prompt(question, unique_chunks, use_simple_language)
+        with metrics.stage("prompt_build"):
+            prompt = self._format_prompt(question, unique_chunks, use_simple_language)
         
         # Generiere Antwort
-        result = await self.ollama_client.generate(prompt, user_id)
+        with metrics.stage("llm_generate"):
+            result = await self.ollama_client.generate(prompt, user_id)
         
         if 'error' in result:
             return {
@@ -532,6 +579,10 @@ Bitte stellen Sie eine spezifischere Frage oder versuchen Sie es später erneut.
         """Gibt Statistiken zu den Dokumenten zurück"""
         return self.document_store.get_document_stats()
     
+    def get_document_counts(self) -> Dict[str, Any]:
+        """Dokument- und Chunk-Anzahl sowie Initialisierungsstatus (günstig, für den Stats-Sampler)"""
+        return {**self.document_store.get_document_counts(), 'rag_initialized': self.initialized}
+    
     async def install_model(self) -> Dict[str, Any]:
         """Installiert das LLM-Modell"""
         return await self.ollama_client.install_model()
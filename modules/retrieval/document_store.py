@@ -291,6 +291,11 @@ class DocumentStore:
         with self.lock:
             return self.chunks
     
+    def get_document_counts(self) -> Dict[str, int]:
+        """Anzahl Dokumente und Chunks ohne Einzelauswertung (für periodische Statistiken)"""
+        with self.lock:
+            return {'document_count': len(self.documents), 'chunk_count': len(self.chunks)}
+    
     def get_document_stats(self) -> Dict[str, Any]:
         """Gibt Statistiken zu den Dokumenten zurück"""
         with self.lock:
@@ -0,0 +1,385 @@
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from ..core.config import Config
+from ..core.logging import LogManager
+from ..core.response_cache import get_response_cache, sessions_tag
+
+logger = LogManager.setup_logging(__name__)
+
+
+class SessionArchiver:
+    """
+    Lagert lange unberührte Chat-Sessions in komprimierte Segmentdateien pro Benutzer aus.
+
+    Jede Session wird als eigenes gzip-Member an das aktuelle Segment des Benutzers
+    angehängt; die Zeile in chat_sessions bleibt als Stub (Titel, Zeitstempel, Position
+    im Segment) für die Sitzungsliste erhalten. Beim Zugriff wird die Session mit ihren
+    ursprünglichen Nachrichten-IDs wiederhergestellt.
+
+    Archivieren, Wiederherstellen und Kompaktieren laufen jeweils in einer Schreibtransaktion
+    (BEGIN IMMEDIATE), die auch die Dateioperationen umschließt. Damit sind sie über alle
+    Worker-Prozesse hinweg serialisiert; archived_at ist der maßgebliche Zustand einer Session.
+
+    Archivierte Nachrichten sind nicht im Volltextindex enthalten und tauchen erst nach dem
+    Wiederherstellen wieder in der Suche auf; die Archivierung ist deshalb standardmäßig aus.
+    """
+
+    def __init__(self, archive_dir: Optional[Path] = None):
+        self.archive_dir = Path(archive_dir or Config.SESSION_ARCHIVE_DIR)
+        self.init_db()
+
+    @staticmethod
+    def _begin() -> sqlite3.Connection:
+        """Verbindung mit sofort gesetzter Schreibsperre (wartet auf andere Prozesse)"""
+        conn = sqlite3.connect(Config.DB_PATH, timeout=30, isolation_level=None)
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def init_db(self):
+        """Ergänzt chat_sessions um die Stub-Spalten für archivierte Sessions"""
+        conn = sqlite3.connect(Config.DB_PATH)
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("PRAGMA table_info(chat_sessions)")
+            column_names = [col[1] for col in cursor.fetchall()]
+
+            for column, definition in (
+                ('archived_at', 'INTEGER'),
+                ('archive_segment', 'TEXT'),
+                ('archive_offset', 'INTEGER'),
+                ('archive_length', 'INTEGER'),
+                ('archive_message_count', 'INTEGER'),
+            ):
+                if column not in column_names:
+                    cursor.execute(f"ALTER TABLE chat_sessions ADD COLUMN {column} {definition}")
+                    logger.info(f"Spalte '{column}' zur chat_sessions-Tabelle hinzugefügt")
+
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chat_sessions_archive ON chat_sessions(archived_at, updated_at)"
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Fehler bei der Initialisierung des Session-Archivs: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Segmentdateien
+    # ------------------------------------------------------------------
+
+    def _user_dir(self, user_id: int) -> Path:
+        path = self.archive_dir / f"u{int(user_id)}"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _current_segment(self, user_id: int) -> Path:
+        """Aktuelles Segment des Benutzers; rotiert bei Erreichen der Maximalgröße"""
+        user_dir = self._user_dir(user_id)
+        segments = sorted(user_dir.glob("*.seg.gz"))
+        if segments and segments[-1].stat().st_size < Config.SESSION_ARCHIVE_SEGMENT_BYTES:
+            return segments[-1]
+        next_number = self._segment_number(segments[-1]) + 1 if segments else 1
+        return user_dir / f"{next_number:06d}.seg.gz"
+
+    @staticmethod
+    def _segment_number(segment_path: Path) -> int:
+        # Kompaktierte Segmente heißen <nummer>-c<n>.seg.gz
+        return int(segment_path.name.split('.')[0].split('-')[0])
+
+    def _append_record(self, user_id: int, record: Dict[str, Any]) -> tuple:
+        """Hängt eine Session als gzip-Member an und gibt (Segment, Offset, Länge) zurück"""
+        payload = gzip.compress(json.dumps(record, ensure_ascii=False).encode('utf-8'), compresslevel=6)
+        segment = self._current_segment(user_id)
+        with open(segment, 'ab') as f:
+            offset = f.tell()
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return str(segment.relative_to(self.archive_dir)), offset, len(payload)
+
+    def _read_record(self, segment: str, offset: int, length: int) -> Dict[str, Any]:
+        with open(self.archive_dir / segment, 'rb') as f:
+            f.seek(offset)
+            payload = f.read(length)
+        return json.loads(gzip.decompress(payload).decode('utf-8'))
+
+    # ------------------------------------------------------------------
+    # Archivieren und Wiederherstellen
+    # ------------------------------------------------------------------
+
+    def archive_session(self, session_id: int) -> bool:
+        """Verschiebt die Nachrichten einer Session ins Archiv und behält nur den Stub"""
+        conn = self._begin()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT user_id, title, created_at, updated_at FROM chat_sessions WHERE id = ? AND archived_at IS NULL",
+                (session_id,)
+            )
+            session = cursor.fetchone()
+            if not session:
+                conn.rollback()
+                return False
+
+            cursor.execute(
+                "SELECT id, is_user, message, created_at FROM chat_messages WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            )
+            messages = [list(row) for row in cursor.fetchall()]
+
+            record = {
+                'session_id': session_id,
+                'user_id': session[0],
+                'title': session[1],
+                'created_at': session[2],
+                'updated_at': session[3],
+                'messages': messages
+            }
+            # Erst die Segmentdatei schreiben, dann die Datenbank ändern: bei einem Absturz
+            # dazwischen bleibt nur ein ungenutzter Eintrag im Segment zurück
+            segment, offset, length = self._append_record(session[0], record)
+
+            cursor.execute(
+                """UPDATE chat_sessions SET archived_at = ?, archive_segment = ?, archive_offset = ?,
+                   archive_length = ?, archive_message_count = ? WHERE id = ?""",
+                (int(time.time()), segment, offset, length, len(messages), session_id)
+            )
+            cursor.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            conn.commit()
+            get_response_cache().invalidate_tags(sessions_tag(session[0]))
+
+            logger.info(f"Session {session_id} archiviert ({len(messages)} Nachrichten, {length} Bytes)")
+            return True
+        except Exception as e:
+            logger.error(f"Fehler beim Archivieren der Session {session_id}: {e}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
+
+    def is_archived(self, session_id: int) -> bool:
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT archived_at FROM chat_sessions WHERE id = ?", (session_id,))
+            row = cursor.fetchone()
+            return bool(row and row[0])
+        finally:
+            conn.close()
+
+    def rehydrate_session(self, session_id: int) -> bool:
+        """Stellt eine archivierte Session mit den ursprünglichen Nachrichten-IDs wieder her"""
+        conn = self._begin()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "SELECT archive_segment, archive_offset, archive_length, user_id FROM chat_sessions WHERE id = ? AND archived_at IS NOT NULL",
+                (session_id,)
+            )
+            stub = cursor.fetchone()
+            if not stub:
+                # Bereits von einem anderen Prozess wiederhergestellt
+                conn.rollback()
+                return False
+
+            record = self._read_record(*stub[:3])
+            cursor.executemany(
+                "INSERT OR IGNORE INTO chat_messages (id, session_id, is_user, message, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(m[0], session_id, m[1], m[2], m[3]) for m in record['messages']]
+            )
+            cursor.execute(
+                """UPDATE chat_sessions SET archived_at = NULL, archive_segment = NULL, archive_offset = NULL,
+                   archive_length = NULL, archive_message_count = NULL WHERE id = ?""",
+                (session_id,)
+            )
+            conn.commit()
+            get_response_cache().invalidate_tags(sessions_tag(stub[3]))
+
+            logger.info(f"Session {session_id} aus dem Archiv wiederhergestellt ({len(record['messages'])} Nachrichten)")
+            return True
+        except Exception as e:
+            logger.error(f"Fehler beim Wiederherstellen der Session {session_id}: {e}")
+            conn.rollback()
+            return False
+        finally:
+            conn.close()
+
+    def archive_idle_sessions(self, max_age_days: Optional[int] = None, batch_size: Optional[int] = None) -> int:
+        """Archiviert Sessions, die seit max_age_days nicht mehr aktualisiert wurden"""
+        max_age_days = max_age_days if max_age_days is not None else Config.SESSION_ARCHIVE_AFTER_DAYS
+        batch_size = batch_size or Config.SESSION_ARCHIVE_BATCH_SIZE
+        cutoff = int(time.time()) - max_age_days * 86400
+
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id FROM chat_sessions WHERE archived_at IS NULL AND updated_at < ? ORDER BY updated_at LIMIT ?",
+                (cutoff, batch_size)
+            )
+            session_ids = [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+        archived = sum(1 for session_id in session_ids if self.archive_session(session_id))
+        if archived:
+            logger.info(f"{archived} Sessions älter als {max_age_days} Tage archiviert")
+        return archived
+
+    # ------------------------------------------------------------------
+    # Kompaktierung
+    # ------------------------------------------------------------------
+
+    def compact_segments(self) -> int:
+        """Schreibt Segmente neu, deren Inhalt überwiegend aus wiederhergestellten/gelöschten Sessions besteht"""
+        rewritten = 0
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT archive_segment, SUM(archive_length) FROM chat_sessions WHERE archived_at IS NOT NULL GROUP BY archive_segment"
+            )
+            live_bytes = dict(cursor.fetchall())
+        finally:
+            conn.close()
+
+        # Vorauswahl ohne Sperre; die eigentliche Entscheidung fällt in _rewrite_segment
+        for segment_path in self.archive_dir.glob("u*/*.seg.gz"):
+            segment = str(segment_path.relative_to(self.archive_dir))
+            size = segment_path.stat().st_size
+            live = live_bytes.get(segment, 0)
+            if self._is_current(segment_path) and (live or size < Config.SESSION_ARCHIVE_SEGMENT_BYTES):
+                # Aktuelles Segment nicht anfassen, solange es noch beschrieben werden kann
+                continue
+            if live / size < 0.5 and self._rewrite_segment(segment_path, segment):
+                rewritten += 1
+        return rewritten
+
+    def _is_current(self, segment_path: Path) -> bool:
+        segments = sorted(segment_path.parent.glob("*.seg.gz"))
+        return bool(segments) and segments[-1] == segment_path
+
+    def _compacted_path(self, segment_path: Path) -> Path:
+        """Freier Dateiname für die kompaktierte Fassung, sortiert vor dem Nachfolgesegment"""
+        number = self._segment_number(segment_path)
+        generation = 1
+        while True:
+            candidate = segment_path.with_name(f"{number:06d}-c{generation}.seg.gz")
+            if not candidate.exists():
+                return candidate
+            generation += 1
+
+    def _rewrite_segment(self, segment_path: Path, segment: str) -> bool:
+        """
+        Kopiert die noch referenzierten Sessions in ein neues Segment und verwirft das alte.
+        Die Stubs werden in derselben Transaktion auf die neue Datei umgestellt; das alte
+        Segment wird erst nach dem Commit gelöscht, ein Absturz hinterlässt nur eine
+        unreferenzierte Datei, die der nächste Lauf entfernt.
+        """
+        conn = self._begin()
+        cursor = conn.cursor()
+        new_path = None
+        try:
+            cursor.execute(
+                "SELECT id, archive_offset, archive_length FROM chat_sessions WHERE archive_segment = ? AND archived_at IS NOT NULL",
+                (segment,)
+            )
+            stubs = cursor.fetchall()
+            if stubs:
+                new_path = self._compacted_path(segment_path)
+                new_segment = str(new_path.relative_to(self.archive_dir))
+                new_positions = []
+                with open(segment_path, 'rb') as src, open(new_path, 'wb') as dst:
+                    for session_id, offset, length in stubs:
+                        src.seek(offset)
+                        new_positions.append((new_segment, dst.tell(), length, session_id))
+                        dst.write(src.read(length))
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                cursor.executemany(
+                    "UPDATE chat_sessions SET archive_segment = ?, archive_offset = ?, archive_length = ? WHERE id = ?",
+                    new_positions
+                )
+            conn.commit()
+            new_path = None
+        except Exception as e:
+            logger.error(f"Fehler beim Kompaktieren von {segment}: {e}")
+            conn.rollback()
+            if new_path is not None and new_path.exists():
+                new_path.unlink()
+            return False
+        finally:
+            conn.close()
+
+        segment_path.unlink(missing_ok=True)
+        logger.info(f"Archivsegment {segment} kompaktiert ({len(stubs)} Sessions)")
+        return True
+
+    def compact_database(self) -> bool:
+        """VACUUM, sobald ein relevanter Anteil der Seiten frei ist, damit die heiße DB klein bleibt"""
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+            freelist_count = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+            if page_count and freelist_count / page_count >= Config.SESSION_ARCHIVE_VACUUM_RATIO:
+                logger.info(f"VACUUM der Datenbank ({freelist_count}/{page_count} freie Seiten)")
+                conn.execute("VACUUM")
+                return True
+            conn.execute("PRAGMA optimize")
+            return False
+        finally:
+            conn.close()
+
+    def run_maintenance(self) -> Dict[str, Any]:
+        """Ein Durchlauf: Sessions archivieren, Segmente und Datenbank kompaktieren"""
+        started = time.time()
+        archived = self.archive_idle_sessions()
+        segments = self.compact_segments()
+        vacuumed = self.compact_database()
+        result = {
+            'archived_sessions': archived,
+            'compacted_segments': segments,
+            'vacuumed': vacuumed,
+            'duration_ms': int((time.time() - started) * 1000)
+        }
+        logger.info(f"Archiv-Wartung abgeschlossen: {result}")
+        return result
+
+    async def run_periodic(self, interval: Optional[int] = None):
+        """Hintergrundschleife für die Archiv-Wartung (als asyncio-Task im Server)"""
+        interval = interval or Config.SESSION_ARCHIVE_INTERVAL
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.run_maintenance)
+            except Exception as e:
+                logger.error(f"Fehler bei der Archiv-Wartung: {e}")
+            await asyncio.sleep(interval)
+
+    def get_archive_stats(self) -> Dict[str, Any]:
+        """Kennzahlen für das Admin-Dashboard"""
+        conn = sqlite3.connect(Config.DB_PATH)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(*), COALESCE(SUM(archive_message_count), 0) FROM chat_sessions WHERE archived_at IS NOT NULL"
+            )
+            sessions, messages = cursor.fetchone()
+        finally:
+            conn.close()
+        size = sum(f.stat().st_size for f in self.archive_dir.glob("u*/*.seg.gz")) if self.archive_dir.exists() else 0
+        return {
+            'archived_sessions': sessions,
+            'archived_messages': messages,
+            'archive_size_mb': round(size / (1024 * 1024), 2)
+        }
@@ -1,3 +1,5 @@
+import html
+import re
 import sqlite3
 import time
 import json
@@ -5,7 +7,9 @@ from typing import Dict, Any, List, Optional
 
 from ..core.config import Config
 from ..core.logging import LogManager
+from ..core.response_cache import get_response_cache, sessions_tag
 from .title_generator import SessionTitleGenerator
+from .archive import SessionArchiver
 
 logger = LogManager.setup_logging()
 
@@ -13,9 +17,17 @@ class ChatHistoryManager:
     """Verwaltet Chat-Verlauf und Sitzungen für Benutzer"""
     
     def __init__(self):
+        self.search_enabled = False
         self.init_db()
+        self.archiver = SessionArchiver()
         self.title_generator = SessionTitleGenerator()
     
+    @staticmethod
+    def _invalidate_cache(user_id: Optional[int]):
+        """Verwirft gecachte Session-Antworten des Benutzers nach Schreibzugriffen"""
+        if user_id is not None:
+            get_response_cache().invalidate_tags(sessions_tag(user_id))
+    
     def init_db(self):
         """Initialisiert die Datenbank für Chat-Verläufe"""
         conn = sqlite3.connect(Config.DB_PATH)
@@ -45,11 +57,71 @@ class ChatHistoryManager:
         )
         ''')
         
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages(session_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_user ON chat_sessions(user_id, updated_at)")
+        
+        self._init_search_index(cursor)
+        
         conn.commit()
         conn.close()
         
         logger.info("Chat-Datenbank initialisiert")
     
+    def _init_search_index(self, cursor):
+        """
+        FTS5-Index über alle Nachrichten, gepflegt per Trigger auf chat_messages.
+        Die Spalte 'owner' enthält das Token 'u<user_id>', damit die Suche pro Benutzer
+        direkt im Index eingeschränkt wird statt über einen Join auf alle Treffer.
+        """
+        try:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chat_messages_fts'")
+            is_new = cursor.fetchone() is None
+            
+            # Inhaltsquelle für highlight()/snippet(): Nachrichten mit Besitzer-Token
+            cursor.execute('''
+            CREATE VIEW IF NOT EXISTS chat_messages_search AS
+            SELECT m.id AS id, m.message AS message, 'u' || s.user_id AS owner
+            FROM chat_messages m JOIN chat_sessions s ON s.id = m.session_id
+            ''')
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS chat_messages_fts USING fts5(
+                message, owner,
+                content='chat_messages_search', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            ''')
+            owner = "(SELECT 'u' || user_id FROM chat_sessions WHERE id = {row}.session_id)"
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN
+                INSERT INTO chat_messages_fts(rowid, message, owner)
+                VALUES (NEW.id, NEW.message, {owner.format(row='NEW')});
+            END
+            ''')
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN
+                INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message, owner)
+                VALUES ('delete', OLD.id, OLD.message, {owner.format(row='OLD')});
+            END
+            ''')
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS chat_messages_fts_au AFTER UPDATE OF message ON chat_messages BEGIN
+                INSERT INTO chat_messages_fts(chat_messages_fts, rowid, message, owner)
+                VALUES ('delete', OLD.id, OLD.message, {owner.format(row='OLD')});
+                INSERT INTO chat_messages_fts(rowid, message, owner)
+                VALUES (NEW.id, NEW.message, {owner.format(row='NEW')});
+            END
+            ''')
+            
+            if is_new:
+                # Relevanz nur über den Nachrichtentext, das Besitzer-Token zählt nicht
+                cursor.execute("INSERT INTO chat_messages_fts(chat_messages_fts, rank) VALUES ('rank', 'bm25(1.0, 0.0)')")
+                cursor.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')")
+                logger.info("Volltextindex für Chat-Nachrichten aufgebaut")
+            self.search_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 nicht verfügbar, Suche im Chatverlauf deaktiviert: {e}")
+            self.search_enabled = False
+    
     def create_session(self, user_id: int, title: str = "Neue Unterhaltung") -> Optional[int]:
         """Erstellt eine neue Chat-Session"""
         try:
@@ -66,6 +138,7 @@ class ChatHistoryManager:
             session_id = cursor.lastrowid
             conn.commit()
             conn.close()
+            self._invalidate_cache(user_id)
             
             logger.info(f"Neue Session erstellt: ID {session_id}, Titel '{title}'")
             return session_id
@@ -82,6 +155,17 @@ class ChatHistoryManager:
             conn = sqlite3.connect(Config.DB_PATH)
             cursor = conn.cursor()
             
+            # Besitzer, Titel und Archivstatus in einer Abfrage
+            cursor.execute(
+                "SELECT user_id, title, archived_at FROM chat_sessions WHERE id = ?",
+                (session_id,)
+            )
+            session = cursor.fetchone()
+            
+            # Archivierte Sessions vor dem Weiterschreiben zurückholen
+            if session and session[2]:
+                self.archiver.rehydrate_session(session_id)
+            
             # Nachricht hinzufügen
             cursor.execute(
                 "INSERT INTO chat_messages (session_id, is_user, message, created_at) VALUES (?, ?, ?, ?)",
@@ -112,11 +196,7 @@ class ChatHistoryManager:
                 new_title = self.title_generator.generate_title(message)
                 
                 # Prüfe, ob der aktuelle Titel der Standardtitel ist
-                cursor.execute(
-                    "SELECT title FROM chat_sessions WHERE id = ?",
-                    (session_id,)
-                )
-                current_title = cursor.fetchone()[0]
+                current_title = session[1]
                 
                 logger.info(f"Session {session_id} - Aktueller Titel: '{current_title}', Neuer Titel: '{new_title}'")
                 
@@ -130,6 +210,7 @@ class ChatHistoryManager:
             
             conn.commit()
             conn.close()
+            self._invalidate_cache(session[0] if session else None)
             
             return message_id
     
@@ -148,8 +229,18 @@ class ChatHistoryManager:
                 (session_id,)
             )
             
+            rows = cursor.fetchall()
+            
+            # Leere Session kann archiviert sein: transparent wiederherstellen
+            if not rows and self.archiver.is_archived(session_id) and self.archiver.rehydrate_session(session_id):
+                cursor.execute(
+                    "SELECT id, is_user, message, created_at FROM chat_messages WHERE session_id = ? ORDER BY created_at",
+                    (session_id,)
+                )
+                rows = cursor.fetchall()
+            
             messages = []
-            for row in cursor.fetchall():
+            for row in rows:
                 # Wichtig: is_user korrekt als Boolean umwandeln
                 messages.append({
                     'id': row[0],
@@ -172,7 +263,7 @@ class ChatHistoryManager:
             cursor = conn.cursor()
             
             cursor.execute(
-                "SELECT id, title, created_at, updated_at FROM chat_sessions WHERE user_id = ? ORDER BY updated_at DESC",
+                "SELECT id, title, created_at, updated_at, archived_at FROM chat_sessions WHERE user_id = ? ORDER BY updated_at DESC",
                 (user_id,)
             )
             
@@ -182,7 +273,8 @@ class ChatHistoryManager:
                     'id': row[0],
                     'title': row[1],
                     'created_at': row[2],
-                    'updated_at': row[3]
+                    'updated_at': row[3],
+                    'archived': row[4] is not None
                 })
             
             conn.close()
@@ -223,6 +315,7 @@ class ChatHistoryManager:
             
             conn.commit()
             conn.close()
+            self._invalidate_cache(user_id)
             
             logger.info(f"Session {session_id} erfolgreich gelöscht")
             return True
@@ -255,6 +348,7 @@ class ChatHistoryManager:
             
             conn.commit()
             conn.close()
+            self._invalidate_cache(user_id)
             
             logger.info(f"Session {session_id} umbenannt zu '{new_title}'")
             return True
@@ -295,12 +389,100 @@ class ChatHistoryManager:
                 (new_title, session_id)
             )
             
+            cursor.execute("SELECT user_id FROM chat_sessions WHERE id = ?", (session_id,))
+            owner = cursor.fetchone()
+            
             conn.commit()
             conn.close()
+            self._invalidate_cache(owner[0] if owner else None)
             
             logger.info(f"Session-Titel für {session_id} nachträglich aktualisiert: '{new_title}'")
             return True
             
         except Exception as e:
             logger.error(f"Fehler beim nachträglichen Aktualisieren des Session-Titels: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def _fts_query(search_term: str) -> str:
+        """Wandelt eine Benutzereingabe in eine sichere FTS5-Abfrage um (alle Wörter als Präfix)"""
+        tokens = [t for t in search_term.split() if t]
+        return " AND ".join('"' + t.replace('"', '""') + '"*' for t in tokens)
+    
+    @staticmethod
+    def _make_excerpt(text: str, terms: List[str], highlight: tuple, width: int = 160) -> str:
+        """Schneidet einen HTML-escapten Ausschnitt um den ersten Treffer aus und markiert die Suchbegriffe"""
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)) + r")\w*",
+            re.IGNORECASE
+        )
+        first = pattern.search(text)
+        start = max(0, (first.start() if first else 0) - width // 3)
+        end = min(len(text), start + width)
+        
+        # Nachrichtentext escapen, nur die Markierungen bleiben als HTML erhalten
+        parts, position = [], start
+        for match in pattern.finditer(text, start, end):
+            parts.append(html.escape(text[position:match.start()]))
+            parts.append(f"{highlight[0]}{html.escape(match.group(0))}{highlight[1]}")
+            position = match.end()
+        parts.append(html.escape(text[position:end]))
+        
+        return ("…" if start > 0 else "") + "".join(parts) + ("…" if end < len(text) else "")
+    
+    def search_messages(self, user_id: int, search_term: str, limit: int = 20, offset: int = 0,
+                        highlight: tuple = ('<mark>', '</mark>')) -> Dict[str, Any]:
+        """
+        Durchsucht den Chatverlauf eines Benutzers, sortiert nach Relevanz (bm25).
+        Gibt Treffer mit hervorgehobenem Ausschnitt und Session-Titel zurück.
+        """
+        query = self._fts_query(search_term or "")
+        if not query or not self.search_enabled:
+            return {'results': [], 'has_more': False, 'offset': offset, 'limit': limit}
+        
+        try:
+            conn = sqlite3.connect(Config.DB_PATH)
+            cursor = conn.cursor()
+            
+            # Besitzer-Filter im Index: owner:u<id> AND (message: ...)
+            match = f'owner:"u{int(user_id)}" AND message:({query})'
+            
+            # 1. Nur Rowids nach Relevanz sortieren (FTS5 optimiert ORDER BY rank LIMIT)
+            cursor.execute(
+                "SELECT rowid FROM chat_messages_fts WHERE chat_messages_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                (match, limit + 1, offset)
+            )
+            ranked_ids = [row[0] for row in cursor.fetchall()]
+            page_ids = ranked_ids[:limit]
+            
+            # 2. Metadaten nur für die Treffer der aktuellen Seite; snippet() würde die
+            #    MATCH-Abfrage pro Zeile erneut auswerten, daher Ausschnitt in Python
+            rows = {}
+            if page_ids:
+                placeholders = ",".join("?" * len(page_ids))
+                cursor.execute(
+                    f"""SELECT m.id, m.session_id, s.title, m.is_user, m.created_at, m.message
+                       FROM chat_messages m
+                       JOIN chat_sessions s ON s.id = m.session_id
+                       WHERE m.id IN ({placeholders}) AND s.user_id = ?""",
+                    (*page_ids, user_id)
+                )
+                rows = {row[0]: row for row in cursor.fetchall()}
+            conn.close()
+            
+            terms = [t for t in search_term.split() if t]
+            results = [{
+                'message_id': row[0],
+                'session_id': row[1],
+                'session_title': row[2],
+                'is_user': bool(row[3]),
+                'timestamp': row[4],
+                'excerpt': self._make_excerpt(row[5], terms, highlight),
+                'rank': offset + position + 1
+            } for position, row in enumerate(rows.get(message_id) for message_id in page_ids) if row]
+            
+            return {'results': results, 'has_more': len(ranked_ids) > limit, 'offset': offset, 'limit': limit}
+        
+        except Exception as e:
+            logger.error(f"Fehler bei der Suche im Chatverlauf: {e}")
+            return {'results': [], 'has_more': False, 'offset': offset, 'limit': limit}
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Batch-Endpunkts: HTTP-Loopback gegen In-Process-Dispatch
+
+Startet eine kleine FastAPI-App mit dem Batch-Router und typischen JSON-Endpunkten
+(mit Token-Prüfung) in uvicorn und führt Batches mit 50 Sub-Requests einmal per
+httpx-Loopback und einmal direkt über den Router der App aus.
+
+Aufruf: python scripts/benchmark/bench_batch_dispatch.py [--batch-size 50] [--rounds 50]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import uvicorn
+from fastapi import Depends, FastAPI, HTTPException, Request
+
+from api.asgi_dispatch import BATCH_USER_STATE_KEY
+from api.batch_handler_fastapi import BatchProcessor, BatchRequest, router as batch_router
+
+SECRET = b"benchmark-secret"
+TOKEN = "user-1." + hmac.new(SECRET, b"user-1", hashlib.sha256).hexdigest()
+
+
+def verify_token(token: str):
+    """Nachbildung der Token-Prüfung (HMAC + Payload-Aufbau)"""
+    subject, _, signature = token.partition(".")
+    expected = hmac.new(SECRET, subject.encode(), hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(signature, expected):
+        return None
+    return {"user_id": 1, "email": "bench@example.com", "role": "user"}
+
+
+async def get_current_user(request: Request):
+    batch_user = getattr(request.state, BATCH_USER_STATE_KEY, None)
+    if batch_user:
+        return batch_user
+    auth_header = request.headers.get("Authorization", "")
+    user = verify_token(auth_header[7:]) if auth_header.startswith("Bearer ") else None
+    if not user:
+        raise HTTPException(status_code=401, detail="Nicht authentifiziert")
+    return user
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/sessions")
+    async def sessions(user=Depends(get_current_user)):
+        return {"sessions": [{"id": i, "title": f"Session {i}", "updated_at": 1700000000 + i} for i in range(20)]}
+
+    @app.get("/api/session/{session_id}")
+    async def session(session_id: int, user=Depends(get_current_user)):
+        return {"session_id": session_id, "messages": [{"id": i, "is_user": i % 2 == 0, "message": "x" * 200} for i in range(10)]}
+
+    @app.get("/api/motd")
+    async def motd():
+        return {"enabled": True, "content": "Wartung am Wochenende"}
+
+    app.include_router(batch_router)
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def build_batch(size: int):
+    endpoints = ["/api/sessions", "/api/motd"] + [f"/api/session/{i}" for i in range(1, 9)]
+    return [
+        BatchRequest(id=f"r{i}", endpoint=endpoints[i % len(endpoints)], method="GET",
+                     headers={"Authorization": f"Bearer {TOKEN}"})
+        for i in range(size)
+    ]
+
+
+async def measure(processor: BatchProcessor, requests, base_url: str, rounds: int, auth=None):
+    timings = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        responses = await processor.process_batch(requests, base_url, auth)
+        timings.append((time.perf_counter() - t0) * 1000)
+        assert all(r.success for r in responses), [r.error for r in responses if not r.success][:3]
+    await processor.close()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app()
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    requests = build_batch(args.batch_size)
+
+    loopback = BatchProcessor(max_concurrent_requests=10)
+    loop_p50, loop_p95 = asyncio.run(measure(loopback, requests, base_url, args.rounds))
+
+    in_process = BatchProcessor(max_concurrent_requests=10)
+    in_process.configure(app)
+    auth = {"authorization": f"Bearer {TOKEN}", "user": verify_token(TOKEN)}
+    inproc_p50, inproc_p95 = asyncio.run(measure(in_process, requests, base_url, args.rounds, auth))
+
+    server.should_exit = True
+    thread.join()
+
+    print(f"Batch mit {args.batch_size} Sub-Requests, {args.rounds} Durchläufe")
+    print(f"HTTP-Loopback:     p50 {loop_p50:7.2f} ms, p95 {loop_p95:7.2f} ms")
+    print(f"In-Process:        p50 {inproc_p50:7.2f} ms, p95 {inproc_p95:7.2f} ms")
+    print(f"Beschleunigung p50: {loop_p50 / inproc_p50:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Konvertierungs-Caches: nächtlicher Lauf über einen weitgehend unveränderten Bestand
+
+Erzeugt synthetische Markdown-Handbücher (Standard: 200 Dokumente à ~128 kB) und misst
+DocConverter._convert_files in drei Läufen:
+1. kalter Cache (alle Dokumente werden konvertiert, entspricht dem bisherigen Verhalten),
+2. warmer Cache ohne Änderungen,
+3. warmer Cache, nachdem ein Anteil der Quelldateien geändert wurde (Standard: 5 %).
+
+Ausgegeben werden Laufzeit, übernommene und konvertierte Dokumente sowie die laut
+Manifest eingesparte Konvertierungszeit.
+
+Aufruf: python scripts/benchmark/bench_conversion_cache.py [--docs 200] [--size-kb 128] [--changed 0.05]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_markdown_rules import handbook
+from doc_converter.main import DocConverter
+from doc_converter.utils.config import ConfigManager
+from doc_converter.utils.logger import LogManager
+
+
+def run(label: str, config: dict, files: list) -> None:
+    converter = DocConverter(dict(config))
+    t0 = time.perf_counter()
+    result = converter._convert_files(files)
+    elapsed = time.perf_counter() - t0
+    if result['failed']:
+        raise RuntimeError(f"{result['failed']} Dokumente fehlgeschlagen: {result['details'][0]}")
+    cache = result['cache']
+    print(f"  {label:28s} {elapsed:7.2f} s  {cache['reused']:5d} übernommen  {cache['converted']:5d} konvertiert  "
+          f"eingespart {cache['reused_conversion_time']:7.2f} s Konvertierungszeit")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--size-kb', type=int, default=128)
+    parser.add_argument('--changed', type=float, default=0.05, help="Anteil geänderter Dokumente im dritten Lauf")
+    parser.add_argument('--backend', default='thread', choices=['thread', 'process'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    LogManager.setup_logging(log_level='WARNING', log_to_file=False)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_cache_'))
+    try:
+        source_dir = workdir / 'raw'
+        source_dir.mkdir()
+        files = []
+        for i in range(args.docs):
+            path = source_dir / f'handbuch_{i:04d}.md'
+            path.write_text(handbook(args.size_kb * 1024, seed=i), encoding='utf-8')
+            files.append(path)
+
+        config = dict(ConfigManager.DEFAULT_CONFIG,
+                      source_dir=str(source_dir), target_dir=str(workdir / 'txt'),
+                      inventory_dir=str(workdir / 'inventory'), temp_dir=str(workdir / 'temp'),
+                      cache_dir=str(workdir / 'cache'), conversion_backend=args.backend,
+                      max_workers=args.workers, log_to_file=False)
+
+        print(f"{args.docs} Dokumente à {args.size_kb} kB, Backend {args.backend}, {args.workers} Worker")
+        run("kalt (bisher)", config, files)
+        run("warm, unverändert", config, files)
+
+        changed = random.Random(args.seed).sample(files, max(1, int(len(files) * args.changed)))
+        for i, path in enumerate(changed):
+            path.write_text(handbook(args.size_kb * 1024, seed=args.docs + i), encoding='utf-8')
+        run(f"warm, {len(changed)} geändert", config, files)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
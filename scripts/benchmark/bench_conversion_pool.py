@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Skalierungs-Benchmark der Dokumentenkonvertierung: Thread-Pool gegen Worker-Prozesse
+
+Erzeugt einen Stapel synthetischer Markdown-Handbücher (Standard: 32 Dokumente à
+~512 kB) und lässt DocConverter._convert_files sie mit 1 bis N Workern konvertieren,
+einmal mit dem bisherigen Thread-Pool und einmal mit dem WorkerPool. Die
+Nachbearbeitung (StructureFixer, MarkdownCleaner, TableFormatter, Validator) ist
+reiner Python-Code und damit an die GIL gebunden, wie die Layoutanalyse der PDFs.
+
+Ausgegeben werden Laufzeit, Durchsatz und Beschleunigung gegenüber einem Worker.
+Die Prozess-Zeiten enthalten den Start und das Aufwärmen der Worker.
+
+Aufruf: python scripts/benchmark/bench_conversion_pool.py [--docs 32] [--size-kb 512] [--max-workers 8]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_markdown_rules import handbook
+from doc_converter.main import DocConverter
+from doc_converter.utils.config import ConfigManager
+from doc_converter.utils.logger import LogManager
+
+
+def worker_counts(maximum: int) -> list:
+    counts, n = [], 1
+    while n < maximum:
+        counts.append(n)
+        n *= 2
+    return counts + [maximum]
+
+
+def run(config: dict, files: list, backend: str, workers: int) -> float:
+    converter = DocConverter(dict(config, conversion_backend=backend, max_workers=workers))
+    t0 = time.perf_counter()
+    result = converter._convert_files(files)
+    elapsed = time.perf_counter() - t0
+    if result['failed']:
+        raise RuntimeError(f"{result['failed']} Dokumente fehlgeschlagen: {result['details'][0]}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=32)
+    parser.add_argument('--size-kb', type=int, default=512)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--start-method', default='spawn', help="multiprocessing-Startmethode der Worker")
+    args = parser.parse_args()
+
+    LogManager.setup_logging(log_level='WARNING', log_to_file=False)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_conversion_'))
+    try:
+        source_dir = workdir / 'raw'
+        source_dir.mkdir()
+        files = []
+        for i in range(args.docs):
+            path = source_dir / f'handbuch_{i:03d}.md'
+            path.write_text(handbook(args.size_kb * 1024, seed=i), encoding='utf-8')
+            files.append(path)
+
+        config = dict(ConfigManager.DEFAULT_CONFIG,
+                      source_dir=str(source_dir), target_dir=str(workdir / 'txt'),
+                      inventory_dir=str(workdir / 'inventory'), temp_dir=str(workdir / 'temp'),
+                      worker_start_method=args.start_method, worker_max_tasks=0, log_to_file=False)
+
+        print(f"{args.docs} Dokumente à {args.size_kb} kB, {os.cpu_count()} CPU-Kerne, "
+              f"Startmethode {args.start_method}")
+        baseline = {}
+        for backend in ('thread', 'process'):
+            print(f"\n{'Threads' if backend == 'thread' else 'Prozesse'}:")
+            for workers in worker_counts(args.max_workers):
+                elapsed = run(config, files, backend, workers)
+                baseline.setdefault(backend, elapsed)
+                print(f"  {workers:3d} Worker {elapsed:7.2f} s  {args.docs / elapsed:6.1f} Dok/s  "
+                      f"Faktor {baseline[backend] / elapsed:4.1f}  "
+                      f"(gegenüber 1 Thread {baseline['thread'] / elapsed:4.1f})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
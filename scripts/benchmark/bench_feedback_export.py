@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Feedback-Exports: Durchsatz und Spitzenspeicher je Format
+
+Legt eine temporäre Datenbank mit synthetischen Feedback-Einträgen an und exportiert
+sie über FeedbackManager.iter_feedback() und iter_export() in alle verfügbaren Formate.
+Die Ausgabe wird verworfen; gemessen werden Laufzeit, Dateigröße und der mit
+tracemalloc ermittelte Spitzenspeicher. Bei mehreren Zeilenzahlen sollte der
+Spitzenspeicher annähernd gleich bleiben.
+
+Aufruf: python scripts/benchmark/bench_feedback_export.py [--rows 10000 100000]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.core.config import Config
+from modules.feedback.feedback_export import EXPORT_FORMATS, PARQUET_AVAILABLE, iter_export
+
+
+def populate(db_path: Path, rows: int):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, email TEXT)")
+    conn.executemany("INSERT OR IGNORE INTO users (id, email) VALUES (?, ?)",
+                     [(i, f"user{i}@example.com") for i in range(1, 51)])
+    conn.execute("DELETE FROM message_feedback")
+    conn.executemany(
+        """INSERT INTO message_feedback (message_id, session_id, user_id, is_positive, comment,
+                                         question, answer, sources, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        [(i, i // 5, 1 + i % 50, i % 3 == 0, f"Kommentar {i}", f"Wie archiviere ich Dokument {i}? " * 4,
+          "Öffnen Sie die Akte und wählen Sie 'Archivieren'. " * 15, json.dumps([f"doc_{i % 40}.md"]),
+          1700000000 + i * 60)
+         for i in range(rows)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--fields', default='id,user_email,is_positive,question,answer,comment,sources,created_at')
+    args = parser.parse_args()
+    fields = args.fields.split(',')
+    formats = [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or PARQUET_AVAILABLE]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.DB_PATH = Path(tmp) / 'users.db'
+        from modules.feedback.feedback_manager import FeedbackManager
+        feedback_manager = FeedbackManager()
+
+        for rows in args.rows:
+            populate(Config.DB_PATH, rows)
+            print(f"{rows} Feedback-Einträge")
+            for fmt in formats:
+                size = 0
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                for chunk in iter_export(feedback_manager.iter_feedback(), fmt, fields):
+                    size += len(chunk)
+                elapsed = time.perf_counter() - t0
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"  {fmt:8s} {size / 1024 / 1024:8.1f} MB  {rows / elapsed:9,.0f} Zeilen/s  "
+                      f"Spitzenspeicher {peak / 1024 / 1024:6.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
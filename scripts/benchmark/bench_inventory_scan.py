@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Inventarisierung: serieller Scan gegen parallelen Scan mit Metadaten-Cache
+
+Erzeugt einen synthetischen Dokumentenbestand (Standard: 2000 Dateien in verschachtelten
+Verzeichnissen, ein Viertel davon PDFs) und misst
+1. den bisherigen Ablauf: root.glob('**/*'), danach Metadaten Datei für Datei,
+2. DocumentScanner.iter_documents mit leerem Cache (paralleles Durchsuchen und Lesen),
+3. denselben Scan mit warmem Cache ohne Änderungen,
+4. warmem Cache, nachdem ein Anteil der Dateien geändert wurde (Standard: 2 %).
+
+Aufruf: python scripts/benchmark/bench_inventory_scan.py [--files 2000] [--changed 0.02] [--backend process]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import fitz
+
+from doc_converter.inventory.inventory_scanner import DocumentScanner
+from doc_converter.utils.logger import LogManager
+
+
+def write_pdf(path: Path, rng: random.Random, pages: int) -> None:
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 60), f"Kapitel {p + 1}\n" + "\n".join(
+            f"Zeile {i} {rng.random():.6f}" for i in range(20)), fontsize=10)
+    doc.save(str(path))
+    doc.close()
+
+
+def build_tree(root: Path, files: int, seed: int) -> list:
+    """Erzeugt Dateien in bis zu drei Ebenen tiefen Verzeichnissen"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        directory = root / f"bereich_{i % 10}" / f"projekt_{i % 37}" / f"ordner_{i % 5}"
+        directory.mkdir(parents=True, exist_ok=True)
+        if i % 4 == 0:
+            path = directory / f"handbuch_{i:05d}.pdf"
+            write_pdf(path, rng, rng.randrange(1, 6))
+        else:
+            path = directory / f"notiz_{i:05d}.{rng.choice(['md', 'txt', 'html'])}"
+            path.write_text(f"# Notiz {i}\n\n{rng.random()}\n", encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def serial_scan(scanner: DocumentScanner, root: Path) -> int:
+    """Bisheriger Ablauf: glob über den ganzen Baum, danach Metadaten nacheinander"""
+    count = 0
+    for path in root.glob('**/*'):
+        if path.is_file() and path.suffix.lower() in scanner.supported_extensions:
+            scanner.extract_document_metadata(path)
+            count += 1
+    return count
+
+
+def timed_scan(label: str, scanner: DocumentScanner, root: Path) -> None:
+    t0 = time.perf_counter()
+    count = sum(1 for _ in scanner.iter_documents(root))
+    print(f"  {label:32s} {time.perf_counter() - t0:7.2f} s  {count} Dokumente")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--changed', type=float, default=0.02, help="Anteil geänderter Dateien im letzten Lauf")
+    parser.add_argument('--backend', default='process', choices=['process', 'thread'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    LogManager.setup_logging(log_level='WARNING', log_to_file=False)
+    workdir = Path(tempfile.mkdtemp(prefix='bench_inventory_'))
+    try:
+        root = workdir / 'raw'
+        paths = build_tree(root, args.files, args.seed)
+        config = {'scan_backend': args.backend, 'scan_workers': args.workers,
+                  'inventory_cache_file': str(workdir / 'scan_cache.sqlite')}
+        scanner = DocumentScanner(config)
+
+        print(f"{args.files} Dateien, Backend {args.backend}, {args.workers} Worker")
+        t0 = time.perf_counter()
+        count = serial_scan(scanner, root)
+        print(f"  {'bisher (glob, seriell)':32s} {time.perf_counter() - t0:7.2f} s  {count} Dokumente")
+
+        timed_scan("neu, leerer Cache", scanner, root)
+        timed_scan("neu, warm, unverändert", scanner, root)
+
+        changed = random.Random(args.seed).sample(paths, max(1, int(len(paths) * args.changed)))
+        for path in changed:
+            if path.suffix == '.pdf':
+                write_pdf(path, random.Random(str(path)), 2)
+            else:
+                path.write_text("# Geändert\n", encoding='utf-8')
+        timed_scan(f"neu, warm, {len(changed)} geändert", scanner, root)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
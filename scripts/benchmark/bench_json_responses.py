@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark für JSON-Serialisierung und Antwortkomprimierung großer API-Nutzlasten
+
+Repräsentative Antworten:
+- Chatverlauf einer Session (/api/session/{id}) mit langen Antworten und Quellen
+- Admin-Feedback-Liste (/api/v1/admin/feedback, limit=1000)
+- Dokumentgraph der Dokumentations-API (/api/docs/graph, Pydantic-Modelle)
+
+Verglichen wird FastAPIs Standardweg (jsonable_encoder + JSONResponse) mit
+FastJSONResponse (orjson, falls installiert) sowie die Größe unkomprimiert,
+mit gzip und mit Brotli samt Komprimierungszeit.
+
+Aufruf: python scripts/benchmark/bench_json_responses.py [--rounds 50]
+"""
+import argparse
+import gzip
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from modules.core.config import Config
+from modules.core.responses import BROTLI_AVAILABLE, ORJSON_AVAILABLE, FastJSONResponse
+
+if BROTLI_AVAILABLE:
+    import brotli
+
+WORDS = ("Dokument Akte Archiv Workflow Berechtigung Ordner Version Suche Index Metadaten Benutzer "
+         "Export Import Vorlage Signatur Freigabe Mandant Attribut Ablage Eingang").split()
+
+
+class DocumentNode(BaseModel):
+    id: str
+    label: str
+    category: str
+    size: int
+
+
+class DocumentEdge(BaseModel):
+    source: str
+    target: str
+    weight: int = 1
+
+
+class DocumentGraph(BaseModel):
+    nodes: List[DocumentNode]
+    edges: List[DocumentEdge]
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def session_history(rng: random.Random) -> dict:
+    messages = []
+    for i in range(60):
+        messages.append({
+            "id": i, "session_id": 42, "is_user": i % 2 == 0,
+            "message": text(rng, 25 if i % 2 == 0 else 350),
+            "created_at": 1700000000 + i * 30,
+            "sources": [] if i % 2 == 0 else [f"docs/{rng.choice(WORDS).lower()}_{n}.md" for n in range(4)],
+        })
+    return {"session_id": 42, "title": "Archivierung von Akten", "messages": messages}
+
+
+def feedback_list(rng: random.Random) -> dict:
+    return {"feedback": [{
+        "id": i, "message_id": 1000 + i, "session_id": i // 4, "user_id": i % 40,
+        "user_email": f"user{i % 40}@example.com", "is_positive": i % 3 == 0,
+        "comment": text(rng, 12) if i % 2 else None,
+        "question": text(rng, 20), "answer": text(rng, 180),
+        "created_at": 1700000000 + i * 600,
+    } for i in range(1000)]}
+
+
+def document_graph(rng: random.Random) -> DocumentGraph:
+    nodes = [DocumentNode(id=f"docs/{c}/{n}.md", label=text(rng, 4), category=c, size=rng.randrange(500, 50000))
+             for c in ("admin", "user", "api", "workflow") for n in range(150)]
+    edges = [DocumentEdge(source=rng.choice(nodes).id, target=rng.choice(nodes).id) for _ in range(3000)]
+    return DocumentGraph(nodes=nodes, edges=edges)
+
+
+def timed(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    payloads = {
+        "Chatverlauf": session_history(rng),
+        "Feedback-Liste": feedback_list(rng),
+        "Dokumentgraph": document_graph(rng),
+    }
+    print(f"orjson: {'ja' if ORJSON_AVAILABLE else 'nein (Standardbibliothek)'}, "
+          f"Brotli: {'ja' if BROTLI_AVAILABLE else 'nein'}, Median aus {args.rounds} Läufen")
+
+    for name, payload in payloads.items():
+        default_ms = timed(lambda: JSONResponse(jsonable_encoder(payload)), args.rounds)
+        fast_ms = timed(lambda: FastJSONResponse(payload), args.rounds)
+        body = FastJSONResponse(payload).body
+        gzip_ms = timed(lambda: gzip.compress(body, compresslevel=Config.RESPONSE_GZIP_LEVEL), args.rounds)
+        gz = gzip.compress(body, compresslevel=Config.RESPONSE_GZIP_LEVEL)
+
+        print(f"{name}")
+        print(f"  Serialisierung: Standard {default_ms:7.2f} ms, FastJSONResponse {fast_ms:6.2f} ms "
+              f"(Faktor {default_ms / fast_ms:4.1f})")
+        print(f"  Größe: {len(body) / 1024:7.1f} kB, gzip-{Config.RESPONSE_GZIP_LEVEL} {len(gz) / 1024:6.1f} kB "
+              f"({len(gz) / len(body):.0%}, {gzip_ms:.2f} ms)", end="")
+        if BROTLI_AVAILABLE:
+            br_ms = timed(lambda: brotli.compress(body, quality=Config.RESPONSE_BROTLI_QUALITY), args.rounds)
+            br = brotli.compress(body, quality=Config.RESPONSE_BROTLI_QUALITY)
+            print(f", br-{Config.RESPONSE_BROTLI_QUALITY} {len(br) / 1024:6.1f} kB "
+                  f"({len(br) / len(body):.0%}, {br_ms:.2f} ms)")
+        else:
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Markdown-Nachbearbeitung: MarkdownCleaner, StructureFixer und MarkdownValidator
+
+Erzeugt ein synthetisches Handbuch im Stil eines konvertierten PDFs (Standard ~5 MB):
+Kapitel mit Überschriften samt schließender #-Zeichen, lange Absätze mit
+Zeilenend-Leerzeichen, Links mit doppelten Klammern, Underscore-Hervorhebungen,
+Aufzählungen mit '-', falsch nummerierte Listen, Tabellen mit fehlenden Zellen,
+eingerückte Codeblöcke, Setext-Überschriften und überzählige Leerzeilen.
+
+Gemessen wird jede Stufe im Speicher (ohne Dateizugriffe) als Median mehrerer
+Läufe. Mit --baseline werden zusätzlich die Module eines früheren Commits
+(git show REV:...) geladen und auf demselben Text gemessen.
+
+Aufruf: python scripts/benchmark/bench_markdown_rules.py [--size-mb 5] [--rounds 3] [--baseline HEAD~1]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT)
+
+from doc_converter.processing.cleaner import MarkdownCleaner
+from doc_converter.processing.structure_fixer import StructureFixer
+from doc_converter.processing.validator import MarkdownValidator
+
+WORDS = ("Dokument Akte Archiv Workflow Berechtigung Ordner Version Suche Index Metadaten Benutzer "
+         "Export Import Vorlage Signatur Freigabe Mandant Attribut Ablage Eingang der die das und für mit").split()
+
+MODULES = {
+    'cleaner': 'doc_converter/processing/cleaner.py',
+    'structure_fixer': 'doc_converter/processing/structure_fixer.py',
+    'validator': 'doc_converter/processing/validator.py',
+}
+
+
+def sentence(rng: random.Random, words: int = 0) -> str:
+    words = words or rng.randrange(6, 18)
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def handbook(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    chapters, total, chapter = [], 0, 0
+    while total < size:
+        chapter += 1
+        parts = [f"# kapitel {chapter} {sentence(rng, 3)[:-1].lower()}", ""]
+        for section in range(1, rng.randrange(3, 7)):
+            parts += [f"#### abschnitt {chapter}.{section} {rng.choice(WORDS)}   ##", ""]
+            for _ in range(rng.randrange(2, 6)):
+                parts.append(" ".join(sentence(rng) for _ in range(rng.randrange(2, 8))) + "  ")
+                if rng.random() < 0.3:
+                    parts.append(f"Siehe [{rng.choice(WORDS)}](( docs/{rng.choice(WORDS).lower()}.md )) "
+                                 f"und __{rng.choice(WORDS)}__ oder _{rng.choice(WORDS)}_.")
+                parts.append("")
+            if rng.random() < 0.5:
+                parts += [f"- {sentence(rng, 4)}" for _ in range(rng.randrange(2, 6))] + [""]
+            if rng.random() < 0.4:
+                parts += [f"{n}. {sentence(rng, 5)}" for n in (1, 2, 2, 4)] + [""]
+            if rng.random() < 0.4:
+                parts += ["| Feld | Wert | Beschreibung |", "|---|---|---|"]
+                parts += [f"| {rng.choice(WORDS)} | {rng.randrange(1000)} | {sentence(rng, 5)} |"
+                          for _ in range(rng.randrange(2, 8))]
+                parts += [f"| {rng.choice(WORDS)} | {rng.randrange(10)} |", ""]
+            if rng.random() < 0.15:
+                parts += ["    SELECT id FROM akte", "    WHERE status = 1", ""]
+            if rng.random() < 0.1:
+                parts += ["```", "def archiviere(akte):", "    return akte", "```", ""]
+            if rng.random() < 0.2:
+                parts += ["Seitentitel", "----------", ""]
+            parts += ["", "", ""]
+        block = "\n".join(parts)
+        chapters.append(block)
+        total += len(block)
+    return "\n".join(chapters)
+
+
+def load_baseline(revision: str, name: str) -> types.ModuleType:
+    """Lädt ein Modul im Stand von revision; relative Importe lösen gegen den aktuellen Baum auf"""
+    source = subprocess.run(['git', 'show', f'{revision}:{MODULES[name]}'], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    module = types.ModuleType(f'doc_converter.processing._baseline_{name}')
+    module.__package__ = 'doc_converter.processing'
+    module.__file__ = os.path.join(ROOT, MODULES[name])
+    exec(compile(source, f'{revision}:{MODULES[name]}', 'exec'), module.__dict__)
+    return module
+
+
+def stages(cleaner_cls, fixer_cls, validator_cls, size: int):
+    cleaner = cleaner_cls()
+    fixer = fixer_cls()
+    validator = validator_cls()
+    path = Path('handbuch.md')
+    return [
+        ("MarkdownCleaner", lambda text: cleaner._clean_markdown(text)),
+        ("StructureFixer", lambda text: fixer._improve_structure(text)),
+        ("MarkdownValidator", lambda text: (text, validator._validate_parts({}, text, path, size)['issues'])),
+    ]
+
+
+def timed(fn, text: str, rounds: int):
+    timings, result = [], None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        result = fn(text)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    return timings[len(timings) // 2], result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size-mb', type=float, default=5.0)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=3)
+    parser.add_argument('--baseline', help="Git-Revision für den Vergleich (z.B. HEAD~1)")
+    args = parser.parse_args()
+
+    text = handbook(int(args.size_mb * 1024 * 1024), args.seed)
+    size = len(text.encode('utf-8'))
+    print(f"Handbuch: {size / 1024 / 1024:.1f} MB, {text.count(chr(10)) + 1} Zeilen, Median aus {args.rounds} Läufen")
+
+    current = stages(MarkdownCleaner, StructureFixer, MarkdownValidator, size)
+    baseline = None
+    if args.baseline:
+        modules = {name: load_baseline(args.baseline, name) for name in MODULES}
+        baseline = stages(modules['cleaner'].MarkdownCleaner, modules['structure_fixer'].StructureFixer,
+                          modules['validator'].MarkdownValidator, size)
+
+    # Die Stufen laufen wie in der Pipeline nacheinander auf dem Ergebnis der vorherigen Stufe;
+    # die bisherige Fassung jeder Stufe erhält dieselbe Eingabe wie die aktuelle
+    total_current, total_baseline = 0.0, 0.0
+    for i, (name, fn) in enumerate(current):
+        elapsed, (output, changes) = timed(fn, text, args.rounds)
+        total_current += elapsed
+        line = f"  {name:18s} {elapsed:7.2f} s ({size / 1024 / 1024 / elapsed:6.1f} MB/s, {len(changes)} Meldungen)"
+        if baseline:
+            base_elapsed, _ = timed(baseline[i][1], text, args.rounds)
+            total_baseline += base_elapsed
+            line += f"  bisher {base_elapsed:7.2f} s (Faktor {base_elapsed / elapsed:5.1f})"
+        text = output
+        print(line)
+
+    summary = f"  {'Gesamt':18s} {total_current:7.2f} s"
+    if baseline:
+        summary += f"{'':33s}  bisher {total_baseline:7.2f} s (Faktor {total_baseline / total_current:5.1f})"
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Instrumentierungs-Overheads (Stage-Timer, Histogramme, Metrik-Middleware)
+
+1. Mikro: Kosten pro Stage-Timer, pro Histogramm-Beobachtung und für /metrics-Rendering.
+2. Ende-zu-Ende: dieselbe FastAPI-App (Token-Prüfung, SQLite-Abfrage der Sessions,
+   JSON-Antwort) einmal ohne und einmal mit MetricsMiddleware und Stage-Timern,
+   batchweise abwechselnd über ASGI aufgerufen, zusammen mit einer zweiten nicht
+   instrumentierten Kopie als Kontrolle für das Messrauschen. Maßgeblich sind die
+   direkt gemessenen Kosten von Middleware und Timern relativ zur Request-Dauer,
+   da das Rauschen Ende-zu-Ende im Bereich weniger Prozent liegt; Ziel < 1 %.
+
+Aufruf: python scripts/benchmark/bench_metrics_overhead.py [--batches 30] [--batch-size 100]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+from fastapi import FastAPI, HTTPException, Request
+
+from modules.core.metrics import MetricsMiddleware, MetricsRegistry
+
+SECRET = b"benchmark-secret"
+TOKEN = "user-1." + hmac.new(SECRET, b"user-1", hashlib.sha256).hexdigest()
+
+
+def create_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("CREATE TABLE chat_sessions (id INTEGER PRIMARY KEY, user_id INTEGER, title TEXT, updated_at INTEGER)")
+    conn.executemany(
+        "INSERT INTO chat_sessions (user_id, title, updated_at) VALUES (?, ?, ?)",
+        [(1 + i % 20, f"Session {i}", 1700000000 + i) for i in range(2000)]
+    )
+    conn.execute("CREATE INDEX idx_user ON chat_sessions(user_id, updated_at)")
+    return conn
+
+
+def create_app(registry: MetricsRegistry = None) -> FastAPI:
+    app = FastAPI()
+    conn = create_db()
+
+    class _NoTimer:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    no_timer = _NoTimer()
+
+    def stage(name):
+        return registry.stage(name) if registry else no_timer
+
+    @app.get("/api/session/{session_id}")
+    async def session(session_id: int, request: Request):
+        with stage("auth"):
+            subject, _, signature = request.headers.get("Authorization", "")[7:].partition(".")
+            expected = hmac.new(SECRET, subject.encode(), hashlib.sha256).hexdigest()
+            if not hmac.compare_digest(signature, expected):
+                raise HTTPException(status_code=401)
+        with stage("session_check"):
+            rows = conn.execute(
+                "SELECT id, title, updated_at FROM chat_sessions WHERE user_id = ? ORDER BY updated_at DESC", (1,)
+            ).fetchall()
+        with stage("prompt_build"):
+            context = "\n".join(f"[{r[0]}] {r[1]}" for r in rows)
+        return {"session_id": session_id, "sessions": [{"id": r[0], "title": r[1], "updated_at": r[2]} for r in rows],
+                "context_length": len(context)}
+
+    if registry:
+        app.add_middleware(MetricsMiddleware, registry=registry)
+    return app
+
+
+async def run_rotation(apps, batches: int, batch_size: int):
+    """Wechselt batchweise reihum zwischen den Apps, damit Störungen alle gleich treffen"""
+    headers = {"Authorization": f"Bearer {TOKEN}"}
+    clients = [httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+               for app in apps]
+    timings = [[] for _ in apps]
+    try:
+        for client in clients:
+            for i in range(50):
+                await client.get(f"/api/session/{i}", headers=headers)
+        for batch in range(batches):
+            # Startposition rotieren, um Aufwärm- und Reihenfolgeeffekte auszugleichen
+            for offset in range(len(apps)):
+                which = (batch + offset) % len(apps)
+                t0 = time.perf_counter()
+                for i in range(batch_size):
+                    response = await clients[which].get(f"/api/session/{i % 100}", headers=headers)
+                    assert response.status_code == 200
+                timings[which].append((time.perf_counter() - t0) / batch_size)
+    finally:
+        for client in clients:
+            await client.aclose()
+    return [statistics.median(t) for t in timings]
+
+
+async def middleware_cost(count: int) -> float:
+    """Direkte Kosten der MetricsMiddleware pro Request (ohne HTTP-Client)"""
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/api/session/1"}
+    wrapped = MetricsMiddleware(endpoint, registry=MetricsRegistry())
+    result = []
+    for app in (endpoint, wrapped):
+        t0 = time.perf_counter()
+        for _ in range(count):
+            await app(dict(scope), receive, send)
+        result.append((time.perf_counter() - t0) / count)
+    return result[1] - result[0]
+
+
+def micro():
+    registry = MetricsRegistry()
+    n = 200000
+    timer_ns = timeit.timeit(lambda: registry.stage("embedding_search").__enter__().__exit__(None, None, None),
+                             number=n) / n * 1e9
+    observe_ns = timeit.timeit(lambda: registry.observe_stage("ttft", 0.0123), number=n) / n * 1e9
+    for i in range(10000):
+        registry.http_duration.observe(i / 1e4, "GET", f"/api/route/{i % 30}", "200")
+    render_ms = timeit.timeit(registry.render, number=20) / 20 * 1000
+    print(f"Stage-Timer:            {timer_ns:7.0f} ns")
+    print(f"Histogramm-Beobachtung: {observe_ns:7.0f} ns")
+    print(f"/metrics rendern:       {render_ms:7.2f} ms (30 Routen, {len(registry.render().splitlines())} Zeilen)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--batches', type=int, default=30)
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    micro()
+
+    plain = create_app()
+    registry = MetricsRegistry()
+    instrumented = create_app(registry)
+
+    stage_ns = timeit.timeit(lambda: registry.stage("x").__enter__().__exit__(None, None, None),
+                             number=100000) / 100000 * 1e9
+    middleware_ns = asyncio.run(middleware_cost(100000)) * 1e9
+
+    # Zwei identische, nicht instrumentierte Apps zeigen das Messrauschen (A/A)
+    base, control, inst = asyncio.run(run_rotation([plain, create_app(), instrumented],
+                                                   args.batches, args.batch_size))
+    per_request = base * 1e6
+    measured = (inst / base - 1) * 100
+    noise = (control / base - 1) * 100
+    # 3 Stage-Timer + Middleware pro Request in der Test-App
+    accounted = (3 * stage_ns + middleware_ns) / 1000
+
+    print(f"Ende-zu-Ende, {args.batches} Runden à {args.batch_size} Requests pro App")
+    print(f"  ohne Instrumentierung: {per_request:8.1f} µs/Request")
+    print(f"  mit Instrumentierung:  {inst * 1e6:8.1f} µs/Request")
+    print(f"  Mehraufwand gemessen:  {measured:+.2f} % (Rauschen A/A: {noise:+.2f} %)")
+    print(f"  Mehraufwand direkt: Middleware {middleware_ns / 1000:.1f} µs + 3 Stage-Timer "
+          f"= {accounted:.1f} µs = {accounted / per_request * 100:.2f} %")
+
+
+if __name__ == '__main__':
+    main()
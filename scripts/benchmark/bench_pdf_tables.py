@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark der PDF-Tabellenerkennung: Camelot pro Seite gegen Vorfilter + gesammelte Aufrufe
+
+Vergleicht auf einem Korpus
+1. den bisherigen Ablauf: camelot.read_pdf für jede Seite einzeln im Lattice-Modus,
+   bei fehlendem Treffer erneut im Stream-Modus (jeder Aufruf liest die Datei neu),
+2. PDFConverter._detect_tables: Vorfilter über Linien und Textgeometrie aus PyMuPDF,
+   danach ein Camelot-Aufruf je Modus für die Kandidatenseiten eines Abschnitts.
+
+Gemessen werden Laufzeit, Anzahl der an Camelot übergebenen Seiten und der Recall
+gegenüber dem bisherigen Ablauf (gleiche Seite, überlappende Bounding Box). Ohne
+--corpus wird ein synthetischer Korpus erzeugt (Fließtext, zweispaltiger Text,
+Tabellen mit und ohne Linien, rechtsbündige Zahlen, Seiten mit Trennlinien); dort
+wird zusätzlich der Recall gegenüber den bekannten Tabellenseiten ausgegeben.
+
+Aufruf: python scripts/benchmark/bench_pdf_tables.py [--corpus DIR] [--docs 4] [--pages 40]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import camelot
+import fitz
+
+from doc_converter.converters.pdf_converter import PDFConverter
+
+WORDS = ("Dokument Akte Archiv Workflow Berechtigung Ordner Version Suche Index Metadaten Benutzer "
+         "Export Import Vorlage Signatur Freigabe Mandant Attribut Ablage Eingang der die das und für mit").split()
+
+
+def text_lines(page, rng, x, y, width_words, lines, size=10):
+    for _ in range(lines):
+        page.insert_text((x, y), " ".join(rng.choice(WORDS) for _ in range(width_words)), fontsize=size)
+        y += size * 1.5
+    return y
+
+
+def lattice_table(page, rng, y, rows, cols):
+    cell_width = 480 / cols
+    for r in range(rows):
+        for c in range(cols):
+            rect = fitz.Rect(60 + c * cell_width, y + r * 20, 60 + (c + 1) * cell_width, y + (r + 1) * 20)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.7)
+            page.insert_text((rect.x0 + 4, rect.y0 + 14), rng.choice(WORDS)[:10], fontsize=9)
+    return y + rows * 20 + 20
+
+
+def stream_table(page, rng, y, rows, cols):
+    cell_width = 480 / cols
+    for r in range(rows):
+        for c in range(cols):
+            if c == cols - 1:
+                # Rechtsbündige Zahlenspalte
+                value = f"{rng.randrange(1, 100000):,}".replace(',', '.')
+                page.insert_text((60 + (c + 1) * cell_width - 6 * len(value), y), value, fontsize=10)
+            else:
+                page.insert_text((60 + c * cell_width, y), rng.choice(WORDS), fontsize=10)
+        y += 16
+    return y + 20
+
+
+def build_corpus(directory: Path, docs: int, pages: int, seed: int) -> dict:
+    """Erzeugt synthetische PDFs; liefert {pfad: {seitennummer: anzahl_tabellen}}"""
+    rng = random.Random(seed)
+    truth = {}
+    for d in range(docs):
+        doc = fitz.open()
+        tables = {}
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((50, 60), f"Kapitel {p + 1}", fontsize=16)
+            kind = rng.choices(['text', 'columns', 'lattice', 'stream', 'rules'], [60, 10, 15, 10, 5])[0]
+            y = text_lines(page, rng, 50, 100, 12, 8)
+            if kind == 'columns':
+                text_lines(page, rng, 50, y + 10, 5, 20)
+                text_lines(page, rng, 310, y + 10, 5, 20)
+            elif kind == 'lattice':
+                y = lattice_table(page, rng, y + 10, rng.randrange(3, 9), rng.randrange(2, 6))
+                text_lines(page, rng, 50, y, 12, 6)
+                tables[p] = 1
+            elif kind == 'stream':
+                y = stream_table(page, rng, y + 20, rng.randrange(4, 10), rng.randrange(3, 5))
+                text_lines(page, rng, 50, y, 12, 6)
+                tables[p] = 1
+            elif kind == 'rules':
+                page.draw_line(fitz.Point(50, 80), fitz.Point(545, 80))
+                page.draw_line(fitz.Point(50, 800), fitz.Point(545, 800))
+                text_lines(page, rng, 50, y, 12, 20)
+            else:
+                text_lines(page, rng, 50, y, 12, 20)
+        path = directory / f"handbuch_{d:02d}.pdf"
+        doc.save(str(path))
+        truth[path] = tables
+    return truth
+
+
+def accepted(converter: PDFConverter, accuracy: float, df) -> bool:
+    return (accuracy >= converter.table_confidence_threshold * 100
+            and len(df) >= converter.min_table_rows and len(df.columns) >= converter.min_table_columns)
+
+
+def per_page(converter: PDFConverter, path: Path, page_count: int):
+    """Bisheriger Ablauf: pro Seite Lattice, bei fehlendem Treffer Stream"""
+    found, calls = {}, 0
+    for page_num in range(page_count):
+        tables = camelot.read_pdf(str(path), pages=str(page_num + 1), flavor='lattice')
+        calls += 1
+        if len(tables) == 0:
+            tables = camelot.read_pdf(str(path), pages=str(page_num + 1), flavor='stream')
+            calls += 1
+        found[page_num] = [t._bbox for t in tables if accepted(converter, t.accuracy, t.df)]
+    return found, calls, page_count
+
+
+def batched(converter: PDFConverter, path: Path):
+    """Neuer Ablauf: Vorfilter und gesammelte Camelot-Aufrufe je Abschnitt"""
+    found, candidates = {}, 0
+    with fitz.open(str(path)) as pdf_doc:
+        for start in range(0, len(pdf_doc), converter.pages_per_task):
+            page_nums = list(range(start, min(start + converter.pages_per_task, len(pdf_doc))))
+            page_dicts = {page_num: converter._page_dict(pdf_doc[page_num]) for page_num in page_nums}
+            detected = converter._detect_tables(pdf_doc, page_nums, page_dicts)
+            candidates += len(detected)
+            for page_num, tables in detected.items():
+                found[page_num] = [t['bbox'] for t in tables if accepted(converter, t['accuracy'], t['df'])]
+    return found, candidates
+
+
+def overlaps(a, b) -> bool:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return width > 0 and height > 0
+
+
+def matched(reference: dict, found: dict) -> int:
+    return sum(1 for page_num, boxes in reference.items() for box in boxes
+               if any(overlaps(box, other) for other in found.get(page_num, [])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', help="Verzeichnis mit PDF-Dateien (Standard: synthetischer Korpus)")
+    parser.add_argument('--docs', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    converter = PDFConverter({})
+
+    with tempfile.TemporaryDirectory(prefix='bench_pdf_tables_') as tmp:
+        if args.corpus:
+            files, truth = sorted(Path(args.corpus).glob('**/*.pdf')), None
+        else:
+            truth = build_corpus(Path(tmp), args.docs, args.pages, args.seed)
+            files = list(truth)
+
+        totals = {'old': 0.0, 'new': 0.0, 'calls': 0, 'pages': 0, 'candidates': 0,
+                  'reference': 0, 'matched': 0, 'truth': 0, 'truth_old': 0, 'truth_new': 0}
+        print(f"{len(files)} PDF-Dateien")
+        for path in files:
+            with fitz.open(str(path)) as pdf_doc:
+                page_count = len(pdf_doc)
+
+            t0 = time.perf_counter()
+            old, calls, _ = per_page(converter, path, page_count)
+            old_elapsed = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            new, candidates = batched(converter, path)
+            new_elapsed = time.perf_counter() - t0
+
+            reference = sum(len(boxes) for boxes in old.values())
+            hits = matched(old, new)
+            totals.update({key: totals[key] + value for key, value in (
+                ('old', old_elapsed), ('new', new_elapsed), ('calls', calls), ('pages', page_count),
+                ('candidates', candidates), ('reference', reference), ('matched', hits))})
+            print(f"  {path.name:24s} {page_count:4d} Seiten  bisher {old_elapsed:6.2f} s ({calls} Aufrufe)  "
+                  f"neu {new_elapsed:6.2f} s ({candidates} Kandidatenseiten)  "
+                  f"Recall {hits}/{reference}")
+
+            if truth is not None:
+                table_pages = truth[path]
+                totals['truth'] += len(table_pages)
+                totals['truth_old'] += sum(1 for page_num in table_pages if old.get(page_num))
+                totals['truth_new'] += sum(1 for page_num in table_pages if new.get(page_num))
+
+        recall = totals['matched'] / totals['reference'] if totals['reference'] else 1.0
+        print(f"\nGesamt: bisher {totals['old']:.2f} s, neu {totals['new']:.2f} s "
+              f"(Faktor {totals['old'] / max(totals['new'], 1e-9):.1f})")
+        print(f"Camelot-Seiten: bisher {totals['pages']} ({totals['calls']} Aufrufe), "
+              f"neu {totals['candidates']} Kandidatenseiten")
+        print(f"Recall gegenüber bisher: {totals['matched']}/{totals['reference']} Tabellen ({recall:.1%})")
+        if truth is not None:
+            print(f"Tabellenseiten erkannt (bekannte Tabellen): bisher {totals['truth_old']}/{totals['truth']}, "
+                  f"neu {totals['truth_new']}/{totals['truth']}")
+
+
+if __name__ == '__main__':
+    main()
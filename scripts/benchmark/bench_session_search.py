@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Volltextsuche im Chatverlauf (ChatHistoryManager.search_messages)
+
+Erzeugt eine temporäre Datenbank mit synthetischen Nachrichten und misst die
+Antwortzeiten typischer Suchanfragen pro Benutzer (Ziel: p95 < 50 ms).
+
+Aufruf: python scripts/benchmark/bench_session_search.py [--messages 1000000] [--users 500]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+DOMAIN_WORDS = (
+    "akte aktenplan berechtigung rolle dokument ablage vorgang benutzer gruppe ordner "
+    "freigabe workflow signatur archiv suche metadaten version löschen export import "
+    "vertretung postkorb wiedervorlage register mandant schriftgut aussonderung"
+).split()
+
+
+def build_vocabulary(rng, size=20000):
+    """Zipf-verteiltes Vokabular: wenige häufige Füllwörter, viele seltene Begriffe"""
+    letters = "abcdefghijklmnopqrstuvwxyzäöü"
+    words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 12))) for _ in range(size)]
+    words[50:50 + len(DOMAIN_WORDS)] = DOMAIN_WORDS
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(size)))
+    return words, cum_weights
+
+
+QUERIES = ["aktenplan berecht", "postkorb", "workflow freigabe", "löschen", "metadaten export", "archiv"]
+
+
+def populate(chat_history, sqlite_path, messages, users, sessions_per_user):
+    conn = sqlite3.connect(sqlite_path)
+    cursor = conn.cursor()
+    now = int(time.time())
+    session_ids = []
+    for user_id in range(1, users + 1):
+        for _ in range(sessions_per_user):
+            cursor.execute(
+                "INSERT INTO chat_sessions (user_id, title, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                (user_id, "Benchmark", now, now)
+            )
+            session_ids.append(cursor.lastrowid)
+
+    rng = random.Random(42)
+    words, cum_weights = build_vocabulary(rng)
+    batch = []
+    for i in range(messages):
+        text = " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(8, 60)))
+        batch.append((rng.choice(session_ids), i % 2 == 0, text, now - rng.randint(0, 86400 * 365)))
+        if len(batch) >= 10000:
+            cursor.executemany(
+                "INSERT INTO chat_messages (session_id, is_user, message, created_at) VALUES (?, ?, ?, ?)", batch
+            )
+            batch.clear()
+    if batch:
+        cursor.executemany(
+            "INSERT INTO chat_messages (session_id, is_user, message, created_at) VALUES (?, ?, ?, ?)", batch
+        )
+    conn.commit()
+    cursor.execute("INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--sessions-per-user', type=int, default=20)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['BASE_DIR'] = tmp
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        from modules.core.config import Config
+        Config.init_directories()
+        from modules.session.chat_history import ChatHistoryManager
+
+        chat_history = ChatHistoryManager()
+        start = time.perf_counter()
+        populate(chat_history, Config.DB_PATH, args.messages, args.users, args.sessions_per_user)
+        print(f"{args.messages} Nachrichten indexiert in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(7)
+        timings = []
+        hits = 0
+        for _ in range(args.queries):
+            user_id = rng.randint(1, args.users)
+            query = rng.choice(QUERIES)
+            t0 = time.perf_counter()
+            result = chat_history.search_messages(user_id, query, limit=20)
+            timings.append((time.perf_counter() - t0) * 1000)
+            hits += len(result['results'])
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"Abfragen: {len(timings)}, Treffer/Abfrage: {hits / len(timings):.1f}")
+        print(f"p50: {statistics.median(timings):.2f} ms, p95: {p95:.2f} ms, max: {timings[-1]:.2f} ms")
+        print("Ziel p95 < 50 ms:", "erreicht" if p95 < 50 else "verfehlt")
+
+
+if __name__ == '__main__':
+    main()
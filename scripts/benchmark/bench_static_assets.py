@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Auslieferung statischer Dateien: alter Pfad gegen StaticAssetMiddleware
+
+Erzeugt ein synthetisches Bundle mit den Größen aus PERFORMANCE_BASELINE.md (~2,5 MB)
+und vergleicht
+1. den bisherigen Aufbau: StaticFiles-Mount hinter einer BaseHTTPMiddleware, die
+   Content-Type umschreibt und no-store setzt (jeder Seitenaufruf lädt alles neu),
+2. den StaticAssetStore als äußerste Middleware (Hash-Namen unveränderlich,
+   ETag, vorkomprimierte Varianten).
+
+Gemessen werden die übertragenen Bytes für Erst- und Folgeaufruf sowie die
+Serverzeit pro Datei (direkter ASGI-Aufruf, ohne HTTP-Client).
+
+Aufruf: python scripts/benchmark/bench_static_assets.py [--rounds 200]
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from modules.core.static_assets import StaticAssetMiddleware, StaticAssetStore
+
+# Name -> Größe in kB (PERFORMANCE_BASELINE.md, Bundle Breakdown)
+BUNDLE = {"messageFormatter": 969, "ui": 254, "auto": 205, "index": 148, "bridge": 138, "vendor": 113}
+
+
+def create_bundle(directory: Path) -> list:
+    rng = random.Random(1)
+    words = ["function", "return", "const", "this", "props", "value", "=>", "{", "}", "(", ")", ";"]
+    files = []
+    (directory / "js").mkdir(parents=True)
+    for name, kb in BUNDLE.items():
+        digest = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(8))
+        # Quelltextähnlicher Inhalt, damit die Kompressionsrate realistisch bleibt
+        parts, size = [], 0
+        while size < kb * 1024:
+            token = rng.choice(words) + (str(rng.randrange(500)) if rng.random() < 0.2 else "") + " "
+            parts.append(token)
+            size += len(token)
+        path = directory / "js" / f"{name}.{digest}.js"
+        path.write_text("".join(parts))
+        files.append(f"/js/{path.name}")
+    return files
+
+
+class NoStoreMiddleware(BaseHTTPMiddleware):
+    """Nachbildung des bisherigen Verhaltens für statische Pfade"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if request.url.path.endswith(".js"):
+            response.headers["Content-Type"] = "application/javascript"
+            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+        return response
+
+
+async def call(app, path: str, headers: dict):
+    scope = {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "scheme": "http", "http_version": "1.1", "server": ("bench", 80),
+             "client": ("bench", 1), "headers": [(k.encode(), v.encode()) for k, v in headers.items()]}
+    result = {"status": 0, "headers": {}, "bytes": 0}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            result["bytes"] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return result
+
+
+async def page_load(app, files, cache: dict):
+    """Ein Seitenaufruf eines Browsers mit Cache: unveränderliche Dateien werden nicht angefragt"""
+    transferred = 0
+    for path in files:
+        entry = cache.get(path)
+        if entry and "immutable" in entry.get("cache-control", ""):
+            continue
+        headers = {"accept-encoding": "gzip, deflate, br"}
+        if entry and "no-store" not in entry.get("cache-control", "") and "etag" in entry:
+            headers["if-none-match"] = entry["etag"]
+        response = await call(app, path, headers)
+        transferred += response["bytes"]
+        if response["status"] == 200:
+            cache[path] = response["headers"]
+    return transferred
+
+
+async def run(rounds: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        files = create_bundle(Path(tmp))
+
+        old = FastAPI()
+        old.add_middleware(NoStoreMiddleware)
+        old.mount("/js", StaticFiles(directory=str(Path(tmp) / "js")), name="js")
+
+        new = FastAPI()
+        store = StaticAssetStore()
+        store.mount("/js", Path(tmp) / "js", build=True)
+        t0 = time.perf_counter()
+        store.prepare()
+        prepare_s = time.perf_counter() - t0
+        new.add_middleware(StaticAssetMiddleware, store=store)
+
+        print(f"Bundle: {len(files)} Dateien, {sum(BUNDLE.values())} kB, Vorbereitung {prepare_s:.2f} s")
+        for label, app in (("bisher", old), ("neu", new)):
+            cache = {}
+            first = await page_load(app, files, cache)
+            repeat = await page_load(app, files, cache)
+
+            timings = []
+            for _ in range(rounds):
+                t0 = time.perf_counter()
+                for path in files:
+                    await call(app, path, {"accept-encoding": "gzip, deflate, br"})
+                timings.append((time.perf_counter() - t0) / len(files))
+            timings.sort()
+            print(f"  {label:7s} Erstaufruf {first / 1024:8.0f} kB, Folgeaufruf {repeat / 1024:8.0f} kB, "
+                  f"Serverzeit pro Datei p50 {timings[len(timings) // 2] * 1e6:7.0f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == '__main__':
+    main()
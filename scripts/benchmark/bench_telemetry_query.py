@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark des Telemetrie-Speichers: Ingest in die Rollups und Abfragelatenz
+
+Erzeugt synthetische Stream-Latenzen (mehrere Modelle, log-normal verteilt) über
+einen Zeitraum von mehreren Tagen, schreibt sie in Batches wie die Telemetrie-Pipeline
+in einen temporären TelemetryStore und misst anschließend die Abfrage
+"p95 Stream-Latenz der letzten 24h nach Modell" sowie die Abweichung der Perzentile
+gegenüber den exakten Werten.
+
+Aufruf: python scripts/benchmark/bench_telemetry_query.py [--events 500000] [--days 7]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.core.telemetry_store import TelemetryStore
+
+MODELS = {"llama3-nscale": 7.0, "mistral": 6.6, "phi3": 6.2}
+
+
+def generate(events: int, days: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = time.time()
+    for _ in range(events):
+        model = rng.choice(list(MODELS))
+        yield {
+            "eventType": "metric",
+            "name": "stream_latency",
+            "value": rng.lognormvariate(MODELS[model], 0.5),
+            "timestamp": int((now - rng.random() * days * 86400) * 1000),
+            "tags": {"model": model, "status": "ok"},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=500000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TelemetryStore(Path(tmp) / "telemetry.db")
+        events = list(generate(args.events, args.days))
+
+        t0 = time.perf_counter()
+        for i in range(0, len(events), args.batch_size):
+            store.ingest(events[i:i + args.batch_size])
+        ingest_s = time.perf_counter() - t0
+
+        timings = []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            result = store.query("stream_latency", hours=24, group_by=["model"])
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+
+        # Exakte Werte zum Vergleich (Zeitraum auf dieselbe Bucket-Grenze abgerundet)
+        since = result["since"] // 3600 * 3600 if result["resolution"] == "hour" else result["since"] // 60 * 60
+        exact = {}
+        for event in events:
+            if event["timestamp"] / 1000 >= since:
+                exact.setdefault(event["tags"]["model"], []).append(event["value"])
+
+        rollups = store._conn().execute("SELECT COUNT(*) FROM telemetry_rollups").fetchone()[0]
+        size_kb = sum(p.stat().st_size for p in Path(tmp).glob("telemetry.db*")) / 1024
+
+    print(f"{args.events} Messwerte über {args.days} Tage, Batches à {args.batch_size}")
+    print(f"Ingest:  {args.events / ingest_s:,.0f} Messwerte/s, {rollups} Rollup-Zeilen, {size_kb:,.0f} KB")
+    print(f"Abfrage p95 nach Modell, 24h ({result['resolution']}): "
+          f"p50 {statistics.median(timings):.2f} ms, max {timings[-1]:.2f} ms")
+    for group in result["groups"]:
+        values = sorted(exact[group["model"]])
+        true_p95 = values[int(0.95 * (len(values) - 1))]
+        print(f"  {group['model']:15s} n={group['count']:7d} p95={group['p95']:9.1f} ms "
+              f"(exakt {true_p95:9.1f}, Abweichung {abs(group['p95'] - true_p95) / true_p95:.2%})")
+
+
+if __name__ == '__main__':
+    main()
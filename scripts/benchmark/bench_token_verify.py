@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Token-Verifizierung: jose vs. PyJWT vs. Token-Cache
+
+Aufruf: python scripts/benchmark/bench_token_verify.py [--iterations N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from modules.auth.token_cache import TOKEN_VERIFIERS, VerifiedTokenCache
+
+
+def make_payload():
+    now = int(time.time())
+    return {
+        'user_id': 1,
+        'email': 'bench@example.com',
+        'role': 'user',
+        'iat': now,
+        'exp': now + 3600,
+        'tokenExpiry': now + 3600
+    }
+
+
+def bench_decode(verifier, token, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verifier.decode(token)
+    return time.perf_counter() - start
+
+
+def bench_cached(verifier, token, iterations):
+    cache = VerifiedTokenCache(max_size=1000)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        claims = cache.get(token)
+        if claims is None:
+            claims = verifier.decode(token)
+            cache.put(token, claims)
+        cache.is_revoked(token, claims)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    payload = make_payload()
+    print(f"{'Backend':<16}{'us/Token':>12}{'Tokens/s':>14}")
+    for name, verifier_class in TOKEN_VERIFIERS.items():
+        try:
+            verifier = verifier_class()
+        except ImportError as e:
+            print(f"{name:<16}{'nicht installiert':>26} ({e})")
+            continue
+        token = verifier.encode(payload)
+
+        for label, func in ((name, bench_decode), (f"{name}+cache", bench_cached)):
+            elapsed = func(verifier, token, args.iterations)
+            print(f"{label:<16}{elapsed / args.iterations * 1e6:>12.2f}{args.iterations / elapsed:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark der Excel-Konvertierung: Spitzenspeicher und Laufzeit bei großen Exporttabellen
+
+Erzeugt eine Exporttabelle (Standard: 200.000 Zeilen × 12 Spalten) und misst jede Variante
+in einem eigenen Prozess (Spitzen-RSS, Laufzeit):
+1. bisher openpyxl: Read-only-Workbook, Zellzugriff über sheet.cell() innerhalb von
+   max_rows/max_cols (jeder Zugriff liest die Blattdaten von vorne, die Laufzeit wächst
+   quadratisch mit max_rows: bei 1000 Zeilen mehrere Minuten, ggf. mit --variants auslassen),
+2. bisher Pandas-Fallback: pd.read_excel(sheet_name=None) lädt alle Blätter vollständig,
+   danach Begrenzung auf max_rows/max_cols,
+3. ExcelConverter._convert_to_markdown: Zeilen in einem Durchgang, Abbruch nach max_rows,
+4. ExcelConverter._convert_with_pandas: Pandas-Fallback mit nrows=max_rows.
+
+Die Tabelle wird wie von Excel mit <dimension>-Eintrag gespeichert; mit --unsized fehlt er
+(wie bei Dateien aus dem Write-only-Modus von openpyxl).
+
+Aufruf: python scripts/benchmark/bench_xlsx_streaming.py [--rows 200000] [--cols 12] [--max-rows 1000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+VARIANTS = {
+    'old_openpyxl': "bisher openpyxl (sheet.cell)",
+    'old_pandas': "bisher Pandas-Fallback",
+    'new_openpyxl': "neu openpyxl (iter_rows)",
+    'new_pandas': "neu Pandas-Fallback (nrows)",
+}
+
+
+def peak_rss_mb() -> float:
+    """Spitzen-RSS des Prozesses; VmHWM beginnt anders als ru_maxrss nach exec neu"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_workbook(path: Path, rows: int, cols: int, sized: bool) -> None:
+    """Schreibt die Tabelle im Write-only-Modus und ergänzt auf Wunsch den <dimension>-Eintrag"""
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Export')
+    ws.append([f'Spalte {c + 1}' for c in range(cols)])
+    for r in range(rows):
+        ws.append([r if c == 0 else (f'Eintrag {r}-{c}' if c % 3 else r * 0.25 + c) for c in range(cols)])
+    raw_path = path.with_suffix('.raw.xlsx')
+    wb.save(raw_path)
+
+    with zipfile.ZipFile(raw_path) as src, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if sized and item.filename.startswith('xl/worksheets/sheet'):
+                dimension = f'<dimension ref="A1:{get_column_letter(cols)}{rows + 1}" />'
+                data = data.replace(b'</sheetPr>', b'</sheetPr>' + dimension.encode(), 1)
+            dst.writestr(item, data)
+    raw_path.unlink()
+
+
+def old_openpyxl(converter, path: Path) -> str:
+    """Bisheriger Ablauf von _convert_sheet_to_markdown: Zellzugriff über sheet.cell()"""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(str(path), data_only=True, read_only=True)
+    sheets = []
+    for sheet in wb.worksheets:
+        min_row, max_row, min_col, max_col = 1, sheet.max_row or 50, 1, sheet.max_column or 10
+        max_row = min(max_row, min_row + converter.max_rows - 1)
+        max_col = min(max_col, min_col + converter.max_cols - 1)
+        rows = [[converter._format_cell_value(sheet.cell(row=r, column=c).value)
+                 for c in range(min_col, max_col + 1)] for r in range(min_row, max_row + 1)]
+        lines = ["| " + " | ".join(rows[0]) + " |", "| " + " | ".join(["---"] * len(rows[0])) + " |"]
+        lines += ["| " + " | ".join(row) + " |" for row in rows[1:]]
+        sheets.append("\n".join(lines))
+    return "\n\n".join(sheets)
+
+
+def old_pandas(converter, path: Path) -> str:
+    """Bisheriger Pandas-Fallback: alle Blätter vollständig laden, danach begrenzen"""
+    import pandas as pd
+
+    excel_data = pd.read_excel(path, sheet_name=None)
+    return "\n\n".join(
+        converter._dataframe_to_markdown(df.iloc[:min(len(df), converter.max_rows), :min(df.shape[1], converter.max_cols)])
+        for df in excel_data.values())
+
+
+def run_variant(variant: str, path: Path, max_rows: int, max_cols: int) -> None:
+    """Wird im Kindprozess ausgeführt und gibt Messwerte als JSON aus"""
+    from doc_converter.converters.xlsx_converter import ExcelConverter
+    from doc_converter.utils.logger import LogManager
+
+    LogManager.setup_logging(log_level='WARNING', log_to_file=False)
+    converter = ExcelConverter({'max_rows': max_rows, 'max_cols': max_cols,
+                                'asset_store_dir': str(path.parent / 'assets')})
+    baseline = peak_rss_mb()
+
+    t0 = time.perf_counter()
+    if variant == 'old_openpyxl':
+        markdown = old_openpyxl(converter, path)
+    elif variant == 'old_pandas':
+        markdown = old_pandas(converter, path)
+    elif variant == 'new_openpyxl':
+        markdown, _ = converter._convert_to_markdown(path)
+    else:
+        markdown, _ = converter._convert_with_pandas(path, {})
+    elapsed = time.perf_counter() - t0
+
+    peak = peak_rss_mb()
+    print(json.dumps({'elapsed': elapsed, 'peak_mb': peak, 'delta_mb': peak - baseline,
+                      'lines': markdown.count('\n') + 1}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--cols', type=int, default=12)
+    parser.add_argument('--max-rows', type=int, default=1000)
+    parser.add_argument('--max-cols', type=int, default=20)
+    parser.add_argument('--unsized', action='store_true', help="Tabelle ohne <dimension>-Eintrag speichern")
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_variant(args.run, Path(args.file), args.max_rows, args.max_cols)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='bench_xlsx_') as tmp:
+        path = Path(tmp) / 'export.xlsx'
+        t0 = time.perf_counter()
+        build_workbook(path, args.rows, args.cols, sized=not args.unsized)
+        print(f"{args.rows} Zeilen × {args.cols} Spalten ({path.stat().st_size / 2**20:.1f} MB, "
+              f"{'ohne' if args.unsized else 'mit'} Dimension), erzeugt in {time.perf_counter() - t0:.1f} s; "
+              f"Limits {args.max_rows} Zeilen × {args.max_cols} Spalten")
+
+        for variant in args.variants.split(','):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--run', variant, '--file', str(path),
+                 '--max-rows', str(args.max_rows), '--max-cols', str(args.max_cols)],
+                capture_output=True, text=True)
+            if output.returncode != 0:
+                print(f"  {VARIANTS[variant]:34s} fehlgeschlagen: {output.stderr.strip().splitlines()[-1:]}")
+                continue
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            print(f"  {VARIANTS[variant]:34s} {result['elapsed']:8.2f} s  Spitzen-RSS {result['peak_mb']:7.1f} MB "
+                  f"(+{result['delta_mb']:.1f} MB)  {result['lines']} Zeilen Markdown")
+
+
+if __name__ == '__main__':
+    main()
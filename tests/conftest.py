@@ -0,0 +1,12 @@
+"""
+Gemeinsame Einstellungen für die Tests der Module unter modules/ und doc_converter/
+"""
+import os
+import sys
+import tempfile
+
+# Config liest BASE_DIR beim Import; Logs und Datenbanken der Tests landen in einem
+# temporären Verzeichnis statt unter /opt/nscale-assist
+os.environ.setdefault('BASE_DIR', tempfile.mkdtemp(prefix='nscale_tests_'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,111 @@
+"""
+Tests für den inhaltsadressierten Bildspeicher (doc_converter/utils/asset_store.py)
+"""
+import os
+import stat
+
+import pytest
+
+from doc_converter.utils.asset_store import AssetStore
+
+LOGO = b'\x89PNG Logo'
+
+
+class _Prepare:
+    """Zählt die Aufrufe und liefert die Rohdaten als 'verarbeitetes' Bild"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, data):
+        self.calls.append(data)
+        return {'data': data.upper(), 'ext': 'png', 'width': 10, 'height': 5}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AssetStore(tmp_path / 'store')
+
+
+def test_same_bytes_across_documents_are_stored_and_prepared_once(store, tmp_path):
+    prepare = _Prepare()
+
+    first = store.add(LOGO, tmp_path / 'doc1' / 'assets', prepare=prepare)
+    second = store.add(LOGO, tmp_path / 'doc2' / 'assets', prepare=prepare)
+
+    assert prepare.calls == [LOGO]
+    assert first['filename'] == second['filename']
+    assert (first['reused'], second['reused']) == (False, True)
+    assert (first['width'], first['height']) == (10, 5)
+    linked = [tmp_path / doc / 'assets' / first['filename'] for doc in ('doc1', 'doc2')]
+    assert all(path.read_bytes() == LOGO.upper() for path in linked)
+    assert os.path.samefile(*linked)
+    stats = store.stats()
+    assert (stats['images'], stats['stored'], stats['reused']) == (2, 1, 1)
+    assert stats['bytes_reused'] == len(LOGO)
+
+
+def test_variant_produces_a_separate_asset(store, tmp_path):
+    prepare = _Prepare()
+
+    small = store.add(LOGO, tmp_path / 'assets', prepare=prepare, variant='max=800')
+    large = store.add(LOGO, tmp_path / 'assets', prepare=prepare, variant='max=1600')
+
+    assert len(prepare.calls) == 2
+    assert small['filename'] != large['filename']
+
+
+def test_skipped_images_are_remembered(store, tmp_path):
+    calls = []
+
+    def too_small(data):
+        calls.append(data)
+        return None
+
+    assert store.add(LOGO, tmp_path / 'assets', prepare=too_small) is None
+    assert store.add(LOGO, tmp_path / 'assets', prepare=too_small) is None
+    assert len(calls) == 1
+    assert store.stats()['skipped'] == 2
+
+
+def test_metadata_written_by_another_process_is_picked_up(store, tmp_path):
+    store.add(LOGO, tmp_path / 'doc1', prepare=_Prepare())
+
+    # Neue Instanz ohne Index im Speicher, wie ein anderer Worker-Prozess
+    other = AssetStore(tmp_path / 'store')
+    prepare = _Prepare()
+    asset = other.add(LOGO, tmp_path / 'doc2', prepare=prepare)
+
+    assert prepare.calls == []
+    assert asset['reused'] is True
+    assert (asset['width'], asset['height']) == (10, 5)
+    assert (tmp_path / 'doc2' / asset['filename']).read_bytes() == LOGO.upper()
+
+
+def test_stored_images_are_read_only_and_edits_are_detected(store, tmp_path):
+    asset = store.add(LOGO, tmp_path / 'doc1', prepare=_Prepare())
+    linked = tmp_path / 'doc1' / asset['filename']
+    assert not os.stat(linked).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+    # Bearbeitung des Hardlinks an Ort und Stelle (z.B. als root trotz Schreibschutz)
+    os.chmod(linked, 0o644)
+    with open(linked, 'r+b') as f:
+        f.write(b'X')
+
+    other = AssetStore(tmp_path / 'store')
+    prepare = _Prepare()
+    asset = other.add(LOGO, tmp_path / 'doc2', prepare=prepare)
+
+    assert prepare.calls == [LOGO]
+    assert (tmp_path / 'doc2' / asset['filename']).read_bytes() == LOGO.upper()
+
+
+def test_copy_mode_gives_documents_independent_files(tmp_path):
+    store = AssetStore(tmp_path / 'store', link_mode='copy')
+    asset = store.add(LOGO, tmp_path / 'doc1', prepare=_Prepare())
+
+    (tmp_path / 'doc1' / asset['filename']).write_bytes(b'bearbeitet')
+    again = store.add(LOGO, tmp_path / 'doc2', prepare=_Prepare())
+
+    assert again['reused'] is True
+    assert (tmp_path / 'doc2' / again['filename']).read_bytes() == LOGO.upper()
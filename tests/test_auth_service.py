@@ -0,0 +1,70 @@
+"""
+Tests für Anmeldung und Sperre nach Fehlversuchen (modules/auth/auth_service.py)
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.auth import auth_service, token_cache
+from modules.auth.auth_service import AuthService, LoginRateLimitError, LoginRateLimiter
+from modules.core.config import Config
+
+pytest.importorskip('jose')
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    from modules.auth.user_model import UserManager
+
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'users.db')
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_ITERATIONS', 1000)
+    monkeypatch.setattr(token_cache, '_token_cache', None)
+    monkeypatch.setattr(auth_service, '_DUMMY_HASH', None)
+    executor = ThreadPoolExecutor(max_workers=1)
+    service = AuthService(UserManager(), executor=executor,
+                          rate_limiter=LoginRateLimiter(max_attempts=5, window=300, lockout=300))
+    asyncio.run(service.register_user('anna@example.com', 'richtig'))
+    asyncio.run(service.register_user('bernd@example.com', 'richtig'))
+    yield service
+    executor.shutdown()
+
+
+def login(service, email, password):
+    return asyncio.run(service.authenticate(email, password))
+
+
+def test_each_failed_login_counts_once(service):
+    for _ in range(4):
+        assert login(service, 'anna@example.com', 'falsch') is None
+    # Nach vier Fehlversuchen ist das Konto noch nicht gesperrt
+    assert login(service, 'anna@example.com', 'richtig')
+
+
+def test_account_locks_after_max_attempts(service):
+    for _ in range(5):
+        assert login(service, 'anna@example.com', 'falsch') is None
+    with pytest.raises(LoginRateLimitError) as excinfo:
+        login(service, 'anna@example.com', 'richtig')
+    assert excinfo.value.retry_after > 0
+
+
+def test_lockout_does_not_affect_other_accounts(service):
+    for _ in range(5):
+        login(service, 'anna@example.com', 'falsch')
+    assert login(service, 'bernd@example.com', 'richtig')
+
+
+def test_successful_login_resets_failures(service):
+    for _ in range(4):
+        login(service, 'anna@example.com', 'falsch')
+    assert login(service, 'anna@example.com', 'richtig')
+    for _ in range(4):
+        login(service, 'anna@example.com', 'falsch')
+    assert login(service, 'anna@example.com', 'richtig')
+
+
+def test_unknown_account_uses_lazily_computed_dummy_hash(service):
+    assert auth_service._DUMMY_HASH is None
+    assert login(service, 'unbekannt@example.com', 'egal') is None
+    assert auth_service._DUMMY_HASH is not None
@@ -0,0 +1,103 @@
+"""
+Tests für die Volltextsuche im Chatverlauf (modules/session/chat_history.py)
+"""
+import pytest
+
+from api.routes_config import SESSION_ROUTES, build_api_url
+from modules.core import response_cache
+from modules.core.config import Config
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    from modules.session.chat_history import ChatHistoryManager
+
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'users.db')
+    monkeypatch.setattr(Config, 'RESPONSE_CACHE_PATH', tmp_path / 'responses.db')
+    monkeypatch.setattr(Config, 'SESSION_ARCHIVE_DIR', tmp_path / 'archive')
+    monkeypatch.setattr(response_cache, '_response_cache', None)
+    manager = ChatHistoryManager()
+    if not manager.search_enabled:
+        pytest.skip("SQLite ohne FTS5")
+    return manager
+
+
+def _session(history, user_id, title, *messages):
+    session_id = history.create_session(user_id, title)
+    for i, message in enumerate(messages):
+        history.add_message(session_id, message, is_user=i % 2 == 0)
+    return session_id
+
+
+def test_search_route_is_versioned():
+    # Kollidiert nicht mit /api/sessions/{session_id}
+    assert build_api_url(SESSION_ROUTES.SEARCH) == '/api/v1/sessions/search'
+
+
+def test_results_are_limited_to_the_owner(history):
+    own = _session(history, 1, "Eigene", "Der Drucker druckt nicht")
+    _session(history, 12, "Fremde", "Mein Drucker ist defekt", "u1 Drucker")
+    _session(history, 2, "Andere", "Drucker im Flur")
+
+    result = history.search_messages(1, "Drucker")
+
+    assert [r['session_id'] for r in result['results']] == [own]
+    # Der Titel wird aus der ersten Nachricht erzeugt
+    assert result['results'][0]['session_title'] == history.get_user_sessions(1)[0]['title']
+    assert result['results'][0]['is_user'] is True
+    assert history.search_messages(3, "Drucker")['results'] == []
+
+
+def test_results_are_ranked_and_excerpts_are_escaped_and_marked(history):
+    _session(history, 1, "Lang",
+             "Allgemeine Frage zur Installation mit vielen weiteren Wörtern, "
+             "in der das Archiv nur einmal am Rande vorkommt und sonst nichts passt")
+    frequent = _session(history, 1, "Archiv", "Archiv <b>Archiv</b> & Archivierung")
+
+    results = history.search_messages(1, "archiv")['results']
+
+    assert [r['session_id'] for r in results][0] == frequent
+    assert [r['rank'] for r in results] == [1, 2]
+    assert results[0]['excerpt'] == ("<mark>Archiv</mark> &lt;b&gt;<mark>Archiv</mark>&lt;/b&gt; "
+                                     "&amp; <mark>Archivierung</mark>")
+
+
+def test_long_messages_are_cut_around_the_first_hit(history):
+    text = "Vorspann " * 40 + "Suchbegriff" + " Nachspann" * 40
+    _session(history, 1, "Lang", text)
+
+    excerpt = history.search_messages(1, "suchbegriff", highlight=('[', ']'))['results'][0]['excerpt']
+
+    assert excerpt.startswith("…") and excerpt.endswith("…")
+    assert "[Suchbegriff]" in excerpt
+    assert len(excerpt) < len(text)
+
+
+def test_paging_returns_disjoint_pages_with_has_more(history):
+    _session(history, 1, "Viele", *[f"Rechnung Nummer {i}" for i in range(5)])
+
+    pages = [history.search_messages(1, "Rechnung", limit=2, offset=offset) for offset in (0, 2, 4)]
+
+    assert [page['has_more'] for page in pages] == [True, True, False]
+    assert [len(page['results']) for page in pages] == [2, 2, 1]
+    assert [r['rank'] for page in pages for r in page['results']] == [1, 2, 3, 4, 5]
+    ids = [r['message_id'] for page in pages for r in page['results']]
+    assert len(set(ids)) == 5
+
+
+def test_archived_sessions_are_not_found_until_rehydrated(history):
+    archived = _session(history, 1, "Alt", "Vertrag verlängern")
+    live = _session(history, 1, "Neu", "Vertrag kündigen")
+    assert history.archiver.archive_session(archived)
+
+    assert [r['session_id'] for r in history.search_messages(1, "Vertrag")['results']] == [live]
+
+    assert history.archiver.rehydrate_session(archived)
+    assert {r['session_id'] for r in history.search_messages(1, "Vertrag")['results']} == {archived, live}
+
+
+def test_empty_or_quoted_terms_do_not_raise(history):
+    _session(history, 1, "Zitat", 'Er sagte "hallo" OR NOT')
+
+    assert history.search_messages(1, "   ")['results'] == []
+    assert len(history.search_messages(1, '"hallo" OR')['results']) == 1
@@ -0,0 +1,136 @@
+"""
+Tests für die Komprimierung und die JSON-Antworten (modules/core/responses.py)
+"""
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import uuid
+import zlib
+
+import pytest
+
+pytest.importorskip('starlette')
+
+from modules.core import responses
+from modules.core.responses import CompressionMiddleware, FastJSONResponse, _select_encoding, accepted_encodings
+
+JSON_BODY = json.dumps([{'id': i, 'text': 'Antwort'} for i in range(200)]).encode()
+
+
+def _app(body_chunks, content_type='application/json', extra_headers=()):
+    async def app(scope, receive, send):
+        headers = [(b'content-type', content_type.encode())] + list(extra_headers)
+        if len(body_chunks) == 1:
+            headers.append((b'content-length', str(len(body_chunks[0])).encode()))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        for i, chunk in enumerate(body_chunks):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': i < len(body_chunks) - 1})
+    return app
+
+
+def _call(app, accept_encoding='gzip', minimum_size=1024):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/',
+             'headers': [(b'accept-encoding', accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, None, send))
+    start, bodies = messages[0], messages[1:]
+    headers = {}
+    for name, value in start['headers']:
+        headers.setdefault(name.decode(), value.decode())
+    return headers, bodies, b''.join(m.get('body', b'') for m in bodies)
+
+
+def test_small_bodies_are_sent_unchanged():
+    headers, _, body = _call(_app([b'{"ok":true}']))
+
+    assert body == b'{"ok":true}'
+    assert 'content-encoding' not in headers
+    assert headers['content-length'] == str(len(body))
+
+
+def test_body_without_savings_is_sent_unchanged():
+    payload = os.urandom(4096)
+
+    headers, _, body = _call(_app([payload], content_type='application/x-custom'))
+
+    assert body == payload
+    assert 'content-encoding' not in headers
+    assert headers['content-length'] == '4096'
+
+
+def test_compressed_body_sets_vary_and_content_length():
+    headers, _, body = _call(_app([JSON_BODY], extra_headers=[(b'vary', b'Origin')]))
+
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['content-length'] == str(len(body))
+    assert headers['vary'] == 'Origin, Accept-Encoding'
+    assert gzip.decompress(body) == JSON_BODY
+
+
+@pytest.mark.parametrize('content_type, encoding', [
+    ('text/event-stream', None),
+    ('application/json', 'br'),
+])
+def test_event_streams_and_encoded_bodies_pass_through(content_type, encoding):
+    extra_headers = [(b'content-encoding', encoding.encode())] if encoding else []
+    chunks = [b'data: eins\n\n' * 200, b'data: zwei\n\n' * 200]
+
+    headers, bodies, body = _call(_app(chunks, content_type=content_type, extra_headers=extra_headers))
+
+    assert [m['body'] for m in bodies] == chunks
+    assert headers.get('content-encoding') == encoding
+    assert 'vary' not in headers
+
+
+def test_streamed_body_is_compressed_per_chunk_and_finished():
+    chunks = [JSON_BODY[:1000], JSON_BODY[1000:3000], JSON_BODY[3000:]]
+
+    headers, bodies, body = _call(_app(chunks))
+
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert 'content-length' not in headers
+    assert len(bodies) == len(chunks)
+    assert [m['more_body'] for m in bodies] == [True, True, False]
+    # Jeder Block ist geflusht und sofort lesbar, der letzte schließt den Strom ab
+    decoder = zlib.decompressobj(31)
+    assert decoder.decompress(bodies[0]['body']) == chunks[0]
+    assert decoder.decompress(b''.join(m['body'] for m in bodies[1:])) == b''.join(chunks[1:])
+    assert decoder.eof
+    assert gzip.decompress(body) == JSON_BODY
+
+
+def test_refused_encodings_are_not_selected_through_wildcard():
+    assert _select_encoding('br;q=0, *') == 'gzip'
+    assert _select_encoding('br;q=0, gzip;q=0, *') is None
+    assert _select_encoding('gzip;q=0, identity') is None
+    assert _select_encoding('gzip, br;q=0.5') == ('br' if responses.BROTLI_AVAILABLE else 'gzip')
+
+
+def test_accepted_encodings_are_limited_to_the_supported_ones():
+    supported = ('br', 'gzip')
+
+    assert accepted_encodings('br;q=0, *', supported) == {'gzip'}
+    assert accepted_encodings('gzip;q=0, br;q=0, *;q=0.5', supported) == set()
+    assert accepted_encodings('GZIP, br;q=0.5, deflate', supported) == {'gzip', 'br'}
+    assert accepted_encodings('*;q=0', supported) == set()
+    assert accepted_encodings('', supported) == set()
+
+
+def test_fast_json_response_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, 'ORJSON_AVAILABLE', False)
+    ident = uuid.UUID(int=1)
+    content = {'zeit': datetime.date(2024, 5, 1), 'tags': {'a'}, 'id': ident, 'text': 'Grüße', 'n': 1}
+
+    response = FastJSONResponse(content)
+
+    assert json.loads(response.body) == {'zeit': '2024-05-01', 'tags': ['a'], 'id': str(ident),
+                                         'text': 'Grüße', 'n': 1}
+    assert 'Grüße'.encode() in response.body
+    assert response.headers['content-type'] == 'application/json'
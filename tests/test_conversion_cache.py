@@ -0,0 +1,106 @@
+"""
+Tests für den Konvertierungs-Cache (doc_converter/utils/conversion_cache.py)
+"""
+import os
+import stat
+
+import pytest
+
+from doc_converter.utils.conversion_cache import ConversionCache
+
+FINGERPRINT = {'converter': 'DocxConverter', 'version': '2', 'config': {'extract_images': True}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'handbuch.docx'
+    path.write_bytes(b'Quelle v1')
+    return path
+
+
+def _store(cache, tmp_path, key, text="# Handbuch\n"):
+    staging = tmp_path / f'staging_{len(list(tmp_path.glob("staging_*")))}'
+    (staging / 'assets').mkdir(parents=True)
+    (staging / 'handbuch.md').write_text(text, encoding='utf-8')
+    (staging / 'assets' / 'bild.png').write_bytes(b'PNG')
+    return cache.store(key, staging, staging / 'handbuch.md', {'source': 'handbuch.docx', 'success': True}, 1.5)
+
+
+def test_miss_then_hit_materializes_the_stored_files(cache, source, tmp_path):
+    key = cache.make_key(source, FINGERPRINT)
+    assert cache.lookup(key) is None
+
+    _store(cache, tmp_path, key)
+    entry = cache.lookup(key)
+
+    assert entry is not None
+    assert entry['result'] == {'success': True}
+    assert entry['conversion_time'] == 1.5
+    target = cache.materialize(entry, tmp_path / 'out')
+    assert target == tmp_path / 'out' / 'handbuch.md'
+    assert target.read_text(encoding='utf-8') == "# Handbuch\n"
+    assert (tmp_path / 'out' / 'assets' / 'bild.png').read_bytes() == b'PNG'
+
+
+def test_changed_source_or_fingerprint_changes_the_key(cache, source):
+    key = cache.make_key(source, FINGERPRINT)
+
+    assert cache.make_key(source, FINGERPRINT) == key
+    assert cache.make_key(source, {**FINGERPRINT, 'version': '3'}) != key
+    source.write_bytes(b'Quelle v2')
+    assert cache.make_key(source, FINGERPRINT) != key
+
+
+def test_objects_are_read_only(cache, source, tmp_path):
+    key = cache.make_key(source, FINGERPRINT)
+    entry = _store(cache, tmp_path, key)
+
+    target = cache.materialize(entry, tmp_path / 'out')
+
+    assert not os.stat(target).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+
+
+def test_copy_mode_produces_writable_independent_files(tmp_path, source):
+    cache = ConversionCache(tmp_path / 'cache', link_mode='copy')
+    key = cache.make_key(source, FINGERPRINT)
+    entry = _store(cache, tmp_path, key)
+
+    target = cache.materialize(entry, tmp_path / 'out')
+    target.write_text("# Bearbeitet\n", encoding='utf-8')
+
+    assert cache.lookup(key) is not None
+    assert cache.materialize(cache.lookup(key), tmp_path / 'out2').read_text(encoding='utf-8') == "# Handbuch\n"
+
+
+def test_in_place_edit_of_hardlinked_target_invalidates_the_entry(cache, source, tmp_path):
+    key = cache.make_key(source, FINGERPRINT)
+    entry = _store(cache, tmp_path, key)
+    target = cache.materialize(entry, tmp_path / 'out')
+
+    # Bearbeitung an Ort und Stelle mit gleicher Größe (z.B. als root trotz Schreibschutz)
+    os.chmod(target, 0o644)
+    with open(target, 'r+', encoding='utf-8') as f:
+        f.write("# HANDBUCH\n")
+
+    assert cache.lookup(key) is None
+
+    # Die nächste Konvertierung legt ein intaktes Objekt ab
+    _store(cache, tmp_path, key)
+    entry = cache.lookup(key)
+    assert entry is not None
+    assert cache.materialize(entry, tmp_path / 'neu').read_text(encoding='utf-8') == "# Handbuch\n"
+
+
+def test_missing_object_is_a_miss(cache, source, tmp_path):
+    key = cache.make_key(source, FINGERPRINT)
+    entry = _store(cache, tmp_path, key)
+    digest = entry['files']['assets/bild.png']['hash']
+
+    (cache.objects_dir / digest[:2] / digest).unlink()
+
+    assert cache.lookup(key) is None
@@ -0,0 +1,108 @@
+"""
+Tests für den Feedback-Export (modules/feedback/feedback_export.py)
+"""
+import csv
+import io
+import json
+import zipfile
+
+import pytest
+
+from modules.feedback.feedback_export import (
+    EXPORT_FORMATS, export_media_type, iter_export, validate_export
+)
+
+FIELDS = ['id', 'user_email', 'is_positive', 'question', 'answer', 'sources', 'created_at']
+
+
+def _rows(count=3):
+    for i in range(count):
+        yield {
+            'id': i + 1,
+            'user_email': f'user{i}@example.org',
+            'is_positive': i % 2 == 0,
+            'question': f'Frage {i} mit Umlauten äöü, "Anführungszeichen" und\nZeilenumbruch',
+            'answer': 'Antwort <b>&</b> ' + 'x' * 10,
+            'sources': json.dumps([{'file': f'doc{i}.pdf'}]),
+            'created_at': 1700000000 + i,
+        }
+
+
+def _export(fmt, count=3, fields=FIELDS) -> bytes:
+    return b''.join(iter_export(_rows(count), fmt, fields))
+
+
+def test_csv_roundtrip():
+    rows = list(csv.DictReader(io.StringIO(_export('csv').decode('utf-8-sig'))))
+    assert [row['id'] for row in rows] == ['1', '2', '3']
+    assert rows[0]['question'].endswith('"Anführungszeichen" und\nZeilenumbruch')
+    assert rows[0]['is_positive'] == 'ja'
+
+
+def test_json_and_ndjson_agree():
+    as_json = json.loads(_export('json'))
+    as_ndjson = [json.loads(line) for line in _export('ndjson').decode('utf-8').splitlines()]
+    assert as_json == as_ndjson
+    assert as_json[1]['created_at'] == 1700000001000
+    assert as_json[2]['sources'] == [{'file': 'doc2.pdf'}]
+
+
+def test_xlsx_is_a_valid_workbook():
+    data = _export('xlsx')
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert '[Content_Types].xml' in archive.namelist()
+        sheet = next(name for name in archive.namelist() if name.startswith('xl/worksheets/'))
+        xml = archive.read(sheet).decode('utf-8')
+    assert 'Antwort &lt;b&gt;&amp;&lt;/b&gt;' in xml
+
+    openpyxl = pytest.importorskip('openpyxl')
+    sheet = openpyxl.load_workbook(io.BytesIO(data), read_only=True).active
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0] == FIELDS
+    assert len(values) == 4
+    assert values[1][0] == 1
+
+
+def test_parquet_roundtrip():
+    pq = pytest.importorskip('pyarrow.parquet')
+    table = pq.read_table(io.BytesIO(_export('parquet', count=5)))
+    assert table.num_rows == 5
+    assert table.column('id').to_pylist() == [1, 2, 3, 4, 5]
+    assert table.column('is_positive').to_pylist()[:2] == [True, False]
+
+
+def test_pdf_is_well_formed():
+    data = _export('pdf', count=200)
+    assert data.startswith(b'%PDF-')
+    assert data.rstrip().endswith(b'%%EOF')
+
+    fitz = pytest.importorskip('fitz')
+    document = fitz.open(stream=data, filetype='pdf')
+    assert document.page_count > 1
+    assert 'user0@example.org' in document[0].get_text()
+
+
+def test_every_format_has_a_media_type():
+    assert set(EXPORT_FORMATS) == {'csv', 'json', 'ndjson', 'xlsx', 'parquet', 'pdf'}
+    assert export_media_type('CSV').startswith('text/csv')
+
+
+def test_validation_rejects_unknown_format_and_fields():
+    with pytest.raises(ValueError):
+        validate_export('docx')
+    with pytest.raises(ValueError):
+        validate_export('csv', ['id', 'password_hash'])
+    assert validate_export('csv', None)[0] == 'id'
+
+
+def test_export_streams_rows_lazily():
+    consumed = []
+
+    def rows():
+        for row in _rows(1000):
+            consumed.append(row['id'])
+            yield row
+
+    chunks = iter_export(rows(), 'ndjson', FIELDS)
+    next(chunks)
+    assert len(consumed) < 1000
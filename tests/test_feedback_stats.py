@@ -0,0 +1,108 @@
+"""
+Tests für die Feedback-Statistik (modules/feedback/feedback_manager.py)
+"""
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from modules.core import response_cache
+from modules.core.config import Config
+
+
+@pytest.fixture
+def managers(tmp_path, monkeypatch):
+    from modules.feedback.feedback_manager import FeedbackManager
+    from modules.session.chat_history import ChatHistoryManager
+
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'users.db')
+    monkeypatch.setattr(Config, 'RESPONSE_CACHE_PATH', tmp_path / 'responses.db')
+    monkeypatch.setattr(response_cache, '_response_cache', None, raising=False)
+    return ChatHistoryManager(), FeedbackManager()
+
+
+def test_feedback_rate_is_share_of_answers_with_feedback(managers):
+    history, feedback = managers
+    session_id = history.create_session(1, "Test")
+    answers = []
+    for i in range(4):
+        history.add_message(session_id, f"Frage {i}", is_user=True)
+        answers.append(history.add_message(session_id, f"Antwort {i}", is_user=False))
+
+    assert feedback.get_feedback_stats()['feedback_rate'] == 0
+    feedback.add_feedback(answers[0], session_id, 1, True)
+    feedback.add_feedback(answers[1], session_id, 1, False, comment="falsch")
+
+    stats = feedback.get_feedback_stats()
+    assert stats['total'] == 2
+    assert stats['feedback_rate'] == 50.0
+
+
+def test_answer_counters_follow_deletes_and_repeat_feedback(managers):
+    history, feedback = managers
+    session_id = history.create_session(1, "Test")
+    answers = [history.add_message(session_id, f"Antwort {i}", is_user=False) for i in range(2)]
+    feedback.add_feedback(answers[0], session_id, 1, True)
+    feedback.add_feedback(answers[0], session_id, 2, False)
+
+    assert feedback.get_feedback_stats()['feedback_rate'] == 50.0
+
+    history.delete_session(session_id, 1)
+    assert feedback.get_feedback_stats()['feedback_rate'] == 0
+
+
+def test_feedback_rate_does_not_scan_messages(managers):
+    history, feedback = managers
+    session_id = history.create_session(1, "Test")
+    answer = history.add_message(session_id, "Antwort", is_user=False)
+    feedback.add_feedback(answer, session_id, 1, True)
+    feedback.get_feedback_stats()
+
+    statements = []
+    real_connect = sqlite3.connect
+
+    def tracing_connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    with patch.object(sqlite3, 'connect', tracing_connect):
+        assert feedback.get_feedback_stats()['feedback_rate'] == 100.0
+    assert statements
+    assert not [s for s in statements if 'chat_messages' in s or 'message_feedback' in s]
+
+
+def test_counters_are_built_once_for_existing_history(managers, tmp_path):
+    from modules.feedback.feedback_manager import FeedbackManager
+
+    history, feedback = managers
+    session_id = history.create_session(1, "Test")
+    answer = history.add_message(session_id, "Antwort", is_user=False)
+    history.add_message(session_id, "Antwort 2", is_user=False)
+    feedback.add_feedback(answer, session_id, 1, True)
+
+    conn = sqlite3.connect(Config.DB_PATH)
+    conn.execute("DROP TRIGGER feedback_answers_ai")
+    conn.execute("DELETE FROM feedback_counters WHERE scope IN ('answers', 'rated')")
+    conn.commit()
+    conn.close()
+
+    assert FeedbackManager().get_feedback_stats()['feedback_rate'] == 50.0
+
+
+def test_counters_are_installed_when_chat_tables_appear_later(tmp_path, monkeypatch):
+    from modules.feedback.feedback_manager import FeedbackManager
+    from modules.session.chat_history import ChatHistoryManager
+
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'users.db')
+    monkeypatch.setattr(Config, 'RESPONSE_CACHE_PATH', tmp_path / 'responses.db')
+    monkeypatch.setattr(response_cache, '_response_cache', None, raising=False)
+    # Reihenfolge wie in api/server.py: FeedbackManager vor ChatHistoryManager
+    feedback = FeedbackManager()
+    history = ChatHistoryManager()
+
+    assert feedback.get_feedback_stats()['feedback_rate'] == 0
+    session_id = history.create_session(1, "Test")
+    answer = history.add_message(session_id, "Antwort", is_user=False)
+    feedback.add_feedback(answer, session_id, 1, True)
+    assert feedback.get_feedback_stats()['feedback_rate'] == 100.0
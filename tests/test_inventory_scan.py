@@ -0,0 +1,125 @@
+"""
+Tests für die inkrementelle Inventarisierung (doc_converter/inventory/scan_cache.py,
+inventory_scanner.py)
+"""
+import os
+
+import pytest
+
+from doc_converter.inventory.scan_cache import ScanCache
+
+
+def test_prune_only_touches_entries_below_the_scanned_root(tmp_path):
+    cache = ScanCache(tmp_path / 'cache.sqlite')
+    root = tmp_path / 'daten'
+    entries = [root / 'a.txt', root / 'sub' / 'b.txt', tmp_path / 'daten2' / 'c.txt', tmp_path / 'andere' / 'd.txt']
+    for path in entries:
+        cache.put(str(path), 1, 1, {'path': str(path)})
+    cache.flush()
+
+    removed = cache.prune(root, seen={str(root / 'a.txt')})
+
+    assert removed == 1
+    cache.load(tmp_path)
+    assert set(cache._index) == {str(p) for p in entries} - {str(root / 'sub' / 'b.txt')}
+    cache.close()
+
+
+def test_lookup_requires_matching_size_and_mtime(tmp_path):
+    cache = ScanCache(tmp_path / 'cache.sqlite')
+    cache.put('/daten/a.txt', 10, 100, {'title': 'a'})
+    cache.close()
+
+    cache = ScanCache(tmp_path / 'cache.sqlite')
+    assert cache.load(tmp_path / 'leer') == 0
+    assert cache.load('/daten') == 1
+    assert cache.lookup('/daten/a.txt', 10, 100) == {'title': 'a'}
+    assert cache.lookup('/daten/a.txt', 11, 100) is None
+    assert cache.lookup('/daten/a.txt', 10, 101) is None
+    cache.close()
+
+
+@pytest.fixture
+def scanner(tmp_path, monkeypatch):
+    for module in ('magic', 'fitz', 'docx', 'pandas'):
+        pytest.importorskip(module)
+    from doc_converter.inventory.inventory_scanner import DocumentScanner
+
+    scanner = DocumentScanner({'parallel_processing': False,
+                               'inventory_cache_file': str(tmp_path / 'cache' / 'scan.sqlite')})
+    scanner.extracted = []
+
+    def extract(file_path):
+        scanner.extracted.append(str(file_path))
+        return {'path': str(file_path), 'size': file_path.stat().st_size}
+
+    monkeypatch.setattr(scanner, 'extract_document_metadata', extract)
+    return scanner
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / 'daten'
+    (root / 'sub').mkdir(parents=True)
+    (root / 'a.txt').write_text('eins')
+    (root / 'sub' / 'b.md').write_text('zwei')
+    # Der Scanner arbeitet mit aufgelösten Pfaden
+    return root.resolve()
+
+
+def _scan(scanner, root):
+    scanner.extracted.clear()
+    return sorted(doc['path'] for doc in scanner.iter_documents(root))
+
+
+def test_unchanged_files_are_served_from_the_cache(scanner, root):
+    first = _scan(scanner, root)
+    assert sorted(scanner.extracted) == first == [str(root / 'a.txt'), str(root / 'sub' / 'b.md')]
+
+    assert _scan(scanner, root) == first
+    assert scanner.extracted == []
+
+
+def test_size_or_mtime_change_forces_reextraction(scanner, root):
+    _scan(scanner, root)
+    a, b = root / 'a.txt', root / 'sub' / 'b.md'
+
+    # Größe ändern, Änderungszeit beibehalten
+    stat = a.stat()
+    a.write_text('eins und mehr')
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    # Nur die Änderungszeit ändern
+    stat = b.stat()
+    os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    _scan(scanner, root)
+
+    assert sorted(scanner.extracted) == [str(a), str(b)]
+    assert _scan(scanner, root) and scanner.extracted == []
+
+
+def test_deleted_files_are_pruned_only_below_the_scanned_root(scanner, root):
+    sibling = root.parent / 'daten2'
+    sibling.mkdir()
+    (sibling / 'c.txt').write_text('drei')
+    _scan(scanner, root)
+    _scan(scanner, sibling)
+
+    (root / 'a.txt').unlink()
+    assert _scan(scanner, root) == [str(root / 'sub' / 'b.md')]
+
+    # Der Eintrag im Nachbarverzeichnis mit gleichem Namensanfang bleibt erhalten
+    assert _scan(scanner, sibling) == [str(sibling / 'c.txt')]
+    assert scanner.extracted == []
+    cache = ScanCache(scanner.cache_file)
+    cache.load(root.parent)
+    assert set(cache._index) == {str(root / 'sub' / 'b.md'), str(sibling / 'c.txt')}
+    cache.close()
+
+
+def test_relative_and_absolute_roots_share_cache_entries(scanner, root, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert _scan(scanner, 'daten') == [str(root / 'a.txt'), str(root / 'sub' / 'b.md')]
+
+    assert _scan(scanner, root) == [str(root / 'a.txt'), str(root / 'sub' / 'b.md')]
+    assert scanner.extracted == []
@@ -0,0 +1,109 @@
+"""
+Tests für Vergabe und Wiederaufnahme von Aufträgen (doc_converter/web/job_queue.py)
+"""
+import io
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import pytest
+
+job_queue = pytest.importorskip('doc_converter.web.job_queue')
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return job_queue.JobQueue(converter=None, config={'jobs_dir': str(tmp_path / 'jobs'), 'job_max_attempts': 2})
+
+
+def _submit(queue, name='bericht.pdf'):
+    return queue.submit(name, io.BytesIO(b'%PDF-1.4'))['job_id']
+
+
+def _set_running(queue, job_id, owner, heartbeat, attempts=1):
+    with queue._connect(write=True) as conn:
+        conn.execute("UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, started = ?, attempts = ? "
+                     "WHERE job_id = ?", (owner, heartbeat, time.time(), attempts, job_id))
+
+
+def _status(queue, job_id):
+    return queue.get(job_id)['status']
+
+
+def test_claim_registers_the_job_before_commit(queue, monkeypatch):
+    job_id = _submit(queue)
+    connect = queue._connect
+    active_before_commit = []
+
+    @contextmanager
+    def checking_connect(write=False):
+        with connect(write) as conn:
+            yield conn
+            if write:
+                active_before_commit.append(set(queue._active))
+
+    monkeypatch.setattr(queue, '_connect', checking_connect)
+    row = queue._claim()
+
+    assert row['job_id'] == job_id
+    assert active_before_commit == [{job_id}]
+    # Unmittelbar danach darf recover() den eigenen Auftrag nicht wieder einreihen
+    assert queue.recover() == 0
+    assert _status(queue, job_id) == 'running'
+
+
+def test_failed_claim_leaves_nothing_active(queue, monkeypatch):
+    job_id = _submit(queue)
+    connect = queue._connect
+
+    @contextmanager
+    def failing_connect(write=False):
+        with connect(write) as conn:
+            yield conn
+            raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(queue, '_connect', failing_connect)
+    with pytest.raises(sqlite3.OperationalError):
+        queue._claim()
+    monkeypatch.undo()
+
+    assert queue._active == {}
+    assert _status(queue, job_id) == 'queued'
+
+
+def test_claim_takes_jobs_in_submission_order(queue):
+    first, second = _submit(queue, 'a.pdf'), _submit(queue, 'b.pdf')
+
+    assert queue._claim()['job_id'] == first
+    assert queue._claim()['job_id'] == second
+    assert queue._claim() is None
+    assert queue.count('running') == 2
+
+
+def test_recover_requeues_jobs_of_dead_owners(queue):
+    job_id = _submit(queue)
+    # Eigene PID ohne aktiven Auftrag: Vorgänger mit derselben PID
+    _set_running(queue, job_id, queue.owner, time.time())
+
+    assert queue.recover() == 1
+    assert _status(queue, job_id) == 'queued'
+
+
+def test_recover_keeps_live_foreign_jobs_and_requeues_stale_ones(queue):
+    live, stale = _submit(queue, 'a.pdf'), _submit(queue, 'b.pdf')
+    now = time.time()
+    _set_running(queue, live, 'anderer-server:4711', now)
+    _set_running(queue, stale, 'anderer-server:4712', now - job_queue.STALE_AFTER - 1)
+
+    assert queue.recover() == 1
+    assert _status(queue, live) == 'running'
+    assert _status(queue, stale) == 'queued'
+
+
+def test_recover_fails_jobs_after_max_attempts(queue):
+    job_id = _submit(queue)
+    _set_running(queue, job_id, queue.owner, time.time(), attempts=2)
+
+    assert queue.recover() == 0
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
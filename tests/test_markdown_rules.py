@@ -0,0 +1,174 @@
+"""
+Regressionstests für die Markdown-Nachbearbeitung (doc_converter/processing/cleaner.py,
+rules.py, structure_fixer.py, validator.py)
+"""
+import pytest
+
+from doc_converter.processing.cleaner import MarkdownCleaner, BlankLineRule
+from doc_converter.processing.rules import Rule, RuleEngine
+
+
+@pytest.fixture
+def cleaner():
+    return MarkdownCleaner()
+
+
+def test_tables_do_not_swallow_prose_between_them(cleaner):
+    text = ("| A | B |\n| --- | --- |\n| 1 | 2 |\n\nText zwischen den Tabellen.\n\n"
+            "| C | D |\n| 3 | 4 | 5 |\n")
+
+    cleaned, changes = cleaner._clean_markdown(text)
+
+    assert cleaned == ("| A | B |\n| --- | --- |\n| 1 | 2 |\n\nText zwischen den Tabellen.\n\n"
+                       "| C | D |\n| --- | --- |\n| 3 | 4 |\n")
+    assert changes == ["Korrigierte 1 Tabellen"]
+
+
+def test_list_items_are_not_glued_to_following_lines(cleaner):
+    cleaned, changes = cleaner._clean_markdown("- eins\n- zwei\nFolgetext\n")
+
+    assert cleaned == "* eins\n* zwei\nFolgetext\n"
+    assert changes == ["Standardisierte 2 Aufzählungszeichen zu '*'"]
+
+
+def test_ordered_lists_are_renumbered_per_list(cleaner):
+    cleaned, changes = cleaner._clean_markdown("1. a\n1. b\n1. c\n\nText\n\n5. x\n7. y\n")
+
+    assert cleaned == "1. a\n2. b\n3. c\n\nText\n\n1. x\n2. y\n"
+    assert changes == ["Korrigierte 4 falsch nummerierte Listeneinträge"]
+
+
+def test_fenced_code_is_skipped_by_heading_spacing_and_renumbering(cleaner):
+    text = "```\n# kein Titel\n3. a\n5. b\n```\nText\n"
+
+    cleaned, changes = cleaner._clean_markdown(text)
+
+    assert cleaned == text
+    assert changes == []
+
+
+def test_bold_at_line_start_is_not_treated_as_list_marker(cleaner):
+    cleaned, changes = cleaner._clean_markdown("**Fett** am Zeilenanfang\n")
+
+    assert cleaned == "**Fett** am Zeilenanfang\n"
+    assert changes == []
+
+
+def test_every_link_on_a_line_is_repaired(cleaner):
+    text = "Siehe [A](( http://a )) und [B]((http://b)) sowie [](http://c)\n"
+
+    cleaned, changes = cleaner._clean_markdown(text)
+
+    assert cleaned == "Siehe [A](http://a) und [B](http://b) sowie [http://c](http://c)\n"
+    assert changes == [
+        "Korrigierte 2 Links mit doppelten Klammern",
+        "Entfernte Leerzeichen innerhalb der Link-Klammern bei 1 Links",
+        "Ersetzte 1 leere Link-Texte durch die URL",
+    ]
+
+
+def test_links_do_not_span_lines(cleaner):
+    text = "[offen\n](( http://a ))\n"
+
+    cleaned, _ = cleaner._clean_markdown(text)
+
+    assert cleaned == text
+
+
+def test_crlf_is_normalised_before_line_rules(cleaner):
+    cleaned, changes = cleaner._clean_markdown("# Titel\r\nText  \r\n")
+
+    assert cleaned == "# Titel\n\nText\n"
+    assert changes == [
+        "Konvertierte 2 Windows-Zeilenumbrüche zu Unix-Zeilenumbrüchen",
+        "Korrigierte Zeilenumbrüche um 1 Überschriften",
+        "Entfernte Leerzeichen am Zeilenende in 1 Zeilen",
+    ]
+
+
+def test_cleaned_text_is_stable(cleaner):
+    text = ("#Titel\n- a\n+ b\n3. x\n3. y\n\n\n\n| A | B |\n| 1 |\n\n"
+            "Ein _Wort_ und __mehr__ [x]((http://x))  \n")
+
+    cleaned, changes = cleaner._clean_markdown(text)
+    again, second_changes = cleaner._clean_markdown(cleaned)
+
+    assert changes
+    assert again == cleaned
+    assert second_changes == []
+
+
+def test_engine_reports_only_rules_that_fired_with_their_counts():
+    engine = RuleEngine([
+        Rule(r'a', 'b', "A {count}"),
+        Rule(r'x', 'y', "X {count}"),
+        # Treffer ohne Änderung zählen bei count_changed nicht
+        Rule(r'c', 'c', "C {count}", count_changed=True),
+        Rule(r'\d', '#', "Ziffer {count}", line=True),
+        Rule(r'z', 'q', "Z {count}", line=True),
+        BlankLineRule(),
+    ])
+
+    text, changes = engine.apply("aa c 12\n\n\n\nc 3")
+
+    assert text == "bb c ##\n\nc #"
+    assert changes == ["A 2", "Ziffer 3", "Entfernte 1 überflüssige Leerzeilen"]
+
+
+def test_engine_counts_match_a_rule_by_rule_run():
+    rules = [
+        Rule(r'^(#+)([^#\s])', r'\1 \2', "H {count}", line=True),
+        Rule(r'[ \t]+$', '', "T {count}", line=True),
+    ]
+    text = "#a  \n##b\nText \n# ok\n"
+
+    fused_text, fused_changes = RuleEngine(rules).apply(text)
+
+    expected_text = text
+    expected_changes = []
+    for rule in rules:
+        lines = []
+        count = 0
+        for line in expected_text.split('\n'):
+            line, n = rule.pattern.subn(rule.replacement, line)
+            lines.append(line)
+            count += n
+        expected_text = '\n'.join(lines)
+        if count:
+            expected_changes.append(rule.message.format(count=count))
+
+    assert fused_text == expected_text
+    assert fused_changes == expected_changes
+
+
+def test_structure_fixer_puts_blank_lines_around_lists():
+    pytest.importorskip('nltk')
+    from doc_converter.processing.structure_fixer import StructureFixer
+
+    text, changes = StructureFixer()._fix_list_formatting("Intro\n- a\n- b\nText\n")
+
+    assert text == "Intro\n\n* a\n* b\n\nText\n"
+    assert changes == ["2 Listenmarkierungen standardisiert zu '*'", "2 Leerzeilen um Listen herum eingefügt"]
+
+
+def test_structure_fixer_indentation_ignores_preceding_newlines():
+    pytest.importorskip('nltk')
+    from doc_converter.processing.structure_fixer import StructureFixer
+
+    text, changes = StructureFixer()._fix_list_formatting("* a\n\n* b\n * c\n")
+
+    assert text == "* a\n\n* b\n  * c\n"
+    assert changes == ["Listeneinrückung korrigiert (1 Änderungen)"]
+
+
+def test_validator_checks_each_table_separately():
+    pytest.importorskip('markdown')
+    from doc_converter.processing.validator import MarkdownValidator
+
+    validator = MarkdownValidator()
+    text = "| A | B |\n| --- | --- |\n| 1 | 2 |\n\nProsa | mit Strich\n\n| C | D |\n| x | y |\n"
+
+    issues, warnings = validator._validate_tables(text)
+
+    assert issues == ["Tabelle 2 hat keine Kopf-Trenner-Zeile (erwartet: |---| Zeile)"]
+    assert warnings == []
@@ -0,0 +1,20 @@
+"""
+Tests für die Zugriffsprüfung des Prometheus-Endpunkts (modules/core/metrics.py)
+"""
+from modules.core.metrics import scrape_allowed
+
+
+def test_without_token_only_loopback_may_scrape():
+    assert scrape_allowed('127.0.0.1', None, '')
+    assert scrape_allowed('::1', None, '')
+    assert scrape_allowed('localhost', None, '')
+    assert not scrape_allowed('10.0.0.5', None, '')
+    assert not scrape_allowed('203.0.113.9', 'Bearer irgendwas', '')
+    assert not scrape_allowed(None, None, '')
+    assert not scrape_allowed('testclient', None, '')
+
+
+def test_with_token_the_header_must_match():
+    assert scrape_allowed('10.0.0.5', 'Bearer geheim', 'geheim')
+    assert not scrape_allowed('10.0.0.5', 'Bearer falsch', 'geheim')
+    assert not scrape_allowed('127.0.0.1', None, 'geheim')
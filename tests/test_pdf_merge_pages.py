@@ -0,0 +1,77 @@
+"""
+Tests für das Zusammenführen der Seiten im PDF-Konverter (doc_converter/converters/pdf_converter.py)
+"""
+import threading
+
+import pytest
+
+pytest.importorskip('fitz')
+pytest.importorskip('camelot')
+pytest.importorskip('tabula')
+
+from doc_converter.converters.pdf_converter import PDFConverter
+
+HEADER = "| Dokument | Version |\n| --- | --- |\n| Handbuch | 1.2 |"
+FOOTER = "| Seite | Stand |\n| --- | --- |\n| intern | 2024 |"
+PRICES = "| Artikel | Preis |\n| --- | --- |\n| A | 1 |"
+
+
+def _page(*blocks):
+    return "\n\n".join(blocks)
+
+
+@pytest.fixture
+def converter():
+    return PDFConverter({'parallel_pages': True, 'page_workers': 4, 'min_pages_for_parallel': 2})
+
+
+def test_repeated_header_and_footer_tables_are_dropped(converter):
+    merged = converter._merge_pages([
+        _page(HEADER, "Text der ersten Seite", FOOTER),
+        _page(HEADER, "Text der zweiten Seite", FOOTER),
+        _page(HEADER, "Text der dritten Seite", FOOTER),
+    ])
+
+    assert merged.count(HEADER) == 1
+    assert merged.count(FOOTER) == 1
+    assert merged.count("Text der") == 3
+
+
+def test_identical_tables_in_the_body_are_kept(converter):
+    merged = converter._merge_pages([
+        _page("Angebot Januar", PRICES, "Ende Januar"),
+        _page("Angebot Februar", PRICES, "Ende Februar"),
+        _page("Zusammenfassung", PRICES, "Ende"),
+    ])
+
+    assert merged.count(PRICES) == 3
+
+
+def test_table_on_non_consecutive_pages_is_kept(converter):
+    merged = converter._merge_pages([
+        _page(PRICES, "Seite eins"),
+        _page("Seite zwei"),
+        _page(PRICES, "Seite drei"),
+    ])
+
+    assert merged.count(PRICES) == 2
+
+
+def test_table_continued_on_next_page_is_joined(converter):
+    merged = converter._merge_pages([
+        _page("Einleitung", PRICES),
+        _page("| Artikel | Preis |\n| --- | --- |\n| B | 2 |", "Schluss"),
+    ])
+
+    assert "| A | 1 |\n| B | 2 |" in merged
+    assert merged.count("| Artikel | Preis |") == 1
+
+
+def test_page_parallelism_only_on_the_main_thread(converter):
+    assert converter._use_parallel_pages(10)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(converter._use_parallel_pages(10)))
+    thread.start()
+    thread.join()
+    assert results == [False]
@@ -0,0 +1,83 @@
+"""
+Tests für den Tabellen-Vorfilter im PDF-Konverter (doc_converter/converters/pdf_converter.py)
+"""
+import pytest
+
+fitz = pytest.importorskip('fitz')
+pytest.importorskip('camelot')
+pytest.importorskip('tabula')
+
+from doc_converter.converters.pdf_converter import PAGE_DICT_FLAGS, PDFConverter
+
+PROSE = ("Dieses Handbuch beschreibt die Installation und den Betrieb der Anwendung. "
+         "Die folgenden Abschnitte erläutern die Konfiguration, die Benutzerverwaltung "
+         "und die Datensicherung. ") * 4
+
+
+@pytest.fixture
+def converter():
+    return PDFConverter({})
+
+
+@pytest.fixture
+def document():
+    doc = fitz.open()
+    yield doc
+    doc.close()
+
+
+def _candidate(converter, page):
+    return converter._table_candidate(page, page.get_text('dict', flags=PAGE_DICT_FLAGS))
+
+
+def _prose(page):
+    page.insert_textbox(fitz.Rect(72, 150, 523, 700), PROSE, fontsize=11)
+
+
+def test_ruled_grid_is_lattice(converter, document):
+    page = document.new_page()
+    for y in (100, 120, 140, 160):
+        page.draw_line(fitz.Point(72, y), fitz.Point(372, y))
+    for x in (72, 172, 272, 372):
+        page.draw_line(fitz.Point(x, 100), fitz.Point(x, 160))
+    for row, y in enumerate((115, 135, 155)):
+        for column, x in enumerate((76, 176, 276)):
+            page.insert_text(fitz.Point(x, y), f"Z{row}S{column}", fontsize=10)
+
+    assert _candidate(converter, page) == 'lattice'
+
+
+def test_grid_of_cell_rectangles_is_lattice(converter, document):
+    page = document.new_page()
+    for row in range(3):
+        for column in range(3):
+            page.draw_rect(fitz.Rect(72 + 100 * column, 100 + 20 * row,
+                                     172 + 100 * column, 120 + 20 * row))
+
+    assert _candidate(converter, page) == 'lattice'
+
+
+def test_aligned_text_without_lines_is_stream(converter, document):
+    page = document.new_page()
+    for row, y in enumerate((100, 120, 140, 160)):
+        for x, text in ((72, f"Artikel {row}"), (250, f"{row * 3},50"), (400, f"{row + 1} Stück")):
+            page.insert_text(fitz.Point(x, y), text, fontsize=10)
+
+    assert _candidate(converter, page) == 'stream'
+
+
+def test_prose_is_no_candidate(converter, document):
+    page = document.new_page()
+    _prose(page)
+
+    assert _candidate(converter, page) is None
+
+
+def test_page_border_and_header_band_are_no_table(converter, document):
+    page = document.new_page()
+    page.draw_rect(page.rect + (36, 36, -36, -36), color=(0, 0, 0))
+    page.draw_rect(fitz.Rect(36, 36, page.rect.width - 36, 90), color=(0, 0, 1), fill=(0.8, 0.8, 1))
+    page.insert_text(fitz.Point(72, 70), "Kopfzeile", fontsize=14)
+    _prose(page)
+
+    assert _candidate(converter, page) is None
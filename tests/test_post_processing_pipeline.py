@@ -0,0 +1,144 @@
+"""
+Tests für die Nachbearbeitungspipeline (doc_converter/processing/pipeline.py)
+und ihren Aufruf aus BaseConverter.convert
+"""
+import os
+
+import pytest
+import yaml
+
+from doc_converter.converters.base_converter import BaseConverter
+from doc_converter.processing import pipeline
+from doc_converter.processing.pipeline import MarkdownDocument, PostProcessingPipeline
+
+SOURCE = "---\ntitle: Handbuch\n---\n# Titel\n\nText\n"
+
+
+def _upper(document):
+    document.body = document.body.upper()
+    return {'success': True, 'changes': ['Großbuchstaben']}
+
+
+def _tag(document):
+    document.frontmatter['stage'] = document.frontmatter.get('title', '') + ' geprüft'
+    return {'success': True, 'changes': ['Frontmatter ergänzt']}
+
+
+def _half_done_then_fail(document):
+    document.body = 'kaputt'
+    document.frontmatter['kaputt'] = True
+    raise ValueError('Stufe abgebrochen')
+
+
+def _reports_failure(document):
+    document.body += 'halb'
+    return {'success': False, 'error': 'nicht möglich', 'changes': []}
+
+
+@pytest.fixture
+def counted_replace(monkeypatch):
+    calls = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        calls.append((str(src), str(dst)))
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(pipeline.os, 'replace', replace)
+    return calls
+
+
+def test_frontmatter_is_parsed_once(tmp_path, monkeypatch):
+    source = tmp_path / 'doc.md'
+    source.write_text(SOURCE, encoding='utf-8')
+    parsed = []
+    real_load = yaml.safe_load
+    monkeypatch.setattr(pipeline.yaml, 'safe_load', lambda text: parsed.append(text) or real_load(text))
+
+    result = PostProcessingPipeline([('tag', _tag), ('upper', _upper)]).process_file(source)
+
+    assert len(parsed) == 1
+    assert result['success']
+    frontmatter, body = pipeline.extract_frontmatter(source.read_text(encoding='utf-8'))
+    assert frontmatter == {'title': 'Handbuch', 'stage': 'Handbuch geprüft'}
+    assert body.strip() == "# TITEL\n\nTEXT"
+
+
+def test_file_is_written_once_by_rename_and_keeps_hardlinked_cache_object(tmp_path, counted_replace):
+    cache_object = tmp_path / 'cache' / 'objekt.md'
+    cache_object.parent.mkdir()
+    cache_object.write_text(SOURCE, encoding='utf-8')
+    target = tmp_path / 'out.md'
+    os.link(cache_object, target)
+
+    PostProcessingPipeline([('upper', _upper), ('tag', _tag)]).process_file(target)
+
+    assert counted_replace == [(str(target.with_name('.out.md.tmp')), str(target))]
+    assert cache_object.read_text(encoding='utf-8') == SOURCE
+    assert 'TITEL' in target.read_text(encoding='utf-8')
+    assert not target.with_name('.out.md.tmp').exists()
+
+
+@pytest.mark.parametrize('failing', [_half_done_then_fail, _reports_failure])
+def test_failing_stage_leaves_document_unchanged_and_later_stages_run(tmp_path, failing):
+    document = MarkdownDocument.from_text(SOURCE, tmp_path / 'doc.md')
+
+    result = PostProcessingPipeline([('tag', _tag), ('kaputt', failing), ('upper', _upper)]).run(document)
+
+    assert not result['success']
+    assert result['stages']['kaputt']['success'] is False
+    assert result['stages']['kaputt']['error']
+    assert result['stages']['upper']['success'] is True
+    assert document.body == "# TITEL\n\nTEXT\n"
+    assert document.frontmatter == {'title': 'Handbuch', 'stage': 'Handbuch geprüft'}
+    assert result['changes'] == ['Frontmatter ergänzt', 'Großbuchstaben']
+
+
+def test_stage_timings_are_logged_per_stage(tmp_path):
+    validated = []
+    post = PostProcessingPipeline([('tag', _tag), ('upper', _upper)],
+                                  validator=lambda document: validated.append(document.body) or {'is_valid': True})
+
+    result = post.run(MarkdownDocument.from_text(SOURCE, tmp_path / 'doc.md'))
+    post.run(MarkdownDocument.from_text(SOURCE, tmp_path / 'doc.md'))
+
+    stage_times = post.pipeline_logger.metrics['stage_times']
+    assert set(stage_times) == {'tag', 'upper', 'validate'}
+    assert all(len(times) == 2 and all(t >= 0 for t in times) for times in stage_times.values())
+    assert set(result['stages']) == {'tag', 'upper', 'validate'}
+    assert result['validation'] == {'is_valid': True}
+    assert validated[0] == "# TITEL\n\nTEXT\n"
+
+
+class _StubConverter(BaseConverter):
+    def _convert_to_markdown(self, source_path, assets_dir=None):
+        return "# Titel\n\nText\n", {'title': 'Handbuch', 'pages': 2, 'tags': ['nicht skalar']}
+
+
+def test_convert_runs_post_processor_in_memory_and_writes_once(tmp_path, monkeypatch):
+    source = tmp_path / 'quelle.txt'
+    source.write_text('egal', encoding='utf-8')
+    converter = _StubConverter({'templates_dir': str(tmp_path / 'templates'),
+                                'asset_store_dir': str(tmp_path / 'assets')})
+    writes = []
+    real_save = converter._save_markdown_document
+    monkeypatch.setattr(converter, '_save_markdown_document',
+                        lambda *args: writes.append(args[0]) or real_save(*args))
+    seen = []
+
+    def inspect(document):
+        seen.append(dict(document.frontmatter))
+        return _upper(document)
+
+    result = converter.convert(str(source), str(tmp_path / 'out'),
+                               post_processor=PostProcessingPipeline([('upper', inspect)]))
+
+    target = tmp_path / 'out' / 'quelle.md'
+    assert result['success']
+    assert writes == [target]
+    assert seen == [{'title': 'Handbuch', 'pages': 2}]
+    assert result['changes'] == ['Großbuchstaben']
+    assert set(result['post_processing']) == {'upper'}
+    frontmatter, body = pipeline.extract_frontmatter(target.read_text(encoding='utf-8'))
+    assert frontmatter == {'title': 'Handbuch', 'pages': 2}
+    assert body.strip() == "# TITEL\n\nTEXT"
@@ -0,0 +1,123 @@
+"""
+Tests für den gemeinsamen Antwort-Cache (modules/core/response_cache.py)
+"""
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from modules.core.response_cache import ResponseCache
+from modules.core.sqlite_pool import SQLitePool
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / 'responses.db'
+
+
+def _tag_version(path, tag):
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("SELECT version FROM cache_tags WHERE tag = ?", (tag,)).fetchone()
+        return row[0] if row else 0
+    finally:
+        conn.close()
+
+
+def test_invalidation_is_visible_locally_before_flush(cache_path):
+    cache = ResponseCache(path=cache_path, shared=True, sync_interval=60)
+    cache.set('k', {'v': 1}, tags=['sessions:u1'])
+    assert cache.get('k') == ({'v': 1}, True)
+
+    cache.invalidate_tags('sessions:u1')
+
+    assert cache.get('k') is None
+    cache.close()
+
+
+def test_invalidations_are_coalesced_into_one_write(cache_path):
+    cache = ResponseCache(path=cache_path, shared=True, sync_interval=60)
+    for _ in range(5):
+        cache.invalidate_tags('sessions:u1')
+    assert _tag_version(cache_path, 'sessions:u1') == 0
+
+    # Eine neue Berechnung mit dem Tag schreibt die gesammelten Invalidierungen vorher
+    versions = cache.current_versions(['sessions:u1'])
+    assert versions == {'sessions:u1': 1}
+    assert _tag_version(cache_path, 'sessions:u1') == 1
+    cache.close()
+
+
+def test_other_worker_sees_flushed_invalidation(cache_path):
+    writer = ResponseCache(path=cache_path, shared=True, sync_interval=0)
+    reader = ResponseCache(path=cache_path, shared=True, sync_interval=0)
+    reader.set('k', 'alt', tags=['feedback'])
+
+    writer.invalidate_tags('feedback')
+
+    assert reader.get('k') is None
+    writer.close()
+    reader.close()
+
+
+def test_close_writes_pending_invalidations(cache_path):
+    cache = ResponseCache(path=cache_path, shared=True, sync_interval=60)
+    cache.invalidate_tags('documents')
+    cache.close()
+    assert _tag_version(cache_path, 'documents') == 1
+
+
+def test_pool_is_bounded_and_shared_between_threads(tmp_path):
+    pool = SQLitePool(tmp_path / 'pool.db', size=2)
+    seen = set()
+
+    def worker():
+        for _ in range(20):
+            with pool.connection() as conn:
+                seen.add(id(conn))
+                conn.execute("SELECT 1").fetchone()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 1 <= len(seen) <= 2
+    pool.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.connection():
+            pass
+
+
+def test_get_or_set_keeps_sqlite_off_the_event_loop(cache_path):
+    cache = ResponseCache(path=cache_path, shared=True, sync_interval=0)
+    other = ResponseCache(path=cache_path, shared=True, sync_interval=0)
+    used_from = []
+    real_connection = cache._pool.connection
+
+    def tracing_connection():
+        used_from.append(threading.get_ident())
+        return real_connection()
+
+    cache._pool.connection = tracing_connection
+
+    async def compute():
+        return {'v': 1}
+
+    async def scenario():
+        loop_thread = threading.get_ident()
+        assert await cache.get_or_set('k', compute, tags=['feedback']) == ({'v': 1}, False)
+        # Lokaler Treffer: keine Datenbank nötig außer dem fälligen Tag-Abgleich
+        assert await cache.get_or_set('k', compute, tags=['feedback']) == ({'v': 1}, True)
+        return loop_thread
+
+    loop_thread = asyncio.run(scenario())
+    assert used_from
+    assert loop_thread not in used_from
+
+    # Der zweite Worker findet den Eintrag in der gemeinsamen Stufe
+    assert asyncio.run(other.get_or_set('k', compute)) == ({'v': 1}, True)
+    cache.close()
+    other.close()
@@ -0,0 +1,84 @@
+"""
+Tests für die Archivierung von Chat-Sessions (modules/session/archive.py)
+"""
+import sqlite3
+
+import pytest
+
+from modules.core import response_cache
+from modules.core.config import Config
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    from modules.session.chat_history import ChatHistoryManager
+
+    monkeypatch.setattr(Config, 'DB_PATH', tmp_path / 'users.db')
+    monkeypatch.setattr(Config, 'RESPONSE_CACHE_PATH', tmp_path / 'responses.db')
+    monkeypatch.setattr(Config, 'SESSION_ARCHIVE_DIR', tmp_path / 'archive')
+    monkeypatch.setattr(response_cache, '_response_cache', None)
+    return ChatHistoryManager()
+
+
+def _session_with_messages(history, count=3):
+    session_id = history.create_session(1, "Test")
+    for i in range(count):
+        history.add_message(session_id, f"Frage {i}", is_user=True)
+        history.add_message(session_id, f"Antwort {i}", is_user=False)
+    return session_id
+
+
+def test_archive_is_disabled_by_default():
+    assert Config.SESSION_ARCHIVE_AFTER_DAYS == 0
+
+
+def test_add_message_rehydrates_archived_session(history):
+    session_id = _session_with_messages(history)
+    original = history.get_session_history(session_id)
+    assert history.archiver.archive_session(session_id)
+    assert history.archiver.is_archived(session_id)
+
+    history.add_message(session_id, "Weiter", is_user=True)
+
+    assert not history.archiver.is_archived(session_id)
+    messages = history.get_session_history(session_id)
+    assert [m['id'] for m in messages[:-1]] == [m['id'] for m in original]
+    assert messages[-1]['message'] == "Weiter"
+
+
+def test_second_archiver_sees_state_of_first(history):
+    """Zustand liegt in der Datenbank: ein zweiter Prozess stellt nicht doppelt wieder her"""
+    from modules.session.archive import SessionArchiver
+
+    session_id = _session_with_messages(history)
+    other = SessionArchiver()
+    assert history.archiver.archive_session(session_id)
+    assert not other.archive_session(session_id)
+    assert other.rehydrate_session(session_id)
+    assert not history.archiver.rehydrate_session(session_id)
+    assert len(history.get_session_history(session_id)) == 6
+
+
+def test_compaction_keeps_live_sessions_readable(history, monkeypatch):
+    sessions = [_session_with_messages(history) for _ in range(4)]
+    for session_id in sessions:
+        assert history.archiver.archive_session(session_id)
+    # Drei von vier Sessions zurückholen, damit das Segment überwiegend tot ist
+    for session_id in sessions[:3]:
+        assert history.archiver.rehydrate_session(session_id)
+    # Segment als voll markieren, damit die nächste Archivierung ein neues beginnt
+    monkeypatch.setattr(Config, 'SESSION_ARCHIVE_SEGMENT_BYTES', 1)
+    assert history.archiver.archive_session(sessions[0])
+
+    assert history.archiver.compact_segments() == 1
+
+    conn = sqlite3.connect(Config.DB_PATH)
+    referenced = {row[0] for row in conn.execute(
+        "SELECT archive_segment FROM chat_sessions WHERE archived_at IS NOT NULL")}
+    conn.close()
+    on_disk = {str(p.relative_to(Config.SESSION_ARCHIVE_DIR))
+               for p in Config.SESSION_ARCHIVE_DIR.glob("u*/*.seg.gz")}
+    assert referenced <= on_disk
+    for session_id in (sessions[0], sessions[3]):
+        assert history.archiver.rehydrate_session(session_id)
+        assert len(history.get_session_history(session_id)) == 6
@@ -0,0 +1,98 @@
+"""
+Tests für den Index der statischen Dateien (modules/core/static_assets.py)
+"""
+import asyncio
+import gzip
+
+from modules.core.static_assets import StaticAssetMiddleware, StaticAssetStore
+
+
+def _store(tmp_path, cache_dir=True):
+    source = tmp_path / 'frontend'
+    (source / 'assets').mkdir(parents=True)
+    (source / 'assets' / 'index.3f9a1Bc2.js').write_text('console.log("hallo");\n' * 200)
+    (source / 'app.css').write_text('body { margin: 0; }\n' * 200)
+    store = StaticAssetStore(cache_dir=tmp_path / 'cache' if cache_dir else None)
+    store.mount('/static', source, build=True)
+    return store, source
+
+
+def _get(store, path, accept_encoding='gzip'):
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path,
+             'headers': [(b'accept-encoding', accept_encoding.encode())]}
+    asyncio.run(StaticAssetMiddleware(app, store)(scope, None, send))
+    return messages[0]['status'], dict(messages[0]['headers']), b''.join(m.get('body', b'') for m in messages[1:])
+
+
+def test_prepare_leaves_the_source_tree_untouched(tmp_path):
+    store, source = _store(tmp_path)
+    before = sorted(p.relative_to(source) for p in source.rglob('*'))
+    stats = store.prepare()
+
+    assert stats['files'] == 2
+    assert stats['compressed'] == 2
+    assert sorted(p.relative_to(source) for p in source.rglob('*')) == before
+    assert list((tmp_path / 'cache').glob('*.gz'))
+
+
+def test_without_cache_dir_variants_stay_in_memory(tmp_path):
+    store, source = _store(tmp_path, cache_dir=False)
+    store.prepare()
+
+    status, headers, body = _get(store, '/static/app.css')
+    assert status == 200
+    assert headers[b'content-encoding'] == b'gzip'
+    assert gzip.decompress(body) == (source / 'app.css').read_bytes()
+    assert not (tmp_path / 'cache').exists()
+    assert not list(source.rglob('*.gz'))
+
+
+def test_cached_variants_survive_a_restart_and_stale_ones_are_pruned(tmp_path):
+    store, source = _store(tmp_path)
+    store.prepare()
+    first = set((tmp_path / 'cache').iterdir())
+
+    (source / 'app.css').write_text('body { margin: 1px; }\n' * 200)
+    restarted = StaticAssetStore(cache_dir=tmp_path / 'cache')
+    restarted.mount('/static', source, build=True)
+    restarted.prepare()
+    second = set((tmp_path / 'cache').iterdir())
+
+    # Die Variante der unveränderten JS-Datei wird übernommen, die der alten CSS-Datei gelöscht
+    assert len(first & second) == len(first) // 2
+    assert len(second) == len(first)
+
+
+def test_mutable_files_are_revalidated_off_the_cache(tmp_path):
+    store, source = _store(tmp_path)
+    store.prepare()
+    assert store.cached('/static/assets/index.3f9a1Bc2.js') is not None
+    assert store.cached('/static/app.css') is None
+
+    (source / 'app.css').write_text('neu')
+    status, headers, body = _get(store, '/static/app.css', accept_encoding='')
+    assert status == 200
+    assert body == b'neu'
+    assert headers[b'cache-control'] == b'no-cache'
+
+
+def test_encodings_refused_with_q0_are_not_reenabled_by_wildcard(tmp_path):
+    store, source = _store(tmp_path)
+    store.prepare()
+
+    status, headers, body = _get(store, '/static/app.css', accept_encoding='br;q=0, *')
+    assert headers[b'content-encoding'] == b'gzip'
+    assert gzip.decompress(body) == (source / 'app.css').read_bytes()
+
+    status, headers, body = _get(store, '/static/app.css', accept_encoding='br;q=0, gzip;q=0, *')
+    assert b'content-encoding' not in headers
+    assert body == (source / 'app.css').read_bytes()
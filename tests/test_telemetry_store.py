@@ -0,0 +1,66 @@
+"""
+Tests für den Telemetrie-Speicher (modules/core/telemetry_store.py)
+"""
+import time
+
+import pytest
+
+from modules.core.telemetry_store import TelemetryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(tmp_path / 'telemetry.db')
+    yield store
+    store.close()
+
+
+def _metric(name, value, **tags):
+    return {'eventType': 'metric', 'name': name, 'value': value, 'tags': tags}
+
+
+def test_client_metrics_are_whitelisted(store):
+    written = store.ingest([
+        _metric('api_call_duration', 120, endpoint='/api/session/42', status='200', model='fake'),
+        _metric('stream_latency', 1, model='fake'),
+        _metric('random_metric_1234', 5),
+    ])
+
+    assert written == 1
+    assert [m['metric'] for m in store.list_metrics()] == ['api_call_duration']
+    groups = store.query('api_call_duration', hours=1, group_by=['endpoint', 'model'])['groups']
+    assert groups[0]['endpoint'] == '/api/session/:id'
+    assert groups[0]['model'] == ''
+
+
+def test_client_dimension_values_are_capped(store):
+    store.max_dimension_values = 3
+    store.ingest([_metric('component_render', 10, component=f'C{i}') for i in range(10)])
+
+    groups = store.query('component_render', hours=1, group_by=['component'])['groups']
+    assert sorted(g['component'] for g in groups) == ['C0', 'C1', 'C2', 'other']
+    assert sum(g['count'] for g in groups) == 10
+
+
+def test_record_does_not_write_in_the_caller(store, monkeypatch):
+    writes = []
+    original_write = store._write
+
+    def tracking_write(samples):
+        result = original_write(samples)
+        writes.append(len(samples))
+        return result
+
+    monkeypatch.setattr(store, '_write', tracking_write)
+
+    store.record('stream_latency', 250, model='m', status='ok')
+    assert writes == []
+
+    # Nach FLUSH_INTERVAL übernimmt ein Hintergrund-Thread das Schreiben
+    store._last_flush -= store.FLUSH_INTERVAL
+    store.record('stream_latency', 300, model='m', status='ok')
+    deadline = time.time() + 2
+    while not writes and time.time() < deadline:
+        time.sleep(0.01)
+    assert writes == [2]
+    assert store.query('stream_latency', hours=1)['groups'][0]['count'] == 2
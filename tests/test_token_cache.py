@@ -0,0 +1,95 @@
+"""
+Tests für Token-Cache und Sperrliste (modules/auth/token_cache.py)
+"""
+import time
+
+import pytest
+
+from modules.auth.token_cache import TokenVerifier, VerifiedTokenCache
+
+
+def make_claims(user_id, iat, ttl=3600):
+    return {'user_id': user_id, 'iat': iat, 'exp': int(iat) + ttl}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / 'users.db'
+
+
+def test_token_verifier_is_abstract():
+    with pytest.raises(TypeError):
+        TokenVerifier()
+
+
+def test_token_issued_after_revocation_in_same_second_stays_valid(db_path, monkeypatch):
+    cache = VerifiedTokenCache(max_size=10, db_path=db_path)
+    second = int(time.time())
+    before = make_claims(1, second + 0.2)
+    after = make_claims(1, second + 0.6)
+    monkeypatch.setattr(time, 'time', lambda: second + 0.4)
+    cache.revoke_user(1)
+
+    assert cache.is_revoked('token-before', before)
+    assert not cache.is_revoked('token-after', after)
+
+
+def test_integer_iat_from_revocation_second_is_revoked(db_path):
+    cache = VerifiedTokenCache(max_size=10, db_path=db_path)
+    cache.revoke_user(7)
+    # Ältere Tokens tragen ganzzahlige iat; dieselbe Sekunde liegt vor dem Widerruf
+    assert cache.is_revoked('old-token', make_claims(7, int(time.time())))
+
+
+def test_revocations_reach_other_processes_through_database(db_path):
+    worker_a = VerifiedTokenCache(max_size=10, db_path=db_path, sync_interval=0)
+    worker_b = VerifiedTokenCache(max_size=10, db_path=db_path, sync_interval=0)
+    claims = make_claims(3, time.time() - 5)
+    worker_b.put('shared-token', claims)
+
+    assert not worker_b.is_revoked('shared-token', claims)
+    worker_a.revoke_user(3)
+    assert worker_b.is_revoked('shared-token', claims)
+    assert worker_b.get('shared-token') is None
+
+    logout_claims = make_claims(4, time.time())
+    worker_a.revoke('logout-token', expiry=logout_claims['exp'])
+    assert worker_b.is_revoked('logout-token', logout_claims)
+
+
+def test_revocation_checks_skip_the_database_between_syncs(db_path, monkeypatch):
+    worker_a = VerifiedTokenCache(max_size=10, db_path=db_path, sync_interval=60)
+    worker_b = VerifiedTokenCache(max_size=10, db_path=db_path, sync_interval=60)
+    claims = make_claims(8, time.time() - 5)
+    worker_a.revoke_user(8)
+
+    # Innerhalb des Intervalls keine Abfrage: der Widerruf des anderen Workers ist noch unbekannt
+    assert not worker_b.is_revoked('lagging-token', claims)
+    monkeypatch.setattr(worker_b, '_last_sync', time.monotonic() - 61)
+    assert worker_b.is_revoked('lagging-token', claims)
+
+
+def test_revocations_survive_restart(db_path):
+    VerifiedTokenCache(max_size=10, db_path=db_path).revoke_user(5)
+    restarted = VerifiedTokenCache(max_size=10, db_path=db_path)
+    assert restarted.is_revoked('token', make_claims(5, time.time() - 1))
+
+
+def test_relogin_right_after_revocation_yields_valid_token(db_path, monkeypatch):
+    pytest.importorskip('jose')
+    from modules.auth import token_cache, user_model
+    from modules.core.config import Config
+
+    monkeypatch.setattr(Config, 'DB_PATH', db_path)
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_ITERATIONS', 1000)
+    monkeypatch.setattr(token_cache, '_token_cache', None)
+    manager = user_model.UserManager()
+    assert manager.register_user('anna@example.com', 'geheim123')
+
+    old_token = manager.authenticate('anna@example.com', 'geheim123')
+    user_id = manager.verify_token(old_token)['user_id']
+    manager.revoke_user_tokens(user_id)
+    new_token = manager.authenticate('anna@example.com', 'geheim123')
+
+    assert manager.verify_token(old_token) is None
+    assert manager.verify_token(new_token)['user_id'] == user_id
@@ -0,0 +1,49 @@
+"""
+Tests für die Log-Weiterleitung des Worker-Pools (doc_converter/utils/worker_pool.py)
+"""
+import logging
+import logging.handlers
+import os
+
+import pytest
+
+from doc_converter.utils.worker_pool import WorkerPool
+
+
+def _log_and_report(item):
+    logging.getLogger('doc_converter.test').warning(f"Eintrag {item} aus {os.getpid()}")
+    return [type(handler).__name__ for handler in logging.getLogger().handlers]
+
+
+class _Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+def test_worker_logs_reach_the_parent_handlers(tmp_path, start_method):
+    root = logging.getLogger()
+    file_handler = logging.handlers.RotatingFileHandler(tmp_path / 'parent.log')
+    collect = _Collect()
+    root.addHandler(file_handler)
+    root.addHandler(collect)
+    try:
+        with WorkerPool(_log_and_report, max_workers=2, start_method=start_method) as pool:
+            results = list(pool.map_unordered(range(4)))
+    finally:
+        root.removeHandler(file_handler)
+        root.removeHandler(collect)
+        file_handler.close()
+
+    assert all(success for _, success, _ in results)
+    # Worker schreiben nie selbst in Dateien, auch nicht mit geerbten Handlern ('fork')
+    assert all(value == ['QueueHandler'] for _, _, value in results)
+    messages = sorted(record.getMessage().split(' aus ')[0] for record in collect.records
+                      if record.name == 'doc_converter.test')
+    assert messages == [f'Eintrag {i}' for i in range(4)]
+    assert all(record.process != os.getpid() for record in collect.records if record.name == 'doc_converter.test')
+    assert 'Eintrag 3' in (tmp_path / 'parent.log').read_text()
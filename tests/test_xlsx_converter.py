@@ -0,0 +1,133 @@
+"""
+Tests für den Excel-Konverter (doc_converter/converters/xlsx_converter.py)
+"""
+import re
+import zipfile
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+pytest.importorskip('pandas')
+
+from doc_converter.converters import xlsx_converter
+from doc_converter.converters.xlsx_converter import ExcelConverter
+
+
+def _workbook(path, rows, title='Daten'):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = title
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _strip_dimension(path):
+    """Entfernt <dimension> aus den Blattdaten, wie bei Dateien anderer Programme"""
+    with zipfile.ZipFile(path) as source:
+        entries = {name: source.read(name) for name in source.namelist()}
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as target:
+        for name, data in entries.items():
+            if name.startswith('xl/worksheets/'):
+                data = re.sub(rb'<dimension [^>]*/>', b'', data)
+            target.writestr(name, data)
+    return path
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Zeichnet alle geöffneten Workbooks auf und markiert sie beim Schließen"""
+    workbooks = []
+    real_load = openpyxl.load_workbook
+
+    def load(*args, **kwargs):
+        wb = real_load(*args, **kwargs)
+        real_close = wb.close
+        wb.closed = False
+
+        def close():
+            wb.closed = True
+            real_close()
+
+        wb.close = close
+        workbooks.append(wb)
+        return wb
+
+    monkeypatch.setattr(xlsx_converter.openpyxl, 'load_workbook', load)
+    return workbooks
+
+
+def test_float_cells_with_integer_values_are_written_without_decimals(tmp_path, opened):
+    path = _workbook(tmp_path / 'preise.xlsx', [
+        ['Artikel', 'Menge', 'Preis', 'Aktiv'],
+        ['A', 3.0, 2.5, True],
+        ['B', 10, 1e20, False],
+    ])
+
+    markdown, metadata = ExcelConverter()._convert_to_markdown(path)
+
+    assert markdown == ("## Daten\n\n"
+                        "| Artikel | Menge | Preis | Aktiv |\n"
+                        "| --- | --- | --- | --- |\n"
+                        "| A | 3 | 2.5 | True |\n"
+                        "| B | 10 | 100000000000000000000 | False |")
+    assert metadata['sheets'][0]['row_count'] == 3
+    assert len(opened) == 1
+    assert opened[0].closed
+
+
+def test_rows_and_columns_are_truncated_to_the_limits(tmp_path):
+    path = _workbook(tmp_path / 'gross.xlsx', [[f'{r}-{c}' for c in range(5)] for r in range(10)])
+
+    markdown, _ = ExcelConverter({'max_rows': 3, 'max_cols': 2})._convert_to_markdown(path)
+
+    assert markdown == ("## Daten\n\n"
+                        "| 0-0 | 0-1 |\n"
+                        "| --- | --- |\n"
+                        "| 1-0 | 1-1 |\n"
+                        "| 2-0 | 2-1 |")
+
+
+def test_unsized_sheet_is_trimmed_to_its_data(tmp_path):
+    path = _strip_dimension(_workbook(tmp_path / 'ohne_dimension.xlsx', [
+        ['Name', 'Wert'],
+        [None, None],
+        ['x', 1],
+    ]))
+
+    converter = ExcelConverter({'max_rows': 50, 'max_cols': 10})
+    markdown, metadata = converter._convert_to_markdown(path)
+
+    # Leerzeilen innerhalb der Daten bleiben, leere Ränder werden entfernt
+    assert markdown == ("## Daten\n\n"
+                        "| Name | Wert |\n"
+                        "| --- | --- |\n"
+                        "|  |  |\n"
+                        "| x | 1 |")
+    assert metadata['sheets'][0]['row_count'] is None
+
+
+def test_empty_sheet_produces_no_table(tmp_path):
+    path = tmp_path / 'leer.xlsx'
+    openpyxl.Workbook().save(path)
+
+    markdown, _ = ExcelConverter()._convert_to_markdown(path)
+
+    assert markdown == ""
+
+
+def test_workbook_is_closed_when_falling_back_to_pandas(tmp_path, opened, monkeypatch):
+    path = _workbook(tmp_path / 'fallback.xlsx', [['A', 'B'], [1, 2]])
+    converter = ExcelConverter()
+
+    def fail(sheet, sheet_name):
+        raise RuntimeError("Blatt nicht lesbar")
+
+    monkeypatch.setattr(converter, '_convert_sheet_to_markdown', fail)
+    markdown, metadata = converter._convert_to_markdown(path)
+
+    assert markdown.startswith("## Daten\n\n")
+    assert "| A | B |" in markdown
+    assert metadata['title'] == 'fallback'
+    assert opened and all(wb.closed for wb in opened)